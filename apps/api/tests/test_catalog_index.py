@@ -0,0 +1,43 @@
+from decimal import Decimal
+from django.test import SimpleTestCase
+
+from apps.utils.catalog_index import CatalogIndex
+
+
+def item(xitem, xdesc, xbarcode=None):
+    return (xitem, xdesc, Decimal('10.00'), xbarcode, Decimal('7.50'), 'Pcs')
+
+
+class CatalogIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = CatalogIndex([
+            item('02-007', 'Hex Bolt M8', '8901234567890'),
+            item('01-001', 'Hex Nut M8'),
+            item('03-002', 'Wood Screw', '4006381333931'),
+            item('01-002', 'Washer M8'),
+        ])
+
+    def test_search_matches_code_description_and_barcode_in_code_order(self):
+        items, more = self.index.search('m8')
+        self.assertEqual([row[0] for row in items], ['01-001', '01-002', '02-007'])
+        self.assertFalse(more)
+
+        items, _ = self.index.search('HEX B')
+        self.assertEqual([row[0] for row in items], ['02-007'])
+
+        items, _ = self.index.search('63813')
+        self.assertEqual([row[0] for row in items], ['03-002'])
+
+    def test_search_does_not_match_across_fields(self):
+        # "02-007" + "Hex" would only match if grams spanned the field separator
+        items, _ = self.index.search('7hex')
+        self.assertEqual(items, [])
+
+    def test_search_pages(self):
+        items, more = self.index.search('m8', offset=0, limit=2)
+        self.assertEqual([row[0] for row in items], ['01-001', '01-002'])
+        self.assertTrue(more)
+
+        items, more = self.index.search('m8', offset=2, limit=2)
+        self.assertEqual([row[0] for row in items], ['02-007'])
+        self.assertFalse(more)
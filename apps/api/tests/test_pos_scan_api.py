@@ -0,0 +1,49 @@
+import json
+from decimal import Decimal
+from unittest.mock import patch
+from django.test import RequestFactory, TestCase
+
+from apps.api.views.pos_scan_api import pos_scan_api
+
+
+class CursorStub:
+    def __init__(self, row):
+        self.row = row
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+    def fetchone(self):
+        return self.row
+
+
+class PosScanApiTests(TestCase):
+    def scan(self, cursor, code):
+        request = RequestFactory().get('/api/pos/scan/', {'code': code})
+        request.user = type('User', (), {'is_authenticated': True})()
+        request.session = {'current_zid': 100001}
+        with patch('apps.api.views.pos_scan_api.connection.cursor', return_value=cursor):
+            return pos_scan_api(request)
+
+    def test_returns_item_with_stock_in_one_query(self):
+        cursor = CursorStub(('02-007', 'Hex Bolt M8', Decimal('10.00'), '8901234567890',
+                             Decimal('7.50'), 'Pcs', Decimal('12.000')))
+        response = self.scan(cursor, ' 8901234567890 ')
+
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.content)['result']
+        self.assertEqual(result['xitem'], '02-007')
+        self.assertEqual(result['stock'], 12.0)
+        self.assertEqual(len(cursor.executed), 1)
+        self.assertEqual(cursor.executed[0][1], [100001, '8901234567890', 100001, '8901234567890'])
+
+    def test_unknown_code_is_not_found(self):
+        response = self.scan(CursorStub(None), 'NOPE')
+        self.assertEqual(response.status_code, 404)
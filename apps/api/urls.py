@@ -1,5 +1,6 @@
 from django.urls import path
 from .views.pos_products_api import pos_products_api
+from .views.pos_scan_api import pos_scan_api
 from .views.avg_item_price import avg_item_price
 from .views.api_get_warehouse import api_get_warehouse
 from .views.api_get_supplier import api_get_supplier
@@ -16,6 +17,8 @@
     # |  Item Related URLS      |
     # +--------------------------+
     path('pos/products/', pos_products_api, name='pos_products_api'),
+    # exact barcode / item code lookup for scanners
+    path('pos/scan/', pos_scan_api, name='pos_scan_api'),
     # avg item price
     path('avg-item-price/', avg_item_price, name='avg-item-price'),
 
@@ -1,5 +1,5 @@
 from django.http import JsonResponse
-from django.db import connection
+from apps.utils.master_data import search_master_data
 from django.contrib.auth.decorators import login_required
 import logging
 
@@ -19,33 +19,16 @@ def api_get_customer(request):
 
         page_size = 20
 
-        with connection.cursor() as cursor:
-            sql = """
-                SELECT xcus, xshort
-                FROM cacus
-                WHERE zid = %s
-            """
-            params = [request.session.get('current_zid')]
-
-            if search_term:
-                sql += " AND (LOWER(xcus) LIKE LOWER(%s) OR LOWER(xshort) LIKE LOWER(%s))"
-                search_pattern = f"%{search_term}%"
-                params.extend([search_pattern, search_pattern])
-
-            sql += " ORDER BY xcus LIMIT %s OFFSET %s"
-            offset = (page - 1) * page_size
-            params.extend([page_size, offset])
-
-            cursor.execute(sql, params)
-            customers = cursor.fetchall()
+        customers, has_more = search_master_data(
+            request.session.get('current_zid'), 'cacus', search_term,
+            offset=(page - 1) * page_size, limit=page_size,
+        )
 
         results = [
             {'id': xcus, 'text': xcus, 'xshort': xshort}
             for xcus, xshort in customers
         ]
 
-        has_more = len(results) == page_size
-
         return JsonResponse({'results': results, 'pagination': {'more': has_more}})
 
     except Exception as e:
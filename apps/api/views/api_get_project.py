@@ -1,6 +1,6 @@
 from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
-from django.db import connection
+from apps.utils.master_data import search_master_data
 import logging
 
 # Set up logging
@@ -17,25 +17,9 @@ def api_get_project(request):
     try:
         search_term = request.GET.get('q', '').strip()
 
-        with connection.cursor() as cursor:
-            # Base query to get project codes
-            sql = """
-                SELECT xcode
-                FROM xcodes
-                WHERE zid = %s AND xtype = 'Project'
-            """
-            params = [request.session.get('current_zid')]
-            logger.info(f'Querying projects for ZID: {params[0]}')
-
-            # Add search filter if search term provided
-            if search_term:
-                sql += " AND LOWER(xcode) LIKE LOWER(%s)"
-                params.append(f'%{search_term}%')
-
-            sql += " ORDER BY xcode"
-
-            cursor.execute(sql, params)
-            projects = cursor.fetchall()
+        zid = request.session.get('current_zid')
+        logger.info(f'Querying projects for ZID: {zid}')
+        projects, _ = search_master_data(zid, 'xcodes', search_term, xtype='Project')
 
         # Format data for Select2
         results = []
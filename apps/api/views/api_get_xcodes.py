@@ -1,6 +1,6 @@
 from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
-from django.db import connection
+from apps.utils.master_data import search_master_data
 import logging
 
 # Import xcode types configuration
@@ -31,25 +31,9 @@ def api_get_xcodes(request, xtype):
         db_xtype = get_db_xtype(xtype)
         search_term = request.GET.get('q', '').strip()
 
-        with connection.cursor() as cursor:
-            # Base query to get xcodes
-            sql = """
-                SELECT xcode
-                FROM xcodes
-                WHERE zid = %s AND xtype = %s
-            """
-            params = [request.session.get('current_zid'), db_xtype]
-            logger.info(f'Querying {xtype} for ZID: {params[0]}')
-
-            # Add search filter if search term provided
-            if search_term:
-                sql += " AND LOWER(xcode) LIKE LOWER(%s)"
-                params.append(f'%{search_term}%')
-
-            sql += " ORDER BY xcode"
-
-            cursor.execute(sql, params)
-            xcodes = cursor.fetchall()
+        zid = request.session.get('current_zid')
+        logger.info(f'Querying {xtype} for ZID: {zid}')
+        xcodes, _ = search_master_data(zid, 'xcodes', search_term, xtype=db_xtype)
 
         # Format data for Select2
         results = []
@@ -13,8 +13,8 @@ def avg_item_price(request):
     Returns data in Select2 format for autocomplete
 
     Formulas:
-    - Stock: sum(xqty * xsign)
-    - Average Price: sum(xval * xsign) / sum(xqty * xsign) (handles divide by 0)
+    - Stock: sum(xqty * xsign), read from stock_balance
+    - Average Price: sum(xval * xsign) / sum(xqty * xsign) (handles divide by 0), read from item_cost
     """
     if request.method != 'GET':
         logger.error(f"Invalid method {request.method} for avg_item_price endpoint")
@@ -54,16 +54,19 @@ def avg_item_price(request):
             c.xstdcost,
             c.xstdprice,
             c.xunitstk,
-            COALESCE(SUM(i.xqty * i.xsign), 0) AS stock,
-            COALESCE(SUM(i.xval * i.xsign), 0) AS total_value,
+            COALESCE((
+                SELECT SUM(b.xqty) FROM stock_balance b
+                WHERE b.zid = c.zid AND b.xitem = c.xitem
+            ), 0) AS stock,
+            COALESCE(ic.xval, 0) AS total_value,
             CASE
-                WHEN COALESCE(SUM(i.xqty * i.xsign), 0) = 0 THEN 0
-                ELSE COALESCE(SUM(i.xval * i.xsign), 0) / COALESCE(SUM(i.xqty * i.xsign), 1)
+                WHEN COALESCE(ic.xqty, 0) = 0 THEN 0
+                ELSE ic.xval / ic.xqty
             END AS avg_price
         FROM
             caitem c
         LEFT JOIN
-            imtrn i ON c.xitem = i.xitem AND c.zid = i.zid
+            item_cost ic ON ic.zid = c.zid AND ic.xitem = c.xitem
         WHERE
             c.zid = %s
             AND (
@@ -71,8 +74,6 @@ def avg_item_price(request):
                 OR LOWER(c.xdesc) LIKE LOWER(%s)
                 OR LOWER(c.xbarcode) LIKE LOWER(%s)
             )
-        GROUP BY
-            c.xitem, c.xdesc, c.xbarcode, c.xstdcost, c.xstdprice, c.xunitstk
         ORDER BY
             c.xitem
         LIMIT %s OFFSET %s
@@ -1,6 +1,7 @@
 from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
-from django.db import connection
+from apps.utils.catalog_index import get_catalog
+from apps.utils.inventory_posting import get_stock_on_hand
 
 
 @login_required
@@ -35,65 +36,30 @@ def pos_products_api(request):
                 'pagination': {'more': False}
             })
 
-        # Build SQL query to get items with stock calculation
-        sql_query = """
-        SELECT
-            c.xitem,
-            c.xdesc,
-            c.xstdprice,
-            c.xbarcode,
-            c.xstdcost,
-            c.xunitstk,
-            COALESCE(SUM(i.xqty * i.xsign), 0) AS stock
-        FROM
-            caitem c
-        LEFT JOIN
-            imtrn i ON c.xitem = i.xitem AND c.zid = i.zid
-        WHERE
-            c.zid = %s
-            AND (
-                LOWER(c.xitem) LIKE LOWER(%s)
-                OR LOWER(c.xdesc) LIKE LOWER(%s)
-                OR LOWER(c.xbarcode) LIKE LOWER(%s)
-            )
-        GROUP BY
-            c.xitem, c.xdesc, c.xstdprice, c.xbarcode, c.xstdcost, c.xunitstk
-        ORDER BY
-            c.xitem
-        LIMIT %s OFFSET %s
-        """
-
-        # Prepare search parameters
-        search_param = f"%{search_term}%"
+        # Search the in-memory catalog, then read stock for this page only
         offset = (page - 1) * page_size
-        params = [current_zid, search_param, search_param, search_param, page_size, offset]
-
-        # Execute the query
-        with connection.cursor() as cursor:
-            cursor.execute(sql_query, params)
-            columns = [col[0] for col in cursor.description]
-            results_data = cursor.fetchall()
+        items, more = get_catalog(current_zid).search(search_term, offset=offset, limit=page_size)
+        stock = get_stock_on_hand(current_zid, [item[0] for item in items])
 
-            # Convert to list of dictionaries and format for Select2
-            results = []
-            for row in results_data:
-                row_dict = dict(zip(columns, row))
-                results.append({
-                    'id': row_dict['xitem'],
-                    'text': f"{row_dict['xitem']} - {row_dict['xdesc'] or 'No Description'}",
-                    'xitem': row_dict['xitem'],
-                    'xdesc': row_dict['xdesc'],
-                    'xstdprice': float(row_dict['xstdprice'] or 0),
-                    'xbarcode': row_dict['xbarcode'],
-                    'item_cost': float(row_dict['xstdcost'] or 0),
-                    'xunitstk': row_dict['xunitstk'],
-                    'stock': float(row_dict['stock'] or 0)
-                })
+        # Format for Select2
+        results = []
+        for xitem, xdesc, xstdprice, xbarcode, xstdcost, xunitstk in items:
+            results.append({
+                'id': xitem,
+                'text': f"{xitem} - {xdesc or 'No Description'}",
+                'xitem': xitem,
+                'xdesc': xdesc,
+                'xstdprice': float(xstdprice or 0),
+                'xbarcode': xbarcode,
+                'item_cost': float(xstdcost or 0),
+                'xunitstk': xunitstk,
+                'stock': stock.get(xitem, 0.0)
+            })
 
         return JsonResponse({
             'results': results,
             'pagination': {
-                'more': len(results) == page_size
+                'more': more
             }
         })
 
@@ -0,0 +1,75 @@
+from django.http import JsonResponse
+from django.contrib.auth.decorators import login_required
+from django.db import connection
+
+
+@login_required
+def pos_scan_api(request):
+    """
+    AJAX endpoint for barcode scanners at the POS counter
+    Looks up a single item by exact xbarcode, falling back to exact xitem,
+    and returns it with price, unit, cost and stock in one query
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+
+    code = request.GET.get('code', '').strip()
+    if not code:
+        return JsonResponse({'error': 'Code is required'}, status=400)
+
+    try:
+        current_zid = request.session.get('current_zid')
+        if not current_zid:
+            return JsonResponse({'error': 'No business context found'}, status=400)
+
+        # Both branches are equality lookups served by caitem indexes;
+        # a barcode hit wins over an item code hit
+        sql_query = """
+        SELECT
+            c.xitem,
+            c.xdesc,
+            c.xstdprice,
+            c.xbarcode,
+            c.xstdcost,
+            c.xunitstk,
+            COALESCE((
+                SELECT SUM(b.xqty) FROM stock_balance b
+                WHERE b.zid = c.zid AND b.xitem = c.xitem
+            ), 0) AS stock
+        FROM (
+            (SELECT 1 AS match_rank, zid, xitem, xdesc, xstdprice, xbarcode, xstdcost, xunitstk
+             FROM caitem WHERE zid = %s AND xbarcode = %s LIMIT 1)
+            UNION ALL
+            (SELECT 2 AS match_rank, zid, xitem, xdesc, xstdprice, xbarcode, xstdcost, xunitstk
+             FROM caitem WHERE zid = %s AND xitem = %s LIMIT 1)
+        ) c
+        ORDER BY c.match_rank
+        LIMIT 1
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql_query, [current_zid, code, current_zid, code])
+            row = cursor.fetchone()
+
+        if not row:
+            return JsonResponse({'error': 'Product not found'}, status=404)
+
+        xitem, xdesc, xstdprice, xbarcode, xstdcost, xunitstk, stock = row
+        return JsonResponse({
+            'result': {
+                'id': xitem,
+                'text': f"{xitem} - {xdesc or 'No Description'}",
+                'xitem': xitem,
+                'xdesc': xdesc,
+                'xstdprice': float(xstdprice or 0),
+                'xbarcode': xbarcode,
+                'item_cost': float(xstdcost or 0),
+                'xunitstk': xunitstk,
+                'stock': float(stock or 0)
+            }
+        })
+
+    except Exception as e:
+        return JsonResponse({
+            'error': f'Scan failed: {str(e)}'
+        }, status=500)
@@ -4,3 +4,7 @@
 class AuthenticationConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.authentication"
+
+    def ready(self):
+        # Register permission cache invalidation handlers
+        from . import signals  # noqa: F401
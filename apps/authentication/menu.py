@@ -0,0 +1,84 @@
+"""
+Permission-filtered sidebar menu, cached per (permission version, user, zid)
+"""
+import hashlib
+import json
+
+from django.core.cache import cache
+
+from .permissions import has_module_permission, permission_version
+
+MENU_KEY = 'menu:{name}:{digest}:{version}:{user_id}:{zid}'
+MENU_CACHE_SECONDS = 24 * 60 * 60
+
+
+def menu_digest(menu_items):
+    """Short content hash of a menu tree, so an edited menu file gets new cache keys"""
+    return hashlib.md5(json.dumps(menu_items, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def filter_menu(menu_items, is_allowed):
+    """
+    Drop the menu items a user may not see
+
+    Mirrors the has_menu_permission / has_submenu_permissions template
+    filters: an item needs its own permission, and an item with a submenu
+    also needs at least one direct child that is unrestricted or permitted.
+    Items without a "permission" key are dropped; headers are always kept.
+
+    Args:
+        menu_items: List of menu item dicts from vertical_menu.json
+        is_allowed: Callable taking a permission code and returning bool
+
+    Returns:
+        New list of item dicts; submenus are filtered recursively
+    """
+    permitted = []
+    for item in menu_items:
+        if 'menu_header' in item:
+            permitted.append(item)
+            continue
+
+        # The templates used to test item.permission with {% if %}, which hides
+        # items that have no "permission" key at all; keep that behaviour
+        if 'permission' not in item:
+            continue
+        if item['permission'] and not is_allowed(item['permission']):
+            continue
+
+        submenu = item.get('submenu')
+        if submenu:
+            if not any(not child.get('permission') or is_allowed(child['permission']) for child in submenu):
+                continue
+            item = dict(item, submenu=filter_menu(submenu, is_allowed))
+
+        permitted.append(item)
+    return permitted
+
+
+def get_permitted_menu(user, zid, menu_items, name='vertical', digest=None):
+    """
+    Menu items visible to a user in a business, cached until permissions change
+
+    Args:
+        user: The user the menu is rendered for
+        zid: The business ZID context (may be None)
+        menu_items: Full menu tree (list of item dicts)
+        name: Menu name, part of the cache key
+        digest: Precomputed menu_digest(menu_items), if the caller has one
+
+    Returns:
+        list: Filtered menu items
+    """
+    digest = digest or menu_digest(menu_items)
+    cache_key = MENU_KEY.format(
+        name=name, digest=digest, version=permission_version(), user_id=user.pk, zid=zid
+    )
+    permitted = cache.get(cache_key)
+    if permitted is None:
+        permitted = filter_menu(
+            menu_items,
+            lambda permission_code: bool(zid) and has_module_permission(user, zid, permission_code)
+        )
+        cache.set(cache_key, permitted, MENU_CACHE_SECONDS)
+    return permitted
@@ -1,7 +1,114 @@
 """
 Utility functions for checking module permissions
 """
-from .models import Business, Module, UserBusinessAccess, UserGroupMembership, BusinessModuleAccess, PermissionGroup
+from django.core.cache import cache
+from .models import Business, UserBusinessAccess, UserGroupMembership, BusinessModuleAccess, PermissionGroup
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Permission types packed into one int per module
+PERMISSION_BITS = {
+    'view': 1,
+    'create': 2,
+    'edit': 4,
+    'delete': 8,
+}
+
+MATRIX_VERSION_KEY = 'perm_matrix_version'
+MATRIX_KEY = 'perm_matrix:{version}:{user_id}:{zid}'
+MATRIX_CACHE_SECONDS = 24 * 60 * 60
+
+
+def permission_version():
+    """Current permission version; bumped by invalidate_permissions()"""
+    return cache.get(MATRIX_VERSION_KEY, 0)
+
+
+def invalidate_permissions():
+    """
+    Drop every cached permission matrix
+
+    Called from apps.authentication.signals whenever business access, group
+    memberships, permission groups or module access change. Old matrices are
+    left to expire; new lookups use the bumped version in their cache key.
+    """
+    try:
+        cache.incr(MATRIX_VERSION_KEY)
+    except ValueError:
+        cache.set(MATRIX_VERSION_KEY, 1, None)
+    logger.info("Permission matrix version bumped")
+
+
+def _build_permission_matrix(user, zid):
+    """Compute the module permission bits of a user in one business (3 queries)"""
+    if not UserBusinessAccess.objects.filter(user=user, business_id=zid).exists():
+        return None
+
+    group_bits = {}
+    for name, permissions in UserGroupMembership.objects.filter(user=user).values_list(
+            'group__name', 'group__permissions'):
+        bits = 0
+        for permission in (permissions or '').split(','):
+            bits |= PERMISSION_BITS.get(permission.strip(), 0)
+        group_bits[name] = bits
+
+    matrix = {}
+    module_access_records = BusinessModuleAccess.objects.filter(
+        business_id=zid,
+        is_active=True
+    ).values_list('module__code', 'permission_groups')
+    for module_code, permission_groups in module_access_records:
+        bits = 0
+        for group_name in (permission_groups or '').split(','):
+            bits |= group_bits.get(group_name.strip(), 0)
+        if bits:
+            matrix[module_code] = bits
+
+    return matrix
+
+
+def get_permission_matrix(user, zid):
+    """
+    Module permission bits of a user in a business
+
+    The matrix is cached per (permission version, user, zid) in the shared
+    cache and memoised on the user object, so repeated checks within a request
+    are dict lookups.
+
+    Args:
+        user: The user to get permissions for
+        zid: The business ZID context
+
+    Returns:
+        dict: {module_code: bits} (see PERMISSION_BITS), or None when the user
+        has no access to the business
+
+    Example:
+        matrix = get_permission_matrix(request.user, 100001)
+        # Returns: {'pos_sales': 3, 'day_end_process': 15}
+    """
+    zid = int(zid)
+    version = permission_version()
+    memo = getattr(user, '_permission_matrices', None)
+    if memo is None or memo.get('version') != version:
+        memo = {'version': version}
+        user._permission_matrices = memo
+    if zid in memo:
+        return memo[zid]
+
+    cache_key = MATRIX_KEY.format(version=version, user_id=user.pk, zid=zid)
+    cached = cache.get(cache_key)
+    if cached is None:
+        matrix = _build_permission_matrix(user, zid)
+        # None (no business access) is cached as an empty marker
+        cache.set(cache_key, {'matrix': matrix}, MATRIX_CACHE_SECONDS)
+    else:
+        matrix = cached['matrix']
+
+    memo[zid] = matrix
+    return matrix
 
 
 def has_business_access(user, zid=None, business=None):
@@ -22,20 +129,15 @@ def has_business_access(user, zid=None, business=None):
     if not zid and not business:
         return False
 
-    if zid and not business:
-        try:
-            business = Business.objects.get(zid=zid)
-        except Business.DoesNotExist:
-            return False
-
-    # Check if user has direct access to the business
-    return UserBusinessAccess.objects.filter(user=user, business=business).exists()
+    return get_permission_matrix(user, zid or business.zid) is not None
 
 
 def has_module_access(user, module_code, zid=None, business=None, permission_type='view'):
     """
     Check if a user has access to a specific module in a business using the new permission group system
 
+    Resolved from the cached permission matrix (see get_permission_matrix).
+
     Args:
         user: The user to check
         module_code: The code of the module
@@ -46,73 +148,17 @@ def has_module_access(user, module_code, zid=None, business=None, permission_typ
     Returns:
         bool: True if the user has access, False otherwise
     """
-    print(f"DEBUG: Checking module access for {user.username} - module: {module_code}, zid: {zid}, type: {permission_type}")
-
     if user.is_superuser:
-        print("DEBUG: User is superuser")
         return True
 
     if not zid and not business:
-        print("DEBUG: No ZID or business provided")
         return False
 
-    if zid and not business:
-        try:
-            business = Business.objects.get(zid=zid)
-            print(f"DEBUG: Found business {business.name} for ZID {zid}")
-        except Business.DoesNotExist:
-            print(f"DEBUG: No business found for ZID {zid}")
-            return False
-
-    # First check if user has direct access to the business
-    if not UserBusinessAccess.objects.filter(user=user, business=business).exists():
-        print(f"DEBUG: User {user.username} does not have business access to {business}")
-        return False
-
-    try:
-        module = Module.objects.get(code=module_code)
-        print(f"DEBUG: Found module {module.name} for code {module_code}")
-    except Module.DoesNotExist:
-        print(f"DEBUG: Module not found for code {module_code}")
+    matrix = get_permission_matrix(user, zid or business.zid)
+    if matrix is None:
         return False
 
-    # Get all permission groups the user belongs to
-    user_group_objects = UserGroupMembership.objects.filter(user=user).select_related('group')
-    user_groups = [membership.group for membership in user_group_objects]
-    user_group_names = [group.name for group in user_groups]
-    print(f"DEBUG: User {user.username} belongs to groups: {user_group_names}")
-
-    # Get the BusinessModuleAccess record for this business and module
-    try:
-        module_access = BusinessModuleAccess.objects.get(
-            business=business,
-            module=module,
-            is_active=True
-        )
-        print(f"DEBUG: Found module access record for {module.name} in {business.name}")
-    except BusinessModuleAccess.DoesNotExist:
-        print(f"DEBUG: No module access record found for {module.name} in {business.name}")
-        return False
-
-    # Get the list of permission groups assigned to this module
-    assigned_groups = module_access.get_permission_groups_list()
-    print(f"DEBUG: Module {module.name} has assigned groups: {assigned_groups}")
-
-    # Check if any of the user's groups are in the assigned groups and have the required permission
-    has_permission = False
-    for user_group in user_groups:
-        if user_group.name in assigned_groups:
-            print(f"DEBUG: User group {user_group.name} is assigned to module {module.name}")
-            # Check if this group has the required permission type
-            if user_group.has_permission(permission_type):
-                has_permission = True
-                print(f"DEBUG: Group {user_group.name} has {permission_type} permission")
-                break
-            else:
-                print(f"DEBUG: Group {user_group.name} does not have {permission_type} permission (has: {user_group.permissions})")
-
-    print(f"DEBUG: Permission check result for {permission_type}: {has_permission}")
-    return has_permission
+    return bool(matrix.get(module_code, 0) & PERMISSION_BITS.get(permission_type, 0))
 
 
 def has_module_permission(user, zid, permission_code):
@@ -127,10 +173,7 @@ def has_module_permission(user, zid, permission_code):
     Returns:
         bool: True if the user has permission, False otherwise
     """
-    print(f"DEBUG: Checking module permission for user {user.username} (superuser: {user.is_superuser})")
-
     if user.is_superuser:
-        print(f"DEBUG: User {user.username} is superuser, granting permission")
         return True
 
     if not permission_code:
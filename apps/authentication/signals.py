@@ -0,0 +1,24 @@
+"""
+Signal handlers that keep cached permission matrices in step with the database
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Business, BusinessModuleAccess, Module, PermissionGroup, UserBusinessAccess, UserGroupMembership
+from .permissions import invalidate_permissions
+
+
+@receiver(post_save, sender=UserBusinessAccess)
+@receiver(post_delete, sender=UserBusinessAccess)
+@receiver(post_save, sender=UserGroupMembership)
+@receiver(post_delete, sender=UserGroupMembership)
+@receiver(post_save, sender=PermissionGroup)
+@receiver(post_delete, sender=PermissionGroup)
+@receiver(post_save, sender=BusinessModuleAccess)
+@receiver(post_delete, sender=BusinessModuleAccess)
+@receiver(post_save, sender=Module)
+@receiver(post_delete, sender=Module)
+@receiver(post_delete, sender=Business)
+def permissions_changed(sender, **kwargs):
+    """Invalidate every cached permission matrix after a permission-related change"""
+    invalidate_permissions()
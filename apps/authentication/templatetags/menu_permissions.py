@@ -1,8 +1,23 @@
 from django import template
+from apps.authentication.menu import get_permitted_menu
 from apps.authentication.permissions import has_module_permission, has_module_access
 
 register = template.Library()
 
+
+@register.simple_tag(takes_context=True)
+def permitted_menu(context, menu_items, name='vertical', digest=None):
+    """
+    Menu items the current user may see in the current business, filtered once
+    and cached until permissions change
+    Usage: {% permitted_menu menu_data.menu digest=menu_registry.digest as menu_items %}
+    """
+    request = context.get('request')
+    if not menu_items or request is None or not request.user.is_authenticated:
+        return []
+
+    return get_permitted_menu(request.user, getattr(request, 'zid', None), menu_items, name=name, digest=digest)
+
 @register.filter
 def has_menu_permission(user, permission_code):
     """
@@ -13,16 +28,13 @@ def has_menu_permission(user, permission_code):
         return True
 
     if not hasattr(user, 'request'):
-        print(f"DEBUG: No request on user object for permission {permission_code}")
         return False
 
     current_zid = getattr(user.request, 'zid', None)
     if not current_zid:
-        print(f"DEBUG: No ZID in request for permission {permission_code}")
         return False
 
     has_perm = has_module_permission(user, current_zid, permission_code)
-    print(f"DEBUG: Checking permission {permission_code} for user {user.username} with ZID {current_zid}: {has_perm}")
     return has_perm
 
 @register.filter
@@ -32,28 +44,21 @@ def has_submenu_permissions(user, submenu):
     Usage: {% if user|has_submenu_permissions:menu_item.submenu %}
     """
     if not submenu:
-        print("DEBUG: No submenu provided")
         return False
 
     if not hasattr(user, 'request'):
-        print("DEBUG: No request on user for submenu check")
         return False
 
     # Check if user has permission for at least one submenu item
     for item in submenu:
         permission_code = item.get('permission')
         if not permission_code:
-            print("DEBUG: No permission required for submenu item", item)
             return True
 
         current_zid = getattr(user.request, 'zid', None)
         if current_zid and has_module_permission(user, current_zid, permission_code):
-            print(f"DEBUG: Found permitted submenu item {item} for user {user.username}")
             return True
-        else:
-            print(f"DEBUG: No permission for submenu item {item} for user {user.username}")
 
-    print("DEBUG: No permitted submenu items found")
     return False
 
 @register.filter
@@ -68,18 +73,14 @@ def has_module_access_permission(user, permission_string):
     try:
         module_code, permission_type = permission_string.split(':')
     except ValueError:
-        print(f"DEBUG: Invalid permission string format: {permission_string}")
         return False
 
     if not hasattr(user, 'request'):
-        print(f"DEBUG: No request on user object for permission {permission_string}")
         return False
 
     current_zid = getattr(user.request, 'zid', None)
     if not current_zid:
-        print(f"DEBUG: No ZID in request for permission {permission_string}")
         return False
 
     has_perm = has_module_access(user, module_code, zid=current_zid, permission_type=permission_type)
-    print(f"DEBUG: Checking module access {permission_string} for user {user.username} with ZID {current_zid}: {has_perm}")
     return has_perm
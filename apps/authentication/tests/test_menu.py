@@ -0,0 +1,97 @@
+from pathlib import Path
+from types import SimpleNamespace
+import json
+import os
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from apps.authentication.menu import filter_menu, get_permitted_menu
+from apps.authentication.models import PermissionGroup
+from apps.authentication.permissions import permission_version
+from web_project.template_helpers.menu import MenuRegistry, validate_menu
+
+MENU = [
+    {'menu_header': 'Apps'},
+    {'name': 'Sales', 'permission': 'sales.view', 'submenu': [
+        {'name': 'POS', 'url': 'pos-sales', 'permission': 'pos_sales.view'},
+        {'name': 'Day End', 'url': 'day-end-process', 'permission': 'day_end_process.view'},
+    ]},
+    {'name': 'Purchase', 'permission': 'purchase.view', 'submenu': [
+        {'name': 'Orders', 'url': 'purchase-order', 'permission': 'purchase_order.view'},
+    ]},
+    {'name': 'Help', 'url': '/help/', 'external': True, 'permission': ''},
+    {'name': 'Demo', 'url': '/demo/', 'external': True},
+]
+
+
+class MenuFilterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_filters_items_and_submenus(self):
+        allowed = {'sales.view', 'pos_sales.view', 'purchase.view'}
+        menu = filter_menu(MENU, allowed.__contains__)
+
+        self.assertEqual([item.get('name', item.get('menu_header')) for item in menu], ['Apps', 'Sales', 'Help'])
+        self.assertEqual([item['name'] for item in menu[1]['submenu']], ['POS'])
+        # The source tree is left untouched
+        self.assertEqual(len(MENU[1]['submenu']), 2)
+
+    def test_filtered_menu_is_cached_until_permissions_change(self):
+        user = User.objects.create_superuser('admin', password='x')
+        self.assertEqual(len(get_permitted_menu(user, 100001, MENU)), 4)
+
+        with self.assertNumQueries(0):
+            get_permitted_menu(user, 100001, MENU)
+
+        # Any permission change bumps the version that is part of the cache key
+        version = permission_version()
+        PermissionGroup.objects.create(name='auditor', permissions='view')
+        self.assertNotEqual(permission_version(), version)
+
+
+class MenuRegistryTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'menu.json'
+        self.path.write_text(json.dumps({'menu': [
+            {'menu_header': 'Apps'},
+            {'name': 'Sales', 'slug': 'sales', 'permission': 'sales.view', 'submenu': [
+                {'name': 'POS', 'slug': 'pos-sales', 'url': 'pos-sales', 'permission': 'pos_sales.view'},
+            ]},
+        ]}))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_indexes_menu(self):
+        registry = MenuRegistry(self.path).get()
+
+        self.assertEqual(set(registry.by_slug), {'sales', 'pos-sales'})
+        self.assertEqual([item['slug'] for item in registry.by_permission['pos_sales.view']], ['pos-sales'])
+        request = RequestFactory().get('/pos/')
+        request.resolver_match = SimpleNamespace(url_name='pos-sales')
+        self.assertEqual(registry.active_slugs(request), {'sales'})
+
+    def test_reports_invalid_menu(self):
+        errors = validate_menu({'menu': [
+            {'name': 'A', 'slug': 'a', 'url': 'a', 'permission': 'a.read'},
+            {'name': 'B', 'slug': 'a', 'url': 'b'},
+        ]})
+        self.assertEqual(len(errors), 2)
+
+    def test_reloads_on_change_only_in_debug(self):
+        registry = MenuRegistry(self.path).get()
+        data = json.loads(self.path.read_text())
+        data['menu'][1]['submenu'].append({'name': 'Returns', 'slug': 'pos-returns', 'url': 'pos-returns'})
+        self.path.write_text(json.dumps(data))
+        stat = self.path.stat()
+        os.utime(self.path, (stat.st_atime, stat.st_mtime + 5))
+
+        with self.settings(DEBUG=False):
+            self.assertNotIn('pos-returns', registry.get().by_slug)
+        with self.settings(DEBUG=True):
+            self.assertIn('pos-returns', registry.get().by_slug)
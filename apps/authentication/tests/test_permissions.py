@@ -0,0 +1,42 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.authentication.models import (
+    Business, BusinessModuleAccess, Module, PermissionGroup, UserBusinessAccess, UserGroupMembership
+)
+from apps.authentication.permissions import has_business_access, has_module_access
+
+
+class PermissionMatrixTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('counter', password='x')
+        business = Business.objects.create(zid=100001, name='Fixit Gulshan')
+        UserBusinessAccess.objects.create(user=self.user, business=business)
+        self.cashier = PermissionGroup.objects.create(name='cashier', permissions='view,create')
+        UserGroupMembership.objects.create(user=self.user, group=self.cashier)
+        module = Module.objects.create(name='POS Sales', code='pos_sales')
+        BusinessModuleAccess.objects.create(business=business, module=module, permission_groups='cashier, manager')
+
+    def test_checks_resolve_from_cached_matrix(self):
+        self.assertTrue(has_module_access(self.user, 'pos_sales', zid=100001, permission_type='create'))
+
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(has_module_access(user, 'pos_sales', zid='100001'))
+            self.assertFalse(has_module_access(user, 'pos_sales', zid=100001, permission_type='delete'))
+            self.assertFalse(has_module_access(user, 'day_end_process', zid=100001))
+            self.assertTrue(has_business_access(user, zid=100001))
+
+    def test_no_business_access(self):
+        self.assertFalse(has_business_access(self.user, zid=100002))
+        self.assertFalse(has_module_access(self.user, 'pos_sales', zid=100002))
+
+    def test_group_change_invalidates_matrix(self):
+        self.assertFalse(has_module_access(self.user, 'pos_sales', zid=100001, permission_type='delete'))
+
+        self.cashier.permissions = 'view,create,delete'
+        self.cashier.save()
+
+        self.assertTrue(has_module_access(self.user, 'pos_sales', zid=100001, permission_type='delete'))
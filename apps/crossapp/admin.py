@@ -0,0 +1,71 @@
+import json
+
+from django.contrib import admin
+from django.utils.html import format_html
+
+from .models import ReportJob, SlowQuery, SlowQuerySample
+
+
+class SlowQuerySampleInline(admin.TabularInline):
+    model = SlowQuerySample
+    fields = ('captured_at', 'duration_ms', 'view', 'call_site', 'params')
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+    show_change_link = True
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    """Captured slow statements grouped by fingerprint, worst total time first"""
+    list_display = ('short_statement', 'calls', 'total_ms', 'avg_ms', 'max_ms', 'last_seen')
+    search_fields = ('statement', 'samples__call_site')
+    ordering = ('-total_ms',)
+    readonly_fields = ('fingerprint', 'statement', 'calls', 'total_ms', 'max_ms', 'first_seen', 'last_seen')
+    inlines = [SlowQuerySampleInline]
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.display(description='Statement')
+    def short_statement(self, obj):
+        return obj.statement[:120]
+
+    @admin.display(description='Avg ms')
+    def avg_ms(self, obj):
+        return round(obj.total_ms / obj.calls, 1) if obj.calls else 0
+
+
+@admin.register(SlowQuerySample)
+class SlowQuerySampleAdmin(admin.ModelAdmin):
+    list_display = ('captured_at', 'duration_ms', 'view', 'call_site')
+    list_filter = ('view',)
+    search_fields = ('sql', 'call_site')
+    ordering = ('-captured_at',)
+    readonly_fields = ('query', 'sql', 'params', 'duration_ms', 'call_site', 'view', 'formatted_plan', 'plan_error', 'captured_at')
+    exclude = ('plan',)
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.display(description='Plan')
+    def formatted_plan(self, obj):
+        if obj.plan is None:
+            return '-'
+        return format_html('<pre>{}</pre>', json.dumps(obj.plan, indent=2))
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    """Background PDF renders; newest first"""
+    list_display = ('created_at', 'zid', 'report', 'params', 'status', 'current', 'size', 'requested_by', 'expires_at')
+    list_filter = ('status', 'report', 'current')
+    search_fields = ('filename', 'requested_by', 'error')
+    ordering = ('-created_at',)
+    readonly_fields = [field.name for field in ReportJob._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,183 @@
+"""
+Management command to check the hot endpoints against their query and time budgets
+"""
+import json
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+
+from apps.sales.views.day_end_process import check_duplicate_processing
+from apps.utils.query_budgets import QUERY_BUDGETS, build_report, check_budget, measure_endpoint
+
+
+class Command(BaseCommand):
+    help = (
+        'Run the hot endpoints (POS, item lists, item ledger, day end, GRN confirm) against a '
+        'seeded database and compare their SQL statement counts and response times with '
+        'apps.utils.query_budgets.QUERY_BUDGETS. Every request is rolled back. Writes a JSON '
+        'report with --report and exits non-zero when a budget is exceeded.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--zid', type=int, required=True, help='Seeded business to run against')
+        parser.add_argument('--user', help='Username to log in as (default: first superuser)')
+        parser.add_argument('--repeat', type=int, default=3, help='Measured runs per endpoint (default: 3)')
+        parser.add_argument('--report', help='Write the JSON report to this file')
+        parser.add_argument('--label', default='', help='Release or build label stored in the report')
+        parser.add_argument('--only', nargs='*', choices=sorted(QUERY_BUDGETS), help='Check only these endpoints')
+
+    def handle(self, *args, **options):
+        zid = options['zid']
+        client = self._client(zid, options['user'])
+        fixtures = self._fixtures(zid)
+
+        entries = []
+        skipped = {}
+        for name, request in self._requests(fixtures).items():
+            if options['only'] and name not in options['only']:
+                continue
+            if isinstance(request, str):
+                skipped[name] = request
+                self.stdout.write(self.style.WARNING(f'{name:<24} skipped: {request}'))
+                continue
+
+            entry = check_budget(name, measure_endpoint(client, repeat=options['repeat'], **request))
+            entries.append(entry)
+            line = (
+                f"{name:<24} {entry['queries']:>4}/{entry['max_queries']:<4} queries "
+                f"{entry['ms']:>9.1f}/{entry['max_ms']} ms  HTTP {entry['status']}"
+            )
+            self.stdout.write(self.style.SUCCESS(line) if entry['passed'] else self.style.ERROR(f"{line}  {'; '.join(entry['failures'])}"))
+
+        report = build_report(entries, zid, label=options['label'], skipped=skipped)
+        if options['report']:
+            with open(options['report'], 'w', encoding='utf-8') as report_file:
+                json.dump(report, report_file, indent=2)
+            self.stdout.write(f"Report written to {options['report']}")
+
+        if not report['passed']:
+            failed = [entry['name'] for entry in entries if not entry['passed']]
+            raise CommandError(f"Over budget: {', '.join(failed)}")
+
+    def _client(self, zid, username):
+        user = (
+            User.objects.filter(username=username).first() if username
+            else User.objects.filter(is_superuser=True).order_by('id').first()
+        )
+        if user is None:
+            raise CommandError('No user to log in as; pass --user')
+
+        # Client's default host, testserver, is only allowed under the test runner
+        client = Client(HTTP_HOST=self._host())
+        client.force_login(user)
+        session = client.session
+        session['current_zid'] = zid
+        session['username'] = user.username
+        session.save()
+        return client
+
+    def _host(self):
+        """A host name ALLOWED_HOSTS accepts, so requests are not rejected with HTTP 400"""
+        for host in settings.ALLOWED_HOSTS:
+            if host != '*':
+                return host.lstrip('.')
+        return 'localhost'
+
+    def _fixtures(self, zid):
+        """Pick an item, warehouse, sales date and open GRN from the seeded data"""
+        fixtures = {}
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT b.xitem, b.xwh, c.xdesc, c.xstdprice, c.xstdcost, c.xunitstk
+                FROM stock_balance b
+                JOIN caitem c ON c.zid = b.zid AND c.xitem = b.xitem
+                WHERE b.zid = %s AND b.xqty >= 1 AND c.xdesc IS NOT NULL
+                ORDER BY b.xqty DESC
+                LIMIT 1
+            """, [zid])
+            fixtures['item'] = cursor.fetchone()
+
+            cursor.execute("""
+                SELECT DISTINCT xdate FROM opord
+                WHERE zid = %s
+                ORDER BY xdate DESC
+                LIMIT 30
+            """, [zid])
+            sale_dates = [row[0] for row in cursor.fetchall()]
+
+            cursor.execute("""
+                SELECT xgrnnum FROM pogrn
+                WHERE zid = %s AND xstatusgrn = '1-Open'
+                ORDER BY xgrnnum DESC
+                LIMIT 1
+            """, [zid])
+            row = cursor.fetchone()
+            fixtures['grn'] = row[0] if row else None
+
+        fixtures['day_end_date'] = next(
+            (str(xdate) for xdate in sale_dates if not check_duplicate_processing(zid, str(xdate))['is_duplicate']),
+            None
+        )
+        return fixtures
+
+    def _requests(self, fixtures):
+        """name -> measure_endpoint() keyword arguments, or the reason it is skipped"""
+        item = fixtures['item']
+        if item is None:
+            no_item = 'no item with stock in stock_balance'
+            return {name: no_item for name in QUERY_BUDGETS}
+
+        xitem, xwh, xdesc, xstdprice, xstdcost, xunitstk = item
+        term = next((word for word in xdesc.split() if len(word) >= 3), xitem)
+        datatable = {'draw': 1, 'start': 0, 'length': 10, 'order[0][column]': 0, 'order[0][dir]': 'desc'}
+        price = float(xstdprice or 0)
+        sale = {
+            'items': [{
+                'xitem': xitem,
+                'xdesc': xdesc,
+                'quantity': 1,
+                'xstdprice': price,
+                'total': price,
+                'item_cost': float(xstdcost or 0),
+                'xunitstk': xunitstk or 'Pcs',
+            }],
+            'payment_method': 'cash',
+            'cash_amount': price,
+            'totals': {'subtotal': price, 'tax_amount': 0, 'grand_total': price},
+            'header_info': {'warehouse': xwh},
+        }
+
+        return {
+            'pos_products_api': {'method': 'get', 'url': '/api/pos/products/', 'data': {'search': term}},
+            'avg_item_price': {'method': 'get', 'url': '/api/avg-item-price/', 'data': {'search': term}},
+            'sales_item_list_ajax': {'method': 'get', 'url': '/sales/api/sales-item-list/', 'data': datatable},
+            'po_open_list': {'method': 'get', 'url': '/purchase/po-open-list/', 'data': datatable},
+            'get_item_ledger': {
+                'method': 'get',
+                'url': '/inventory/reports/item-ledger/get-item-ledger/',
+                'data': {
+                    'warehouse': xwh,
+                    'select_item': xitem,
+                    'from_date': (date.today() - timedelta(days=365)).isoformat(),
+                    'to_date': date.today().isoformat(),
+                },
+            },
+            'pos_complete_sale': {
+                'method': 'post',
+                'url': '/sales/api/pos/complete-sale/',
+                'data': json.dumps(sale),
+                'content_type': 'application/json',
+            },
+            'create_day_end_process': (
+                {'method': 'post', 'url': '/sales/create-day-end-process/', 'data': {'xdate': fixtures['day_end_date']}}
+                if fixtures['day_end_date'] else 'no sales date without a day-end voucher'
+            ),
+            'po_confirm': (
+                {'method': 'post', 'url': f"/purchase/po-confirm/{fixtures['grn']}/"}
+                if fixtures['grn'] else 'no open GRN'
+            ),
+        }
@@ -0,0 +1,477 @@
+"""
+Management command to generate a synthetic, production-scale dataset for benchmarking
+"""
+import random
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.authentication.models import Business
+from apps.sales.views.day_end_process import BANK_ACCOUNTS, BANK_SUB_ACCOUNTS
+from apps.utils.bulk_insert import copy_rows
+from apps.utils.inventory_posting import rebuild_item_cost, rebuild_stock_balance
+
+# Row counts per business for each --scale; any count can be overridden on the command line.
+# Every sale line and GRN line is one imtrn row, plus one opening receipt per item and warehouse,
+# so "large" gives roughly 50M imtrn rows per business.
+SCALES = {
+    'small': {'items': 2000, 'customers': 500, 'suppliers': 100, 'orders': 20000, 'purchase_orders': 500, 'days': 90},
+    'medium': {'items': 20000, 'customers': 10000, 'suppliers': 500, 'orders': 500000, 'purchase_orders': 10000, 'days': 365},
+    'large': {'items': 100000, 'customers': 50000, 'suppliers': 2000, 'orders': 16000000, 'purchase_orders': 200000, 'days': 730},
+}
+
+WAREHOUSES = ['Fixit Gulshan', 'Fixit Banani', 'Fixit Uttara', 'Central Store', 'Fixit Mirpur']
+PROJECT = 'HMBR FIXIT GULSHAN'
+BRANDS = ['Bosch', 'Makita', 'Stanley', 'Total', 'Ingco', 'DeWalt', 'Hitachi', 'Black+Decker', 'Tolsen', 'Yato']
+GROUPS = ['Power Tools', 'Hand Tools', 'Fasteners', 'Electrical', 'Plumbing', 'Paint', 'Safety', 'Adhesives']
+NOUNS = ['Drill', 'Hammer', 'Screwdriver', 'Wrench', 'Bolt', 'Nut', 'Anchor', 'Cable', 'Switch', 'Pipe',
+         'Valve', 'Brush', 'Roller', 'Glove', 'Tape', 'Saw', 'Blade', 'Grinder', 'Socket', 'Clamp']
+MATERIALS = ['Steel', 'Brass', 'PVC', 'Copper', 'Carbon', 'Nylon', 'Rubber', 'Chrome', 'Aluminium', 'Titanium']
+UNITS = ['Pcs', 'Box', 'Set', 'Mtr', 'Kg', 'Ltr']
+FIRST_NAMES = ['Rahim', 'Karim', 'Nusrat', 'Farhana', 'Tanvir', 'Sadia', 'Imran', 'Ayesha', 'Rafiq', 'Mitu']
+LAST_NAMES = ['Ahmed', 'Hossain', 'Islam', 'Rahman', 'Khan', 'Chowdhury', 'Akter', 'Uddin', 'Sarkar', 'Das']
+BANKS = sorted(BANK_ACCOUNTS)
+WALK_IN_CUSTOMER = 'CUS-000001'
+
+# GL accounts (the day-end fallbacks, plus inventory and payables)
+CASH_ACCOUNT = '01010001'
+SALES_ACCOUNT = '08010001'
+DISCOUNT_ACCOUNT = '07080001'
+INVENTORY_ACCOUNT = '01060001'
+PAYABLE_ACCOUNT = '02010001'
+
+# Legacy tables filled for each business; existing rows in any of them stop the run
+TABLES = ['caitem', 'cacus', 'casup', 'xcodes', 'opord', 'opodt', 'imtrn',
+          'poord', 'poodt', 'pogrn', 'pogdt', 'glheader', 'gldetail']
+
+# GRNs left unconfirmed at the end of the range, so po_confirm has work
+OPEN_GRNS = 20
+
+
+def _money(value) -> str:
+    return f"{value:.2f}"
+
+
+def _qty(value) -> str:
+    return f"{value:.3f}"
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a deterministic synthetic dataset (items, customers, suppliers, codes, POS sales, '
+        'purchases with GRNs, inventory transactions and GL vouchers) for one or more businesses, '
+        'loaded with COPY. The same --seed and options always produce the same rows. Businesses '
+        'must not already have data in the legacy tables.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--zids', type=int, nargs='+', required=True, help='Businesses to generate (created if missing)')
+        parser.add_argument('--scale', choices=sorted(SCALES), default='small', help='Size preset (default: small)')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed (default: 1)')
+        parser.add_argument('--end-date', default='2025-12-31', help='Last business day (default: 2025-12-31)')
+        parser.add_argument('--warehouses', type=int, default=3, choices=range(1, len(WAREHOUSES) + 1),
+                            help='Warehouses per business (default: 3)')
+        parser.add_argument('--lines', type=int, default=3, help='Average lines per sale (default: 3)')
+        for name in SCALES['small']:
+            parser.add_argument(f"--{name.replace('_', '-')}", type=int, help=f'Override the preset {name} count')
+
+    def handle(self, *args, **options):
+        sizes = dict(SCALES[options['scale']])
+        for name in sizes:
+            if options[name] is not None:
+                sizes[name] = options[name]
+        sizes['lines'] = max(1, options['lines'])
+        sizes['warehouses'] = WAREHOUSES[:options['warehouses']]
+        end_date = date.fromisoformat(options['end_date'])
+        self.start_date = end_date - timedelta(days=sizes['days'] - 1)
+        self.seed = options['seed']
+        self.sizes = sizes
+
+        for zid in options['zids']:
+            self._check_empty(zid)
+
+        for zid in options['zids']:
+            started = time.perf_counter()
+            Business.objects.get_or_create(zid=zid, defaults={'name': f'Synthetic {zid}'})
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    self._generate(cursor, zid)
+            self.stdout.write(self.style.SUCCESS(
+                f'Generated zid {zid} in {time.perf_counter() - started:.1f}s'
+            ))
+
+        self.stdout.write('Seeding voucher sequences and analyzing tables...')
+        call_command('seed_voucher_sequences', stdout=self.stdout)
+        with connection.cursor() as cursor:
+            for table in TABLES + ['stock_balance', 'item_cost']:
+                cursor.execute(f"ANALYZE {table}")
+
+    def _check_empty(self, zid):
+        with connection.cursor() as cursor:
+            for table in TABLES:
+                cursor.execute(f"SELECT 1 FROM {table} WHERE zid = %s LIMIT 1", [zid])
+                if cursor.fetchone():
+                    raise CommandError(f'zid {zid} already has rows in {table}; use a business without data')
+
+    def _rng(self, zid, stream):
+        """Independent deterministic generator per business and data stream"""
+        return random.Random(f'{self.seed}:{zid}:{stream}')
+
+    def _copy(self, cursor, table, columns, rows):
+        started = time.perf_counter()
+        count = copy_rows(cursor, table, columns, rows)
+        self.stdout.write(f'  {table:<10} {count:>12,} rows {time.perf_counter() - started:>8.1f}s')
+
+    def _stamp(self, day, second=0):
+        return timezone.make_aware(datetime.combine(day, dt_time(9, 0)) + timedelta(seconds=second))
+
+    def _width(self, count):
+        """Voucher number width: the usual 6 digits, wider when the count needs it"""
+        return max(6, len(str(count)))
+
+    def _generate(self, cursor, zid):
+        self.stdout.write(f'Generating zid {zid}...')
+        items = self._items(zid)
+        self._copy(cursor, 'caitem', [
+            'ztime', 'zutime', 'zid', 'xitem', 'xdesc', 'xgitem', 'xbrand', 'xcat', 'xwh', 'xunitstk',
+            'xstdcost', 'xstdprice', 'xbarcode',
+        ], (
+            (self._stamp(self.start_date), self._stamp(self.start_date), zid, xitem, xdesc, xgitem, xbrand,
+             xgitem, self.sizes['warehouses'][0], xunitstk, _money(xstdcost), _money(xstdprice), xbarcode)
+            for xitem, xdesc, xbarcode, xstdcost, xstdprice, xunitstk, xgitem, xbrand in items
+        ))
+        self._masters(cursor, zid)
+
+        # Sales and purchases are generated as streams and replayed once per table,
+        # so nothing is held in memory; the same seed gives the same stream each pass
+        self._copy(cursor, 'opord', OPORD_COLUMNS, (order[0] for order in self._sales(zid, items)))
+        self._copy(cursor, 'opodt', OPODT_COLUMNS, (line for order in self._sales(zid, items) for line in order[1]))
+        self._copy(cursor, 'poord', POORD_COLUMNS, (po[0] for po in self._purchases(zid, items)))
+        self._copy(cursor, 'poodt', POODT_COLUMNS, (line for po in self._purchases(zid, items) for line in po[1]))
+        self._copy(cursor, 'pogrn', POGRN_COLUMNS, (po[2] for po in self._purchases(zid, items)))
+        self._copy(cursor, 'pogdt', POGDT_COLUMNS, (line for po in self._purchases(zid, items) for line in po[3]))
+        self._copy(cursor, 'imtrn', IMTRN_COLUMNS, self._imtrn(zid, items))
+        self._copy(cursor, 'glheader', GLHEADER_COLUMNS, (voucher[0] for voucher in self._vouchers(zid, items)))
+        self._copy(cursor, 'gldetail', GLDETAIL_COLUMNS, (line for voucher in self._vouchers(zid, items) for line in voucher[1]))
+
+        started = time.perf_counter()
+        balances = rebuild_stock_balance(cursor, zid)
+        costs = rebuild_item_cost(cursor, zid)
+        self.stdout.write(f'  derived    {balances:>12,} stock balances, {costs:,} item costs {time.perf_counter() - started:.1f}s')
+
+    def _items(self, zid):
+        """(xitem, xdesc, xbarcode, xstdcost, xstdprice, xunitstk, xgitem, xbrand) per item"""
+        rng = self._rng(zid, 'items')
+        items = []
+        for position in range(1, self.sizes['items'] + 1):
+            group = rng.randrange(len(GROUPS))
+            brand = rng.choice(BRANDS)
+            cost = rng.randint(50, 500000) / 100
+            items.append((
+                f'{group + 1:02d}-{position:06d}',
+                f'{brand} {rng.choice(MATERIALS)} {rng.choice(NOUNS)} {rng.choice([6, 8, 10, 12, 16, 20, 25])}mm',
+                f'89{zid % 100:02d}{position:09d}',
+                cost,
+                round(cost * rng.uniform(1.1, 1.6), 2),
+                rng.choice(UNITS),
+                GROUPS[group],
+                brand,
+            ))
+        return items
+
+    def _masters(self, cursor, zid):
+        stamp = self._stamp(self.start_date)
+
+        rng = self._rng(zid, 'customers')
+        self._copy(cursor, 'cacus', ['ztime', 'zutime', 'zid', 'xcus', 'xshort', 'xorg', 'xmobile', 'xcity', 'xstatuscus'], (
+            (stamp, stamp, zid, f'CUS-{n:06d}',
+             'Walk-in Customer' if n == 1 else f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+             'Walk-in Customer' if n == 1 else f'{rng.choice(LAST_NAMES)} Traders',
+             f'01{rng.randint(300000000, 999999999)}', 'Dhaka', 'Active')
+            for n in range(1, self.sizes['customers'] + 1)
+        ))
+
+        rng = self._rng(zid, 'suppliers')
+        self._copy(cursor, 'casup', ['ztime', 'zutime', 'zid', 'xsup', 'xshort', 'xorg', 'xphone', 'xcity', 'xstatussup'], (
+            (stamp, stamp, zid, f'SUP-{n:06d}', f'{rng.choice(BRANDS)} {rng.choice(LAST_NAMES)}',
+             f'{rng.choice(LAST_NAMES)} {rng.choice(["Enterprise", "Trading", "Import", "Distribution"])}',
+             f'01{rng.randint(300000000, 999999999)}', 'Dhaka', 'Active')
+            for n in range(1, self.sizes['suppliers'] + 1)
+        ))
+
+        codes = (
+            [('Brand', brand) for brand in BRANDS]
+            + [('Item Group', group) for group in GROUPS]
+            + [('Unit', unit) for unit in UNITS]
+            + [('Warehouse', warehouse) for warehouse in self.sizes['warehouses']]
+            + [('Project', PROJECT)]
+        )
+        self._copy(cursor, 'xcodes', ['ztime', 'zutime', 'zid', 'xtype', 'xcode', 'xdescdet', 'zactive'], (
+            (stamp, stamp, zid, xtype, xcode, xcode, '1') for xtype, xcode in codes
+        ))
+
+    def _day(self, index, count):
+        """Business day for the index-th of count documents spread evenly over the range"""
+        return self.start_date + timedelta(days=index * self.sizes['days'] // count)
+
+    def _sales(self, zid, items):
+        """Yield (opord row, [opodt rows]) per POS order, in date order"""
+        rng = self._rng(zid, 'sales')
+        orders = self.sizes['orders']
+        warehouses = self.sizes['warehouses']
+        width = self._width(orders)
+        is_width = self._width(orders * (2 * self.sizes['lines'] - 1))
+        is_number = 0
+
+        for index in range(orders):
+            day = self._day(index, orders)
+            stamp = self._stamp(day, index % 36000)
+            xordernum = f'CO--{index + 1:0{width}d}'
+            xwh = warehouses[0] if rng.random() < 0.5 else rng.choice(warehouses)
+            card = rng.random() < 0.3
+            bank = rng.choice(BANKS) if card else ''
+            xcus = WALK_IN_CUSTOMER if rng.random() < 0.8 else f'CUS-{rng.randint(1, self.sizes["customers"]):06d}'
+
+            lines = []
+            total = 0
+            for xrow, item in enumerate(rng.sample(items, min(len(items), rng.randint(1, 2 * self.sizes['lines'] - 1))), 1):
+                xitem, xdesc, _, xstdcost, xstdprice, xunitstk, _, _ = item
+                qty = rng.randint(1, 3)
+                amount = round(qty * xstdprice, 2)
+                total += amount
+                is_number += 1
+                lines.append((
+                    stamp, zid, xordernum, str(xrow), xitem, xitem, 'Stock-N-Sell', xwh, _qty(qty), _qty(qty),
+                    xunitstk, 'BDT', f'{xstdprice:.4f}', _money(amount), _money(amount), '0.00',
+                    f'IS--{is_number:0{is_width}d}', _money(xstdcost), 0, xdesc,
+                    # Carried for imtrn, not part of the opodt row
+                    day, qty, xstdcost, xstdprice,
+                ))
+
+            discount = round(total * 0.05, 2) if rng.random() < 0.1 else 0
+            grand_total = round(total - discount, 2)
+            header = (
+                stamp, stamp, zid, xordernum, day, xcus, 'Confirmed', 'BDT', 0, 0, xwh, 'counter@fixit.com',
+                'counter@fixit.com', '0.00', _money(discount), '0.00', '0.00', _money(discount), _money(grand_total),
+                'Ohidul', 'Card Sale' if card else 'Cash Sale', bank, 'CO--', 0,
+                _money(grand_total) if card else '0.00', 'CT04', day.year, day.month, 'counter@fixit.com', '',
+                stamp, '0.00', '7.50',
+            )
+            yield header, [line[:len(OPODT_COLUMNS)] for line in lines], lines
+
+    def _purchases(self, zid, items):
+        """Yield (poord row, [poodt rows], pogrn row, [pogdt rows]) per purchase order, in date order"""
+        rng = self._rng(zid, 'purchases')
+        count = self.sizes['purchase_orders']
+        width = self._width(count)
+        warehouses = self.sizes['warehouses']
+
+        for index in range(count):
+            day = self._day(index, count)
+            stamp = self._stamp(day, index % 36000)
+            xpornum = f'PO--{index + 1:0{width}d}'
+            xgrnnum = f'GRN-{index + 1:0{width}d}'
+            xsup = f'SUP-{rng.randint(1, self.sizes["suppliers"]):06d}'
+            xwh = rng.choice(warehouses)
+            confirmed = index < count - OPEN_GRNS
+
+            order_lines, grn_lines = [], []
+            total = 0
+            for xrow, item in enumerate(rng.sample(items, min(len(items), rng.randint(1, 10))), 1):
+                xitem, _, _, xstdcost, _, _, _, _ = item
+                qty = rng.randint(10, 200)
+                rate = round(xstdcost * rng.uniform(0.9, 1.05), 2)
+                amount = round(qty * rate, 2)
+                total += amount
+                order_lines.append((
+                    stamp, zid, xpornum, xrow, xitem, 'Our Code', xitem, 'Priced', 'Stock-N-Sell', xwh, 0,
+                    _qty(qty), _qty(qty), '0.000', 1, '0.000', 'BDT', 1, f'{rate:.4f}', 0, 0, 0, 0, 'Entered', 0,
+                    f'{rate:.4f}', '2999-12-31', 0, 0, 0, 0, '', 0, '0.000', '0.00', '0.00', _money(amount),
+                    _money(amount), 0, xwh,
+                ))
+                grn_lines.append((
+                    stamp, stamp, zid, xgrnnum, xrow, xitem, 'Our Code', xitem, 'Stock-N-Sell', xwh, 0, _qty(qty),
+                    _qty(qty), xpornum, 1, '0.000', 'BDT', f'{rate:.4f}', 0, 0, 0, 1, 'Entered', 0, f'{rate:.4f}',
+                    '2999-12-31', day, '5-Confirmed' if confirmed else '1-Open', 0, 0, 0, 0, 0, '0.000', '0.00',
+                    '0.00', _money(amount), _money(amount), '0.000', 'Yes',
+                ))
+
+            order = (
+                stamp, zid, xpornum, day, xsup, '', day, '', 'Any', PROJECT,
+                '5-Received' if confirmed else '1-Open', '0.00', 0, 'BDT', 1, '', xwh, 0, _money(total), '0.00',
+                '0.00', _money(total), '0.00', _money(total), 'purchase@fixit.com', 'purchase@fixit.com', 'PO--',
+                'Local', 'Header', 'purchase@fixit.com',
+            )
+            grn = (
+                stamp, stamp, zid, xgrnnum, day, xpornum, '0', 0, xgrnnum[4:], xsup, '', day, day, 'Any', PROJECT,
+                '5-Confirmed' if confirmed else '1-Open', 'BDT', 1, xwh, '', 0, _money(total), '0.00', '0.00',
+                _money(total), '0.00', _money(total), 'purchase@fixit.com',
+                '8-QC Completed' if confirmed else '1-Open', 'Local', 'Header', 'purchase@fixit.com',
+                stamp, stamp, stamp, stamp, 0,
+            )
+            yield order, order_lines, grn, grn_lines
+
+    def _imtrn(self, zid, items):
+        """Opening receipts, then GRN receipts and POS issues"""
+        rng = self._rng(zid, 'opening')
+        warehouses = self.sizes['warehouses']
+        # Enough opening stock that the simulated sales do not drive items negative
+        sales_per_item = self.sizes['orders'] * self.sizes['lines'] * 2 / max(1, len(items) * len(warehouses))
+        day = self.start_date
+        stamp = self._stamp(day)
+        receipts = len(items) * len(warehouses) + self.sizes['purchase_orders'] * 10
+        width = self._width(receipts)
+        receipt_number = 0
+
+        for xitem, _, _, xstdcost, xstdprice, _, _, _ in items:
+            for xwh in warehouses:
+                receipt_number += 1
+                qty = rng.randint(int(sales_per_item * 3) + 20, int(sales_per_item * 4) + 50)
+                yield self._imtrn_row(
+                    stamp, zid, f'RE--{receipt_number:0{width}d}', xitem, xwh, day, qty, qty * xstdcost,
+                    'Opening', 'OB--', 1, 'Receipt', 1, 'RE--', xstdprice,
+                )
+
+        for _, _, grn, grn_lines in self._purchases(zid, items):
+            if grn[15] != '5-Confirmed':
+                continue
+            for line in grn_lines:
+                receipt_number += 1
+                qty = float(line[11])
+                yield self._imtrn_row(
+                    line[0], zid, f'RE--{receipt_number:0{width}d}', line[7], line[9], line[26], qty,
+                    float(line[37]), '', grn[3], line[4], 'Receipt', 1, 'RE--', float(line[17]),
+                )
+
+        for header, _, lines in self._sales(zid, items):
+            for line in lines:
+                day, qty, xstdcost, xstdprice = line[-4:]
+                yield self._imtrn_row(
+                    line[0], zid, line[16], line[5], line[7], day, qty, qty * xstdcost, header[20],
+                    header[3], int(line[3]), 'Issue', -1, 'IS--', xstdprice,
+                )
+
+    def _imtrn_row(self, stamp, zid, ximtrnnum, xitem, xwh, day, qty, value, xitemrow, xdocnum, xdocrow,
+                   xaction, xsign, xtrnim, xstdprice):
+        return (
+            stamp, zid, ximtrnnum, xitem, xitemrow, xwh, day, str(day.year), str(day.month), _qty(qty),
+            f'{value:.6f}', f'{value:.6f}' if xsign > 0 else '0.000000', xtrnim, xdocnum, xdocrow, day, day, '',
+            xaction, xsign, stamp, 'system@fixit.com', xtrnim, f'{xstdprice:.4f}',
+        )
+
+    def _vouchers(self, zid, items):
+        """Yield (glheader row, [gldetail rows]): one day-end SALE voucher per day and one SINV per confirmed GRN"""
+        days = {}
+        for header, _, _ in self._sales(zid, items):
+            totals = days.setdefault(header[4], {'cash': 0, 'discount': 0, 'banks': {}})
+            amount = float(header[18])
+            totals['discount'] += float(header[14])
+            if header[21]:
+                totals['banks'][header[21]] = totals['banks'].get(header[21], 0) + amount
+            else:
+                totals['cash'] += amount
+
+        # The latest day is left for the day-end process to post
+        sale_days = sorted(days)[:-1]
+        width = self._width(len(sale_days))
+        for number, day in enumerate(sale_days, 1):
+            totals = days[day]
+            xvoucher = f'SALE{number:0{width}d}'
+            stamp = self._stamp(day, 43200)
+            sales_total = totals['cash'] + sum(totals['banks'].values()) + totals['discount']
+            lines = [(SALES_ACCOUNT, 'Ledger', None, -sales_total, 'Income')]
+            if totals['cash']:
+                lines.append((CASH_ACCOUNT, 'Ledger', None, totals['cash'], 'Asset'))
+            for bank, amount in sorted(totals['banks'].items()):
+                lines.append((BANK_ACCOUNTS[bank], 'Bank', BANK_SUB_ACCOUNTS[bank], amount, 'Asset'))
+            if totals['discount']:
+                lines.append((DISCOUNT_ACCOUNT, 'Ledger', None, totals['discount'], 'Expenditure'))
+            yield (
+                self._glheader(stamp, zid, xvoucher, f'***System generated Sales voucher on {day}', day,
+                               f'** Created By System On {day} **', 'SALE'),
+                [self._gldetail(stamp, zid, xvoucher, row, xacc, xaccusage, xsub, amount, xacctype, day)
+                 for row, (xacc, xaccusage, xsub, amount, xacctype) in enumerate(lines, 20)],
+            )
+
+        numbers = {}
+        for _, _, grn, _ in self._purchases(zid, items):
+            if grn[15] != '5-Confirmed':
+                continue
+            day = grn[4]
+            prefix = f"SINV{day.strftime('%m%y')}-"
+            numbers[prefix] = numbers.get(prefix, 0) + 1
+            xvoucher = f'{prefix}{numbers[prefix]:06d}'
+            amount = float(grn[26])
+            yield (
+                self._glheader(grn[0], zid, xvoucher, grn[3], day,
+                               f'**System generated Supplier Invoice** MRR Number: {grn[3]}', 'SINV'),
+                [
+                    self._gldetail(grn[0], zid, xvoucher, 1, INVENTORY_ACCOUNT, 'Ledger', None, amount, 'Asset', day),
+                    self._gldetail(grn[0], zid, xvoucher, 2, PAYABLE_ACCOUNT, 'AP', grn[9], -amount, 'Liability', day),
+                ],
+            )
+
+    def _glheader(self, stamp, zid, xvoucher, xref, day, xlong, xtrngl):
+        return (
+            stamp, zid, xvoucher, xref, day, xlong, True, day.year, f'{day.month:02d}', 'Balanced', day, 0,
+            xtrngl, 'system@fixit.com', 1, 'Journal',
+        )
+
+    def _gldetail(self, stamp, zid, xvoucher, xrow, xacc, xaccusage, xsub, amount, xacctype, day):
+        return (
+            stamp, zid, xvoucher, xrow, xacc, xaccusage, 'None', PROJECT, 'BDT', 1, _money(amount), _money(amount), xacctype, '', day, 1, day, day, xsub,
+        )
+
+
+OPORD_COLUMNS = [
+    'ztime', 'zutime', 'zid', 'xordernum', 'xdate', 'xcus', 'xstatusord', 'xcur', 'xdisc', 'xdiscf', 'xwh',
+    'zemail', 'xemail', 'xdtwotax', 'xdtdisc', 'xdttax', 'xval', 'xdiscamt', 'xtotamt', 'xsp', 'xsltype',
+    'xsalescat', 'xtrnord', 'xdocnum', 'xdtcomm', 'xcounterno', 'xyear', 'xper', 'xemp', 'xmobile',
+    'xdatecon', 'xamtpaid', 'xamt',
+]
+OPODT_COLUMNS = [
+    'ztime', 'zid', 'xordernum', 'xrow', 'xcode', 'xitem', 'xstype', 'xwh', 'xqtyreq', 'xqtyord', 'xunitsel',
+    'xcur', 'xrate', 'xlineamt', 'xdtwotax', 'xdttax', 'ximtrnnum', 'xcost', 'xsign', 'xdesc',
+]
+IMTRN_COLUMNS = [
+    'ztime', 'zid', 'ximtrnnum', 'xitem', 'xitemrow', 'xwh', 'xdate', 'xyear', 'xper', 'xqty', 'xval',
+    'xvalpost', 'xdoctype', 'xdocnum', 'xdocrow', 'xdateexp', 'xdaterec', 'xlicense', 'xaction', 'xsign',
+    'xtime', 'zemail', 'xtrnim', 'xstdprice',
+]
+POORD_COLUMNS = [
+    'ztime', 'zid', 'xpornum', 'xdate', 'xsup', 'xsupref', 'xdatesupref', 'xdiv', 'xsec', 'xproj',
+    'xstatuspor', 'xappamt', 'xpartial', 'xcur', 'xexch', 'xrem', 'xwh', 'xdisc', 'xdtwotax', 'xdtdisc',
+    'xdttax', 'xval', 'xdiscamt', 'xtotamt', 'zemail', 'xemail', 'xtrnpor', 'xtypepor', 'xwhoption', 'xmember',
+]
+POODT_COLUMNS = [
+    'ztime', 'zid', 'xpornum', 'xrow', 'xcode', 'xcodebasis', 'xitem', 'xstatuspdt', 'xstype', 'xwh',
+    'xdropship', 'xqtyord', 'xqtygrn', 'xqtystk', 'xcfpur', 'xwtunit', 'xcur', 'xexch', 'xrate', 'xmargin',
+    'xdisc', 'xdiscf', 'xcomm', 'xpricebasis', 'xexchbuy', 'xprice', 'xdatesch', 'xtaxrate1', 'xtaxrate2',
+    'xtaxrate3', 'xtaxrate4', 'xtaxcode5', 'xtaxrate5', 'xlandcost', 'xdttax', 'xdtdisc', 'xdtwotax',
+    'xlineamt', 'xline', 'xcompwh',
+]
+POGRN_COLUMNS = [
+    'ztime', 'zutime', 'zid', 'xgrnnum', 'xdate', 'xpornum', 'xshiplno', 'xrow', 'xsinnum', 'xsup', 'xsupref',
+    'xdatesupref', 'xdatedue', 'xsec', 'xproj', 'xstatusgrn', 'xcur', 'xexch', 'xwh', 'xrem', 'xdisc',
+    'xdtwotax', 'xdtdisc', 'xdttax', 'xval', 'xdiscamt', 'xtotamt', 'zemail', 'xstatusqc', 'xtypepor',
+    'xwhoption', 'xmember', 'xconfirmt', 'xfailedt', 'xreviset', 'xinvoicet', 'xdiscf',
+]
+POGDT_COLUMNS = [
+    'ztime', 'zutime', 'zid', 'xgrnnum', 'xrow', 'xcode', 'xcodebasis', 'xitem', 'xstype', 'xwh', 'xdropship',
+    'xqty', 'xqtygrn', 'xpornum', 'xcfpur', 'xwtunit', 'xcur', 'xrate', 'xdisc', 'xdiscf', 'xcomm', 'xexch',
+    'xpricebasis', 'xexchbuy', 'xprice', 'xdatesch', 'xdaterec', 'xstatusgdt', 'xtaxrate1', 'xtaxrate2',
+    'xtaxrate3', 'xtaxrate4', 'xtaxrate5', 'xlandcost', 'xdttax', 'xdtdisc', 'xdtwotax', 'xlineamt',
+    'xqtycrn', 'xchgapply',
+]
+GLHEADER_COLUMNS = [
+    'ztime', 'zid', 'xvoucher', 'xref', 'xdate', 'xlong', 'xpostflag', 'xyear', 'xper', 'xstatusjv',
+    'xdatedue', 'xnumofper', 'xtrngl', 'xmember', 'xapproved', 'xaction',
+]
+GLDETAIL_COLUMNS = [
+    'ztime', 'zid', 'xvoucher', 'xrow', 'xacc', 'xaccusage', 'xaccsource', 'xproj', 'xcur', 'xexch', 'xprime',
+    'xbase', 'xacctype', 'xinvnum', 'xdateapp', 'xexchval', 'xdateclr', 'xdatedue', 'xsub',
+]
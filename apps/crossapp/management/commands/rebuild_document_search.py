@@ -0,0 +1,48 @@
+"""
+Management command to (re)build document_search rows from the document headers
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.utils.document_search import SEARCH_DOCUMENTS, available, backfill_sql
+
+
+class Command(BaseCommand):
+    help = 'Index existing document headers for the list search (triggers keep it current afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--zid',
+            type=int,
+            help='Only index documents of this business',
+        )
+        parser.add_argument(
+            '--kind',
+            choices=sorted(SEARCH_DOCUMENTS),
+            help='Only index this document table',
+        )
+
+    def handle(self, *args, **options):
+        if not available():
+            raise CommandError('The document search index needs PostgreSQL.')
+
+        with connection.cursor() as cursor:
+            if options.get('zid'):
+                zids = [options['zid']]
+            else:
+                cursor.execute("SELECT zid FROM authentication_business ORDER BY zid")
+                zids = [row[0] for row in cursor.fetchall()]
+
+        kinds = [options['kind']] if options.get('kind') else list(SEARCH_DOCUMENTS)
+        total = 0
+        for kind in kinds:
+            for zid in zids:
+                # One business per transaction keeps each step short
+                with transaction.atomic():
+                    with connection.cursor() as cursor:
+                        cursor.execute(backfill_sql(kind), [zid])
+                        indexed = cursor.rowcount
+                self.stdout.write(f'  {kind} {zid}: {indexed} documents')
+                total += indexed
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} documents.'))
@@ -0,0 +1,87 @@
+"""
+Management command to backfill voucher_sequence counters from existing documents
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction, DatabaseError
+
+from apps.utils.voucher_generator import VOUCHER_SOURCES, like_prefix, max_voucher_number_sql, sequence_key
+
+
+class Command(BaseCommand):
+    help = 'Seed voucher_sequence counters with the highest voucher number already used per business and prefix'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--zid',
+            type=int,
+            help='Only seed counters for this business',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show the counters that would be written without saving them',
+        )
+
+    def handle(self, *args, **options):
+        zid_filter = options.get('zid')
+        seeds = {}
+
+        for prefix, table, column in VOUCHER_SOURCES:
+            self.stdout.write(f'Scanning {table}.{column} for {prefix}...')
+            try:
+                with transaction.atomic():
+                    with connection.cursor() as cursor:
+                        cursor.execute(
+                            max_voucher_number_sql(table, column, group_by_zid=True),
+                            [len(prefix) + 1, like_prefix(prefix)]
+                        )
+                        rows = cursor.fetchall()
+            except DatabaseError as e:
+                self.stdout.write(self.style.WARNING(f'  Skipped {table}.{column}: {e}'))
+                continue
+
+            for zid, last_number in rows:
+                if last_number is None or (zid_filter and int(zid) != zid_filter):
+                    continue
+                key = (int(zid), sequence_key(prefix, table))
+                seeds[key] = max(seeds.get(key, 0), int(last_number))
+
+        # Supplier invoices use one counter per month ("SINVMMYY-")
+        self.stdout.write('Scanning glheader.xvoucher for SINV months...')
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT zid, SUBSTRING(xvoucher FROM 1 FOR 9) AS xprefix,
+                       MAX(CAST(SUBSTRING(xvoucher FROM 10) AS BIGINT))
+                FROM glheader
+                WHERE xvoucher ~ '^SINV[0-9]{4}-[0-9]+$'
+                GROUP BY zid, SUBSTRING(xvoucher FROM 1 FOR 9)
+                """
+            )
+            for zid, prefix, last_number in cursor.fetchall():
+                if zid_filter and int(zid) != zid_filter:
+                    continue
+                key = (int(zid), prefix)
+                seeds[key] = max(seeds.get(key, 0), int(last_number))
+
+        if options['dry_run']:
+            for (zid, prefix), last_number in sorted(seeds.items()):
+                self.stdout.write(f'  {zid} {prefix} -> {last_number}')
+            self.stdout.write(self.style.SUCCESS(f'Dry run: {len(seeds)} counters found, nothing written.'))
+            return
+
+        # Never move an existing counter backwards
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for (zid, prefix), last_number in sorted(seeds.items()):
+                    cursor.execute(
+                        """
+                        INSERT INTO voucher_sequence (zid, xprefix, xlast, zutime)
+                        VALUES (%s, %s, %s, NOW())
+                        ON CONFLICT (zid, xprefix)
+                        DO UPDATE SET xlast = GREATEST(voucher_sequence.xlast, EXCLUDED.xlast), zutime = NOW()
+                        """,
+                        [zid, prefix, last_number]
+                    )
+
+        self.stdout.write(self.style.SUCCESS(f'Seeded {len(seeds)} voucher sequences.'))
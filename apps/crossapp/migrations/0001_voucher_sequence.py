@@ -0,0 +1,271 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('authentication', '0009_alter_permissiongroup_permissions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Cacus',
+            fields=[
+                ('zid', models.OneToOneField(db_column='zid', on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='authentication.business')),
+                ('ztime', models.DateTimeField(blank=True, null=True)),
+                ('zutime', models.DateTimeField(blank=True, null=True)),
+                ('xcus', models.CharField(max_length=100)),
+                ('xshort', models.CharField(blank=True, max_length=100, null=True)),
+                ('xorg', models.CharField(blank=True, max_length=100, null=True)),
+                ('xadd1', models.CharField(blank=True, max_length=100, null=True)),
+                ('xadd2', models.CharField(blank=True, max_length=100, null=True)),
+                ('xcity', models.CharField(blank=True, max_length=100, null=True)),
+                ('xstate', models.CharField(blank=True, max_length=100, null=True)),
+                ('xzip', models.CharField(blank=True, max_length=100, null=True)),
+                ('xcountry', models.CharField(blank=True, max_length=100, null=True)),
+                ('xsalute', models.CharField(blank=True, max_length=100, null=True)),
+                ('xfirst', models.CharField(blank=True, max_length=100, null=True)),
+                ('xmiddle', models.CharField(blank=True, max_length=100, null=True)),
+                ('xlast', models.CharField(blank=True, max_length=100, null=True)),
+                ('xtitle', models.CharField(blank=True, max_length=100, null=True)),
+                ('xemail', models.CharField(blank=True, max_length=100, null=True)),
+                ('xphone', models.CharField(blank=True, max_length=40, null=True)),
+                ('xmobile', models.CharField(blank=True, max_length=100, null=True)),
+                ('xfax', models.CharField(blank=True, max_length=100, null=True)),
+                ('xurl', models.CharField(blank=True, max_length=100, null=True)),
+                ('xid', models.CharField(blank=True, max_length=100, null=True)),
+                ('xtaxnum', models.CharField(blank=True, max_length=100, null=True)),
+                ('xaccar', models.CharField(blank=True, max_length=100, null=True)),
+                ('xacctd', models.CharField(blank=True, max_length=100, null=True)),
+                ('xgcus', models.CharField(blank=True, max_length=100, null=True)),
+                ('xgprice', models.CharField(blank=True, max_length=100, null=True)),
+                ('xsic', models.CharField(blank=True, max_length=100, null=True)),
+                ('xtaxscope', models.CharField(blank=True, max_length=100, null=True)),
+                ('xstatuscus', models.CharField(blank=True, max_length=100, null=True)),
+                ('xcrlimit', models.DecimalField(blank=True, decimal_places=2, max_digits=18, null=True)),
+                ('xcreditr', models.CharField(blank=True, max_length=100, null=True)),
+                ('xcrterms', models.IntegerField(blank=True, null=True)),
+                ('xdisc', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('xagent', models.CharField(blank=True, max_length=100, null=True)),
+                ('xcomm', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('xpayins', models.CharField(blank=True, max_length=1000, null=True)),
+                ('xindustry', models.CharField(blank=True, max_length=100, null=True)),
+                ('xdatecra', models.DateField(blank=True, null=True)),
+                ('xdateapp', models.DateField(blank=True, null=True)),
+                ('xdateexp', models.DateField(blank=True, null=True)),
+                ('xdatecorp', models.DateField(blank=True, null=True)),
+                ('xdatecre', models.DateField(blank=True, null=True)),
+                ('xdatefst', models.DateField(blank=True, null=True)),
+                ('xbilladd', models.CharField(blank=True, max_length=100, null=True)),
+                ('xlicense', models.CharField(blank=True, max_length=100, null=True)),
+                ('xtypebo', models.CharField(blank=True, max_length=100, null=True)),
+                ('xeccnum', models.CharField(blank=True, max_length=100, null=True)),
+                ('xeccrange', models.CharField(blank=True, max_length=100, null=True)),
+                ('xeccdiv', models.CharField(blank=True, max_length=100, null=True)),
+                ('xecccom', models.CharField(blank=True, max_length=100, null=True)),
+                ('xvatnum', models.CharField(blank=True, max_length=100, null=True)),
+                ('xcstnum', models.CharField(blank=True, max_length=100, null=True)),
+                ('xpannum', models.CharField(blank=True, max_length=100, null=True)),
+                ('xregoff', models.CharField(blank=True, max_length=100, null=True)),
+                ('xmethodpay', models.CharField(blank=True, max_length=100, null=True)),
+                ('xmethodship', models.CharField(blank=True, max_length=100, null=True)),
+                ('xrem', models.CharField(blank=True, max_length=500, null=True)),
+                ('xpoints', models.DecimalField(blank=True, decimal_places=2, max_digits=18, null=True)),
+                ('xsp', models.CharField(blank=True, max_length=100, null=True)),
+                ('xdate', models.DateField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Customer',
+                'verbose_name_plural': 'Customers',
+                'db_table': 'cacus',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Caitem',
+            fields=[
+                ('zid', models.OneToOneField(db_column='zid', on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='authentication.business')),
+                ('ztime', models.DateTimeField(blank=True, null=True)),
+                ('zutime', models.DateTimeField(blank=True, null=True)),
+                ('xitem', models.CharField(max_length=100, verbose_name='Item Code')),
+                ('xalias', models.CharField(blank=True, max_length=100, null=True, verbose_name='Alias')),
+                ('xitemnew', models.CharField(blank=True, max_length=100, null=True)),
+                ('xitemold', models.CharField(blank=True, max_length=100, null=True)),
+                ('xdrawing', models.CharField(blank=True, max_length=100, null=True)),
+                ('xscode', models.CharField(blank=True, max_length=100, null=True)),
+                ('xdesc', models.CharField(blank=True, max_length=250, null=True, verbose_name='Description')),
+                ('xlong', models.CharField(blank=True, max_length=1000, null=True, verbose_name='Long Description')),
+                ('xlinks', models.CharField(blank=True, max_length=500, null=True)),
+                ('xgitem', models.CharField(blank=True, max_length=100, null=True)),
+                ('xcitem', models.CharField(blank=True, max_length=100, null=True)),
+                ('xcat', models.CharField(blank=True, max_length=100, null=True)),
+                ('xpricecat', models.CharField(blank=True, max_length=100, null=True)),
+                ('xtaxcat', models.CharField(blank=True, max_length=100, null=True)),
+                ('xduty', models.CharField(blank=True, max_length=100, null=True)),
+                ('xorigin', models.CharField(blank=True, max_length=100, null=True)),
+                ('xdiv', models.CharField(blank=True, max_length=100, null=True)),
+                ('xwh', models.CharField(blank=True, max_length=100, null=True, verbose_name='Warehouse')),
+                ('xsup', models.CharField(blank=True, max_length=100, null=True)),
+                ('xtypeserial', models.CharField(blank=True, max_length=100, null=True)),
+                ('xbatchman', models.CharField(blank=True, max_length=1, null=True)),
+                ('xabc', models.CharField(blank=True, max_length=100, null=True)),
+                ('xlife', models.IntegerField(blank=True, null=True)),
+                ('xwtunit', models.DecimalField(blank=True, decimal_places=3, max_digits=18, null=True)),
+                ('xunitwt', models.CharField(blank=True, max_length=100, null=True)),
+                ('xl', models.DecimalField(blank=True, decimal_places=3, max_digits=18, null=True)),
+                ('xw', models.DecimalField(blank=True, decimal_places=3, max_digits=18, null=True)),
+                ('xh', models.DecimalField(blank=True, decimal_places=3, max_digits=18, null=True)),
+                ('xunitlen', models.CharField(blank=True, max_length=100, null=True)),
+                ('xminordqty', models.DecimalField(blank=True, decimal_places=3, max_digits=18, null=True)),
+                ('xminordval', models.DecimalField(blank=True, decimal_places=2, max_digits=18, null=True)),
+                ('xordmult', models.DecimalField(blank=True, decimal_places=3, max_digits=18, null=True)),
+                ('xyield', models.DecimalField(blank=True, decimal_places=10, max_digits=18, null=True)),
+                ('xdtf', models.IntegerField(blank=True, null=True)),
+                ('xptf', models.IntegerField(blank=True, null=True)),
+                ('xleadf', models.IntegerField(blank=True, null=True)),
+                ('xleadv', models.IntegerField(blank=True, null=True)),
+                ('xleadt', models.IntegerField(blank=True, null=True)),
+                ('xunitstk', models.CharField(blank=True, max_length=100, null=True)),
+                ('xunitalt', models.CharField(blank=True, max_length=100, null=True)),
+                ('xunitiss', models.CharField(blank=True, max_length=100, null=True)),
+                ('xunitpck', models.CharField(blank=True, max_length=100, null=True)),
+                ('xunitsta', models.CharField(blank=True, max_length=100, null=True)),
+                ('xunitpur', models.CharField(blank=True, max_length=100, null=True)),
+                ('xunitsel', models.CharField(blank=True, max_length=100, null=True)),
+                ('xcfiss', models.DecimalField(blank=True, decimal_places=6, max_digits=18, null=True)),
+                ('xcfpck', models.DecimalField(blank=True, decimal_places=6, max_digits=18, null=True)),
+                ('xcfsta', models.DecimalField(blank=True, decimal_places=6, max_digits=18, null=True)),
+                ('xcfpur', models.DecimalField(blank=True, decimal_places=6, max_digits=18, null=True)),
+                ('xcfsel', models.DecimalField(blank=True, decimal_places=6, max_digits=18, null=True)),
+                ('xstdcost', models.DecimalField(blank=True, decimal_places=4, max_digits=18, null=True, verbose_name='Standard Cost')),
+                ('xstdprice', models.DecimalField(blank=True, decimal_places=4, max_digits=18, null=True, verbose_name='Standard Price')),
+                ('xsplprice', models.DecimalField(blank=True, decimal_places=4, max_digits=18, null=True)),
+                ('xminprice', models.DecimalField(blank=True, decimal_places=4, max_digits=18, null=True)),
+                ('xmargincost', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('xdisc', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, verbose_name='Discount')),
+                ('xcomm', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('xcurcost', models.CharField(blank=True, max_length=100, null=True)),
+                ('xcurprice', models.CharField(blank=True, max_length=100, null=True)),
+                ('xnote', models.CharField(blank=True, max_length=1000, null=True)),
+                ('xexcisecat', models.CharField(blank=True, max_length=100, null=True)),
+                ('xbrand', models.CharField(blank=True, max_length=100, null=True)),
+                ('xbarcode', models.CharField(blank=True, max_length=100, null=True)),
+                ('xmanufacturer', models.CharField(blank=True, max_length=100, null=True)),
+                ('xwarranty', models.IntegerField(blank=True, null=True)),
+                ('xhide', models.CharField(blank=True, max_length=1, null=True)),
+                ('xstoporder', models.CharField(blank=True, max_length=100, null=True)),
+                ('xdateeff', models.DateField(blank=True, null=True)),
+                ('xdateexp', models.DateField(blank=True, null=True)),
+                ('xtypestk', models.CharField(blank=True, max_length=100, null=True)),
+                ('xstype', models.CharField(blank=True, max_length=100, null=True)),
+                ('xbinman', models.CharField(blank=True, max_length=1, null=True)),
+                ('xbin', models.CharField(blank=True, max_length=100, null=True)),
+                ('xloc', models.CharField(blank=True, max_length=100, null=True)),
+                ('zemail', models.CharField(blank=True, max_length=50, null=True)),
+                ('xemail', models.CharField(blank=True, max_length=100, null=True)),
+            ],
+            options={
+                'verbose_name': 'Item',
+                'verbose_name_plural': 'Items',
+                'db_table': 'caitem',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Casup',
+            fields=[
+                ('zid', models.OneToOneField(db_column='zid', on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='authentication.business')),
+                ('ztime', models.DateTimeField(blank=True, null=True)),
+                ('zutime', models.DateTimeField(blank=True, null=True)),
+                ('xsup', models.CharField(max_length=100)),
+                ('xshort', models.CharField(blank=True, max_length=100, null=True)),
+                ('xorg', models.CharField(max_length=100)),
+                ('xadd1', models.CharField(blank=True, max_length=100, null=True)),
+                ('xadd2', models.CharField(blank=True, max_length=100, null=True)),
+                ('xcity', models.CharField(blank=True, max_length=100, null=True)),
+                ('xstate', models.CharField(blank=True, max_length=100, null=True)),
+                ('xzip', models.CharField(blank=True, max_length=100, null=True)),
+                ('xcountry', models.CharField(blank=True, max_length=100, null=True)),
+                ('xsalute', models.CharField(blank=True, max_length=100, null=True)),
+                ('xfirst', models.CharField(blank=True, max_length=100, null=True)),
+                ('xmiddle', models.CharField(blank=True, max_length=100, null=True)),
+                ('xlast', models.CharField(blank=True, max_length=100, null=True)),
+                ('xtitle', models.CharField(blank=True, max_length=100, null=True)),
+                ('xemail', models.CharField(blank=True, max_length=100, null=True)),
+                ('xphone', models.CharField(blank=True, max_length=40, null=True)),
+                ('xfax', models.CharField(blank=True, max_length=100, null=True)),
+                ('xurl', models.CharField(blank=True, max_length=100, null=True)),
+                ('xid', models.CharField(blank=True, max_length=100, null=True)),
+                ('xtaxnum', models.CharField(blank=True, max_length=100, null=True)),
+                ('xaccap', models.CharField(blank=True, max_length=100, null=True)),
+                ('xaccgit', models.CharField(blank=True, max_length=100, null=True)),
+                ('xgsup', models.CharField(blank=True, max_length=100, null=True)),
+                ('xgprice', models.CharField(blank=True, max_length=100, null=True)),
+                ('xsic', models.CharField(blank=True, max_length=100, null=True)),
+                ('xtaxscope', models.CharField(blank=True, max_length=100, null=True)),
+                ('xstatussup', models.CharField(blank=True, max_length=100, null=True)),
+                ('xcrlimit', models.DecimalField(blank=True, decimal_places=2, max_digits=18, null=True)),
+                ('xcrterms', models.IntegerField(blank=True, null=True)),
+                ('xdisc', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('xagent', models.CharField(blank=True, max_length=100, null=True)),
+                ('xcomm', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('xcur', models.CharField(blank=True, max_length=100, null=True)),
+                ('xpayins', models.CharField(blank=True, max_length=1000, null=True)),
+                ('xlocation', models.CharField(blank=True, max_length=100, null=True)),
+                ('xzonedel', models.CharField(blank=True, max_length=100, null=True)),
+                ('xtimeslot', models.CharField(blank=True, max_length=100, null=True)),
+                ('xlicense', models.CharField(blank=True, max_length=100, null=True)),
+                ('xdateexp', models.DateField(blank=True, null=True)),
+                ('xpermitapp', models.CharField(blank=True, max_length=100, null=True)),
+                ('xby', models.CharField(blank=True, max_length=100, null=True)),
+            ],
+            options={
+                'verbose_name': 'Supplier',
+                'verbose_name_plural': 'Suppliers',
+                'db_table': 'casup',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Xcodes',
+            fields=[
+                ('zid', models.IntegerField(db_column='zid', primary_key=True, serialize=False)),
+                ('ztime', models.DateTimeField(blank=True, null=True)),
+                ('zutime', models.DateTimeField(blank=True, null=True)),
+                ('xtype', models.CharField(max_length=100, verbose_name='Code Type')),
+                ('xcode', models.CharField(max_length=100, verbose_name='Code Value')),
+                ('xdescdet', models.CharField(blank=True, max_length=250, null=True, verbose_name='Description')),
+                ('xprops', models.CharField(blank=True, max_length=1000, null=True, verbose_name='Properties/Parameters')),
+                ('xcodealt', models.CharField(blank=True, max_length=100, null=True, verbose_name='Alternative Code')),
+                ('xteam', models.CharField(blank=True, max_length=100, null=True, verbose_name='Team')),
+                ('zactive', models.CharField(blank=True, max_length=1, null=True, verbose_name='Active Status')),
+            ],
+            options={
+                'verbose_name': 'Common Code',
+                'verbose_name_plural': 'Common Codes',
+                'db_table': 'xcodes',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='VoucherSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('zid', models.IntegerField(verbose_name='Business ID')),
+                ('xprefix', models.CharField(max_length=20, verbose_name='Voucher Prefix')),
+                ('xlast', models.BigIntegerField(default=0, verbose_name='Last Issued Number')),
+                ('zutime', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Voucher Sequence',
+                'verbose_name_plural': 'Voucher Sequences',
+                'db_table': 'voucher_sequence',
+                'unique_together': {('zid', 'xprefix')},
+            },
+        ),
+    ]
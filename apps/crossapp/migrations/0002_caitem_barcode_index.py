@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:05
+
+from django.db import migrations
+
+
+def _table_exists(schema_editor, table):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s)", [table])
+        return cursor.fetchone()[0] is not None
+
+
+def create_index(apps, schema_editor):
+    if _table_exists(schema_editor, 'caitem'):
+        schema_editor.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS caitem_zid_xbarcode_idx ON caitem (zid, xbarcode)")
+
+
+def drop_index(apps, schema_editor):
+    schema_editor.execute("DROP INDEX CONCURRENTLY IF EXISTS caitem_zid_xbarcode_idx")
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; building the
+    # index concurrently keeps caitem writable on live databases.
+    atomic = False
+
+    dependencies = [
+        ('crossapp', '0001_voucher_sequence'),
+    ]
+
+    # caitem is a legacy unmanaged table, so the index is created with SQL, and
+    # only where the table exists (not on a fresh or test database).
+    # (zid, xitem) lookups are already served by the legacy primary key.
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
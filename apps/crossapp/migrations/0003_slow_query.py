@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-18 12:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crossapp', '0002_caitem_barcode_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=32, unique=True)),
+                ('statement', models.TextField()),
+                ('calls', models.IntegerField(default=0, verbose_name='Slow Calls')),
+                ('total_ms', models.FloatField(default=0, verbose_name='Total ms')),
+                ('max_ms', models.FloatField(default=0, verbose_name='Max ms')),
+                ('first_seen', models.DateTimeField(auto_now_add=True)),
+                ('last_seen', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Slow Query',
+                'verbose_name_plural': 'Slow Queries',
+                'db_table': 'slow_query',
+            },
+        ),
+        migrations.CreateModel(
+            name='SlowQuerySample',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sql', models.TextField()),
+                ('params', models.TextField(blank=True)),
+                ('duration_ms', models.FloatField()),
+                ('call_site', models.CharField(blank=True, max_length=255)),
+                ('view', models.CharField(blank=True, max_length=255)),
+                ('plan', models.JSONField(blank=True, null=True)),
+                ('plan_error', models.CharField(blank=True, max_length=255)),
+                ('captured_at', models.DateTimeField(auto_now_add=True)),
+                ('query', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='samples', to='crossapp.slowquery')),
+            ],
+            options={
+                'verbose_name': 'Slow Query Sample',
+                'verbose_name_plural': 'Slow Query Samples',
+                'db_table': 'slow_query_sample',
+                'ordering': ['-captured_at'],
+            },
+        ),
+    ]
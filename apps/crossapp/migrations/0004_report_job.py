@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:05
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crossapp', '0003_slow_query'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('zid', models.IntegerField()),
+                ('report', models.CharField(max_length=50)),
+                ('params', models.JSONField(default=dict)),
+                ('fingerprint', models.CharField(max_length=64)),
+                ('current', models.BooleanField(default=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('filename', models.CharField(max_length=255)),
+                ('file_path', models.CharField(blank=True, max_length=255)),
+                ('size', models.IntegerField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('requested_by', models.CharField(blank=True, max_length=150)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('expires_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Report Job',
+                'verbose_name_plural': 'Report Jobs',
+                'db_table': 'report_job',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='reportjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('current', True)), fields=('fingerprint',), name='report_job_one_current_per_fingerprint'),
+        ),
+    ]
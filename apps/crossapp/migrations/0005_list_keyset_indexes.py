@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:40
+
+from django.db import migrations
+
+# (index, table, columns): the date-ordered document lists page through these
+# with keyset pagination (apps.utils.datatables); the document number is the
+# tiebreaker. Sorting by document number alone uses the legacy primary keys.
+INDEXES = [
+    ('opord_zid_xdate_xordernum_idx', 'opord', 'zid, xdate, xordernum'),
+    ('imtemptrn_zid_xdate_ximtmptrn_idx', 'imtemptrn', 'zid, xdate, ximtmptrn'),
+    ('poord_zid_xdate_xpornum_idx', 'poord', 'zid, xdate, xpornum'),
+    ('pogrn_zid_xdate_xgrnnum_idx', 'pogrn', 'zid, xdate, xgrnnum'),
+]
+
+
+def _table_exists(schema_editor, table):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s)", [table])
+        return cursor.fetchone()[0] is not None
+
+
+def create_indexes(apps, schema_editor):
+    for name, table, columns in INDEXES:
+        if _table_exists(schema_editor, table):
+            schema_editor.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})")
+
+
+def drop_indexes(apps, schema_editor):
+    for name, _, _ in INDEXES:
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; building the
+    # indexes concurrently keeps the document tables writable on live databases.
+    atomic = False
+
+    dependencies = [
+        ('crossapp', '0004_report_job'),
+    ]
+
+    # The document tables are legacy unmanaged tables, so the indexes are created
+    # with SQL, and only on the tables that exist (not on a fresh or test database).
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:55
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+from apps.utils.document_search import SEARCH_DOCUMENTS, backfill_sql, install_sql, uninstall_sql
+
+
+def _table_exists(schema_editor, table):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s)", [table])
+        return cursor.fetchone()[0] is not None
+
+
+def index_documents(apps, schema_editor):
+    """Install each header table's trigger, then index its existing documents"""
+    for kind in SEARCH_DOCUMENTS:
+        if not _table_exists(schema_editor, kind):
+            continue
+        schema_editor.execute(install_sql(kind), params=None)
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(f"SELECT DISTINCT zid FROM {kind}")
+            for (zid,) in cursor.fetchall():
+                cursor.execute(backfill_sql(kind), [zid])
+
+
+def unindex_documents(apps, schema_editor):
+    for kind in SEARCH_DOCUMENTS:
+        if _table_exists(schema_editor, kind):
+            schema_editor.execute(uninstall_sql(kind), params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crossapp', '0005_list_keyset_indexes'),
+    ]
+
+    # The header tables are legacy unmanaged tables, so their triggers and the
+    # GIN indexes are created with SQL. Existing documents are indexed here, in
+    # the same transaction as the triggers, so the lists find them as soon as
+    # the migration is applied. Header tables missing from the database (a
+    # fresh or test database) are skipped.
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name='DocumentSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('zid', models.IntegerField()),
+                ('kind', models.CharField(max_length=20)),
+                ('number', models.CharField(max_length=50)),
+                ('search_text', models.TextField()),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(null=True)),
+            ],
+            options={
+                'verbose_name': 'Document Search Row',
+                'verbose_name_plural': 'Document Search Rows',
+                'db_table': 'document_search',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='documentsearch',
+            constraint=models.UniqueConstraint(fields=('zid', 'kind', 'number'), name='document_search_one_per_document'),
+        ),
+        migrations.RunSQL(
+            sql="CREATE INDEX IF NOT EXISTS document_search_vector_idx ON document_search USING gin (search_vector)",
+            reverse_sql="DROP INDEX IF EXISTS document_search_vector_idx",
+        ),
+        migrations.RunSQL(
+            sql="CREATE INDEX IF NOT EXISTS document_search_trgm_idx ON document_search USING gin (search_text gin_trgm_ops)",
+            reverse_sql="DROP INDEX IF EXISTS document_search_trgm_idx",
+        ),
+        migrations.RunPython(index_documents, unindex_documents),
+    ]
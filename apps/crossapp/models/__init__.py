@@ -2,10 +2,19 @@
 from .cacus import Cacus
 from .xcodes import Xcodes
 from .casup import Casup
+from .voucher_sequence import VoucherSequence
+from .slow_query import SlowQuery, SlowQuerySample
+from .report_job import ReportJob
+from .document_search import DocumentSearch
 
 __all__ = [
     'Caitem',
     'Cacus',
     'Xcodes',
-    'Casup'
+    'Casup',
+    'VoucherSequence',
+    'SlowQuery',
+    'SlowQuerySample',
+    'ReportJob',
+    'DocumentSearch'
 ]
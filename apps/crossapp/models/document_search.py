@@ -0,0 +1,27 @@
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class DocumentSearch(models.Model):
+    """
+    Search row of one document header (see apps.utils.document_search)
+
+    Written by triggers on the header tables, never by Django. The GIN
+    indexes (tsvector and trigram) are created by migration 0006.
+    """
+    zid = models.IntegerField()
+    kind = models.CharField(max_length=20)  # Source table: opord, imtemptrn, poord, pogrn
+    number = models.CharField(max_length=50)  # Document number in the source table
+    search_text = models.TextField()  # Searchable fields, upper case
+    search_vector = SearchVectorField(null=True)
+
+    class Meta:
+        db_table = 'document_search'
+        verbose_name = 'Document Search Row'
+        verbose_name_plural = 'Document Search Rows'
+        constraints = [
+            models.UniqueConstraint(fields=['zid', 'kind', 'number'], name='document_search_one_per_document'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.number} ({self.zid})"
@@ -0,0 +1,51 @@
+import uuid
+
+from django.db import models
+from django.db.models import Q
+
+
+class ReportJob(models.Model):
+    """A PDF report rendered in the background (see apps.utils.report_jobs)"""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    zid = models.IntegerField()
+    report = models.CharField(max_length=50)  # Key of apps.utils.report_jobs.REPORTS
+    params = models.JSONField(default=dict)
+    fingerprint = models.CharField(max_length=64)  # sha256 of (zid, report, params)
+    # True while the job can be shared by identical requests: pending, running,
+    # or done and not yet expired. At most one current job per fingerprint.
+    current = models.BooleanField(default=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    filename = models.CharField(max_length=255)  # Download name
+    file_path = models.CharField(max_length=255, blank=True)  # Relative to REPORT_JOB_ROOT
+    size = models.IntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    requested_by = models.CharField(max_length=150, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        db_table = 'report_job'
+        ordering = ['-created_at']
+        verbose_name = 'Report Job'
+        verbose_name_plural = 'Report Jobs'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['fingerprint'], condition=Q(current=True), name='report_job_one_current_per_fingerprint'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.report} {self.params} ({self.status})"
@@ -0,0 +1,42 @@
+from django.db import models
+
+
+class SlowQuery(models.Model):
+    """One normalized SQL statement that exceeded SLOW_QUERY_THRESHOLD_MS (see apps.utils.slow_queries)"""
+    fingerprint = models.CharField(max_length=32, unique=True)  # md5 of the normalized statement
+    statement = models.TextField()  # Normalized statement: literals and placeholders replaced by ?
+    calls = models.IntegerField(default=0, verbose_name='Slow Calls')
+    total_ms = models.FloatField(default=0, verbose_name='Total ms')
+    max_ms = models.FloatField(default=0, verbose_name='Max ms')
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'slow_query'
+        verbose_name = 'Slow Query'
+        verbose_name_plural = 'Slow Queries'
+
+    def __str__(self):
+        return self.statement[:80]
+
+
+class SlowQuerySample(models.Model):
+    """A captured execution of a SlowQuery; the newest SLOW_QUERY_SAMPLES per statement are kept"""
+    query = models.ForeignKey(SlowQuery, on_delete=models.CASCADE, related_name='samples')
+    sql = models.TextField()  # As executed, with %s placeholders
+    params = models.TextField(blank=True)  # Redacted parameters
+    duration_ms = models.FloatField()
+    call_site = models.CharField(max_length=255, blank=True)  # e.g. apps/inventory/views/item_ledger.py:42 in get_item_ledger
+    view = models.CharField(max_length=255, blank=True)
+    plan = models.JSONField(null=True, blank=True)  # EXPLAIN (ANALYZE off, FORMAT JSON)
+    plan_error = models.CharField(max_length=255, blank=True)
+    captured_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'slow_query_sample'
+        ordering = ['-captured_at']
+        verbose_name = 'Slow Query Sample'
+        verbose_name_plural = 'Slow Query Samples'
+
+    def __str__(self):
+        return f"{self.duration_ms:.0f} ms at {self.call_site}"
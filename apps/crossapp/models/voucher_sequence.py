@@ -0,0 +1,17 @@
+from django.db import models
+
+class VoucherSequence(models.Model):
+    """Per-business counter backing voucher number allocation (see apps.utils.voucher_generator)"""
+    zid = models.IntegerField(verbose_name='Business ID')
+    xprefix = models.CharField(max_length=20, verbose_name='Voucher Prefix')  # e.g. 'CO--', 'IS--', 'SINV1025-'
+    xlast = models.BigIntegerField(default=0, verbose_name='Last Issued Number')
+    zutime = models.DateTimeField(auto_now=True)  # Update Time
+
+    class Meta:
+        db_table = 'voucher_sequence'
+        unique_together = (('zid', 'xprefix'),)
+        verbose_name = 'Voucher Sequence'
+        verbose_name_plural = 'Voucher Sequences'
+
+    def __str__(self):
+        return f"{self.zid} {self.xprefix}{self.xlast:06d}"
@@ -0,0 +1,38 @@
+"""
+Celery tasks for the crossapp app
+"""
+import logging
+
+from celery import shared_task
+from django.utils import timezone
+
+from apps.crossapp.models import ReportJob
+from apps.utils.report_jobs import purge_expired_jobs, run_report_job
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def render_report_job(job_id):
+    """
+    Render one queued ReportJob (see apps.utils.report_jobs)
+
+    Returns:
+        str: Final job status
+    """
+    # Claim the job; a redelivered message finds it already running
+    claimed = ReportJob.objects.filter(id=job_id, status=ReportJob.PENDING).update(
+        status=ReportJob.RUNNING, started_at=timezone.now()
+    )
+    if not claimed:
+        return 'skipped'
+    return run_report_job(ReportJob.objects.get(id=job_id)).status
+
+
+@shared_task
+def purge_report_jobs():
+    """Delete expired report files; scheduled in CELERY_BEAT_SCHEDULE"""
+    removed = purge_expired_jobs()
+    if removed:
+        logger.info(f"Purged {removed} report jobs")
+    return removed
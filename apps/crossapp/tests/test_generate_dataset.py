@@ -0,0 +1,75 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from apps.crossapp.management.commands.generate_dataset import (
+    Command,
+    GLDETAIL_COLUMNS,
+    IMTRN_COLUMNS,
+    OPODT_COLUMNS,
+    OPORD_COLUMNS,
+    WAREHOUSES,
+)
+from apps.utils.bulk_insert import copy_rows
+
+
+class CopyCursorStub:
+    def copy_expert(self, sql, stream, size):
+        self.sql = sql
+        self.data = b''
+        while True:
+            chunk = stream.read(size)
+            if not chunk:
+                break
+            self.data += chunk
+
+
+def make_command(seed=7):
+    command = Command()
+    command.seed = seed
+    command.sizes = {
+        'items': 50, 'customers': 10, 'suppliers': 5, 'orders': 200, 'purchase_orders': 30,
+        'days': 10, 'lines': 3, 'warehouses': WAREHOUSES[:2],
+    }
+    command.start_date = date(2025, 12, 31) - timedelta(days=9)
+    return command
+
+
+class GenerateDatasetTests(SimpleTestCase):
+    def test_streams_are_deterministic(self):
+        first, second = make_command(), make_command()
+        items = first._items(100001)
+
+        self.assertEqual(items, second._items(100001))
+        self.assertEqual(list(first._imtrn(100001, items)), list(second._imtrn(100001, items)))
+        self.assertNotEqual(items, make_command(seed=8)._items(100001))
+        self.assertNotEqual(items, first._items(100002))
+
+    def test_rows_match_columns_and_vouchers_balance(self):
+        command = make_command()
+        items = command._items(100001)
+
+        orders = list(command._sales(100001, items))
+        self.assertEqual({len(order[0]) for order in orders}, {len(OPORD_COLUMNS)})
+        self.assertEqual({len(line) for order in orders for line in order[1]}, {len(OPODT_COLUMNS)})
+
+        imtrn = list(command._imtrn(100001, items))
+        self.assertEqual({len(row) for row in imtrn}, {len(IMTRN_COLUMNS)})
+        self.assertEqual(len({row[2] for row in imtrn}), len(imtrn))
+
+        vouchers = list(command._vouchers(100001, items))
+        for header, lines in vouchers:
+            self.assertEqual({len(line) for line in lines}, {len(GLDETAIL_COLUMNS)})
+            self.assertEqual(sum(Decimal(line[10]) for line in lines).quantize(Decimal('1')), 0, header[2])
+        # The last sales day is left for the day-end process
+        sale_days = {header[4] for header, _ in vouchers if header[12] == 'SALE'}
+        self.assertEqual(len(sale_days), 9)
+
+    def test_copy_rows_streams_copy_text(self):
+        cursor = CopyCursorStub()
+        count = copy_rows(cursor, 'xcodes', ['zid', 'xcode', 'xdescdet'], iter([(1, 'A\tB', None), (2, 'C', 'x\\y')]))
+
+        self.assertEqual(count, 2)
+        self.assertEqual(cursor.sql, 'COPY xcodes (zid, xcode, xdescdet) FROM STDIN')
+        self.assertEqual(cursor.data, b'1\tA\\tB\t\\N\n2\tC\tx\\\\y\n')
@@ -0,0 +1,116 @@
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.crossapp.models import ReportJob
+from apps.crossapp.tasks import purge_report_jobs, render_report_job
+from apps.utils.report_jobs import REPORTS, submit_report
+
+TEST_REPORT = {
+    'context': 'apps.crossapp.tests.test_report_jobs.fake_context',
+    'template': 'report_job.html',
+    'filename': 'test_{transaction_id}.pdf',
+    'params': ('transaction_id',),
+}
+
+
+def fake_context(zid, transaction_id):
+    return None if transaction_id == 'missing' else {'zid': zid, 'transaction_id': transaction_id}
+
+
+@patch.dict(REPORTS, {'test': TEST_REPORT})
+@patch('apps.utils.report_jobs.render_pdf', return_value=b'%PDF-1.4 test')
+class ReportJobTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        settings = override_settings(REPORT_JOB_ROOT=self.root.name, DOCUMENT_CACHE_ROOT=self.root.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.client.force_login(User.objects.create_user('clerk', password='x'))
+        session = self.client.session
+        session['current_zid'] = 100001
+        session.save()
+
+    def test_identical_requests_share_one_rendering(self, render_pdf):
+        with patch.object(render_report_job, 'delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                first, created = submit_report(100001, 'test', {'transaction_id': 'GRN-1'})
+            second, created_again = submit_report('100001', 'test', {'transaction_id': 'GRN-1'})
+            other, _ = submit_report(100002, 'test', {'transaction_id': 'GRN-1'})
+
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertEqual(first.id, second.id)
+        self.assertNotEqual(first.id, other.id)
+        delay.assert_called_once_with(str(first.id))
+
+        self.assertEqual(render_report_job(str(first.id)), ReportJob.DONE)
+        self.assertEqual(render_report_job(str(first.id)), 'skipped')
+        render_pdf.assert_called_once()
+
+        status = self.client.get(f'/crossapp/api/report-jobs/{first.id}/').json()
+        self.assertEqual(status['status'], 'done')
+        response = self.client.get(status['download_url'])
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF-1.4 test')
+        self.assertIn('test_GRN-1.pdf', response['Content-Disposition'])
+
+        # Another business cannot see the job
+        self.assertEqual(self.client.get(f'/crossapp/api/report-jobs/{other.id}/').status_code, 404)
+
+    def test_missing_documents_fail_and_are_not_shared(self, render_pdf):
+        job, _ = submit_report(100001, 'test', {'transaction_id': 'missing'})
+        render_report_job(str(job.id))
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, ReportJob.FAILED)
+        self.assertFalse(job.current)
+        self.assertIn('not found', job.error)
+        retry, created = submit_report(100001, 'test', {'transaction_id': 'missing'})
+        self.assertTrue(created)
+        self.assertNotEqual(retry.id, job.id)
+
+    def test_expired_reports_are_rendered_again_and_purged(self, render_pdf):
+        job, _ = submit_report(100001, 'test', {'transaction_id': 'GRN-2'})
+        render_report_job(str(job.id))
+        ReportJob.objects.filter(id=job.id).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(self.client.get(f'/crossapp/report-jobs/{job.id}/download/').status_code, 410)
+        fresh, created = submit_report(100001, 'test', {'transaction_id': 'GRN-2'})
+        self.assertTrue(created)
+
+        self.assertEqual(purge_report_jobs(), 1)
+        self.assertFalse(ReportJob.objects.filter(id=job.id).exists())
+        self.assertTrue(ReportJob.objects.filter(id=fresh.id).exists())
+
+    @patch('apps.utils.document_cache.document_version', return_value='v1')
+    def test_edited_documents_are_rendered_again(self, document_version, render_pdf):
+        with patch.dict(REPORTS['test'], {'document': ('po_grn', 'transaction_id')}):
+            job, _ = submit_report(100001, 'test', {'transaction_id': 'GRN-3'})
+            render_report_job(str(job.id))
+            self.assertEqual(submit_report(100001, 'test', {'transaction_id': 'GRN-3'}), (job, False))
+
+            # The GRN is edited: the finished job no longer matches
+            document_version.return_value = 'v2'
+            edited, created = submit_report(100001, 'test', {'transaction_id': 'GRN-3'})
+        self.assertTrue(created)
+        self.assertNotEqual(edited.id, job.id)
+
+    @patch('apps.utils.document_cache.lookup', return_value=(None, 'v1'))
+    def test_print_views_redirect_to_the_job_page(self, lookup, render_pdf):
+        response = self.client.get('/purchase/po-grn-print/GRN-000123/')
+
+        job = ReportJob.objects.get()
+        self.assertEqual((job.report, job.params), ('po_grn', {'transaction_id': 'GRN-000123'}))
+        self.assertRedirects(response, f'/crossapp/report-jobs/{job.id}/', fetch_redirect_response=False)
+
+        # An unchanged document already rendered is returned without a job
+        lookup.return_value = (b'%PDF-1.4 cached', 'v1')
+        response = self.client.get('/purchase/po-grn-print/GRN-000123/')
+        self.assertEqual(response.content, b'%PDF-1.4 cached')
+        self.assertEqual(ReportJob.objects.count(), 1)
@@ -0,0 +1,91 @@
+from django.test import TestCase
+from unittest.mock import patch
+
+from apps.utils.voucher_generator import generate_voucher_number, like_prefix, reserve_voucher_numbers
+
+
+class CursorStub:
+    def __init__(self, counter=None, seed=None):
+        self.counter = counter
+        self.seed = seed
+        self.statements = []
+        self.params = []
+        self.result = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, sql, params=None):
+        self.result = None
+        if 'SAVEPOINT' in sql:
+            return
+        self.statements.append(sql)
+        self.params.append(params)
+        if 'UPDATE voucher_sequence' in sql:
+            if self.counter is not None:
+                self.counter += params[0]
+                self.result = (self.counter,)
+        elif 'INSERT INTO voucher_sequence' in sql:
+            if self.counter is None:
+                self.counter = params[2]
+        elif 'SELECT MAX' in sql:
+            self.result = (self.seed,)
+
+    def fetchone(self):
+        return self.result
+
+
+class VoucherSequenceTests(TestCase):
+    @patch('apps.utils.voucher_generator.connection.cursor')
+    def test_existing_counter_single_statement(self, mock_cursor):
+        stub = CursorStub(counter=41)
+        mock_cursor.return_value = stub
+        self.assertEqual(generate_voucher_number(100001, 'CO--', 'opord', 'xordernum'), 'CO--000042')
+        self.assertEqual(len(stub.statements), 1)
+
+    @patch('apps.utils.voucher_generator.connection.cursor')
+    def test_new_counter_seeded_from_table(self, mock_cursor):
+        stub = CursorStub(seed=1034)
+        mock_cursor.return_value = stub
+        self.assertEqual(generate_voucher_number(100001, 'RE--', 'imtrn', 'ximtrnnum'), 'RE--001035')
+        self.assertIn('FROM imtrn', stub.statements[1])
+
+    @patch('apps.utils.voucher_generator.connection.cursor')
+    def test_new_counter_without_documents(self, mock_cursor):
+        mock_cursor.return_value = CursorStub(seed=None)
+        self.assertEqual(generate_voucher_number(100001, 'PO--', 'poord', 'xpornum'), 'PO--000001')
+
+    @patch('apps.utils.voucher_generator.connection.cursor')
+    def test_reserve_block_single_statement(self, mock_cursor):
+        stub = CursorStub(counter=40)
+        mock_cursor.return_value = stub
+        numbers = reserve_voucher_numbers(100001, 'IS--', 'imtrn', 'ximtrnnum', 3)
+        self.assertEqual(numbers, ['IS--000041', 'IS--000042', 'IS--000043'])
+        self.assertEqual(len(stub.statements), 1)
+        self.assertEqual(stub.counter, 43)
+
+    @patch('apps.utils.voucher_generator.connection.cursor')
+    def test_sales_return_lines_keep_their_own_counter(self, mock_cursor):
+        header = CursorStub(seed=7)
+        mock_cursor.return_value = header
+        self.assertEqual(generate_voucher_number(100001, 'SRE-', 'imtemptrn', 'ximtmptrn'), 'SRE-000008')
+        self.assertEqual(header.params[0][2], 'SRE-')
+
+        # The lines are seeded from imtemptdt only, under their own key
+        lines = CursorStub(seed=120)
+        mock_cursor.return_value = lines
+        numbers = reserve_voucher_numbers(100001, 'SRE-', 'imtemptdt', 'ximtrnnum', 2)
+        self.assertEqual(numbers, ['SRE-000121', 'SRE-000122'])
+        self.assertIn('FROM imtemptdt', lines.statements[1])
+        self.assertEqual(lines.params[0][2], 'SRE-@imtemptdt')
+        self.assertEqual(lines.params[2][1], 'SRE-@imtemptdt')
+
+    def test_reserve_nothing(self):
+        self.assertEqual(reserve_voucher_numbers(100001, 'IS--', 'imtrn', 'ximtrnnum', 0), [])
+
+    def test_like_prefix_escapes_wildcards(self):
+        self.assertEqual(like_prefix('CO--'), 'CO--%')
+        self.assertEqual(like_prefix('A_B%'), 'A\\_B\\%%')
@@ -3,6 +3,7 @@
 from .views.brands import BrandsView, get_brands_json, create_brand_api, update_brand_api, delete_brand_api
 from .views.customers import CustomersView, get_customers_json
 from .views.item_group import ItemGroupView, get_item_group_json, create_item_group_api, update_item_group_api, delete_item_group_api
+from .views.report_jobs import submit_report_job_api, report_job_status_api, report_job_page, report_job_download
 
 
 
@@ -42,6 +43,12 @@
     path('api/item_group/update/<str:item_group_code>/', update_item_group_api, name='update-item-group-api'),
     path('api/item_group/delete/<str:item_group_code>/', delete_item_group_api, name='delete-item-group-api'),
 
+    # Background PDF report jobs
+    path("report-jobs/<uuid:job_id>/", report_job_page, name="report-job"),
+    path("report-jobs/<uuid:job_id>/download/", report_job_download, name="report-job-download"),
+    path("api/report-jobs/", submit_report_job_api, name="report-job-submit-api"),
+    path("api/report-jobs/<uuid:job_id>/", report_job_status_api, name="report-job-status-api"),
+
 
 
 ]
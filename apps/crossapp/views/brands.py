@@ -6,6 +6,7 @@
 from apps.authentication.mixins import ZidRequiredMixin
 from apps.authentication.mixins import ModulePermissionMixin
 from ..models.xcodes import Xcodes
+from apps.utils.master_data import invalidate_master_data
 
 # Get logger for this module
 logger = logging.getLogger(__name__)
@@ -106,6 +107,7 @@ def create_brand_api(request):
             xtype='Brand',
             zactive = '1'
         )
+        invalidate_master_data(current_zid, 'xcodes')
 
         logger.info(f"Brand created successfully: {brand_name} (code: {brand_name}) for business: {current_zid} by user: {request.user.username}")
 
@@ -188,6 +190,7 @@ def update_brand_api(request, brand_code):
             xcode=new_brand_name,
             xdescdet=new_brand_name
         )
+        invalidate_master_data(current_zid, 'xcodes')
 
         logger.info(f"Brand updated successfully: {brand_code} -> {new_brand_name} (code: {new_brand_name}) for business: {current_zid} by user: {request.user.username}")
 
@@ -235,6 +238,7 @@ def delete_brand_api(request, brand_code):
             xtype='Brand',
             xcode=brand_code
         ).delete()
+        invalidate_master_data(current_zid, 'xcodes')
 
         logger.info(f"Brand deleted successfully: {brand_name} (code: {brand_code}) for business: {current_zid} by user: {request.user.username}")
 
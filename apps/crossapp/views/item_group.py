@@ -5,6 +5,7 @@
 from apps.authentication.mixins import ZidRequiredMixin
 from apps.authentication.mixins import ModulePermissionMixin
 from ..models.xcodes import Xcodes
+from apps.utils.master_data import invalidate_master_data
 import json
 import logging
 
@@ -103,6 +104,7 @@ def create_item_group_api(request):
             xtype='Item Group',
             zactive='1'
         )
+        invalidate_master_data(current_zid, 'xcodes')
         return JsonResponse({
             'status': 'success',
             'message': 'Item group created successfully',
@@ -177,6 +179,7 @@ def update_item_group_api(request, item_group_code):
             xcode=new_item_group_name,
             xdescdet=new_item_group_name
         )
+        invalidate_master_data(current_zid, 'xcodes')
 
         logger.info(f"Item group updated successfully: {item_group_code} -> {new_item_group_name}")
         return JsonResponse({
@@ -225,6 +228,7 @@ def delete_item_group_api(request, item_group_code):
             xcode=item_group_code,      # Exact match (already lowercased)
             xtype='Item Group'          # Hardcoded type
         ).delete()
+        invalidate_master_data(current_zid, 'xcodes')
 
         if deleted_count == 0:
             logger.warning(f"Item group not found for deletion: {item_group_code} for business: {current_zid}")
@@ -5,6 +5,7 @@
 from apps.authentication.mixins import ZidRequiredMixin
 from apps.authentication.mixins import ModulePermissionMixin
 from ..models.caitem import Caitem
+from apps.utils.catalog_index import invalidate_catalog
 import logging
 
 logger = logging.getLogger(__name__)
@@ -127,6 +128,7 @@ def delete_item_api(request, item_code):
             zid=current_zid,
             xitem=item_code
         ).delete()
+        invalidate_catalog(current_zid)
         
         logger.info(f"Item deleted successfully: {item_name} (code: {item_code}) for business: {current_zid} by user: {request.user.username}")
         
@@ -0,0 +1,111 @@
+import json
+import logging
+
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, JsonResponse
+from django.shortcuts import redirect, render
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.utils.report_jobs import REPORTS, report_root, submit_report
+from ..models.report_job import ReportJob
+
+logger = logging.getLogger(__name__)
+
+
+def _job_for_session(request, job_id):
+    """The job if it belongs to the session's business, else None"""
+    return ReportJob.objects.filter(id=job_id, zid=request.session.get('current_zid')).first()
+
+
+def _not_found():
+    return JsonResponse({'error': 'Report job not found'}, status=404)
+
+
+def _job_json(job):
+    data = {
+        'job_id': str(job.id),
+        'report': job.report,
+        'params': job.params,
+        'status': job.status,
+        'error': job.error,
+        'filename': job.filename,
+        'size': job.size,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'expires_at': job.expires_at.isoformat() if job.expires_at else None,
+        'status_url': reverse('report-job-status-api', args=[job.id]),
+    }
+    if job.status == ReportJob.DONE:
+        data['download_url'] = reverse('report-job-download', args=[job.id])
+    return data
+
+
+@login_required
+def submit_report_job_api(request):
+    """
+    Queue a PDF report: POST {"report": "po_grn", "params": {"transaction_id": "GRN-000123"}}
+
+    Returns the job (202 when queued, 200 when an identical job is shared).
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST method allowed'}, status=405)
+
+    current_zid = request.session.get('current_zid')
+    if not current_zid:
+        return JsonResponse({'error': 'No business context found'}, status=400)
+
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON data'}, status=400)
+
+    report = data.get('report')
+    params = data.get('params') or {}
+    if report not in REPORTS:
+        return JsonResponse({'error': f'Unknown report: {report}', 'reports': sorted(REPORTS)}, status=400)
+    missing = [name for name in REPORTS[report]['params'] if not params.get(name)]
+    if missing:
+        return JsonResponse({'error': f"Missing parameters: {', '.join(missing)}"}, status=400)
+
+    job, created = submit_report(current_zid, report, params, requested_by=request.user.get_username())
+    return JsonResponse(_job_json(job), status=202 if created else 200)
+
+
+@login_required
+def report_job_status_api(request, job_id):
+    """Current status of a report job; includes download_url once it is done"""
+    job = _job_for_session(request, job_id)
+    if job is None:
+        return _not_found()
+    return JsonResponse(_job_json(job))
+
+
+@login_required
+def report_job_page(request, job_id):
+    """Waiting page opened by the print buttons; goes to the PDF when it is ready"""
+    job = _job_for_session(request, job_id)
+    if job is None:
+        return _not_found()
+    if job.status == ReportJob.DONE:
+        return redirect('report-job-download', job_id=job.id)
+    return render(request, 'report_job.html', {'job': job, 'status_url': reverse('report-job-status-api', args=[job.id])})
+
+
+@login_required
+def report_job_download(request, job_id):
+    """The rendered PDF, inline"""
+    job = _job_for_session(request, job_id)
+    if job is None:
+        return _not_found()
+    if job.status != ReportJob.DONE:
+        return JsonResponse({'error': f'Report is {job.status}'}, status=409)
+    if job.expires_at and job.expires_at <= timezone.now():
+        return JsonResponse({'error': 'Report has expired; print it again'}, status=410)
+
+    try:
+        report_file = open(report_root() / job.file_path, 'rb')
+    except FileNotFoundError:
+        logger.error(f"Report file missing for job {job.id}: {job.file_path}")
+        return JsonResponse({'error': 'Report file is no longer available; print it again'}, status=410)
+    return FileResponse(report_file, filename=job.filename, content_type='application/pdf')
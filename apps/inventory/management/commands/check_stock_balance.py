@@ -0,0 +1,41 @@
+"""
+Management command to verify stock_balance against imtrn
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.utils.inventory_posting import find_stock_balance_mismatches
+
+
+class Command(BaseCommand):
+    help = 'Report items whose stock_balance differs from SUM(xqty * xsign) over imtrn'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--zid',
+            type=int,
+            help='Only check balances for this business',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=100,
+            help='Maximum number of mismatches to list (default: 100)',
+        )
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            mismatches = find_stock_balance_mismatches(cursor, options.get('zid'), options['limit'])
+
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS('stock_balance is consistent with imtrn.'))
+            return
+
+        for row in mismatches:
+            self.stdout.write(
+                f"  {row['zid']} {row['xitem']} @ '{row['xwh']}': "
+                f"balance={row['balance_qty']} imtrn={row['imtrn_qty']}"
+            )
+        raise CommandError(
+            f"{len(mismatches)} stock_balance mismatches found; run rebuild_stock_balance to repair."
+        )
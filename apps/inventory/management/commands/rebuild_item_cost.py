@@ -0,0 +1,28 @@
+"""
+Management command to rebuild the item_cost table from imtrn
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.utils.inventory_posting import rebuild_item_cost
+
+
+class Command(BaseCommand):
+    help = 'Recompute item_cost (running quantity, value and average price per zid/item) from the imtrn history'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--zid',
+            type=int,
+            help='Only rebuild costs for this business',
+        )
+
+    def handle(self, *args, **options):
+        zid = options.get('zid')
+        self.stdout.write(f"Rebuilding item_cost for {'zid ' + str(zid) if zid else 'all businesses'}...")
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                written = rebuild_item_cost(cursor, zid)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} item cost rows.'))
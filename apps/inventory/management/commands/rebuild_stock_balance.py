@@ -0,0 +1,28 @@
+"""
+Management command to rebuild the stock_balance table from imtrn
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.utils.inventory_posting import rebuild_stock_balance
+
+
+class Command(BaseCommand):
+    help = 'Recompute stock_balance (stock on hand per zid/item/warehouse) from the imtrn history'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--zid',
+            type=int,
+            help='Only rebuild balances for this business',
+        )
+
+    def handle(self, *args, **options):
+        zid = options.get('zid')
+        self.stdout.write(f"Rebuilding stock_balance for {'zid ' + str(zid) if zid else 'all businesses'}...")
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                written = rebuild_stock_balance(cursor, zid)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} stock balance rows.'))
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('zid', models.IntegerField(verbose_name='Business ID')),
+                ('xitem', models.CharField(max_length=100, verbose_name='Item Code')),
+                ('xwh', models.CharField(max_length=100, verbose_name='Warehouse')),
+                ('xqty', models.DecimalField(decimal_places=3, default=0, max_digits=18, verbose_name='Quantity On Hand')),
+                ('zutime', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Stock Balance',
+                'verbose_name_plural': 'Stock Balances',
+                'db_table': 'stock_balance',
+                'unique_together': {('zid', 'xitem', 'xwh')},
+            },
+        ),
+    ]
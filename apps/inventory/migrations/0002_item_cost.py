@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0001_stock_balance'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ItemCost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('zid', models.IntegerField(verbose_name='Business ID')),
+                ('xitem', models.CharField(max_length=100, verbose_name='Item Code')),
+                ('xqty', models.DecimalField(decimal_places=3, default=0, max_digits=18, verbose_name='Quantity')),
+                ('xval', models.DecimalField(decimal_places=6, default=0, max_digits=20, verbose_name='Value')),
+                ('xavg', models.DecimalField(decimal_places=6, default=0, max_digits=20, verbose_name='Average Price')),
+                ('xdatelast', models.DateField(blank=True, null=True, verbose_name='Last Posting Date')),
+                ('zutime', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Item Cost',
+                'verbose_name_plural': 'Item Costs',
+                'db_table': 'item_cost',
+                'unique_together': {('zid', 'xitem')},
+            },
+        ),
+    ]
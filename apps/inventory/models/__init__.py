@@ -0,0 +1,7 @@
+from .stock_balance import StockBalance
+from .item_cost import ItemCost
+
+__all__ = [
+    'StockBalance',
+    'ItemCost'
+]
@@ -0,0 +1,29 @@
+from django.db import models
+
+
+class ItemCost(models.Model):
+    """
+    Running inventory valuation per business and item.
+
+    xqty and xval are SUM(xqty * xsign) and SUM(xval * xsign) over the item's
+    imtrn rows, so they are exact whatever order postings arrive in. xdatelast
+    is the latest xdate seen; average price lookups for an earlier date fall
+    back to aggregating imtrn (see apps.utils.average_price_calculation).
+    Rebuild with `manage.py rebuild_item_cost`.
+    """
+    zid = models.IntegerField(verbose_name='Business ID')
+    xitem = models.CharField(max_length=100, verbose_name='Item Code')
+    xqty = models.DecimalField(max_digits=18, decimal_places=3, default=0, verbose_name='Quantity')
+    xval = models.DecimalField(max_digits=20, decimal_places=6, default=0, verbose_name='Value')
+    xavg = models.DecimalField(max_digits=20, decimal_places=6, default=0, verbose_name='Average Price')
+    xdatelast = models.DateField(blank=True, null=True, verbose_name='Last Posting Date')
+    zutime = models.DateTimeField(auto_now=True)  # Update Time
+
+    class Meta:
+        db_table = 'item_cost'
+        unique_together = (('zid', 'xitem'),)
+        verbose_name = 'Item Cost'
+        verbose_name_plural = 'Item Costs'
+
+    def __str__(self):
+        return f"{self.xitem}: {self.xqty} @ {self.xavg}"
@@ -0,0 +1,25 @@
+from django.db import models
+
+
+class StockBalance(models.Model):
+    """
+    Stock on hand per business, item and warehouse.
+
+    Equals SUM(xqty * xsign) over the matching imtrn rows. Maintained by
+    apps.utils.inventory_posting in the same transaction as every imtrn
+    insert/delete; rebuild with `manage.py rebuild_stock_balance`.
+    """
+    zid = models.IntegerField(verbose_name='Business ID')
+    xitem = models.CharField(max_length=100, verbose_name='Item Code')
+    xwh = models.CharField(max_length=100, verbose_name='Warehouse')  # '' when imtrn.xwh is NULL
+    xqty = models.DecimalField(max_digits=18, decimal_places=3, default=0, verbose_name='Quantity On Hand')
+    zutime = models.DateTimeField(auto_now=True)  # Update Time
+
+    class Meta:
+        db_table = 'stock_balance'
+        unique_together = (('zid', 'xitem', 'xwh'),)
+        verbose_name = 'Stock Balance'
+        verbose_name_plural = 'Stock Balances'
+
+    def __str__(self):
+        return f"{self.xitem} @ {self.xwh}: {self.xqty}"
@@ -0,0 +1,87 @@
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+from django.test import SimpleTestCase
+
+from datetime import date
+
+from apps.sales.views.edit_sales_api import update_transaction_items
+from apps.utils.inventory_posting import apply_cost_deltas, apply_stock_deltas, delete_imtrn, lock_stock, post_imtrn
+
+
+class CursorStub:
+    def __init__(self, deleted_rows=None):
+        self.deleted_rows = deleted_rows or []
+        self.executed = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+    def fetchall(self):
+        return self.deleted_rows
+
+
+class InventoryPostingTests(SimpleTestCase):
+    def test_post_updates_balance_once_per_key(self):
+        cursor = CursorStub()
+        rows = [
+            {'zid': 100001, 'ximtrnnum': 'IS--000001', 'xitem': 'A', 'xwh': 'WH1', 'xqty': '2.000', 'xsign': '-1'},
+            {'zid': 100001, 'ximtrnnum': 'IS--000002', 'xitem': 'A', 'xwh': 'WH1', 'xqty': '3.000', 'xsign': '-1'},
+            {'zid': 100001, 'ximtrnnum': 'IS--000003', 'xitem': 'B', 'xwh': 'WH1', 'xqty': '1.000', 'xsign': '-1'},
+        ]
+        self.assertEqual(post_imtrn(cursor, rows), 3)
+
+        # One multi-row imtrn insert, one stock_balance upsert, one item_cost upsert
+        self.assertEqual(len(cursor.executed), 3)
+        insert_sql, insert_params = cursor.executed[0]
+        self.assertIn('INSERT INTO imtrn', insert_sql)
+        self.assertEqual(len(insert_params), 3 * len(rows[0]))
+
+        balance_sql, params = cursor.executed[-2]
+        self.assertIn('INSERT INTO stock_balance', balance_sql)
+        self.assertEqual(params, [100001, 'A', 'WH1', Decimal('-5.000'), 100001, 'B', 'WH1', Decimal('-1.000')])
+
+    def test_delete_reverses_balance(self):
+        cursor = CursorStub(deleted_rows=[(100001, 'A', None, Decimal('4.000'), Decimal('40.000000'), 1)])
+        self.assertEqual(delete_imtrn(cursor, 'zid = %s AND xdocnum = %s', [100001, 'GRN-000001']), 1)
+
+        balance_sql, params = cursor.executed[-2]
+        self.assertEqual(params, [100001, 'A', '', Decimal('-4.000')])
+        cost_sql, params = cursor.executed[-1]
+        self.assertIn('INSERT INTO item_cost', cost_sql)
+        self.assertEqual(params[2:4], [Decimal('-4.000'), Decimal('-40.000000')])
+
+    def test_cost_delta_keeps_latest_date(self):
+        cursor = CursorStub()
+        apply_cost_deltas(cursor, [
+            (100001, 'A', Decimal('2'), Decimal('20'), '2026-10-18'),
+            (100001, 'A', Decimal('2'), Decimal('30'), date(2026, 9, 1)),
+        ])
+        cost_sql, params = cursor.executed[-1]
+        self.assertEqual(params, [100001, 'A', Decimal('4'), Decimal('50'), Decimal('12.5'), date(2026, 10, 18)])
+
+    def test_zero_net_movement_skips_balance_write(self):
+        cursor = CursorStub()
+        apply_stock_deltas(cursor, [(100001, 'A', 'WH1', Decimal('2')), (100001, 'A', 'WH1', Decimal('-2'))])
+        self.assertEqual(cursor.executed, [])
+
+    def test_lock_stock_locks_one_warehouse_in_item_order(self):
+        cursor = CursorStub(deleted_rows=[('A', Decimal('5.000'))])
+        stock = lock_stock(cursor, '100001', 'WH1', ['C', 'A', 'C'])
+
+        lock_sql, params = cursor.executed[0]
+        self.assertIn('ORDER BY xitem COLLATE "C"', lock_sql)
+        self.assertIn('FOR UPDATE', lock_sql)
+        self.assertEqual(params, [100001, 'WH1', 'A', 'C'])
+        self.assertEqual(stock, {'A': 5.0, 'C': 0.0})
+
+    def test_sale_edit_numbers_lines_before_locking_stock(self):
+        calls = []
+        with patch('apps.sales.views.edit_sales_api.connection', MagicMock()), \
+                patch('apps.sales.views.edit_sales_api.reserve_voucher_numbers',
+                      side_effect=lambda *args: calls.append('reserve') or ['IS--000001']), \
+                patch('apps.sales.views.edit_sales_api.delete_imtrn',
+                      side_effect=lambda *args: calls.append('delete_imtrn') or 0):
+            update_transaction_items(100001, 'CO--000001', [{'xitem': 'A', 'xqtyord': 1, 'xrate': 10}])
+
+        # Same order as a POS sale: voucher counter first, then stock rows
+        self.assertEqual(calls, ['reserve', 'delete_imtrn'])
@@ -7,6 +7,7 @@
 from web_project import TemplateLayout
 from apps.authentication.mixins import ZidRequiredMixin
 from apps.authentication.mixins import ModulePermissionMixin
+from apps.utils import row_counts
 from apps.utils.voucher_generator import generate_voucher_number
 from django.db import transaction, connection
 
@@ -75,6 +76,7 @@ def save_receive_entry(request):
                     request.POST.get('xdateinv'),
                     'Open'  # xstatustrn
                 ])
+                row_counts.bump('imtemptrn', current_zid, 1, tag=prefix)
 
                 logger.info(f"Voucher {voucher_number} inserted into imtemptrn table by {request.user.username} successfully")
 
@@ -1,22 +1,19 @@
 from django.http import HttpResponse
 from django.db import connection
-from django.template.loader import render_to_string
 from django.contrib.auth.decorators import login_required
-from xhtml2pdf import pisa
-from io import BytesIO
 from datetime import datetime
+
+from apps.utils.report_jobs import submit_and_wait
+
+
 def _fmt_date(d):
     try:
         return d.strftime('%d-%b-%Y') if d else ''
     except Exception:
         return str(d) if d else ''
 
-@login_required
-def po_grn_print(request, transaction_id):
-    zid = request.session.get('current_zid')
-    if not zid:
-        return HttpResponse("Session ZID not found", status=400)
-
+def po_grn_context(zid, transaction_id):
+    """Template context for the GRN print, or None if the GRN does not exist"""
     business_sql = """
         SELECT name, address, mobile, website
         FROM authentication_business
@@ -80,7 +77,7 @@ def po_grn_print(request, transaction_id):
         cursor.execute(header_sql, [zid, transaction_id])
         hr = cursor.fetchone()
         if not hr:
-            return HttpResponse(f"GRN not found: {transaction_id}", status=404)
+            return None
 
         header = {
             'xgrnnum': hr[0] or '',
@@ -125,7 +122,7 @@ def po_grn_print(request, transaction_id):
             'grand_total': header['xtotamt']
         }
 
-    html = render_to_string('reports/po_grn_print.html', {
+    return {
         'header': header,
         'line_items': line_items,
         'totals': totals,
@@ -133,12 +130,14 @@ def po_grn_print(request, transaction_id):
         'print_date': datetime.now().strftime('%d-%b-%Y'),
         'current_year': datetime.now().year,
         'transaction_id': transaction_id
-    })
+    }
+
+
+@login_required
+def po_grn_print(request, transaction_id):
+    zid = request.session.get('current_zid')
+    if not zid:
+        return HttpResponse("Session ZID not found", status=400)
 
-    result = BytesIO()
-    pdf = pisa.pisaDocument(BytesIO(html.encode('UTF-8')), result)
-    if pdf.err:
-        return HttpResponse('Error generating PDF', status=500)
-    response = HttpResponse(result.getvalue(), content_type='application/pdf')
-    response['Content-Disposition'] = f'inline; filename="GRN_{transaction_id}.pdf"'
-    return response
+    # Rendered by a Celery worker; the page waits for it and then shows the PDF
+    return submit_and_wait(request, 'po_grn', {'transaction_id': transaction_id})
@@ -1,25 +1,18 @@
 
 from django.http import HttpResponse
 from django.db import connection
-from django.template.loader import render_to_string
 from django.contrib.auth.decorators import login_required
-from xhtml2pdf import pisa
-from io import BytesIO
 from datetime import datetime
 import logging
 
-logger = logging.getLogger(__name__)
-
+from apps.utils.report_jobs import submit_and_wait
 
+logger = logging.getLogger(__name__)
 
-@login_required
-def po_req_print(request, transaction_id):
-    # Get current ZID from session
-    session_zid = request.session.get('current_zid')
 
-    if not session_zid:
-        return HttpResponse("Session ZID not found", status=400)
 
+def po_req_context(session_zid, transaction_id):
+    """Template context for the purchase requisition print, or None if the PO does not exist"""
     # SQL query to get purchase order data including preparer email (zemail)
     po_sql = """
         SELECT
@@ -57,8 +50,8 @@ def po_req_print(request, transaction_id):
         LEFT JOIN (
             SELECT
                 xitem,
-                SUM(xqty * xsign) AS prev_stock
-            FROM imtrn
+                SUM(xqty) AS prev_stock
+            FROM stock_balance
             WHERE zid = %s
             GROUP BY xitem
         ) AS stk
@@ -107,7 +100,7 @@ def po_req_print(request, transaction_id):
 
         if not rows:
             logger.error(f"Purchase Order not found: {transaction_id}")
-            return HttpResponse(f"Purchase Order not found: {transaction_id}", status=404)
+            return None
 
 
         # Process data
@@ -136,24 +129,22 @@ def po_req_print(request, transaction_id):
                 'previous_stock': row[10]
             })
 
-    # Render HTML template
-    html_string = render_to_string('reports/po_req_print.html', {
+    return {
         'header': header_data,
         'business': business_data,
         'line_items': line_items,
         'print_date': datetime.now().strftime('%d/%m/%y'),
         'current_year': datetime.now().year
-    })
-
-    # Generate PDF
-    result = BytesIO()
-    pdf = pisa.pisaDocument(BytesIO(html_string.encode("UTF-8")), result)
-
-    if not pdf.err:
-        logger.info(f"PDF generated successfully for PO {transaction_id}")
-        response = HttpResponse(result.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = f'inline; filename="PO_{transaction_id}.pdf"'
-        return response
-    else:
-        logger.error(f"Error generating PDF for PO {transaction_id}: {pdf.err}")
-        return HttpResponse('Error generating PDF', status=500)
+    }
+
+
+@login_required
+def po_req_print(request, transaction_id):
+    # Get current ZID from session
+    session_zid = request.session.get('current_zid')
+
+    if not session_zid:
+        return HttpResponse("Session ZID not found", status=400)
+
+    # Rendered by a Celery worker; the page waits for it and then shows the PDF
+    return submit_and_wait(request, 'po_req', {'transaction_id': transaction_id})
@@ -6,8 +6,9 @@
 from django.utils import timezone
 import re
 from decimal import Decimal
-from apps.utils.voucher_generator import generate_voucher_number, generate_sinv_voucher
-from apps.utils.average_price_calculation import get_average_price
+from apps.utils.voucher_generator import reserve_voucher_numbers, generate_sinv_voucher
+from apps.utils.average_price_calculation import receipt_line_values
+from apps.utils.inventory_posting import post_imtrn
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,7 +22,7 @@ def po_confirm(request, transaction_id: str):
     - Validate context and input
     - Lock GRN header; ensure it is open
     - Load GRN detail lines
-    - Compute average price per item via shared utility (fallback to line rate)
+    - Compute average price per line via shared utility (fallback to line rate)
     - Insert corresponding inventory receipt transactions
     - Update GRN header and detail statuses
     - Return JSON response
@@ -78,79 +79,70 @@ def po_confirm(request, transaction_id: str):
 
                 total_line_amount = Decimal('0.00')
                 ledger_rows = []
+                imtrn_rows = []
+
+                # Reserve inventory receipt voucher numbers for all lines at once, and the
+                # supplier invoice voucher, before post_imtrn locks any stock
+                im_vouchers = reserve_voucher_numbers(zid=zid, prefix='RE--', table='imtrn', column='ximtrnnum', count=len(items))
+                sinv_voucher = generate_sinv_voucher(zid=zid, prefix='SINV')
+
+                # Average price per line via shared utility (bounded to GRN date, fallback
+                # to the line rate); a repeated item sees the lines above it
+                line_values = receipt_line_values(
+                    zid,
+                    [(str(xitem), xqty or 0, xrate or 0) for xitem, xqty, xrate, _ in items],
+                    (xdate.strftime('%Y-%m-%d') if xdate else now_ts.strftime('%Y-%m-%d'))
+                )
 
                 for idx, (xitem, xqty, xrate, xlineamt) in enumerate(items, start=1):
                     # Quantity to receive
                     qty = Decimal(str(xqty or 0))
-                    # Average price via shared utility (bounded to GRN date)
-                    avg_price_float = get_average_price(
-                        zid,
-                        str(xitem),
-                        (xdate.strftime('%Y-%m-%d') if xdate else now_ts.strftime('%Y-%m-%d'))
-                    )
 
                     # Accumulate total line amount and collect ledger rows
                     line_amount = Decimal(str(xlineamt or 0)) if xlineamt is not None else (qty * Decimal(str(xrate or 0)))
                     total_line_amount += line_amount
                     ledger_rows.append((idx, line_amount))
-                    avg_price = Decimal(str(avg_price_float))
-                    # Fallback to GRN line rate when average price is zero
-                    if avg_price == Decimal('0'):
-                        avg_price = Decimal(str(xrate or 0))
                     # Extended value for this receipt line
-                    xval = (qty * avg_price).quantize(Decimal('0.000000'))
+                    _, xval = line_values[idx - 1]
 
-                    # Generate inventory receipt voucher number for imtrn
-                    im_voucher = generate_voucher_number(zid=zid, prefix='RE--', table='imtrn', column='ximtrnnum')
+                    # Inventory receipt voucher number for imtrn
+                    im_voucher = im_vouchers[idx - 1]
 
-                    # Post inventory receipt line into imtrn
-                    cursor.execute(
-                        """
-                        INSERT INTO imtrn (
-                            ztime, zid, ximtrnnum, xitem, xwh, xdate, xyear, xper,
-                            xqty, xval, xvalpost, xdoctype, xdocnum, xdocrow, xnote,
-                            xaltqty, xsec, xproj, xdateexp, xdaterec, xsup, xaction,
-                            xsign, xtime, zemail, xtrnim, xmember
-                        ) VALUES (
-                            %s, %s, %s, %s, %s, %s, %s, %s,
-                            %s, %s, %s, %s, %s, %s, %s,
-                            %s, %s, %s, %s, %s, %s, %s,
-                            %s, %s, %s, %s, %s
-                        )
-                        """,
-                        [
-                            now_ts,              # ztime
-                            zid,                 # zid
-                            im_voucher,          # ximtrnnum
-                            str(xitem),          # xitem
-                            str(xwh),            # xwh
-                            xdate,               # xdate
-                            str(year),           # xyear
-                            str(month),          # xper
-                            f"{float(qty):.3f}",  # xqty
-                            f"{float(xval):.6f}", # xval
-                            f"{float(xval):.6f}", # xvalpost
-                            '0027',              # xdoctype
-                            str(xgrnnum),        # xdocnum
-                            int(idx),            # xdocrow
-                            'Goods Received',    # xnote
-                            '0.000',             # xaltqty
-                            'Any',               # xsec
-                            str(xproj or ''),    # xproj
-                            xdate,               # xdateexp
-                            xdate,               # xdaterec
-                            str(xsup or ''),     # xsup
-                            'Receipt',           # xaction
-                            '1',                 # xsign
-                            now_ts,              # xtime
-                            session_user,        # zemail
-                            'RE--',              # xtrnim
-                            session_user,        # xmember
-                        ]
-                    )
+                    # Collect inventory receipt line for imtrn
+                    imtrn_rows.append({
+                        'ztime': now_ts,
+                        'zid': zid,
+                        'ximtrnnum': im_voucher,
+                        'xitem': str(xitem),
+                        'xwh': str(xwh),
+                        'xdate': xdate,
+                        'xyear': str(year),
+                        'xper': str(month),
+                        'xqty': f"{float(qty):.3f}",
+                        'xval': f"{float(xval):.6f}",
+                        'xvalpost': f"{float(xval):.6f}",
+                        'xdoctype': '0027',
+                        'xdocnum': str(xgrnnum),
+                        'xdocrow': int(idx),
+                        'xnote': 'Goods Received',
+                        'xaltqty': '0.000',
+                        'xsec': 'Any',
+                        'xproj': str(xproj or ''),
+                        'xdateexp': xdate,
+                        'xdaterec': xdate,
+                        'xsup': str(xsup or ''),
+                        'xaction': 'Receipt',
+                        'xsign': '1',
+                        'xtime': now_ts,
+                        'zemail': session_user,
+                        'xtrnim': 'RE--',
+                        'xmember': session_user,
+                    })
 
-                # Generate supplier invoice voucher and insert GL header (after IM postings)
-                sinv_voucher = generate_sinv_voucher(zid=zid, prefix='SINV')
+                # Post inventory receipt lines into imtrn and update stock_balance
+                post_imtrn(cursor, imtrn_rows)
+
+                # Insert the supplier invoice GL header (after IM postings)
                 xlong = f"**System generated Supplier Invoice** MRR Number: {xgrnnum}"
                 cursor.execute(
                     """
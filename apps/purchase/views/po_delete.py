@@ -2,6 +2,7 @@
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST
 from django.db import connection, transaction
+from apps.utils.inventory_posting import delete_imtrn
 import logging
 
 logger = logging.getLogger(__name__)
@@ -97,13 +98,7 @@ def po_delete(request, po_number: str):
 
                 if grn_numbers:
                     # Remove inventory movements generated by GRNs; uses GRN number as document id.
-                    cursor.execute(
-                        """
-                        DELETE FROM imtrn
-                        WHERE zid = %s AND xdocnum IN %s
-                        """,
-                        [zid, tuple(grn_numbers)],
-                    )
+                    delete_imtrn(cursor, "zid = %s AND xdocnum IN %s", [zid, tuple(grn_numbers)])
                     # Delete GRN detail lines prior to header to satisfy FK relationships.
                     cursor.execute(
                         """
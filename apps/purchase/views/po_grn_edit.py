@@ -9,6 +9,7 @@
 from django.utils import timezone
 from web_project import TemplateLayout
 from apps.authentication.mixins import ZidRequiredMixin, ModulePermissionMixin
+from apps.utils import document_cache
 
 
 class POGrnEditView(ZidRequiredMixin, ModulePermissionMixin, TemplateView):
@@ -267,5 +268,6 @@ def to_decimal(val, default=Decimal('0.00')):
             )
             row_num += 1
 
+    document_cache.invalidate(zid, 'po_grn', transaction_id)
     return JsonResponse({'success': True, 'message': 'GRN updated', 'grn': transaction_id})
 
@@ -0,0 +1,98 @@
+"""
+Management command to benchmark the day-end process on a synthetic day of sales
+"""
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.sales.views.day_end_process import (
+    aggregate_sales_data,
+    execute_day_end_process,
+    get_day_end_accounts,
+    BANK_ACCOUNTS,
+)
+from apps.utils.bulk_insert import insert_rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the day-end process against a synthetic day of POS orders. The orders are loaded '
+        'into a temporary table that shadows opordnview for this session only, and the whole '
+        'run is rolled back, so no data is kept.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--zid', type=int, required=True, help='Business to post the voucher for')
+        parser.add_argument('--orders', type=int, default=5000, help='Orders on the synthetic day (default: 5000)')
+        parser.add_argument('--date', default='2099-12-31', help='Synthetic posting date (default: 2099-12-31)')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for the synthetic orders (default: 1)')
+
+    def handle(self, *args, **options):
+        zid = options['zid']
+        xdate = options['date']
+
+        with transaction.atomic():
+            self._load_synthetic_day(zid, xdate, options['orders'], options['seed'])
+
+            started = time.perf_counter()
+            with CaptureQueriesContext(connection) as queries:
+                aggregate_sales_data(zid, xdate)
+            self._report('aggregate_sales_data', started, queries)
+
+            started = time.perf_counter()
+            with CaptureQueriesContext(connection) as queries:
+                get_day_end_accounts(zid)
+            self._report('get_day_end_accounts', started, queries)
+
+            started = time.perf_counter()
+            with CaptureQueriesContext(connection) as queries:
+                result = execute_day_end_process(zid, xdate, 'benchmark')
+            self._report('execute_day_end_process', started, queries)
+
+            transaction.set_rollback(True)
+
+        if not result['success']:
+            raise CommandError(result['message'])
+        self.stdout.write(self.style.SUCCESS(f"Benchmark complete, voucher {result['voucher']} rolled back."))
+
+    def _load_synthetic_day(self, zid, xdate, orders, seed):
+        """Create a temporary opordnview with the given number of orders"""
+        rng = random.Random(seed)
+        banks = sorted(BANK_ACCOUNTS)
+        rows = []
+        for _ in range(orders):
+            amount = Decimal(rng.randint(100, 50000)) / 100
+            discount = Decimal(rng.choice([0, 0, 0, rng.randint(1, 500)])) / 100
+            card = rng.random() < 0.3
+            rows.append({
+                'zid': zid,
+                'xdate': xdate,
+                'xsltype': 'Card Sale' if card else 'Cash Sale',
+                'xsalescat': rng.choice(banks) if card else '',
+                'xtotamt': amount,
+                'xlineamt': Decimal('0') if card else amount,
+                'xdtcomm': amount if card else Decimal('0'),
+                'xdtdisc': discount,
+                'xdiscf': Decimal('0'),
+            })
+
+        with connection.cursor() as cursor:
+            # Temporary tables are resolved before permanent relations of the same name
+            cursor.execute("""
+                CREATE TEMP TABLE opordnview (
+                    zid INTEGER, xdate DATE, xsltype VARCHAR(50), xsalescat VARCHAR(50),
+                    xtotamt NUMERIC(20, 2), xlineamt NUMERIC(20, 2), xdtcomm NUMERIC(20, 2),
+                    xdtdisc NUMERIC(20, 2), xdiscf NUMERIC(20, 2)
+                ) ON COMMIT DROP
+            """)
+            insert_rows(cursor, 'opordnview', rows)
+            cursor.execute("ANALYZE opordnview")
+        self.stdout.write(f'Loaded {orders} synthetic orders for zid={zid} on {xdate}')
+
+    def _report(self, label, started, queries):
+        elapsed = (time.perf_counter() - started) * 1000
+        self.stdout.write(f'{label:<26} {elapsed:>9.1f} ms {len(queries.captured_queries):>4} queries')
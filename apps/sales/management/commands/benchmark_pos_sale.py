@@ -0,0 +1,136 @@
+"""
+Management command to benchmark pos_complete_sale at different basket sizes
+"""
+import json
+import statistics
+import time
+from itertools import cycle, islice
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from apps.sales.views.pos_sales import pos_complete_sale
+
+
+class Command(BaseCommand):
+    help = (
+        'Time pos_complete_sale for baskets of 1, 10, 50 and 200 lines against the configured database. '
+        'Every sale runs inside a transaction that is rolled back, so no data is kept.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--zid', type=int, required=True, help='Business to sell from')
+        parser.add_argument('--sizes', default='1,10,50,200', help='Comma-separated basket sizes (default: 1,10,50,200)')
+        parser.add_argument('--repeat', type=int, default=5, help='Sales per basket size (default: 5)')
+        parser.add_argument('--warehouse', help='Warehouse to sell from (default: the one with most stocked items)')
+        parser.add_argument('--username', help='User to run the sales as (default: first superuser)')
+
+    def handle(self, *args, **options):
+        zid = options['zid']
+        sizes = [int(size) for size in options['sizes'].split(',') if size.strip()]
+        repeat = options['repeat']
+
+        user = (
+            User.objects.filter(username=options['username']).first() if options['username']
+            else User.objects.filter(is_superuser=True).first()
+        )
+        if not user:
+            raise CommandError('No user found to run the benchmark as; pass --username')
+
+        warehouse = options['warehouse'] or self._busiest_warehouse(zid, repeat)
+        catalog = self._stocked_items(zid, warehouse, repeat, max(sizes))
+        if not catalog:
+            raise CommandError(f'No items with stock in warehouse {warehouse!r} for zid {zid}')
+
+        self.stdout.write(f'zid={zid} warehouse={warehouse!r} items available={len(catalog)} repeat={repeat}')
+        self.stdout.write(f"{'lines':>6} {'median ms':>10} {'max ms':>10} {'queries':>8}")
+
+        factory = RequestFactory()
+        for size in sizes:
+            timings = []
+            query_counts = []
+            for _ in range(repeat):
+                payload = self._payload(list(islice(cycle(catalog), size)), warehouse)
+                request = factory.post('/sales/api/pos/complete-sale/', data=json.dumps(payload),
+                                       content_type='application/json')
+                request.user = user
+                request.session = {'current_zid': zid, 'username': user.username}
+
+                with transaction.atomic():
+                    with CaptureQueriesContext(connection) as queries:
+                        started = time.perf_counter()
+                        response = pos_complete_sale(request)
+                        elapsed = (time.perf_counter() - started) * 1000
+                    transaction.set_rollback(True)
+
+                result = json.loads(response.content)
+                if response.status_code != 200 or not result.get('success'):
+                    raise CommandError(f'Sale with {size} lines failed: {result}')
+
+                timings.append(elapsed)
+                query_counts.append(len(queries.captured_queries))
+
+            self.stdout.write(
+                f'{size:>6} {statistics.median(timings):>10.1f} {max(timings):>10.1f} {max(query_counts):>8}'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Benchmark complete (all sales rolled back).'))
+
+    def _busiest_warehouse(self, zid, min_qty):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT xwh FROM stock_balance
+                WHERE zid = %s AND xqty >= %s
+                GROUP BY xwh
+                ORDER BY COUNT(*) DESC
+                LIMIT 1
+                """,
+                [zid, min_qty]
+            )
+            row = cursor.fetchone()
+        if not row:
+            raise CommandError(f'No stocked warehouse found for zid {zid}')
+        return row[0]
+
+    def _stocked_items(self, zid, warehouse, min_qty, limit):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT c.xitem, c.xdesc, c.xstdprice, c.xstdcost, c.xunitstk
+                FROM stock_balance b
+                JOIN caitem c ON c.zid = b.zid AND c.xitem = b.xitem
+                WHERE b.zid = %s AND b.xwh = %s AND b.xqty >= %s
+                ORDER BY b.xqty DESC
+                LIMIT %s
+                """,
+                [zid, warehouse, min_qty, limit]
+            )
+            return cursor.fetchall()
+
+    def _payload(self, lines, warehouse):
+        items = []
+        for xitem, xdesc, xstdprice, xstdcost, xunitstk in lines:
+            price = float(xstdprice or 0)
+            items.append({
+                'xitem': xitem,
+                'xdesc': xdesc or '',
+                'quantity': 1,
+                'xstdprice': price,
+                'total': price,
+                'item_vat': 0,
+                'item_cost': float(xstdcost or 0),
+                'xunitstk': xunitstk or 'Pcs',
+            })
+        grand_total = sum(item['total'] for item in items)
+        return {
+            'items': items,
+            'payment_method': 'cash',
+            'cash_amount': grand_total,
+            'totals': {'subtotal': grand_total, 'tax_amount': 0, 'grand_total': grand_total},
+            'discounts': {},
+            'header_info': {'warehouse': warehouse, 'customer_name': 'CUS-000001'},
+        }
@@ -0,0 +1,184 @@
+"""
+Management command to load-test POS checkout with concurrent counters
+"""
+import json
+import threading
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.utils.pos_load import (
+    CheckoutCounter, ContentionSampler, RunStats, STEPS,
+    build_report, database_deadlocks, duplicate_vouchers,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Simulate concurrent POS counters (search -> add -> checkout) against a running server '
+        'and report checkout throughput, p50/p95/p99 latency per step, deadlocks, duplicate '
+        'voucher numbers and where the database backends wait. Run it with the same settings '
+        'as the server so it can read the database. Sales are committed: use a seeded copy, '
+        'never production.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--zid', type=int, required=True, help='Business to sell from')
+        parser.add_argument('--username', required=True, help='User the counters log in as')
+        parser.add_argument('--password', required=True, help='Password for --username')
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Server to load (default: http://127.0.0.1:8000)')
+        parser.add_argument('--counters', type=int, nargs='+', default=[10, 25, 50],
+                            help='Concurrent counters; several values run one step each (default: 10 25 50)')
+        parser.add_argument('--duration', type=int, default=60, help='Seconds per step (default: 60)')
+        parser.add_argument('--warehouse', help='Warehouse to sell from (default: the one with most stocked items)')
+        parser.add_argument('--think-ms', type=int, default=0, help='Pause between sales per counter (default: 0)')
+        parser.add_argument('--seed', type=int, default=1, help='Seed for baskets and search terms (default: 1)')
+        parser.add_argument('--report', help='Write the JSON report to this file')
+        parser.add_argument('--label', default='', help='Release or build label stored in the report')
+
+    def handle(self, *args, **options):
+        zid = options['zid']
+        warehouse = options['warehouse'] or self._busiest_warehouse(zid)
+        terms = self._search_terms(zid, warehouse)
+        if not terms:
+            raise CommandError(f'No stocked items in warehouse {warehouse!r} for zid {zid}')
+
+        credentials = {'username': options['username'], 'password': options['password'], 'zid': zid}
+        self.stdout.write(
+            f"zid={zid} warehouse={warehouse!r} server={options['base_url']} "
+            f"search terms={len(terms)} {options['duration']}s per step"
+        )
+
+        runs = []
+        for counters in options['counters']:
+            run = self._run_step(counters, credentials, terms, warehouse, options)
+            runs.append(run)
+            self._print_run(run)
+
+        if options['report']:
+            with open(options['report'], 'w', encoding='utf-8') as report_file:
+                json.dump(build_report(runs, zid, options['base_url'], label=options['label']), report_file, indent=2, default=str)
+            self.stdout.write(f"Report written to {options['report']}")
+
+        if any(run['duplicate_vouchers']['opord'] or run['duplicate_vouchers']['imtrn'] for run in runs):
+            raise CommandError('Duplicate voucher numbers were issued under load')
+
+    def _run_step(self, counters, credentials, terms, warehouse, options):
+        stats = RunStats()
+        window = {}
+
+        def start_clock():
+            # Runs once, in the last thread to reach the barrier, before any is released
+            window['start'] = time.monotonic()
+            window['end'] = window['start'] + options['duration']
+
+        # Every counter logs in first; the clock starts once all are ready
+        gate = threading.Barrier(counters + 1, action=start_clock)
+        workers = [
+            CheckoutCounter(
+                number, options['base_url'], credentials, terms, warehouse, stats,
+                deadline=lambda: window['end'], start_gate=gate,
+                seed=options['seed'], think_ms=options['think_ms'],
+            )
+            for number in range(1, counters + 1)
+        ]
+        deadlocks_before = database_deadlocks()
+        since = datetime.now()
+        for worker in workers:
+            worker.start()
+
+        gate.wait()
+        failed = [worker.failure for worker in workers if worker.failure]
+        if failed:
+            window['end'] = 0
+            raise CommandError(failed[0])
+
+        sampler = ContentionSampler()
+        sampler.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.monotonic() - window['start']
+        sampler.stop()
+
+        deadlocks_after = database_deadlocks()
+        run = stats.summary(elapsed)
+        run.update({
+            'counters': counters,
+            'dead_counters': [worker.failure for worker in workers if worker.failure],
+            'server_deadlocks': (
+                deadlocks_after - deadlocks_before if deadlocks_before is not None and deadlocks_after is not None else None
+            ),
+            'duplicate_vouchers': duplicate_vouchers(credentials['zid'], since),
+            'contention': sampler.summary(),
+        })
+        return run
+
+    def _print_run(self, run):
+        outcomes = run['outcomes']
+        self.stdout.write('')
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{run['counters']} counters: {run['sales']} sales in {run['elapsed_s']}s = "
+            f"{run['sales_per_s']} sales/s ({run['lines_per_s']} lines/s)"
+        ))
+        self.stdout.write(f"{'step':<10} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for step in STEPS:
+            row = run['steps'][step]
+            self.stdout.write(
+                f"{step:<10} {row['count']:>7} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}"
+            )
+
+        problems = {
+            'deadlocks (responses)': outcomes.get('deadlock', 0),
+            'deadlocks (pg_stat_database)': run['server_deadlocks'],
+            'duplicate-voucher errors': outcomes.get('duplicate_voucher', 0),
+            'duplicate opord numbers': len(run['duplicate_vouchers']['opord']),
+            'duplicate imtrn numbers': len(run['duplicate_vouchers']['imtrn']),
+            'lock timeouts': outcomes.get('lock_timeout', 0),
+        }
+        for name, count in problems.items():
+            line = f'{name:<30} {count if count is not None else "n/a"}'
+            self.stdout.write(self.style.ERROR(line) if count else line)
+        self.stdout.write(f"{'stock rejections':<30} {outcomes.get('stock_rejected', 0)}")
+        self.stdout.write(f"{'other errors':<30} {outcomes.get('error', 0)}")
+        for message, count in run['top_errors']:
+            self.stdout.write(f'  {count:>5} x {message}')
+        if run['dead_counters']:
+            self.stdout.write(self.style.ERROR(f"{'counters stopped early':<30} {len(run['dead_counters'])}"))
+            for failure in run['dead_counters']:
+                self.stdout.write(f'  {failure}')
+
+        if run['contention']:
+            self.stdout.write('Busy backends by area and wait event (avg backends per sample):')
+            for entry in run['contention']:
+                self.stdout.write(f"  {entry['area']:<18} {entry['wait']:<28} {entry['avg_backends']:>6.2f}")
+
+    def _busiest_warehouse(self, zid):
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT xwh FROM stock_balance
+                WHERE zid = %s AND xqty >= 1
+                GROUP BY xwh
+                ORDER BY COUNT(*) DESC
+                LIMIT 1
+            """, [zid])
+            row = cursor.fetchone()
+        if not row:
+            raise CommandError(f'No stocked warehouse found for zid {zid}')
+        return row[0]
+
+    def _search_terms(self, zid, warehouse, limit=200):
+        """Words from stocked items' descriptions, the way a cashier would type them"""
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT c.xdesc
+                FROM stock_balance b
+                JOIN caitem c ON c.zid = b.zid AND c.xitem = b.xitem
+                WHERE b.zid = %s AND b.xwh = %s AND b.xqty >= 1 AND c.xdesc IS NOT NULL
+                ORDER BY b.xqty DESC
+                LIMIT %s
+            """, [zid, warehouse, limit])
+            descriptions = [row[0] for row in cursor.fetchall()]
+        terms = {word.lower() for xdesc in descriptions for word in xdesc.split() if len(word) >= 3 and word.isalnum()}
+        return sorted(terms)
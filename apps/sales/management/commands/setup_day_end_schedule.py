@@ -0,0 +1,48 @@
+"""
+Management command to schedule the nightly day-end process with django_celery_beat
+"""
+import json
+
+from django.core.management.base import BaseCommand
+from django_celery_beat.models import CrontabSchedule, PeriodicTask
+
+
+class Command(BaseCommand):
+    help = 'Create or update the nightly day-end Celery beat task for a business'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--zid', type=int, required=True, help='Business to run day end for')
+        parser.add_argument('--hour', type=int, default=1, help='Hour to run at, server time zone (default: 1)')
+        parser.add_argument('--minute', type=int, default=0, help='Minute to run at (default: 0)')
+        parser.add_argument('--user', default='system', help='Recorded as xmember on the vouchers (default: system)')
+        parser.add_argument('--disable', action='store_true', help='Disable the schedule instead of enabling it')
+
+    def handle(self, *args, **options):
+        zid = options['zid']
+        name = f'Day end process {zid}'
+
+        if options['disable']:
+            updated = PeriodicTask.objects.filter(name=name).update(enabled=False)
+            self.stdout.write(self.style.SUCCESS(f'Disabled {updated} schedule(s) for zid {zid}.'))
+            return
+
+        schedule, _ = CrontabSchedule.objects.get_or_create(
+            minute=str(options['minute']),
+            hour=str(options['hour']),
+            day_of_week='*',
+            day_of_month='*',
+            month_of_year='*',
+        )
+        task, created = PeriodicTask.objects.update_or_create(
+            name=name,
+            defaults={
+                'task': 'apps.sales.tasks.day_end_nightly',
+                'crontab': schedule,
+                'args': json.dumps([zid, options['user']]),
+                'enabled': True,
+            },
+        )
+        action = 'Created' if created else 'Updated'
+        self.stdout.write(self.style.SUCCESS(
+            f"{action} '{task.name}' at {options['hour']:02d}:{options['minute']:02d} daily."
+        ))
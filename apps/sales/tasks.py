@@ -0,0 +1,142 @@
+"""
+Celery tasks for the sales app
+"""
+from datetime import date, datetime, timedelta
+import logging
+
+from celery import shared_task
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from apps.sales.views.day_end_process import check_duplicate_processing, execute_day_end_process
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_LOCK_KEY = 'day_end_backfill_lock:{zid}'
+BACKFILL_LOCK_SECONDS = 6 * 60 * 60
+# Business that queued a backfill, so only it can read the task's progress
+BACKFILL_OWNER_KEY = 'day_end_backfill_owner:{task_id}'
+BACKFILL_OWNER_SECONDS = 24 * 60 * 60
+# Longest range the nightly task catches up in one run
+NIGHTLY_MAX_DAYS = 31
+
+
+def day_end_dates(start_date: str, end_date: str) -> list:
+    """Every date from start_date to end_date inclusive, as 'YYYY-MM-DD' strings"""
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+    if end < start:
+        raise ValueError(f'End date {end_date} is before start date {start_date}')
+    return [(start + timedelta(days=offset)).isoformat() for offset in range((end - start).days + 1)]
+
+
+def run_day_end_range(zid, start_date, end_date, session_user='system', owner='inline', on_progress=None):
+    """
+    Run the day-end process for every date in a range, oldest first
+
+    Dates that already have a day-end voucher (check_duplicate_processing) are
+    skipped, so a range can be re-run safely. Each date is posted in its own
+    transaction; the run stops at the first failure so vouchers stay in date
+    order. Only one range runs per business at a time.
+
+    Args:
+        zid: Zone/Company ID
+        start_date: First date to process ('YYYY-MM-DD')
+        end_date: Last date to process ('YYYY-MM-DD')
+        session_user: Recorded as xmember on the generated vouchers
+        owner: Stored in the per-business lock (the task id)
+        on_progress: Called with the progress dict before each date
+
+    Returns:
+        dict: {'total', 'done', 'processed', 'skipped', 'failed', 'current'}
+    """
+    dates = day_end_dates(start_date, end_date)
+    progress = {
+        'total': len(dates),
+        'done': 0,
+        'processed': [],
+        'skipped': [],
+        'failed': None,
+        'current': None,
+    }
+
+    lock_key = BACKFILL_LOCK_KEY.format(zid=zid)
+    if not cache.add(lock_key, owner, BACKFILL_LOCK_SECONDS):
+        raise RuntimeError(f'A day-end backfill is already running for zid {zid}')
+
+    try:
+        for xdate in dates:
+            progress['current'] = xdate
+            if on_progress is not None:
+                on_progress(progress)
+
+            duplicate_check = check_duplicate_processing(zid, xdate)
+            if duplicate_check['is_duplicate']:
+                progress['skipped'].append({'date': xdate, 'voucher': duplicate_check['voucher']})
+            else:
+                try:
+                    with transaction.atomic():
+                        result = execute_day_end_process(zid, xdate, session_user)
+                except Exception as e:
+                    logger.error(f"Day-end backfill failed for zid={zid}, xdate={xdate}: {str(e)}")
+                    progress['failed'] = {'date': xdate, 'message': str(e)}
+                    break
+
+                if result['success']:
+                    progress['processed'].append({'date': xdate, 'voucher': result['voucher']})
+                else:
+                    progress['skipped'].append({'date': xdate, 'message': result['message']})
+
+            progress['done'] += 1
+
+        progress['current'] = None
+        logger.info(
+            f"Day-end backfill for zid={zid} {start_date}..{end_date}: "
+            f"{len(progress['processed'])} processed, {len(progress['skipped'])} skipped, "
+            f"failed={progress['failed']}"
+        )
+        return progress
+    finally:
+        cache.delete(lock_key)
+
+
+@shared_task(bind=True)
+def day_end_backfill(self, zid, start_date, end_date, session_user='system'):
+    """
+    Celery task running run_day_end_range; progress is published as task
+    state PROGRESS with the same meta the final result has
+    """
+    def publish(progress):
+        if not self.request.is_eager:
+            self.update_state(state='PROGRESS', meta=progress)
+
+    return run_day_end_range(zid, start_date, end_date, session_user, self.request.id or 'eager', publish)
+
+
+@shared_task
+def day_end_nightly(zid, session_user='system'):
+    """
+    Catch the day-end process up to yesterday
+
+    Starts the day after the latest system-generated SALE voucher (at most
+    NIGHTLY_MAX_DAYS back) and runs the range in this task (run_day_end_range;
+    a task must not wait on another task's result). Schedule it with the
+    setup_day_end_schedule management command.
+    """
+    yesterday = date.today() - timedelta(days=1)
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT MAX(xdate) FROM glheader
+            WHERE zid = %s AND xtrngl = 'SALE' AND xref LIKE '***System generated Sales voucher on %%'
+        """, [zid])
+        last_processed = cursor.fetchone()[0]
+    if isinstance(last_processed, datetime):
+        last_processed = last_processed.date()
+
+    start = yesterday - timedelta(days=NIGHTLY_MAX_DAYS - 1)
+    if last_processed is not None:
+        start = max(start, last_processed + timedelta(days=1))
+    if start > yesterday:
+        return {'total': 0, 'done': 0, 'processed': [], 'skipped': [], 'failed': None, 'current': None}
+
+    return run_day_end_range(zid, start.isoformat(), yesterday.isoformat(), session_user, owner='nightly')
@@ -0,0 +1,52 @@
+from datetime import date
+from decimal import Decimal
+from io import BytesIO
+from unittest.mock import patch
+
+import openpyxl
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+ROWS = [
+    (date(2025, 1, 1), 'CO--000001', 'CBL', Decimal('50.00'), Decimal('45.00'), Decimal('5.00'), Decimal('100.00')),
+    (date(2025, 1, 2), 'CO--000002', None, None, Decimal('20.00'), None, Decimal('20.00')),
+]
+
+
+class DailySalesReportExportTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('cashier', password='x'))
+        session = self.client.session
+        session['current_zid'] = 100001
+        session.save()
+
+    def export(self, report_type, to_date='2025-12-31'):
+        with patch('apps.sales.views.reports.daily_sales_report_export.iter_query', return_value=iter(ROWS)):
+            return self.client.get('/sales/reports/daily-sales-report-export/', {
+                'from_date': '2025-01-01', 'to_date': to_date, 'report_type': report_type,
+            })
+
+    def test_csv_streams_rows_and_running_totals(self):
+        response = self.export('csv')
+
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertIn('2025-01-01,CO--000001,CBL,50.0,45.0,5.0,100.0', lines)
+        self.assertIn('2025-01-02,CO--000002,,0.0,20.0,0.0,20.0', lines)
+        self.assertIn('Total Records:,2', lines)
+        self.assertIn('Grand Total:,120.0', lines)
+
+    def test_excel_uses_a_write_only_sheet(self):
+        response = self.export('excel')
+
+        sheet = openpyxl.load_workbook(BytesIO(b''.join(response.streaming_content))).active
+        values = list(sheet.iter_rows(values_only=True))
+        self.assertEqual(values[8][:3], ('Date', 'Order Number', 'Bank'))
+        self.assertEqual(values[9][6], 100.0)
+        self.assertEqual(values[-1][:2], ('Grand Total:', 120.0))
+        self.assertIn('A1:G1', {str(merged) for merged in sheet.merged_cells.ranges})
+
+    def test_long_pdf_ranges_are_refused_not_switched(self):
+        response = self.export('pdf')
+
+        self.assertRedirects(response, '/sales/reports/daily-sales-report/', fetch_redirect_response=False)
@@ -0,0 +1,100 @@
+import json
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from config.celery import app as celery_app
+from apps.sales.tasks import day_end_backfill, day_end_nightly
+from apps.sales.views.day_end_backfill import day_end_backfill_status, start_day_end_backfill
+
+
+class DayEndBackfillTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self._eager = celery_app.conf.task_always_eager
+        celery_app.conf.task_always_eager = True
+
+    def tearDown(self):
+        celery_app.conf.task_always_eager = self._eager
+
+    def test_processes_dates_in_order_and_skips_done_days(self):
+        posted = []
+
+        def execute(zid, xdate, session_user):
+            posted.append(xdate)
+            return {'success': True, 'voucher': f'SALE{len(posted):06d}'}
+
+        def duplicate(zid, xdate):
+            if xdate == '2026-10-02':
+                return {'is_duplicate': True, 'voucher': 'SALE000099'}
+            return {'is_duplicate': False}
+
+        with patch('apps.sales.tasks.check_duplicate_processing', side_effect=duplicate), \
+                patch('apps.sales.tasks.execute_day_end_process', side_effect=execute):
+            result = day_end_backfill.delay(100001, '2026-10-01', '2026-10-04').get()
+
+        self.assertEqual(posted, ['2026-10-01', '2026-10-03', '2026-10-04'])
+        self.assertEqual(result['done'], 4)
+        self.assertEqual(result['skipped'], [{'date': '2026-10-02', 'voucher': 'SALE000099'}])
+        self.assertIsNone(result['failed'])
+
+    def test_stops_at_first_failure(self):
+        def execute(zid, xdate, session_user):
+            if xdate == '2026-10-02':
+                raise RuntimeError('glmst missing')
+            return {'success': True, 'voucher': 'SALE000001'}
+
+        with patch('apps.sales.tasks.check_duplicate_processing', return_value={'is_duplicate': False}), \
+                patch('apps.sales.tasks.execute_day_end_process', side_effect=execute) as execute_mock:
+            result = day_end_backfill.delay(100001, '2026-10-01', '2026-10-03').get()
+
+        self.assertEqual(execute_mock.call_count, 2)
+        self.assertEqual(result['done'], 1)
+        self.assertEqual(result['failed'], {'date': '2026-10-02', 'message': 'glmst missing'})
+
+    def test_nightly_catches_up_without_waiting_on_another_task(self):
+        today = date.today()
+        connection = MagicMock()
+        connection.cursor.return_value.__enter__.return_value.fetchone.return_value = (today - timedelta(days=3),)
+
+        # As in a worker: joining another task's result from here would raise
+        with patch('apps.sales.tasks.connection', connection), \
+                patch('celery.result.task_join_will_block', return_value=True), \
+                patch('apps.sales.tasks.check_duplicate_processing', return_value={'is_duplicate': False}), \
+                patch('apps.sales.tasks.execute_day_end_process', return_value={'success': True, 'voucher': 'SALE000001'}):
+            result = day_end_nightly.apply(args=[100001])
+
+        self.assertTrue(result.successful(), result.result)
+        self.assertEqual(
+            [entry['date'] for entry in result.result['processed']],
+            [(today - timedelta(days=2)).isoformat(), (today - timedelta(days=1)).isoformat()],
+        )
+
+    def request(self, zid, method='get', data=None):
+        request = getattr(RequestFactory(), method)('/sales/api/day-end-backfill/', data or {})
+        request.user = type('User', (), {'is_authenticated': True, 'username': 'admin'})()
+        request.zid = zid
+        request.session = {'current_zid': zid, 'username': 'admin'}
+        return request
+
+    def test_start_endpoint_queues_the_range(self):
+        request = self.request(100001, 'post', {'start_date': '2026-10-01', 'end_date': '2026-10-03'})
+
+        with patch('apps.authentication.decorators.has_module_access', return_value=True), \
+                patch('apps.sales.tasks.check_duplicate_processing', return_value={'is_duplicate': True, 'voucher': 'SALE000001'}):
+            response = start_day_end_backfill(request)
+
+        data = json.loads(response.content)
+        self.assertTrue(data['success'])
+        self.assertEqual(data['total'], 3)
+        self.assertTrue(data['task_id'])
+
+        # Only the business that queued the task can read its progress
+        with patch('apps.authentication.decorators.has_module_access', return_value=True), \
+                patch('apps.sales.views.day_end_backfill.AsyncResult') as result:
+            result.return_value.state = 'SUCCESS'
+            result.return_value.info = {'total': 3, 'done': 3}
+            self.assertEqual(day_end_backfill_status(self.request(100001), data['task_id']).status_code, 200)
+            self.assertEqual(day_end_backfill_status(self.request(100002), data['task_id']).status_code, 404)
+            self.assertEqual(day_end_backfill_status(self.request(100001), 'unknown').status_code, 404)
@@ -0,0 +1,68 @@
+from decimal import Decimal
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.sales.views.day_end_process import aggregate_sales_data, insert_gl_details
+
+
+class CursorStub:
+    def __init__(self, rows=None, row=None):
+        self.rows = rows or []
+        self.row = row
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.row
+
+
+class DayEndProcessTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_aggregates_come_from_one_grouped_query(self):
+        cursor = CursorStub(rows=[
+            ('Cash Sale', '', Decimal('100.00'), Decimal('100.00'), Decimal('0'), Decimal('5.00')),
+            ('Card Sale', 'CBL', Decimal('50.00'), Decimal('0'), Decimal('50.00'), Decimal('0')),
+            ('Card Sale', 'DBBL', Decimal('20.00'), Decimal('0'), Decimal('20.00'), Decimal('1.00')),
+        ])
+        with patch('apps.sales.views.day_end_process.connection.cursor', return_value=cursor):
+            data = aggregate_sales_data(100001, '2026-10-18')
+
+        self.assertEqual(len(cursor.executed), 1)
+        self.assertEqual(data['total_amt'], Decimal('170.00'))
+        self.assertEqual(data['cash_amt'], Decimal('100.00'))
+        self.assertEqual(data['disc_amt'], Decimal('6.00'))
+        self.assertEqual(data['bank_data'], [('CBL', Decimal('50.00')), ('DBBL', Decimal('20.00'))])
+
+    def test_voucher_rows_are_written_in_one_insert(self):
+        cursor = CursorStub(row=('HMBR FIXIT GULSHAN', '08010001', '01010001', '07080001'))
+        data = {
+            'total_amt': Decimal('170.00'),
+            'cash_amt': Decimal('100.00'),
+            'bank_data': [('CBL', Decimal('50.00')), ('DBBL', Decimal('20.00'))],
+            'disc_amt': Decimal('6.00'),
+        }
+        with patch('apps.sales.views.day_end_process.connection.cursor', return_value=cursor):
+            insert_gl_details(100001, 'SALE000001', '2026-10-18', data)
+            # The account map is cached, so a second voucher does not look it up again
+            insert_gl_details(100001, 'SALE000002', '2026-10-18', data)
+
+        statements = [sql for sql, _ in cursor.executed]
+        self.assertEqual(len(statements), 3)
+        self.assertIn('FROM glmst', statements[0])
+        self.assertIn('INSERT INTO gldetail', statements[1])
+        # Sales, cash, two banks and discount
+        self.assertEqual(len(cursor.executed[1][1]), 5 * 19)
@@ -0,0 +1,41 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+
+
+class TodaysSalesTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('cashier', password='x'))
+        session = self.client.session
+        session['current_zid'] = 100001
+        session.save()
+
+        today = date.today()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE opord (zid integer, xdate date, xordernum varchar(20), xcus varchar(20), "
+                "xsltype varchar(20), xdtcomm numeric, xtotamt numeric, xstatusord varchar(20))"
+            )
+            for values in [
+                (100001, today, 'CO--000001', 'CUS-1', 'Cash Sale', 0, 100, 'Confirmed'),
+                (100001, today, 'CO--000002', 'CUS-2', 'Card Sale', 40, 40, 'Confirmed'),
+                (100001, today, 'CO--000003', 'CUS-1', 'Cash Sale', 0, 60, 'Confirmed'),
+                (100001, today, 'CO--000004', 'CUS-3', 'Cash Sale', 0, 999, 'Open'),
+                (100001, today - timedelta(days=1), 'CO--000000', 'CUS-1', 'Cash Sale', 0, 999, 'Confirmed'),
+                (100002, today, 'CO--000005', 'CUS-9', 'Cash Sale', 0, 999, 'Confirmed'),
+            ]:
+                cursor.execute("INSERT INTO opord VALUES (%s, %s, %s, %s, %s, %s, %s, %s)", values)
+
+    def test_orders_are_paged_by_the_list_engine(self):
+        response = self.client.get('/sales/api/todays-sales/', {'draw': '1', 'start': '0', 'length': '2'}).json()
+
+        self.assertEqual((response['recordsTotal'], response['recordsFiltered']), (3, 3))
+        self.assertEqual([row[1] for row in response['data']], ['CO--000003', 'CO--000002'])
+        self.assertEqual(response['data'][1][2:], ['CUS-2', 'Confirmed', 'Card Sale', '', 'Card Sale', 40.0, 40.0])
+
+    def test_summary_covers_every_order_of_the_day(self):
+        response = self.client.get('/sales/api/todays-sales-summary/').json()
+
+        self.assertEqual((response['total_orders'], response['total_sales'], response['card_sales']), (3, 200.0, 40.0))
@@ -7,6 +7,7 @@
 from .views.edit_sales import SalesEditView
 from .views.edit_sales_api import update_transaction_api, delete_transaction_api
 from .views.day_end_process import create_day_end_process, delete_day_end_process
+from .views.day_end_backfill import start_day_end_backfill, day_end_backfill_status
 from .views.sales_return_confirm import sales_return_confirm
 from .views.sales_return_detail import SalesReturnDetailView
 from .views.sales_return_print import sales_return_print
@@ -47,6 +48,9 @@
     path("create-day-end-process/", create_day_end_process, name="create-day-end-process"),
     # create a block comment Sales Return URLs
     path("api/delete-day-end-process/<str:date>/", delete_day_end_process, name="delete-day-end-process"),
+    # Date-range day end process (Celery) and its progress
+    path("api/day-end-backfill/", start_day_end_backfill, name="day-end-backfill"),
+    path("api/day-end-backfill/<str:task_id>/", day_end_backfill_status, name="day-end-backfill-status"),
     # AJAX API endpoints
     path("api/pos/complete-sale/", pos_complete_sale, name="pos-complete-sale"),
     path("api/sales-item-list/", sales_item_list_ajax, name="sales-item-list-ajax"),
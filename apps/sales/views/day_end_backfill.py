@@ -0,0 +1,92 @@
+from django.core.cache import cache
+from django.http import JsonResponse
+from apps.authentication.decorators import require_module_permission
+from django.views.decorators.csrf import csrf_exempt
+from django.contrib.auth.decorators import login_required
+from celery.result import AsyncResult
+from apps.sales.tasks import BACKFILL_OWNER_KEY, BACKFILL_OWNER_SECONDS, day_end_backfill, day_end_dates
+import logging
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Longest range a single backfill request may cover
+MAX_BACKFILL_DAYS = 366
+
+
+@csrf_exempt
+@login_required
+@require_module_permission('day_end_process', 'create')
+def start_day_end_backfill(request):
+    """
+    Queue the day-end process for a date range (start_date..end_date)
+
+    Returns the Celery task id; poll day_end_backfill_status for progress.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'message': 'Only POST method allowed'})
+
+    start_date = request.POST.get('start_date')
+    end_date = request.POST.get('end_date') or start_date
+    current_zid = request.session.get('current_zid')
+    session_user = request.session.get('username', 'admin@fixit.com')
+
+    if not start_date:
+        return JsonResponse({'success': False, 'message': 'Start date is required'}, status=400)
+
+    if not current_zid:
+        return JsonResponse({'success': False, 'message': 'No business context found'}, status=400)
+
+    try:
+        dates = day_end_dates(start_date, end_date)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': f'Invalid date range: {str(e)}'}, status=400)
+
+    if len(dates) > MAX_BACKFILL_DAYS:
+        return JsonResponse({
+            'success': False,
+            'message': f'Date range is limited to {MAX_BACKFILL_DAYS} days'
+        }, status=400)
+
+    task = day_end_backfill.delay(int(current_zid), start_date, end_date, session_user)
+    cache.set(BACKFILL_OWNER_KEY.format(task_id=task.id), int(current_zid), BACKFILL_OWNER_SECONDS)
+    logger.info(f"Queued day-end backfill {task.id} for zid={current_zid} {start_date}..{end_date} by {session_user}")
+
+    return JsonResponse({
+        'success': True,
+        'task_id': task.id,
+        'total': len(dates),
+        'message': f'Day end process queued for {len(dates)} dates'
+    })
+
+
+@login_required
+@require_module_permission('day_end_process', 'view')
+def day_end_backfill_status(request, task_id):
+    """
+    Progress of a day-end backfill task
+
+    state is PENDING (queued), PROGRESS, SUCCESS or FAILURE; progress has the
+    total/done counts and per-date outcomes. Tasks queued by another business
+    (or unknown ids) are 404.
+    """
+    current_zid = request.session.get('current_zid')
+    owner = cache.get(BACKFILL_OWNER_KEY.format(task_id=task_id))
+    if owner is None or not current_zid or owner != int(current_zid):
+        return JsonResponse({'success': False, 'message': 'Backfill task not found'}, status=404)
+
+    result = AsyncResult(task_id)
+
+    if result.state == 'FAILURE':
+        return JsonResponse({
+            'success': False,
+            'state': result.state,
+            'message': str(result.result)
+        })
+
+    progress = result.info if isinstance(result.info, dict) else None
+    return JsonResponse({
+        'success': True,
+        'state': result.state,
+        'progress': progress
+    })
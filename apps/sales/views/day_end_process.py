@@ -2,15 +2,38 @@
 from apps.authentication.decorators import require_module_permission
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
 from django.db import transaction, connection
 from django.utils import timezone
 from datetime import datetime
+from apps.utils.bulk_insert import insert_rows
 from apps.utils.voucher_generator import generate_voucher_number
 import logging
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+ACCOUNT_CACHE_KEY = 'day_end_accounts:{zid}'
+ACCOUNT_CACHE_SECONDS = 3600
+
+# Bank mapping - using parent account 01020001 for all banks
+BANK_ACCOUNTS = {
+    'PBL': '01020001',
+    'DBBL': '01020001',
+    'CBL': '01020001',
+    'MTBL': '01020001',
+    'UCB': '01020001'
+}
+
+# Sub-account codes for each bank
+BANK_SUB_ACCOUNTS = {
+    'PBL': '0102000101',
+    'DBBL': '0102000102',
+    'CBL': '0102000103',
+    'MTBL': '0102000104',
+    'UCB': '0102000105'
+}
+
 
 def check_duplicate_processing(zid, xdate):
     """
@@ -39,50 +62,79 @@ def check_duplicate_processing(zid, xdate):
 def aggregate_sales_data(zid, xdate):
     """
     Aggregate sales data from opordnview
+
+    One grouped scan per (zid, xdate); total, cash, per-bank card and discount
+    amounts are then summed from the groups. Returns None when there are no
+    orders on the date.
     """
     with connection.cursor() as cursor:
-        # Get total amount
         cursor.execute("""
-            SELECT COALESCE(SUM(xtotamt), 0) as total_amt
+            SELECT
+                xsltype,
+                xsalescat,
+                COALESCE(SUM(xtotamt), 0) AS total_amt,
+                COALESCE(SUM(xlineamt), 0) AS cash_amt,
+                COALESCE(SUM(xdtcomm), 0) AS bank_amt,
+                COALESCE(SUM(xdtdisc), 0) + COALESCE(SUM(xdiscf), 0) AS disc_amt
             FROM opordnview
             WHERE zid = %s AND xdate = %s
+            GROUP BY xsltype, xsalescat
         """, [zid, xdate])
-        total_result = cursor.fetchone()
-        total_amt = total_result[0] if total_result else 0
+        groups = cursor.fetchall()
+
+    # No orders on this date
+    if not groups:
+        return None
+
+    total_amt = 0
+    cash_amt = 0
+    disc_amt = 0
+    bank_amounts = {}
+    for xsltype, xsalescat, group_total, group_cash, group_bank, group_disc in groups:
+        total_amt += group_total
+        cash_amt += group_cash
+        disc_amt += group_disc
+        if xsltype == 'Card Sale':
+            bank_amounts[xsalescat] = bank_amounts.get(xsalescat, 0) + group_bank
+
+    return {
+        'total_amt': total_amt,
+        'cash_amt': cash_amt,
+        'bank_data': list(bank_amounts.items()),
+        'disc_amt': disc_amt
+    }
 
-        # Get cash amount
-        cursor.execute("""
-            SELECT COALESCE(SUM(xlineamt), 0) as cash_amt
-            FROM opordnview
-            WHERE zid = %s AND xdate = %s
-        """, [zid, xdate])
-        cash_result = cursor.fetchone()
-        cash_amt = cash_result[0] if cash_result else 0
 
-        # Get bank amounts by xsalescat
-        cursor.execute("""
-            SELECT xsalescat, COALESCE(SUM(xdtcomm), 0) as bank_amt
-            FROM opordnview
-            WHERE zid = %s AND xdate = %s AND xsltype = 'Card Sale'
-            GROUP BY xsalescat
-        """, [zid, xdate])
-        bank_data = cursor.fetchall()
+def get_day_end_accounts(zid):
+    """
+    Project code and GL accounts used by the day-end voucher, cached per zid
 
-        # Get discount amount
-        cursor.execute("""
-            SELECT COALESCE(SUM(xdtdisc), 0) + COALESCE(SUM(xdiscf), 0) as disc_amt
-            FROM opordnview
-            WHERE zid = %s AND xdate = %s
-        """, [zid, xdate])
-        disc_result = cursor.fetchone()
-        disc_amt = disc_result[0] if disc_result else 0
+    Returns:
+        dict: {'project': str, 'sales': str, 'cash': str, 'discount': str}
+    """
+    cache_key = ACCOUNT_CACHE_KEY.format(zid=zid)
+    accounts = cache.get(cache_key)
+    if accounts is not None:
+        return accounts
 
-        return {
-            'total_amt': total_amt,
-            'cash_amt': cash_amt,
-            'bank_data': bank_data,
-            'disc_amt': disc_amt
-        }
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT
+                (SELECT xcode FROM xcodes WHERE zid = %s AND xtype = 'Project' LIMIT 1),
+                (SELECT xacc FROM glmst WHERE xdesc = 'Sales' AND zid = %s LIMIT 1),
+                (SELECT xacc FROM glmst WHERE xdesc = 'Cash' AND zid = %s LIMIT 1),
+                (SELECT xacc FROM glmst WHERE xdesc LIKE '%%Discount%%' AND zid = %s LIMIT 1)
+        """, [zid, zid, zid, zid])
+        project_code, sales_account, cash_account, discount_account = cursor.fetchone()
+
+    accounts = {
+        'project': project_code or "HMBR FIXIT GULSHAN",
+        'sales': sales_account or "08010001",
+        'cash': cash_account or "01010001",
+        'discount': discount_account or "07080001",
+    }
+    cache.set(cache_key, accounts, ACCOUNT_CACHE_SECONDS)
+    return accounts
 
 
 def insert_gl_header(zid, voucher, xdate, session_user):
@@ -125,141 +177,80 @@ def insert_gl_header(zid, voucher, xdate, session_user):
         ])
 
 
-def insert_gl_detail_row(cursor, ztime, zid, xvoucher, xrow, xacc,
-                       xaccusage, xaccsource, xproj, xcur, xprime, xbase,
-                       xacctype, xinvnum, xdateapp, xdateclr, xdatedue, xsub=None):
+def gl_detail_row(ztime, zid, xvoucher, xrow, xacc,
+                  xaccusage, xaccsource, xproj, xcur, xprime, xbase,
+                  xacctype, xinvnum, xdateapp, xdateclr, xdatedue, xsub=None):
     """
-    Insert a single GL detail row
+    Build a single GL detail row for insert_rows
     """
-    try:
-        cursor.execute("""
-            INSERT INTO gldetail (
-                ztime, zid, xvoucher, xrow, xacc, xaccusage, xaccsource,
-                xproj, xcur, xexch, xprime, xbase, xacctype, xinvnum,
-                xdateapp, xexchval, xdateclr, xdatedue, xsub
-            ) VALUES (
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-            )
-        """, [
-            ztime, zid, xvoucher, xrow, xacc, xaccusage, xaccsource,
-            xproj, xcur, 1, xprime, xbase, xacctype, xinvnum,
-            xdateapp, 1, xdateclr, xdatedue, xsub
-        ])
-    except Exception as e:
-        logger.error(f"Error inserting GL detail row: {str(e)}")
-        logger.error(f"Parameters: voucher={xvoucher}, row={xrow}, account={xacc}")
-        raise
+    return {
+        'ztime': ztime, 'zid': zid, 'xvoucher': xvoucher, 'xrow': xrow, 'xacc': xacc,
+        'xaccusage': xaccusage, 'xaccsource': xaccsource, 'xproj': xproj, 'xcur': xcur,
+        'xexch': 1, 'xprime': xprime, 'xbase': xbase, 'xacctype': xacctype, 'xinvnum': xinvnum,
+        'xdateapp': xdateapp, 'xexchval': 1, 'xdateclr': xdateclr, 'xdatedue': xdatedue, 'xsub': xsub,
+    }
 
 # Helper function to insert GL details
 def insert_gl_details(zid, voucher, xdate, aggregated_data):
     """
-    Insert all GL detail records
+    Insert all GL detail records with one multi-row INSERT
     """
     logger.info(f"Starting GL details insertion for voucher: {voucher}")
     current_timestamp = timezone.now()
     row_number = 20
 
-    # Bank mapping - using parent account 01020001 for all banks
-    bank_mapping = {
-        'PBL': '01020001',
-        'DBBL': '01020001',
-        'CBL': '01020001',
-        'MTBL': '01020001',
-        'UCB': '01020001'
-    }
-
-    # Sub-account codes for each bank
-    bank_sub_mapping = {
-        'PBL': '0102000101',
-        'DBBL': '0102000102',
-        'CBL': '0102000103',
-        'MTBL': '0102000104',
-        'UCB': '0102000105'
-    }
-
-    with connection.cursor() as cursor:
-        # Get project code
-        cursor.execute("""
-            SELECT xcode FROM xcodes
-            WHERE zid = %s AND xtype = 'Project'
-            LIMIT 1
-        """, [zid])
-        project_result = cursor.fetchone()
-        project_code = project_result[0] if project_result else "HMBR FIXIT GULSHAN"
-
-        # Get sales account
-        cursor.execute("""
-            SELECT xacc FROM glmst
-            WHERE xdesc = 'Sales' AND zid = %s
-            LIMIT 1
-        """, [zid])
-        sales_account_result = cursor.fetchone()
-        sales_account = sales_account_result[0] if sales_account_result else "08010001"
-
-        # Get cash account
-        cursor.execute("""
-            SELECT xacc FROM glmst
-            WHERE xdesc = 'Cash' AND zid = %s
-            LIMIT 1
-        """, [zid])
-        cash_account_result = cursor.fetchone()
-        cash_account = cash_account_result[0] if cash_account_result else "01010001"
-
-        # 1. Sales Revenue Entry (Credit)
-        insert_gl_detail_row(
-            cursor, current_timestamp, zid, voucher, row_number,
-            sales_account, "Ledger", "None", project_code, "BDT",
-            -aggregated_data['total_amt'], -aggregated_data['total_amt'],
-            "Income", voucher, xdate, xdate, xdate
-        )
+    accounts = get_day_end_accounts(zid)
+    project_code = accounts['project']
+    rows = []
+
+    # 1. Sales Revenue Entry (Credit)
+    rows.append(gl_detail_row(
+        current_timestamp, zid, voucher, row_number,
+        accounts['sales'], "Ledger", "None", project_code, "BDT",
+        -aggregated_data['total_amt'], -aggregated_data['total_amt'],
+        "Income", voucher, xdate, xdate, xdate
+    ))
+    row_number += 10
+
+    # 2. Cash Entry (Debit)
+    if aggregated_data['cash_amt'] > 0:
+        rows.append(gl_detail_row(
+            current_timestamp, zid, voucher, row_number,
+            accounts['cash'], "Cash", "None", project_code, "BDT",
+            aggregated_data['cash_amt'], aggregated_data['cash_amt'],
+            "Asset", voucher, xdate, xdate, xdate
+        ))
         row_number += 10
 
-        # 2. Cash Entry (Debit)
-        if aggregated_data['cash_amt'] > 0:
-            insert_gl_detail_row(
-                cursor, current_timestamp, zid, voucher, row_number,
-                cash_account, "Cash", "None", project_code, "BDT",
-                aggregated_data['cash_amt'], aggregated_data['cash_amt'],
-                "Asset", voucher, xdate, xdate, xdate
-            )
+    # 3. Bank Entries (Debit)
+    for bank_code, bank_amount in aggregated_data['bank_data']:
+        if bank_amount > 0 and bank_code in BANK_ACCOUNTS and bank_code in BANK_SUB_ACCOUNTS:
+            rows.append(gl_detail_row(
+                current_timestamp, zid, voucher, row_number,
+                BANK_ACCOUNTS[bank_code], "Bank", "Subaccount", project_code, "BDT",
+                bank_amount, bank_amount, "Asset", voucher, xdate, xdate, xdate,
+                xsub=BANK_SUB_ACCOUNTS[bank_code]
+            ))
             row_number += 10
+        else:
+            logger.warning(f"Skipping bank entry {bank_code}: amount={bank_amount}, mapping_exists={bank_code in BANK_ACCOUNTS and bank_code in BANK_SUB_ACCOUNTS}")
 
-        # 3. Bank Entries (Debit)
-        for bank_code, bank_amount in aggregated_data['bank_data']:
-            if bank_amount > 0 and bank_code in bank_mapping and bank_code in bank_sub_mapping:
-                bank_account = bank_mapping[bank_code]
-                bank_sub_account = bank_sub_mapping[bank_code]
-                insert_gl_detail_row(
-                    cursor, current_timestamp, zid, voucher, row_number,
-                    bank_account, "Bank", "Subaccount", project_code, "BDT",
-                    bank_amount, bank_amount, "Asset", voucher, xdate, xdate, xdate,
-                    xsub=bank_sub_account
-                )
-                row_number += 10
-            else:
-                logger.warning(f"Skipping bank entry {bank_code}: amount={bank_amount}, mapping_exists={bank_code in bank_mapping and bank_code in bank_sub_mapping}")
-
-        # 4. Discount Entry (Debit)
-        if aggregated_data['disc_amt'] > 0:
-            # Get discount account
-            try:
-                cursor.execute("""
-                    SELECT xacc FROM glmst
-                    WHERE xdesc LIKE '%Discount%' AND zid = %s
-                    LIMIT 1
-                """, [zid])
-                discount_account_result = cursor.fetchone()
-                discount_account = discount_account_result[0] if discount_account_result else "07080001"
-            except Exception as e:
-                logger.error(f"Error getting discount account: {str(e)}")
-                discount_account = "07080001"
-
-            insert_gl_detail_row(
-                cursor, current_timestamp, zid, voucher, row_number,
-                discount_account, "Ledger", "Customer", project_code, "BDT",
-                aggregated_data['disc_amt'], aggregated_data['disc_amt'],
-                "Expenditure", voucher, xdate, xdate, xdate
-            )
+    # 4. Discount Entry (Debit)
+    if aggregated_data['disc_amt'] > 0:
+        rows.append(gl_detail_row(
+            current_timestamp, zid, voucher, row_number,
+            accounts['discount'], "Ledger", "Customer", project_code, "BDT",
+            aggregated_data['disc_amt'], aggregated_data['disc_amt'],
+            "Expenditure", voucher, xdate, xdate, xdate
+        ))
+
+    with connection.cursor() as cursor:
+        try:
+            insert_rows(cursor, 'gldetail', rows)
+        except Exception as e:
+            logger.error(f"Error inserting GL detail rows: {str(e)}")
+            logger.error(f"Parameters: voucher={voucher}, rows={len(rows)}")
+            raise
 
 # Helper function to execute day end process
 def execute_day_end_process(zid, xdate, session_user):
@@ -3,7 +3,9 @@
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.db import connection, transaction
-from apps.utils.voucher_generator import generate_voucher_number
+from apps.utils import document_cache, row_counts
+from apps.utils.inventory_posting import delete_imtrn, post_imtrn
+from apps.utils.voucher_generator import reserve_voucher_numbers
 import json
 import logging
 from datetime import datetime
@@ -74,6 +76,7 @@ def update_transaction_api(request):
         if not update_items_result['success']:
             return JsonResponse(update_items_result, status=400)
 
+        document_cache.invalidate(current_zid, ['invoice', 'pos_slip'], transaction_id)
         logger.info(f"Transaction {transaction_id} updated successfully by user {request.user.username}")
 
         return JsonResponse({
@@ -164,6 +167,8 @@ def delete_transaction_api(request):
                     'message': 'Failed to delete transaction'
                 }, status=500)
 
+        document_cache.invalidate(current_zid, ['invoice', 'pos_slip'], transaction_id)
+        row_counts.bump('opord', current_zid, -1)
         logger.info(f"Transaction {transaction_id} deleted successfully by user {request.user.username}")
 
         return JsonResponse({
@@ -244,6 +249,10 @@ def update_transaction_items(zid, transaction_id, items_data):
     Delete existing records first, then insert new ones to prevent duplicates
     """
     try:
+        # Reserve IS numbers for all imtrn records in one allocation, before
+        # delete_imtrn locks any stock (counters first, then stock rows)
+        is_numbers = reserve_voucher_numbers(zid, 'IS--', 'imtrn', 'ximtrnnum', len(items_data))
+
         with connection.cursor() as cursor:
             # First, delete existing items for this transaction from both tables
             # Delete from opodt table
@@ -253,10 +262,7 @@ def update_transaction_items(zid, transaction_id, items_data):
             """, [zid, transaction_id])
             
             # Delete from imtrn table (using xdocnum which stores the order number)
-            cursor.execute("""
-                DELETE FROM imtrn
-                WHERE zid = %s AND xdocnum = %s AND xdoctype = 'IS--'
-            """, [zid, transaction_id])
+            delete_imtrn(cursor, "zid = %s AND xdocnum = %s AND xdoctype = 'IS--'", [zid, transaction_id])
 
             # Get header information for imtrn records
             cursor.execute("""
@@ -279,6 +285,7 @@ def update_transaction_items(zid, transaction_id, items_data):
             timestamp = current_time.strftime('%Y-%m-%d %H:%M:%S')
 
             # Insert updated items into both opodt and imtrn
+            imtrn_rows = []
             for idx, item in enumerate(items_data, 1):
                 # Calculate line amount if not provided
                 qty = float(item.get('xqtyord', 0))
@@ -304,8 +311,8 @@ def update_transaction_items(zid, transaction_id, items_data):
                     float(item.get('xdttax', 0))
                 ])
 
-                # Generate IS number for imtrn record
-                is_number = generate_voucher_number(zid, 'IS--', 'imtrn', 'ximtrnnum')
+                # IS number for imtrn record
+                is_number = is_numbers[idx - 1]
                 
                 # Get average price for xval calculation (default to rate if not available)
                 cursor.execute("""
@@ -318,46 +325,37 @@ def update_transaction_items(zid, transaction_id, items_data):
                 avg_price = avg_result[0] if avg_result and avg_result[0] else rate
                 xval = float(avg_price) * qty
 
-                # Insert into imtrn table
-                cursor.execute("""
-                    INSERT INTO imtrn (
-                        ztime, zid, ximtrnnum, xitem, xitemrow, xwh, xdate, xyear,
-                        xper, xqty, xval, xvalpost, xdoctype, xdocnum, xdocrow,
-                        xdateexp, xdaterec, xlicense, xcus, xaction, xsign, xtime,
-                        zemail, xtrnim, xstdprice
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s,
-                        %s, %s, %s, %s, %s, %s, %s,
-                        %s, %s, %s, %s, %s, %s, %s,
-                        %s, %s, %s
-                    )
-                """, [
-                    timestamp,  # ztime
-                    zid,  # zid
-                    is_number,  # ximtrnnum
-                    item.get('xitem', ''),  # xitem
-                    xsltype or 'Cash',  # xitemrow (payment method)
-                    xwh or 'Fixit Gulshan',  # xwh
-                    xdate,  # xdate
-                    str(xyear) if xyear else str(current_time.year),  # xyear
-                    str(xper) if xper else str(current_time.month),  # xper
-                    f"{qty:.3f}",  # xqty
-                    f"{xval:.6f}",  # xval
-                    "0.000000",  # xvalpost
-                    'IS--',  # xdoctype
-                    transaction_id,  # xdocnum
-                    idx,  # xdocrow
-                    xdate,  # xdateexp
-                    xdate,  # xdaterec
-                    '',  # xlicense
-                    xcus or 'CUS-000001',  # xcus
-                    'Issue',  # xaction
-                    '-1',  # xsign
-                    timestamp,  # xtime
-                    zemail or 'system',  # zemail
-                    'IS--',  # xtrnim
-                    f"{rate:.4f}"  # xstdprice
-                ])
+                # Collect imtrn record
+                imtrn_rows.append({
+                    'ztime': timestamp,
+                    'zid': zid,
+                    'ximtrnnum': is_number,
+                    'xitem': item.get('xitem', ''),
+                    'xitemrow': xsltype or 'Cash',  # payment method
+                    'xwh': xwh or 'Fixit Gulshan',
+                    'xdate': xdate,
+                    'xyear': str(xyear) if xyear else str(current_time.year),
+                    'xper': str(xper) if xper else str(current_time.month),
+                    'xqty': f"{qty:.3f}",
+                    'xval': f"{xval:.6f}",
+                    'xvalpost': "0.000000",
+                    'xdoctype': 'IS--',
+                    'xdocnum': transaction_id,
+                    'xdocrow': idx,
+                    'xdateexp': xdate,
+                    'xdaterec': xdate,
+                    'xlicense': '',
+                    'xcus': xcus or 'CUS-000001',
+                    'xaction': 'Issue',
+                    'xsign': '-1',
+                    'xtime': timestamp,
+                    'zemail': zemail or 'system',
+                    'xtrnim': 'IS--',
+                    'xstdprice': f"{rate:.4f}",
+                })
+
+            # Insert into imtrn table and update stock_balance
+            post_imtrn(cursor, imtrn_rows)
 
             # Update total amount in header
             cursor.execute("""
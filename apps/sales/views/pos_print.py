@@ -3,6 +3,9 @@
 from django.contrib.auth.decorators import login_required
 from django.db import connection
 import logging
+import pickle
+
+from apps.utils import document_cache
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -20,6 +23,12 @@ def pos_print_slip(request, transaction_id):
             logger.warning(f"No business context found for user: {request.user.username}")
             raise Http404("No business context found")
 
+        # The slip shows the print time and user, so the cache holds its
+        # context rather than its HTML
+        cached_context, version = document_cache.lookup(current_zid, 'pos_slip', transaction_id)
+        if cached_context is not None:
+            return render(request, 'pos_print.html', pickle.loads(cached_context))
+
         # Get transaction data using raw SQL with comprehensive JOIN
         with connection.cursor() as cursor:
             # Use the improved SQL query with proper JOINs
@@ -188,6 +197,7 @@ def pos_print_slip(request, transaction_id):
             },
             'current_zid': current_zid,
         }
+        document_cache.store(current_zid, 'pos_slip', transaction_id, version, pickle.dumps(context))
 
         return render(request, 'pos_print.html', context)
 
@@ -9,8 +9,11 @@
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
 from apps.utils.average_price_calculation import get_average_prices_bulk
+from apps.utils.bulk_insert import insert_rows
+from apps.utils.inventory_posting import post_imtrn
 from apps.utils.items_check_inventory import items_check_inventory
-from apps.utils.voucher_generator import generate_voucher_number
+from apps.utils import row_counts
+from apps.utils.voucher_generator import generate_voucher_number, reserve_voucher_numbers
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -49,19 +52,7 @@ def pos_complete_sale(request):
                 'error': 'No items found in the order'
             }, status=400)
 
-        # Validate inventory for all items
-        inventory_validation = items_check_inventory(items, current_zid)
-
-        if not inventory_validation['success']:
-            # Return validation errors with detailed information
-            return JsonResponse({
-                'success': False,
-                'message': inventory_validation['message'],
-                'errors': inventory_validation['errors'],
-                'validation_failed': True
-            }, status=400)
-
-        # If validation passes, extract additional data
+        # Extract payment data
         bank_name = data.get('bank_name', '')
         payment_method = data.get('payment_method', 'Cash Sale')
         card_number = data.get('card_number', '')
@@ -83,17 +74,37 @@ def pos_complete_sale(request):
             total_individual_vat += item_vat
             logger.info(f"Item {item.get('xitem')}: VAT = {item_vat}, Selling Unit = {selling_unit}, Unit Cost = {unit_cost}")
 
-        logger.info(f"Inventory validation successful for order with {len(items)} items")
-
         # Process the sale with database insertions
         try:
             with transaction.atomic():
-                # Generate order number
+                header_info = data.get('header_info', {})
+                warehouse = header_info.get('warehouse', 'Fixit Gulshan')
+
+                # Number the order and its lines before locking any stock: every
+                # stock writer takes its voucher counters first, then the stock rows
                 order_number = generate_voucher_number(current_zid, 'CO--', 'opord', 'xordernum')
+                is_numbers = reserve_voucher_numbers(current_zid, 'IS--', 'imtrn', 'ximtrnnum', len(items))
+
+                # Lock the basket's stock rows in the selling warehouse and validate
+                # against them; the locks are held until the sale commits
+                with connection.cursor() as cursor:
+                    inventory_validation = items_check_inventory(items, current_zid, warehouse, cursor)
+
+                if not inventory_validation['success']:
+                    # Give the numbers back
+                    transaction.set_rollback(True)
+                    # Return validation errors with detailed information
+                    return JsonResponse({
+                        'success': False,
+                        'message': inventory_validation['message'],
+                        'errors': inventory_validation['errors'],
+                        'validation_failed': True
+                    }, status=400)
+
+                logger.info(f"Inventory validation successful for order with {len(items)} items in {warehouse}")
 
                 # Extract additional data
                 discounts = data.get('discounts', {})
-                header_info = data.get('header_info', {})
                 timestamp_str = data.get('timestamp', datetime.now().isoformat())
 
                 # Parse timestamp
@@ -146,7 +157,7 @@ def pos_complete_sale(request):
                         'BDT',  # xcur
                         discounts.get('percent_discount', 0),  # xdisc
                         discounts.get('fixed_discount', 0),  # xdiscf
-                        header_info.get('warehouse', 'Fixit Gulshan'),  # xwh
+                        warehouse,  # xwh
                         session_user,  # zemail
                         session_user,  # xemail
                         0.00,  # xdtwotax
@@ -170,98 +181,79 @@ def pos_complete_sale(request):
                         0.00,  # xamtpaid
                         7.50  # xamt
                     ])
+                    row_counts.bump('opord', current_zid, 1)
 
                     # Get average prices for all items
                     item_codes = [item['xitem'] for item in items]
                     average_prices = get_average_prices_bulk(current_zid, item_codes, current_date)
 
-                    # Insert into opodt and imtrn tables for each item
+                    # Build opodt and imtrn rows in memory, then write each table with one statement
+                    opodt_rows = []
+                    imtrn_rows = []
                     for idx, item in enumerate(items, 1):
-                        # Generate IS-- number for this item
-                        is_number = generate_voucher_number(current_zid, 'IS--', 'imtrn', 'ximtrnnum')
-
-                        # Insert into opodt table
-                        opodt_sql = """
-                        INSERT INTO opodt (
-                            ztime, zid, xordernum, xrow, xcode, xitem, xstype, xwh,
-                            xqtyreq, xqtyord, xunitsel, xcur, xrate, xlineamt, xdtwotax,
-                            xdttax, ximtrnnum, xcost, xsign, xdesc
-                        ) VALUES (
-                            %s, %s, %s, %s, %s, %s, %s, %s,
-                            %s, %s, %s, %s, %s, %s, %s,
-                            %s, %s, %s, %s, %s
-                        )
-                        """
-
-                        cursor.execute(opodt_sql, [
-                            timestamp,  # ztime
-                            current_zid,  # zid
-                            order_number,  # xordernum
-                            str(idx),  # xrow
-                            item['xitem'],  # xcode
-                            item['xitem'],  # xitem
-                            'Stock-N-Sell',  # xstype
-                            header_info.get('warehouse', 'Fixit Gulshan'),  # xwh
-                            f"{float(item['quantity']):.3f}",  # xqtyreq
-                            f"{float(item['quantity']):.3f}",  # xqtyord
-                            item.get('xunitstk', 'Pcs'),  # xunitsel
-                            'BDT',  # xcur
-                            f"{float(item['xstdprice']):.4f}",  # xrate
-                            f"{float(item['total']):.2f}",  # xlineamt
-                            f"{float(item['total']):.2f}",  # xdtwotax
-                            f"{float(item.get('item_vat', 0)):.2f}",  # xdttax
-                            is_number,  # ximtrnnum
-                            f"{float(item.get('item_cost', 0)):.2f}",  # xcost
-                            0,  # xsign
-                            item['xdesc']  # xdesc
-                        ])
+                        is_number = is_numbers[idx - 1]
+
+                        opodt_rows.append({
+                            'ztime': timestamp,
+                            'zid': current_zid,
+                            'xordernum': order_number,
+                            'xrow': str(idx),
+                            'xcode': item['xitem'],
+                            'xitem': item['xitem'],
+                            'xstype': 'Stock-N-Sell',
+                            'xwh': warehouse,
+                            'xqtyreq': f"{float(item['quantity']):.3f}",
+                            'xqtyord': f"{float(item['quantity']):.3f}",
+                            'xunitsel': item.get('xunitstk', 'Pcs'),
+                            'xcur': 'BDT',
+                            'xrate': f"{float(item['xstdprice']):.4f}",
+                            'xlineamt': f"{float(item['total']):.2f}",
+                            'xdtwotax': f"{float(item['total']):.2f}",
+                            'xdttax': f"{float(item.get('item_vat', 0)):.2f}",
+                            'ximtrnnum': is_number,
+                            'xcost': f"{float(item.get('item_cost', 0)):.2f}",
+                            'xsign': 0,
+                            'xdesc': item['xdesc'],
+                        })
 
                         # Calculate xval for imtrn using average price
                         avg_price = average_prices.get(item['xitem'], 0)
                         xval = float(avg_price) * float(item['quantity'])
 
-                        # Insert into imtrn table
-                        imtrn_sql = """
-                            INSERT INTO imtrn (
-                                ztime, zid, ximtrnnum, xitem, xitemrow, xwh, xdate, xyear,
-                                xper, xqty, xval, xvalpost, xdoctype, xdocnum, xdocrow,
-                                xdateexp, xdaterec, xlicense, xcus, xaction, xsign, xtime,
-                                zemail, xtrnim, xstdprice
-                            ) VALUES (
-                                %s, %s, %s, %s, %s, %s, %s, %s,
-                                %s, %s, %s, %s, %s, %s, %s,
-                                %s, %s, %s, %s, %s, %s, %s,
-                                %s, %s, %s
-                            )
-                        """
-
-                        cursor.execute(imtrn_sql, [
-                            timestamp,  # ztime
-                            current_zid,  # zid
-                            is_number,  # ximtrnnum
-                            item['xitem'],  # xitem
-                            xsltype,  # xitemrow (payment_method)
-                            header_info.get('warehouse', 'Fixit Gulshan'),  # xwh
-                            current_date,  # xdate
-                            str(current_year),  # xyear
-                            str(current_month),  # xper
-                            f"{float(item['quantity']):.3f}",  # xqty
-                            f"{float(xval):.6f}",  # xval
-                            "0.000000",  # xvalpost
-                            'IS--',  # xdoctype
-                            order_number,  # xdocnum
-                            idx,  # xdocrow
-                            current_date,  # xdateexp
-                            current_date,  # xdaterec
-                            '',  # xlicense
-                            header_info.get('customer_name', 'CUS-000001'),  # xcus
-                            'Issue',  # xaction
-                            '-1',  # xsign
-                            timestamp,  # xtime
-                            session_user,  # zemail
-                            'IS--',  # xtrnim
-                            f"{float(item['xstdprice']):.4f}"  # xstdprice
-                        ])
+                        # Collect imtrn row for this item
+                        imtrn_rows.append({
+                            'ztime': timestamp,
+                            'zid': current_zid,
+                            'ximtrnnum': is_number,
+                            'xitem': item['xitem'],
+                            'xitemrow': xsltype,  # payment_method
+                            'xwh': warehouse,
+                            'xdate': current_date,
+                            'xyear': str(current_year),
+                            'xper': str(current_month),
+                            'xqty': f"{float(item['quantity']):.3f}",
+                            'xval': f"{float(xval):.6f}",
+                            'xvalpost': "0.000000",
+                            'xdoctype': 'IS--',
+                            'xdocnum': order_number,
+                            'xdocrow': idx,
+                            'xdateexp': current_date,
+                            'xdaterec': current_date,
+                            'xlicense': '',
+                            'xcus': header_info.get('customer_name', 'CUS-000001'),
+                            'xaction': 'Issue',
+                            'xsign': '-1',
+                            'xtime': timestamp,
+                            'zemail': session_user,
+                            'xtrnim': 'IS--',
+                            'xstdprice': f"{float(item['xstdprice']):.4f}",
+                        })
+
+                    # Insert sale lines into opodt
+                    insert_rows(cursor, 'opodt', opodt_rows)
+
+                    # Insert into imtrn and update stock_balance
+                    post_imtrn(cursor, imtrn_rows)
 
                 logger.info(f"Sale processed successfully. Order Number: {order_number}")
 
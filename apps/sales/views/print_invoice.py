@@ -6,12 +6,19 @@
 from xhtml2pdf import pisa
 from io import BytesIO
 
+from apps.utils import document_cache
+
 
 @login_required
 def print_invoice(request, transaction_id):
     # Get current ZID from session
     session_zid = request.session.get('current_zid') 
 
+    # Reprints of an unchanged invoice are served from the render cache
+    cached_pdf, version = document_cache.lookup(session_zid, 'invoice', transaction_id)
+    if cached_pdf is not None:
+        return _pdf_response(cached_pdf, transaction_id)
+
     # SQL query to get order header information from opord table
     header_sql = """
     SELECT ztime, zid, xordernum, xdate, xcus, xstatusord, xcur,
@@ -73,9 +80,13 @@ def print_invoice(request, transaction_id):
     pdf = pisa.pisaDocument(BytesIO(html_string.encode("UTF-8")), result)
 
     if not pdf.err:
-        # Return PDF response
-        response = HttpResponse(result.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = f'inline; filename="sales_invoice_{transaction_id}.pdf"'
-        return response
+        document_cache.store(session_zid, 'invoice', transaction_id, version, result.getvalue())
+        return _pdf_response(result.getvalue(), transaction_id)
     else:
         return HttpResponse('Error generating PDF', status=500)
+
+
+def _pdf_response(content, transaction_id):
+    response = HttpResponse(content, content_type='application/pdf')
+    response['Content-Disposition'] = f'inline; filename="sales_invoice_{transaction_id}.pdf"'
+    return response
@@ -1,15 +1,86 @@
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.db import connection
-from django.template.loader import render_to_string
+from django.shortcuts import redirect
 from django.contrib.auth.decorators import login_required
-from xhtml2pdf import pisa
-from io import BytesIO, StringIO
 from datetime import datetime
-import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 from django.contrib import messages
-import csv
+
+from apps.utils.report_jobs import submit_and_wait
+from apps.utils.streaming_export import iter_csv, iter_query, workbook_response, write_only_workbook
+
+# PDF renders the whole report in memory (in a worker); longer ranges export as CSV or Excel
+PDF_MAX_DAYS = 31
+
+HEADERS = ['Date', 'Order Number', 'Bank', 'Card Amount', 'Cash Amount', 'Discount', 'Total']
+
+# SQL query for daily sales report
+DAILY_SALES_SQL = """
+    SELECT
+        xdate,
+        xordernum,
+        xsalescat,
+        xdtcomm,
+        (xtotamt) - (xdtcomm + xdiscf + xdtdisc) as cash_amount,
+        xdiscf + xdtdisc as discount,
+        xtotamt
+    FROM opordview
+    WHERE zid = %s
+      AND xdate BETWEEN %s AND %s
+    ORDER BY xdate, xordernum
+"""
+
+
+class SalesTotals:
+    """Grand totals accumulated while the rows stream past"""
+
+    def __init__(self):
+        self.total_records = 0
+        self.total_card_amount = 0.0
+        self.total_cash_amount = 0.0
+        self.total_discount = 0.0
+        self.grand_total = 0.0
+
+    def add(self, row):
+        """Add one sales row (as returned by sales_row) and pass it through"""
+        self.total_records += 1
+        self.total_card_amount += row[3]
+        self.total_cash_amount += row[4]
+        self.total_discount += row[5]
+        self.grand_total += row[6]
+        return row
+
+    def as_dict(self):
+        return {
+            'total_card_amount': self.total_card_amount,
+            'total_cash_amount': self.total_cash_amount,
+            'total_discount': self.total_discount,
+            'grand_total': self.grand_total,
+        }
+
+    def summary_rows(self):
+        return [
+            ['Total Records:', self.total_records],
+            ['Total Card Amount:', self.total_card_amount],
+            ['Total Cash Amount:', self.total_cash_amount],
+            ['Total Discount:', self.total_discount],
+            ['Grand Total:', self.grand_total],
+        ]
+
+
+def sales_row(row):
+    """Database row -> [date, order number, bank, card, cash, discount, total]"""
+    return [
+        row[0].strftime('%Y-%m-%d') if row[0] else '',
+        row[1] or '',
+        row[2] or '',  # Bank
+        float(row[3]) if row[3] else 0.0,  # Card Amount
+        float(row[4]) if row[4] else 0.0,  # Cash Amount
+        float(row[5]) if row[5] else 0.0,  # Discount
+        float(row[6]) if row[6] else 0.0,  # Total
+    ]
 
 
 @login_required
@@ -20,133 +91,85 @@ def daily_sales_report_export(request):
     # Get parameters from request
     from_date = request.GET.get('from_date')
     to_date = request.GET.get('to_date')
-    report_format = request.GET.get('report_type', 'pdf')
-
-    # Debug: Log the received parameters
-    print(f"DEBUG: from_date={from_date}, to_date={to_date}, report_format={report_format}")
-    print(f"DEBUG: All GET parameters: {dict(request.GET)}")
+    report_format = request.GET.get('report_type', 'pdf').lower()
 
     if not from_date or not to_date:
         return HttpResponse('From Date and To Date are required', status=400)
 
-    # SQL query for daily sales report
-    daily_sales_sql = """
-        SELECT
-            xdate,
-            xordernum,
-            xsalescat,
-            xdtcomm,
-            (xtotamt) - (xdtcomm + xdiscf + xdtdisc) as cash_amount,
-            xdiscf + xdtdisc as discount,
-            xtotamt
-        FROM opordview
-        WHERE zid = %s
-          AND xdate BETWEEN %s AND %s
-        ORDER BY xdate, xordernum
-    """
+    try:
+        from_date_obj = datetime.strptime(from_date, '%Y-%m-%d')
+        to_date_obj = datetime.strptime(to_date, '%Y-%m-%d')
+    except ValueError:
+        return HttpResponse('Dates must be in YYYY-MM-DD format', status=400)
+
+    # Get business information from session (populated by BusinessInfoMiddleware)
+    business_info = request.session.get('business_info', {})
+    business_data = {
+        'business_id': business_info.get('zid'),
+        'business_name': business_info.get('business_name', ''),
+        'business_address': business_info.get('business_address', ''),
+        'business_mobile': business_info.get('business_mobile', ''),
+        'business_email': business_info.get('business_email', ''),
+        'business_website': business_info.get('business_website', ''),
+    }
 
-    with connection.cursor() as cursor:
-        # Get daily sales data
-        cursor.execute(daily_sales_sql, [session_zid, from_date, to_date])
-        rows = cursor.fetchall()
-
-        # Get business information from session (populated by BusinessInfoMiddleware)
-        business_info = request.session.get('business_info', {})
-        business_data = {
-            'business_id': business_info.get('zid'),
-            'business_name': business_info.get('business_name', ''),
-            'business_address': business_info.get('business_address', ''),
-            'business_mobile': business_info.get('business_mobile', ''),
-            'business_email': business_info.get('business_email', ''),
-            'business_website': business_info.get('business_website', ''),
-        }
+    # Rows are read lazily from a server-side cursor while the response is sent
+    rows = (sales_row(row) for row in iter_query(DAILY_SALES_SQL, [session_zid, from_date, to_date]))
+
+    if report_format == 'excel':
+        return generate_excel_report(rows, business_data, from_date, to_date)
+    elif report_format == 'csv':
+        return generate_csv_report(rows, business_data, from_date, to_date)
+
+    date_diff = (to_date_obj - from_date_obj).days + 1  # +1 to include both dates
+    if date_diff > PDF_MAX_DAYS:
+        messages.warning(
+            request,
+            f"PDF is limited to {PDF_MAX_DAYS} days and this range is {date_diff} days. "
+            f"Export it as CSV or Excel instead."
+        )
+        return redirect('daily-sales-report')
+
+    # Rendered by a Celery worker; the page waits for it and then shows the PDF
+    return submit_and_wait(request, 'daily_sales', {'from_date': from_date, 'to_date': to_date})
 
-        # Process the sales data
-        sales_data = []
-        for row in rows:
-            sales_item = {
-                'xdate': row[0].strftime('%Y-%m-%d') if row[0] else '',
-                'xordernum': row[1] or '',
-                'xsalescat': row[2] or '',  # Bank
-                'xdtcomm': float(row[3]) if row[3] else 0.0,  # Card Amount
-                'cash_amount': float(row[4]) if row[4] else 0.0,  # Cash Amount
-                'discount': float(row[5]) if row[5] else 0.0,  # Discount
-                'xtotamt': float(row[6]) if row[6] else 0.0  # Total
-            }
-            sales_data.append(sales_item)
-
-    # Calculate grand totals
-    grand_totals = {
-        'total_card_amount': sum(item['xdtcomm'] for item in sales_data),
-        'total_cash_amount': sum(item['cash_amount'] for item in sales_data),
-        'total_discount': sum(item['discount'] for item in sales_data),
-        'grand_total': sum(item['xtotamt'] for item in sales_data)
-    }
 
-    # Check date range for PDF export - automatically switch to CSV if >= 31 days
-    if report_format.lower() == 'pdf':
-        try:
-            from_date_obj = datetime.strptime(from_date, '%Y-%m-%d')
-            to_date_obj = datetime.strptime(to_date, '%Y-%m-%d')
-            date_diff = (to_date_obj - from_date_obj).days + 1  # +1 to include both dates
-
-            if date_diff >= 7:
-                print(f"DEBUG: Date range is {date_diff} days (>=7), automatically switching PDF to CSV for performance")
-                messages.warning(request, f"Date range is {date_diff} days (>=7), automatically switching to CSV format for performance.")
-                report_format = 'csv'  # Override format to CSV
-        except ValueError:
-            # If date parsing fails, continue with original format
-            print("DEBUG: Date parsing failed, continuing with original format")
-            pass
-
-    # Generate report based on format
-    print(f"DEBUG: Checking format - report_format.lower() = '{report_format.lower()}'")
-    if report_format.lower() == 'excel':
-        print("DEBUG: Generating Excel report")
-        return generate_excel_report(sales_data, business_data, from_date, to_date)
-    elif report_format.lower() == 'csv':
-        print("DEBUG: Generating CSV report")
-        return generate_csv_report(sales_data, business_data, from_date, to_date)
-    else:
-        print("DEBUG: Generating PDF report")
-        return generate_pdf_report(request, sales_data, business_data, from_date, to_date, grand_totals)
-
-
-def generate_pdf_report(request, sales_data, business_data, from_date, to_date, grand_totals):
-    """Generate PDF report using xhtml2pdf"""
-
-    # Render HTML template
-    html_string = render_to_string('reports/daily_sales_report_export.html', {
+def daily_sales_pdf_context(zid, from_date, to_date):
+    """Template context for the daily sales PDF"""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT zid, name, address, mobile, email, website
+            FROM authentication_business
+            WHERE zid = %s
+        """, [zid])
+        business_row = cursor.fetchone() or (zid, '', '', '', '', '')
+    business_data = dict(zip(
+        ('business_id', 'business_name', 'business_address', 'business_mobile', 'business_email', 'business_website'),
+        (value or '' for value in business_row)
+    ))
+
+    totals = SalesTotals()
+    keys = ('xdate', 'xordernum', 'xsalescat', 'xdtcomm', 'cash_amount', 'discount', 'xtotamt')
+    sales_data = [
+        dict(zip(keys, totals.add(sales_row(row))))
+        for row in iter_query(DAILY_SALES_SQL, [zid, from_date, to_date])
+    ]
+
+    return {
         'business': business_data,
         'sales_data': sales_data,
         'from_date': from_date,
         'to_date': to_date,
         'print_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'total_records': len(sales_data),
-        'grand_totals': grand_totals,
+        'total_records': totals.total_records,
+        'grand_totals': totals.as_dict(),
         'report_title': 'Daily Sales Report',
-    }, request=request)
-
-    # Generate PDF using xhtml2pdf
-    result = BytesIO()
-    pdf = pisa.pisaDocument(BytesIO(html_string.encode("UTF-8")), result)
-
-    if not pdf.err:
-        # Return PDF response
-        response = HttpResponse(result.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = f'inline; filename="daily_sales_report_{from_date}_to_{to_date}.pdf"'
-        return response
-    else:
-        return HttpResponse('Error generating PDF', status=500)
-
+    }
 
-def generate_excel_report(sales_data, business_data, from_date, to_date):
-    """Generate Excel report using openpyxl"""
 
-    # Create workbook and worksheet
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Daily Sales Report"
+def generate_excel_report(rows, business_data, from_date, to_date):
+    """Generate Excel report with an openpyxl write-only worksheet"""
+    wb, ws = write_only_workbook("Daily Sales Report")
 
     # Define styles
     header_font = Font(bold=True, size=12)
@@ -159,124 +182,87 @@ def generate_excel_report(sales_data, business_data, from_date, to_date):
     )
     center_alignment = Alignment(horizontal='center', vertical='center')
 
-    # Add business header
-    ws.merge_cells('A1:G1')
-    ws['A1'] = business_data['business_name']
-    ws['A1'].font = title_font
-    ws['A1'].alignment = center_alignment
-
-    ws.merge_cells('A2:G2')
-    ws['A2'] = business_data['business_address']
-    ws['A2'].alignment = center_alignment
-
-    ws.merge_cells('A3:G3')
-    ws['A3'] = f"Mobile: {business_data['business_mobile']} | Email: {business_data['business_email']}"
-    ws['A3'].alignment = center_alignment
-
-    ws.merge_cells('A4:G4')
-    ws['A4'] = f"Website: {business_data['business_website']}"
-    ws['A4'].alignment = center_alignment
-
-    # Add report title
-    ws.merge_cells('A6:G6')
-    ws['A6'] = "DAILY SALES REPORT"
-    ws['A6'].font = title_font
-    ws['A6'].alignment = center_alignment
-
-    # Add date range
-    ws.merge_cells('A7:G7')
-    ws['A7'] = f"From: {from_date} To: {to_date}"
-    ws['A7'].alignment = center_alignment
+    def cell(value, font=None, alignment=None, cell_border=None):
+        styled = WriteOnlyCell(ws, value=value)
+        if font:
+            styled.font = font
+        if alignment:
+            styled.alignment = alignment
+        if cell_border:
+            styled.border = cell_border
+        return styled
+
+    # Column widths must be set before the first row is written
+    for col in range(1, len(HEADERS) + 1):
+        ws.column_dimensions[get_column_letter(col)].width = 15
+
+    # Business header, report title and date range, each merged across the table
+    title_rows = {
+        1: cell(business_data['business_name'], title_font, center_alignment),
+        2: cell(business_data['business_address'], alignment=center_alignment),
+        3: cell(f"Mobile: {business_data['business_mobile']} | Email: {business_data['business_email']}",
+                alignment=center_alignment),
+        4: cell(f"Website: {business_data['business_website']}", alignment=center_alignment),
+        6: cell("DAILY SALES REPORT", title_font, center_alignment),
+        7: cell(f"From: {from_date} To: {to_date}", alignment=center_alignment),
+    }
+    for row_number in range(1, 9):
+        if row_number in title_rows:
+            ws.append([title_rows[row_number]])
+            ws.merged_cells.add(f'A{row_number}:G{row_number}')
+        else:
+            ws.append([])
 
     # Add column headers
-    headers = ['Date', 'Order Number', 'Bank', 'Card Amount', 'Cash Amount', 'Discount', 'Total']
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=9, column=col, value=header)
-        cell.font = header_font
-        cell.border = border
-        cell.alignment = center_alignment
+    ws.append([cell(header, header_font, center_alignment, border) for header in HEADERS])
 
     # Add data rows
-    for row_idx, item in enumerate(sales_data, 10):
-        ws.cell(row=row_idx, column=1, value=item['xdate']).border = border
-        ws.cell(row=row_idx, column=2, value=item['xordernum']).border = border
-        ws.cell(row=row_idx, column=3, value=item['xsalescat']).border = border
-        ws.cell(row=row_idx, column=4, value=item['xdtcomm']).border = border
-        ws.cell(row=row_idx, column=5, value=item['cash_amount']).border = border
-        ws.cell(row=row_idx, column=6, value=item['discount']).border = border
-        ws.cell(row=row_idx, column=7, value=item['xtotamt']).border = border
-
-    # Auto-adjust column widths
-    for col in range(1, 8):
-        column_letter = get_column_letter(col)
-        ws.column_dimensions[column_letter].width = 15
-
-    # Save to BytesIO
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
-
-    # Return Excel response
-    response = HttpResponse(
-        output.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
-    response['Content-Disposition'] = f'attachment; filename="daily_sales_report_{from_date}_to_{to_date}.xlsx"'
-
-    return response
+    totals = SalesTotals()
+    for row in rows:
+        ws.append([cell(value, cell_border=border) for value in totals.add(row)])
 
+    # Add summary totals
+    ws.append([])
+    ws.append([cell('SUMMARY', header_font)])
+    for label, value in totals.summary_rows():
+        ws.append([cell(label, header_font), value])
 
-def generate_csv_report(sales_data, business_data, from_date, to_date):
-    """Generate CSV report using Python's csv module"""
+    return workbook_response(wb, f"daily_sales_report_{from_date}_to_{to_date}.xlsx")
 
-    # Create StringIO buffer
-    output = StringIO()
-    writer = csv.writer(output)
 
+def _csv_rows(rows, business_data, from_date, to_date):
     # Write business header information
-    writer.writerow([business_data['business_name']])
-    writer.writerow([business_data['business_address']])
-    writer.writerow([f"Mobile: {business_data['business_mobile']} | Email: {business_data['business_email']}"])
-    writer.writerow([f"Website: {business_data['business_website']}"])
-    writer.writerow([])  # Empty row
+    yield [business_data['business_name']]
+    yield [business_data['business_address']]
+    yield [f"Mobile: {business_data['business_mobile']} | Email: {business_data['business_email']}"]
+    yield [f"Website: {business_data['business_website']}"]
+    yield []  # Empty row
 
     # Write report title and date range
-    writer.writerow(['DAILY SALES REPORT'])
-    writer.writerow([f'From: {from_date} To: {to_date}'])
-    writer.writerow([f'Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}'])
-    writer.writerow([])  # Empty row
+    yield ['DAILY SALES REPORT']
+    yield [f'From: {from_date} To: {to_date}']
+    yield [f'Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}']
+    yield []  # Empty row
 
-    # Write column headers
-    headers = ['Date', 'Order Number', 'Bank', 'Card Amount', 'Cash Amount', 'Discount', 'Total']
-    writer.writerow(headers)
+    yield HEADERS
 
     # Write data rows
-    for item in sales_data:
-        writer.writerow([
-            item['xdate'],
-            item['xordernum'],
-            item['xsalescat'],
-            item['xdtcomm'],
-            item['cash_amount'],
-            item['discount'],
-            item['xtotamt']
-        ])
+    totals = SalesTotals()
+    for row in rows:
+        yield totals.add(row)
 
     # Write summary totals
-    writer.writerow([])  # Empty row
-    writer.writerow(['SUMMARY'])
-    writer.writerow(['Total Records:', len(sales_data)])
-    writer.writerow(['Total Card Amount:', sum(item['xdtcomm'] for item in sales_data)])
-    writer.writerow(['Total Cash Amount:', sum(item['cash_amount'] for item in sales_data)])
-    writer.writerow(['Total Discount:', sum(item['discount'] for item in sales_data)])
-    writer.writerow(['Grand Total:', sum(item['xtotamt'] for item in sales_data)])
-
-    # Get CSV content
-    csv_content = output.getvalue()
-    output.close()
-
-    # Create HTTP response
-    response = HttpResponse(csv_content, content_type='text/csv')
+    yield []  # Empty row
+    yield ['SUMMARY']
+    yield from totals.summary_rows()
+
+
+def generate_csv_report(rows, business_data, from_date, to_date):
+    """Stream the CSV report line by line as the rows are read"""
+    response = StreamingHttpResponse(
+        iter_csv(_csv_rows(rows, business_data, from_date, to_date)),
+        content_type='text/csv'
+    )
     response['Content-Disposition'] = f'attachment; filename="daily_sales_report_{from_date}_to_{to_date}.csv"'
 
     return response
@@ -12,7 +12,9 @@
 from django.utils import timezone
 
 # Local application imports
-from apps.utils.voucher_generator import generate_voucher_number
+from apps.utils import row_counts
+from apps.utils.inventory_posting import post_imtrn
+from apps.utils.voucher_generator import generate_voucher_number, reserve_voucher_numbers
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -117,9 +119,11 @@ def sales_return_confirm(request):
             ])
 
             # 2. Insert into imtemptdt and imtrn for each cart item
+            # Reserve an individual voucher for every item in one allocation
+            item_vouchers = reserve_voucher_numbers(current_zid, 'SRE-', 'imtemptdt', 'ximtrnnum', len(cart_items))
+            imtrn_rows = []
             for idx, item in enumerate(cart_items, 1):
-                # Generate individual voucher for each item
-                item_voucher = generate_voucher_number(current_zid, 'SRE-', 'imtemptdt', 'ximtrnnum')
+                item_voucher = item_vouchers[idx - 1]
 
                 inv_value = Decimal(str(item.get('mkt_price', 0)))
                 item_total = Decimal(str(item.get('quantity', 0))) * inv_value
@@ -155,39 +159,34 @@ def sales_return_confirm(request):
                     mkt_value  # xlineamt (MKT Value)
                 ])
 
-                # Insert into imtrn
+                # Collect imtrn row for this item
                 item_total = Decimal(str(item.get('quantity', 0))) * Decimal(str(item.get('mkt_price', 0)))
-                cursor.execute("""
-                    INSERT INTO imtrn (
-                        ztime, zid, ximtrnnum, xitem, xwh, xdate, xyear, xper, xqty, xval,
-                        xvalpost, xdoctype, xdocnum, xdocrow, xaltqty, xproj, xdateexp,
-                        xdaterec, xaction, xsign, xmember
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                    )
-                """, [
-                    current_timestamp,  # ztime
-                    current_zid,  # zid
-                    item_voucher,  # ximtrnnum (individual item voucher)
-                    item['xitem'],  # xitem
-                    form_data['warehouse'],  # xwh
-                    invoice_date,  # xdate
-                    year,  # xyear
-                    month,  # xper
-                    Decimal(str(item.get('quantity', 0))),  # xqty
-                    item_total,  # xval
-                    item_total,  # xvalpost (same as xval)
-                    'SRE-',  # xdoctype
-                    sre_voucher,  # xdocnum
-                    str(idx),  # xdocrow (row number as string)
-                    0,  # xaltqty (default 0)
-                    form_data['project'],  # xproj
-                    invoice_date,  # xdateexp
-                    invoice_date,  # xdaterec
-                    'Return',  # xaction
-                    1,  # xsign (default 1)
-                    session_user  # xmember
-                ])
+                imtrn_rows.append({
+                    'ztime': current_timestamp,
+                    'zid': current_zid,
+                    'ximtrnnum': item_voucher,  # individual item voucher
+                    'xitem': item['xitem'],
+                    'xwh': form_data['warehouse'],
+                    'xdate': invoice_date,
+                    'xyear': year,
+                    'xper': month,
+                    'xqty': Decimal(str(item.get('quantity', 0))),
+                    'xval': item_total,
+                    'xvalpost': item_total,  # same as xval
+                    'xdoctype': 'SRE-',
+                    'xdocnum': sre_voucher,
+                    'xdocrow': str(idx),  # row number as string
+                    'xaltqty': 0,
+                    'xproj': form_data['project'],
+                    'xdateexp': invoice_date,
+                    'xdaterec': invoice_date,
+                    'xaction': 'Return',
+                    'xsign': 1,
+                    'xmember': session_user,
+                })
+
+            # 3. Insert into imtrn and update stock_balance
+            post_imtrn(cursor, imtrn_rows)
 
             # 4. Insert into glheader
             cursor.execute("""
@@ -384,6 +383,7 @@ def sales_return_confirm(request):
                 xsub_values[3]  # xsub (conditional based on zid)
             ])
 
+        row_counts.bump('imtemptrn', current_zid, 1, tag='SRE-')
         logger.info(f"Sales return {sre_voucher} processed successfully by {session_user}")
 
         return JsonResponse({
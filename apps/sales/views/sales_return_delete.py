@@ -4,6 +4,8 @@
 from django.db import transaction, connection
 from django.views.decorators.http import require_POST
 from django.views.decorators.csrf import csrf_exempt
+from apps.utils import row_counts
+from apps.utils.inventory_posting import delete_imtrn
 import logging
 
 logger = logging.getLogger(__name__)
@@ -66,11 +68,7 @@ def sales_return_delete(request, transaction_id):
                 logger.info(f"Deleted {glheader_deleted} records from glheader")
 
             # Delete from imtrn (inventory transactions)
-            cursor.execute("""
-                DELETE FROM imtrn
-                WHERE zid = %s AND xdocnum = %s
-            """, [session_zid, transaction_id])
-            imtrn_deleted = cursor.rowcount
+            imtrn_deleted = delete_imtrn(cursor, "zid = %s AND xdocnum = %s", [session_zid, transaction_id])
             logger.info(f"Deleted {imtrn_deleted} records from imtrn")
 
             # Delete from imtemptdt (transaction details)
@@ -95,6 +93,7 @@ def sales_return_delete(request, transaction_id):
                     'message': 'Failed to delete sales return transaction.'
                 }, status=500)
 
+        row_counts.bump('imtemptrn', session_zid, -1, tag='SRE-')
         logger.info(f"Successfully deleted sales return transaction: {transaction_id}")
 
         return JsonResponse({
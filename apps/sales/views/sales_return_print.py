@@ -1,18 +1,13 @@
 
-from django.http import HttpResponse
 from django.db import connection
-from django.template.loader import render_to_string
 from django.contrib.auth.decorators import login_required
-from xhtml2pdf import pisa
-from io import BytesIO
 from datetime import datetime
 
+from apps.utils.report_jobs import submit_and_wait
 
-@login_required
-def sales_return_print(request, transaction_id):
-    # Get current ZID from session
-    session_zid = request.session.get('current_zid')
 
+def sales_return_context(session_zid, transaction_id):
+    """Template context for the sales return print, or None if the return does not exist"""
     # SQL query to get sales return data with business information and item descriptions
     sales_return_sql = """
         SELECT
@@ -58,18 +53,7 @@ def sales_return_print(request, transaction_id):
         rows = cursor.fetchall()
 
         if not rows:
-            # Debug information
-            debug_sql = "SELECT zid, ximtmptrn FROM imtemptrn WHERE ximtmptrn = %s"
-            cursor.execute(debug_sql, [transaction_id])
-            debug_results = cursor.fetchall()
-
-            debug_info = f"Sales return not found. Transaction ID: {transaction_id}, Session ZID: {session_zid}. "
-            if debug_results:
-                debug_info += f"Found transaction with different ZIDs: {debug_results}"
-            else:
-                debug_info += "No sales return found with this transaction ID in any ZID."
-
-            return HttpResponse(debug_info, status=404)
+            return None
 
         # Process the data
         header_data = None
@@ -126,8 +110,7 @@ def sales_return_print(request, transaction_id):
             'item_count': len(line_items)
         }
 
-    # Render HTML template
-    html_string = render_to_string('sales_return_print.html', {
+    return {
         'header': header_data,
         'business': business_data,
         'line_items': line_items,
@@ -135,16 +118,10 @@ def sales_return_print(request, transaction_id):
         'session_zid': session_zid,
         'transaction_id': transaction_id,
         'print_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    })
+    }
 
-    # Generate PDF using xhtml2pdf
-    result = BytesIO()
-    pdf = pisa.pisaDocument(BytesIO(html_string.encode("UTF-8")), result)
 
-    if not pdf.err:
-        # Return PDF response
-        response = HttpResponse(result.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = f'inline; filename="sales_return_{transaction_id}.pdf"'
-        return response
-    else:
-        return HttpResponse('Error generating PDF', status=500)
+@login_required
+def sales_return_print(request, transaction_id):
+    # Rendered by a Celery worker; the page waits for it and then shows the PDF
+    return submit_and_wait(request, 'sales_return', {'transaction_id': transaction_id})
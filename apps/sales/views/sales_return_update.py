@@ -14,7 +14,9 @@
 from web_project import TemplateLayout
 from apps.authentication.mixins import ZidRequiredMixin
 from apps.authentication.mixins import ModulePermissionMixin
-from apps.utils.voucher_generator import generate_voucher_number
+from apps.utils import document_cache
+from apps.utils.inventory_posting import delete_imtrn, post_imtrn
+from apps.utils.voucher_generator import reserve_voucher_numbers
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -181,6 +183,10 @@ def process_sales_return_update(self, request, transaction_id):
                 xglref = result[0]
                 logger.info(f"Found xglref: {xglref} for transaction: {transaction_id}")
 
+                # Reserve an individual voucher for every item in one allocation,
+                # before delete_imtrn locks any stock (counters first, then stock rows)
+                item_vouchers = reserve_voucher_numbers(current_zid, 'SRE', 'imtrn', 'ximtrnnum', len(cart_items))
+
                 # Step 2: Delete existing records in proper order
                 if xglref:
                     # Delete from gldetail first (child table)
@@ -197,11 +203,8 @@ def process_sales_return_update(self, request, transaction_id):
                     """, [xglref, current_zid])
                     logger.info(f"Deleted glheader record for voucher: {xglref}")
 
-                # Delete from imtrn
-                cursor.execute("""
-                    DELETE FROM imtrn
-                    WHERE xdocnum = %s AND zid = %s
-                """, [transaction_id, current_zid])
+                # Delete from imtrn (reverses stock_balance)
+                delete_imtrn(cursor, "xdocnum = %s AND zid = %s", [transaction_id, current_zid])
                 logger.info(f"Deleted imtrn records for transaction: {transaction_id}")
 
                 # Delete from imtemptdt
@@ -276,6 +279,7 @@ def process_sales_return_update(self, request, transaction_id):
                 total_inventory_value = Decimal(str(totals.get('totalInvValue', 0)))
 
                 # Step 4: Re-insert cart items into imtemptdt and imtrn
+                imtrn_rows = []
                 for idx, item in enumerate(cart_items, 1):
                     # Use 'rate' field from frontend (matches sales_return_confirm.py logic)
                     inv_value = Decimal(str(item.get('rate', 0)))
@@ -283,8 +287,8 @@ def process_sales_return_update(self, request, transaction_id):
                     item_total = quantity * inv_value
                     mkt_value = Decimal(str(item.get('amount', item_total)))
 
-                    # Generate individual voucher for each item in imtemptdt
-                    item_voucher = generate_voucher_number(current_zid, 'SRE', 'imtrn', 'ximtrnnum')
+                    # Individual voucher for this item in imtemptdt
+                    item_voucher = item_vouchers[idx - 1]
                     
                     # Insert into imtemptdt with correct column structure
                     cursor.execute("""
@@ -328,38 +332,33 @@ def process_sales_return_update(self, request, transaction_id):
                     item_year = item_date_obj.year
                     item_month = f"{item_date_obj.month:02d}"
 
-                    cursor.execute("""
-                        INSERT INTO imtrn (
-                            ztime, zutime, zid, ximtrnnum, xitem, xwh, xdate, xyear, xper, xqty, xval,
-                            xvalpost, xdoctype, xdocnum, xdocrow, xaltqty, xproj, xdateexp,
-                            xdaterec, xaction, xsign, xmember
-                        ) VALUES (
-                            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                        )
-                    """, [
-                        current_timestamp,  # ztime
-                        current_timestamp,  # zutime (update timestamp)
-                        current_zid,  # zid
-                        item_voucher,  # ximtrnnum (individual item voucher)
-                        item.get('item_code', ''),  # xitem - frontend sends item_code
-                        item_warehouse,  # xwh
-                        item_date,  # xdate
-                        item_year,  # xyear
-                        item_month,  # xper
-                        quantity,  # xqty
-                        item_total,  # xval (quantity * inv_value)
-                        item_total,  # xvalpost (same as xval)
-                        'SRE-',  # xdoctype
-                        transaction_id,  # xdocnum
-                        str(idx),  # xdocrow (row number as string)
-                        0,  # xaltqty (default 0)
-                        item_project,  # xproj
-                        item_date,  # xdateexp
-                        item_date,  # xdaterec
-                        'Return',  # xaction
-                        1,  # xsign (default 1)
-                        session_user  # xmember
-                    ])
+                    imtrn_rows.append({
+                        'ztime': current_timestamp,
+                        'zutime': current_timestamp,  # update timestamp
+                        'zid': current_zid,
+                        'ximtrnnum': item_voucher,  # individual item voucher
+                        'xitem': item.get('item_code', ''),  # frontend sends item_code
+                        'xwh': item_warehouse,
+                        'xdate': item_date,
+                        'xyear': item_year,
+                        'xper': item_month,
+                        'xqty': quantity,
+                        'xval': item_total,  # quantity * inv_value
+                        'xvalpost': item_total,  # same as xval
+                        'xdoctype': 'SRE-',
+                        'xdocnum': transaction_id,
+                        'xdocrow': str(idx),  # row number as string
+                        'xaltqty': 0,
+                        'xproj': item_project,
+                        'xdateexp': item_date,
+                        'xdaterec': item_date,
+                        'xaction': 'Return',
+                        'xsign': 1,
+                        'xmember': session_user,
+                    })
+
+                # Insert into imtrn and update stock_balance
+                post_imtrn(cursor, imtrn_rows)
 
                 # Step 5: Re-insert GL entries if xglref exists
                 if xglref:
@@ -508,6 +507,7 @@ def process_sales_return_update(self, request, transaction_id):
                         total_inventory_value, Decimal('0.00'), xsub_values[3]
                     ])
 
+            document_cache.invalidate(current_zid, 'sales_return', transaction_id)
             logger.info(f"Sales return {transaction_id} updated successfully by {session_user}")
 
             return JsonResponse({
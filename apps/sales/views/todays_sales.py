@@ -3,11 +3,29 @@
 from django.views.decorators.csrf import csrf_protect
 from django.views.decorators.http import require_http_methods
 from django.db import connection
-from datetime import date
+from apps.utils.datatables import DATE, NUMBER, fetch
+from datetime import date, timedelta
 import logging
 
 logger = logging.getLogger(__name__)
 
+# The day is a range on xdate so the list uses the (zid, xdate, xordernum) index
+TODAYS_SALES = {
+    'name': 'todays_sales',
+    'from': 'opord',
+    'where': "zid = %s AND xdate >= %s AND xdate < %s AND xstatusord = 'Confirmed'",
+    'key': ['xordernum'],
+    'columns': [
+        {'expr': 'xdate', 'type': DATE, 'keyset': True},
+        {'expr': 'xordernum', 'keyset': True},
+        {'expr': 'xcus'},
+        {'expr': 'xsltype'},
+        {'expr': 'xdtcomm', 'type': NUMBER},
+        {'expr': 'xtotamt', 'type': NUMBER},
+    ],
+    'order': (0, 'desc'),
+}
+
 @login_required
 @csrf_protect
 @require_http_methods(["GET"])
@@ -21,45 +39,26 @@ def todays_sales_ajax(request):
         if not current_zid:
             return JsonResponse({'error': 'No business context found'}, status=400)
 
-        # Get today's date
         today = date.today()
-
-        with connection.cursor() as cursor:
-            # Simple query to get today's confirmed sales
-            query = """
-                SELECT xcus, xordernum, xtotamt, xsltype, xdtcomm, xdate
-                FROM opord
-                WHERE zid = %s 
-                AND DATE(xdate) = %s 
-                AND xstatusord = 'Confirmed'
-                ORDER BY xdate DESC
-            """
-
-            cursor.execute(query, [current_zid, today])
-            rows = cursor.fetchall()
-
-            # Format data for response
-            data = []
-            for row in rows:
-                data.append([
-                    row[5].strftime('%Y-%m-%d') if row[5] else '',  # xdate
-                    row[1] or '',  # xordernum
-                    row[0] or '',  # xcus
-                    'Confirmed',   # status (always confirmed)
-                    row[3] or '',  # xsltype (Cash/Card Sale)
-                    '',            # warehouse (placeholder)
-                    row[3] or '',  # payment type (xsltype)
-                    float(row[4]) if row[4] else 0.00,  # xdtcomm (Card Amount)
-                    float(row[2]) if row[2] else 0.00   # xtotamt (Total Amount)
-                ])
-
-            response = {
-                'data': data,
-                'recordsTotal': len(data),
-                'recordsFiltered': len(data)
-            }
-
-            return JsonResponse(response)
+        result = fetch(TODAYS_SALES, request.GET, [current_zid, today, today + timedelta(days=1)])
+
+        # Format data for response
+        data = []
+        for row in result['data']:
+            data.append([
+                row[0].strftime('%Y-%m-%d') if row[0] else '',  # xdate
+                row[1] or '',  # xordernum
+                row[2] or '',  # xcus
+                'Confirmed',   # status (always confirmed)
+                row[3] or '',  # xsltype (Cash/Card Sale)
+                '',            # warehouse (placeholder)
+                row[3] or '',  # payment type (xsltype)
+                float(row[4]) if row[4] else 0.00,  # xdtcomm (Card Amount)
+                float(row[5]) if row[5] else 0.00   # xtotamt (Total Amount)
+            ])
+        result['data'] = data
+
+        return JsonResponse(result)
 
     except Exception as e:
         logger.error(f"Error in todays_sales_ajax: {str(e)}")
@@ -89,7 +88,8 @@ def todays_sales_summary(request):
             summary_query = """
                 SELECT 
                     COUNT(*) as total_orders,
-                    SUM(xtotamt) as total_sales
+                    SUM(xtotamt) as total_sales,
+                    SUM(xdtcomm) as card_sales
                 FROM opord
                 WHERE zid = %s 
                 AND DATE(xdate) = %s 
@@ -103,6 +103,7 @@ def todays_sales_summary(request):
                 'success': True,
                 'total_orders': summary_row[0] or 0,
                 'total_sales': float(summary_row[1]) if summary_row[1] else 0.00,
+                'card_sales': float(summary_row[2]) if summary_row[2] else 0.00,
                 'date': today.strftime('%Y-%m-%d')
             }
 
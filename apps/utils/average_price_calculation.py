@@ -1,50 +1,82 @@
 """
 Average Price Calculation Utility for Inventory Management
+
+Prices are read from the item_cost table, which holds SUM(xval * xsign) and
+SUM(xqty * xsign) per item and is kept current by apps.utils.inventory_posting.
+When the requested date is earlier than the item's latest posting (a
+back-dated lookup), or the item has no item_cost row yet, the price is
+aggregated from imtrn as before.
 """
 
 from django.db import connection
 from datetime import datetime
+from decimal import Decimal
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _is_current(xdatelast, current_date: str) -> bool:
+    """True when an item_cost row already reflects every posting up to current_date"""
+    if xdatelast is None:
+        return True
+    return xdatelast <= datetime.strptime(current_date[:10], '%Y-%m-%d').date()
+
+
+def _decimal(value) -> Decimal:
+    """NULL-safe Decimal of a quantity, value or price"""
+    return Decimal(str(value)) if value is not None else Decimal('0')
+
+
+def _average(xqty: Decimal, xval: Decimal) -> Decimal:
+    """Average price from stock totals; zero when there is no stock on hand"""
+    return xval / xqty if xqty > 0 else Decimal('0')
+
+
 def get_average_price(zid: int, xitem: str, current_date: str = None) -> float:
     """
     Calculate average price for an item based on historical transactions
-    
+
     Args:
         zid: Zone/Company ID
         xitem: Item code
         current_date: Date for calculation (defaults to current date)
-        
+
     Returns:
         Average price as float
-        
+
     Example:
         avg_price = get_average_price(100001, '02-007')
         # Returns: 150.75
     """
-    
+
     if current_date is None:
         current_date = datetime.now().strftime('%Y-%m-%d')
-    
+
     try:
         with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT xavg, xdatelast FROM item_cost WHERE zid = %s AND xitem = %s",
+                [zid, xitem]
+            )
+            cost_row = cursor.fetchone()
+            if cost_row and _is_current(cost_row[1], current_date):
+                return float(cost_row[0] or 0)
+
             sql = """
-                SELECT CASE 
-                         WHEN SUM(xqty * xsign) > 0 THEN SUM(xval * xsign) / SUM(xqty * xsign) 
-                         ELSE 0 
-                       END AS average 
-                FROM imtrn 
-                WHERE zid = %s 
-                  AND xitem = %s 
+                SELECT CASE
+                         WHEN SUM(xqty * xsign) > 0 THEN SUM(xval * xsign) / SUM(xqty * xsign)
+                         ELSE 0
+                       END AS average
+                FROM imtrn
+                WHERE zid = %s
+                  AND xitem = %s
                   AND xdate <= %s
             """
-            
+
             cursor.execute(sql, [zid, xitem, current_date])
             result = cursor.fetchone()
-            
+
             if result and result[0] is not None:
                 average_price = float(result[0])
                 logger.info(f"Average price for item {xitem}: {average_price}")
@@ -52,69 +84,130 @@ def get_average_price(zid: int, xitem: str, current_date: str = None) -> float:
             else:
                 logger.warning(f"No average price found for item {xitem}, returning 0")
                 return 0.0
-                
+
     except Exception as e:
         logger.error(f"Error calculating average price for item {xitem}: {str(e)}")
         return 0.0
 
 
+def get_item_totals_bulk(zid: int, items: list, current_date: str = None) -> dict:
+    """
+    Stock quantity and value totals for multiple items in bulk
+
+    Args:
+        zid: Zone/Company ID
+        items: List of item codes
+        current_date: Date for calculation (defaults to current date)
+
+    Returns:
+        Dictionary with item codes as keys and (quantity, value) Decimal tuples,
+        i.e. SUM(xqty * xsign) and SUM(xval * xsign) up to current_date
+
+    Example:
+        totals = get_item_totals_bulk(100001, ['02-007'])
+        # Returns: {'02-007': (Decimal('4.000'), Decimal('603.000000'))}
+    """
+
+    if current_date is None:
+        current_date = datetime.now().strftime('%Y-%m-%d')
+
+    if not items:
+        return {}
+
+    result_dict = {item: (Decimal('0'), Decimal('0')) for item in items}
+
+    with connection.cursor() as cursor:
+        placeholders = ','.join(['%s'] * len(items))
+        cursor.execute(
+            f"SELECT xitem, xqty, xval, xdatelast FROM item_cost WHERE zid = %s AND xitem IN ({placeholders})",
+            [zid] + list(items)
+        )
+        stale_items = set(items)
+        for xitem, xqty, xval, xdatelast in cursor.fetchall():
+            if _is_current(xdatelast, current_date):
+                result_dict[xitem] = (_decimal(xqty), _decimal(xval))
+                stale_items.discard(xitem)
+
+        if stale_items:
+            stale_items = sorted(stale_items)
+            placeholders = ','.join(['%s'] * len(stale_items))
+            cursor.execute(f"""
+                SELECT xitem, SUM(xqty * xsign), SUM(xval * xsign)
+                FROM imtrn
+                WHERE zid = %s
+                  AND xitem IN ({placeholders})
+                  AND xdate <= %s
+                GROUP BY xitem
+            """, [zid] + stale_items + [current_date])
+            for xitem, xqty, xval in cursor.fetchall():
+                result_dict[xitem] = (_decimal(xqty), _decimal(xval))
+
+    logger.info(f"Bulk item totals calculated for {len(items)} items ({len(stale_items)} from imtrn)")
+    return result_dict
+
+
 def get_average_prices_bulk(zid: int, items: list, current_date: str = None) -> dict:
     """
     Calculate average prices for multiple items in bulk
-    
+
     Args:
         zid: Zone/Company ID
         items: List of item codes
         current_date: Date for calculation (defaults to current date)
-        
+
     Returns:
         Dictionary with item codes as keys and average prices as values
-        
+
     Example:
         prices = get_average_prices_bulk(100001, ['02-007', '03-002'])
         # Returns: {'02-007': 150.75, '03-002': 324.0}
     """
-    
-    if current_date is None:
-        current_date = datetime.now().strftime('%Y-%m-%d')
-    
-    result_dict = {}
-    
+
+    if not items:
+        return {}
+
     try:
-        with connection.cursor() as cursor:
-            # Create placeholders for IN clause
-            placeholders = ','.join(['%s'] * len(items))
-            
-            sql = f"""
-                SELECT xitem,
-                       CASE 
-                         WHEN SUM(xqty * xsign) > 0 THEN SUM(xval * xsign) / SUM(xqty * xsign) 
-                         ELSE 0 
-                       END AS average 
-                FROM imtrn 
-                WHERE zid = %s 
-                  AND xitem IN ({placeholders})
-                  AND xdate <= %s
-                GROUP BY xitem
-            """
-            
-            params = [zid] + items + [current_date]
-            cursor.execute(sql, params)
-            results = cursor.fetchall()
-            
-            # Initialize all items with 0
-            for item in items:
-                result_dict[item] = 0.0
-            
-            # Update with actual values
-            for row in results:
-                xitem, average_price = row
-                result_dict[xitem] = float(average_price) if average_price is not None else 0.0
-            
-            logger.info(f"Bulk average prices calculated for {len(items)} items")
-            return result_dict
-            
+        totals = get_item_totals_bulk(zid, items, current_date)
+        return {xitem: float(_average(xqty, xval)) for xitem, (xqty, xval) in totals.items()}
+
     except Exception as e:
         logger.error(f"Error calculating bulk average prices: {str(e)}")
         # Return dictionary with all items set to 0
-        return {item: 0.0 for item in items}
\ No newline at end of file
+        return {item: 0.0 for item in items}
+
+
+def receipt_line_values(zid: int, lines: list, current_date: str = None) -> list:
+    """
+    Value receipt lines at the average price, as if they were posted one by one
+
+    Each line is valued at the item's average including the lines before it on
+    the same document, falling back to the line rate when that average is zero.
+    A repeated item therefore gets the same values as when every line was
+    posted before the next one was priced.
+
+    Args:
+        zid: Zone/Company ID
+        lines: List of (xitem, quantity, rate) tuples in posting order
+        current_date: Date for calculation (defaults to current date)
+
+    Returns:
+        List of (average price, value) Decimal tuples, one per line; values are
+        rounded to 6 decimal places like imtrn.xval
+
+    Example:
+        values = receipt_line_values(100001, [('02-007', 2, 150), ('02-007', 1, 160)])
+        # Returns: [(Decimal('150'), Decimal('300.000000')), (Decimal('150'), Decimal('150.000000'))]
+    """
+    totals = get_item_totals_bulk(zid, list({str(line[0]) for line in lines}), current_date)
+
+    values = []
+    for xitem, qty, rate in lines:
+        qty = _decimal(qty)
+        xqty, xval = totals[str(xitem)]
+        avg_price = _average(xqty, xval)
+        if avg_price == 0:
+            avg_price = _decimal(rate)
+        line_value = (qty * avg_price).quantize(Decimal('0.000000'))
+        totals[str(xitem)] = (xqty + qty, xval + line_value)
+        values.append((avg_price, line_value))
+    return values
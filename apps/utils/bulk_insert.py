@@ -0,0 +1,114 @@
+"""
+Multi-row INSERT and COPY helpers for raw SQL writers
+"""
+import io
+
+
+# Keeps each statement well below PostgreSQL's 65535 bind parameter limit
+# for the widest legacy tables (imtrn/opodt have ~25 columns per row).
+DEFAULT_CHUNK_SIZE = 500
+
+
+def insert_rows(cursor, table: str, rows, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Insert many rows with one INSERT ... VALUES (...), (...) statement per chunk
+
+    Args:
+        cursor: Open database cursor (inside the caller's transaction)
+        table: Table name (e.g., 'opodt', 'imtrn')
+        rows: List of dicts mapping column name to value; all rows must have
+              the same columns in the same order
+        chunk_size: Maximum rows per statement (default: 500)
+
+    Returns:
+        Number of rows inserted
+
+    Example:
+        insert_rows(cursor, 'opodt', [{'zid': 100001, 'xordernum': 'CO--000042', 'xrow': '1', ...}])
+    """
+    if not rows:
+        return 0
+
+    columns = list(rows[0].keys())
+    for row in rows:
+        if list(row.keys()) != columns:
+            raise ValueError(f"All rows inserted into {table} must have the same columns")
+
+    row_sql = f"({', '.join(['%s'] * len(columns))})"
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        params = []
+        for row in chunk:
+            params.extend(row.values())
+        cursor.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES {', '.join([row_sql] * len(chunk))}",
+            params
+        )
+    return len(rows)
+
+
+# Bytes handed to PostgreSQL per COPY read
+COPY_BUFFER_SIZE = 1 << 20
+
+
+def _copy_value(value) -> str:
+    """One field in COPY text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+class _CopyStream(io.RawIOBase):
+    """Read-only file over an iterator of row tuples, encoded lazily as COPY text"""
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._buffer = b''
+        self.count = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = COPY_BUFFER_SIZE
+        lines = []
+        length = len(self._buffer)
+        while length < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            line = ('\t'.join(_copy_value(value) for value in row) + '\n').encode()
+            lines.append(line)
+            length += len(line)
+            self.count += 1
+        data = self._buffer + b''.join(lines)
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def copy_rows(cursor, table: str, columns, rows) -> int:
+    """
+    Stream rows into a table with PostgreSQL COPY ... FROM STDIN
+
+    Rows are encoded as they are read, so an iterator of any length can be
+    loaded without building it in memory. Much faster than insert_rows for
+    large loads, but PostgreSQL only.
+
+    Args:
+        cursor: Open database cursor (inside the caller's transaction)
+        table: Table name (e.g., 'imtrn')
+        columns: Column names, in the order of the values in each row
+        rows: Iterable of tuples
+
+    Returns:
+        Number of rows copied
+
+    Example:
+        copy_rows(cursor, 'caitem', ['zid', 'xitem', 'xdesc'], ((100001, f'IT-{n:06d}', 'Bolt') for n in range(100000)))
+    """
+    stream = _CopyStream(rows)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", stream, size=COPY_BUFFER_SIZE)
+    return stream.count
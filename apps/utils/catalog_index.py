@@ -0,0 +1,203 @@
+"""
+In-process POS catalog index
+
+Loads caitem for one business into memory once and answers the POS search box
+without touching the database. Every item gets a lower-cased search text
+(code, description and barcode); each 3-character gram of that text maps to
+the sorted list of item positions containing it, so a search only verifies
+the items in the shortest posting list for the term. Two-character terms scan
+the texts in item order and stop once the page is full. Barcode scans are
+not served from here: pos_scan_api looks the code up in caitem directly.
+
+Indexes are rebuilt when:
+  * invalidate_catalog(zid) bumps the per-zid version in the shared cache
+    (called by the item views in this project), or
+  * the caitem fingerprint (row count and latest zutime) changes; it is probed
+    at most once every POS_CATALOG_CHECK_SECONDS, which picks up items written
+    by the legacy system directly into caitem.
+
+Stock is never cached here; callers merge it in from stock_balance for the
+handful of items they return.
+"""
+
+from array import array
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'pos_catalog_version:{zid}'
+CHECK_SECONDS = getattr(settings, 'POS_CATALOG_CHECK_SECONDS', 30)
+
+# Search text separator; never part of a gram, so grams do not span fields
+_SEPARATOR = '\n'
+
+_indexes = {}
+_build_locks = {}
+_locks_guard = threading.Lock()
+
+
+class CatalogIndex:
+    """
+    Search index over the caitem rows of one business
+
+    Items are kept as tuples ordered by xitem:
+    (xitem, xdesc, xstdprice, xbarcode, xstdcost, xunitstk)
+    """
+
+    FIELDS = ('xitem', 'xdesc', 'xstdprice', 'xbarcode', 'xstdcost', 'xunitstk')
+
+    def __init__(self, rows, version=0, fingerprint=None):
+        self.items = sorted(rows, key=lambda row: row[0])
+        self.version = version
+        self.fingerprint = fingerprint
+        self.checked_at = time.monotonic()
+
+        self._texts = []
+        postings = {}
+
+        for position, (xitem, xdesc, _, xbarcode, _, _) in enumerate(self.items):
+            text = _SEPARATOR.join(
+                (value or '').lower() for value in (xitem, xdesc, xbarcode)
+            )
+            self._texts.append(text)
+
+            for gram in self._grams(text):
+                positions = postings.get(gram)
+                if positions is None:
+                    postings[gram] = [position]
+                else:
+                    positions.append(position)
+
+        # Compact posting lists: 4 bytes per entry instead of a Python int
+        self._grams_index = {gram: array('I', positions) for gram, positions in postings.items()}
+
+    @staticmethod
+    def _grams(text):
+        """Distinct 3-character grams of text that stay inside one field"""
+        return {
+            gram for gram in (text[start:start + 3] for start in range(len(text) - 2))
+            if _SEPARATOR not in gram
+        }
+
+    def __len__(self):
+        return len(self.items)
+
+    def search(self, term: str, offset: int = 0, limit: int = 20):
+        """
+        Items whose code, description or barcode contains term (case-insensitive)
+
+        Args:
+            term: Search text, at least 2 characters
+            offset: Number of matches to skip
+            limit: Maximum number of matches to return
+
+        Returns:
+            Tuple of (list of item tuples ordered by xitem, True when more
+            matches exist after this page)
+        """
+        term = (term or '').lower()
+        if len(term) < 2:
+            return [], False
+
+        if len(term) == 2:
+            shortest = range(len(self.items))
+        else:
+            shortest = None
+            for start in range(len(term) - 2):
+                postings = self._grams_index.get(term[start:start + 3])
+                if postings is None:
+                    return [], False
+                if shortest is None or len(postings) < len(shortest):
+                    shortest = postings
+
+        matches = []
+        wanted = offset + limit + 1
+        texts = self._texts
+        for position in shortest:
+            if term in texts[position]:
+                matches.append(position)
+                if len(matches) == wanted:
+                    break
+
+        page = matches[offset:offset + limit]
+        return [self.items[position] for position in page], len(matches) > offset + limit
+
+
+def _current_version(zid: int) -> int:
+    return cache.get(VERSION_KEY.format(zid=zid), 0)
+
+
+def _fingerprint(cursor, zid: int):
+    cursor.execute("SELECT COUNT(*), MAX(zutime) FROM caitem WHERE zid = %s", [zid])
+    return tuple(cursor.fetchone())
+
+
+def _build(zid: int, version: int) -> CatalogIndex:
+    started = time.perf_counter()
+    with connection.cursor() as cursor:
+        fingerprint = _fingerprint(cursor, zid)
+        cursor.execute(
+            f"SELECT {', '.join(CatalogIndex.FIELDS)} FROM caitem WHERE zid = %s AND xitem IS NOT NULL",
+            [zid]
+        )
+        index = CatalogIndex(cursor.fetchall(), version=version, fingerprint=fingerprint)
+    logger.info(
+        f"Built POS catalog index for zid {zid}: {len(index)} items, version {version}, "
+        f"{(time.perf_counter() - started) * 1000:.0f} ms"
+    )
+    return index
+
+
+def get_catalog(zid) -> CatalogIndex:
+    """
+    Return the up-to-date catalog index for a business, building it if needed
+
+    Args:
+        zid: Zone/Company ID
+
+    Example:
+        items, more = get_catalog(100001).search('bolt', offset=0, limit=20)
+    """
+    zid = int(zid)
+    version = _current_version(zid)
+    index = _indexes.get(zid)
+
+    if index is not None and index.version == version:
+        if time.monotonic() - index.checked_at < CHECK_SECONDS:
+            return index
+        with connection.cursor() as cursor:
+            fingerprint = _fingerprint(cursor, zid)
+        if fingerprint == index.fingerprint:
+            index.checked_at = time.monotonic()
+            return index
+
+    with _locks_guard:
+        build_lock = _build_locks.setdefault(zid, threading.Lock())
+
+    with build_lock:
+        current = _indexes.get(zid)
+        if current is not None and current is not index and current.version == version:
+            # Another thread rebuilt it while we were waiting
+            return current
+        index = _build(zid, version)
+        _indexes[zid] = index
+        return index
+
+
+def invalidate_catalog(zid) -> None:
+    """
+    Mark the catalog index of a business as stale in every process
+
+    Call after any change to caitem rows (create, edit, delete).
+    """
+    key = VERSION_KEY.format(zid=int(zid))
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+    logger.info(f"Invalidated POS catalog index for zid {zid}")
@@ -0,0 +1,248 @@
+"""
+Server-side DataTables list engine
+
+The list endpoints declare their query once and let fetch() speak the
+DataTables protocol (draw/start/length/search[value]/order[0][...]):
+
+    SALES_LIST = {
+        'name': 'sales_item_list',
+        'from': 'opord',
+        'where': 'zid = %s',
+        'key': ['xordernum'],
+        'counter': ('opord', ''),
+        'search_index': [('opord', 'xordernum')],
+        'columns': [
+            {'expr': 'xdate', 'type': DATE, 'keyset': True},
+            {'expr': 'xordernum', 'keyset': True},
+            {'expr': 'xtotamt', 'type': NUMBER},
+        ],
+        'order': (0, 'desc'),
+    }
+    result = fetch(SALES_LIST, request.GET, [zid])
+    # {'draw', 'recordsTotal', 'recordsFiltered', 'recordsApproximate', 'data': [row tuples]}
+
+Columns are in DataTables column order; order[0][column] may only pick a
+column whose 'sortable' is not False. 'key' is a unique tiebreaker appended
+to every ORDER BY so pages are stable.
+
+Search is typed instead of casting every column to text:
+  TEXT columns: the document_search index for lists that declare
+      'search_index' (see apps.utils.document_search), else LIKE %term%
+  DATE columns: a range when the term is a date (2024-03-05), a month
+      (2024-03) or a year (2024)
+  NUMBER columns: equality when the term is a number
+
+Pagination: sorting by a 'keyset' column (backed by an index) and asking for
+the page right after one already served seeks past that page's last row
+((sort, key) < (last sort, last key)) instead of using OFFSET, so paging
+through a long list stays flat. The boundary of every page is remembered in
+the cache for DATATABLE_KEYSET_TTL seconds; any other page falls back to
+OFFSET. Keyset columns must not be NULL.
+
+Counts come from apps.utils.row_counts. A list whose rows are one
+row_counts (table, tag) slice declares it as 'counter' (the first where
+parameter is the zid); its total is kept current by bump() at the insert and
+delete sites. Other totals are cached for ROW_COUNT_FILTERED_TTL seconds.
+Searched lists may report a planner estimate, with recordsApproximate set.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from apps.utils import document_search, row_counts
+import calendar
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+TEXT = 'text'
+DATE = 'date'
+NUMBER = 'number'
+
+MAX_LENGTH = 500
+DEFAULT_KEYSET_TTL = 300
+
+
+def _int(value, default):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def date_range(term):
+    """
+    Half-open [first, after) date range a search term denotes, or None
+
+    Example:
+        date_range('2024-02') == (date(2024, 2, 1), date(2024, 3, 1))
+    """
+    for fmt in ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y'):
+        try:
+            day = datetime.strptime(term, fmt).date()
+        except ValueError:
+            continue
+        return day, date.fromordinal(day.toordinal() + 1)
+
+    try:
+        month = datetime.strptime(term, '%Y-%m').date()
+    except ValueError:
+        month = None
+    if month is not None:
+        days = calendar.monthrange(month.year, month.month)[1]
+        return month, date.fromordinal(month.toordinal() + days)
+
+    if len(term) == 4 and term.isdigit() and int(term) >= 1900:
+        return date(int(term), 1, 1), date(int(term) + 1, 1, 1)
+    return None
+
+
+def search_condition(columns, term, index=None):
+    """
+    SQL (without leading AND) and parameters matching term against the searchable columns
+
+    index is (conditions, params) from document_search.index_condition(); it
+    stands in for the TEXT columns.
+    """
+    term = term.strip()
+    if not term:
+        return '', []
+
+    dates = date_range(term)
+    try:
+        number = Decimal(term.replace(',', ''))
+    except InvalidOperation:
+        number = None
+
+    conditions, params = (list(index[0]), list(index[1])) if index else ([], [])
+    for column in columns:
+        if column.get('search') is False:
+            continue
+        kind = column.get('type', TEXT)
+        if kind == DATE:
+            if dates:
+                conditions.append(f"({column['expr']} >= %s AND {column['expr']} < %s)")
+                params.extend(dates)
+        elif kind == NUMBER:
+            if number is not None and number.is_finite():
+                conditions.append(f"{column['expr']} = %s")
+                params.append(number)
+        elif not index:
+            conditions.append(f"{column['expr']} LIKE %s")
+            params.append(f'%{term}%')
+
+    if not conditions:
+        return '1 = 0', []
+    return '(' + ' OR '.join(conditions) + ')', params
+
+
+def _signature(*parts) -> str:
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+
+
+def list_total(spec, params):
+    """Unfiltered total of a list"""
+    sql = f"SELECT COUNT(*) FROM {spec['from']} WHERE {spec['where']}"
+    if spec.get('counter'):
+        table, tag = spec['counter']
+        return row_counts.total(table, params[0], sql, params, tag)
+    return row_counts.total(
+        spec['name'], params[0], sql, params, tag=_signature(params),
+        ttl=getattr(settings, 'ROW_COUNT_FILTERED_TTL', row_counts.DEFAULT_FILTERED_TTL),
+    )
+
+
+def fetch(spec, query, params):
+    """
+    Run one DataTables draw of a declared list
+
+    Args:
+        spec: List declaration (see module docstring)
+        query: request.GET
+        params: Parameters for spec['where']
+
+    Returns:
+        Dict with draw, recordsTotal, recordsFiltered, recordsApproximate
+        (True when recordsFiltered is a planner estimate) and data (row
+        tuples in column order)
+    """
+    columns = spec['columns']
+    draw = _int(query.get('draw'), 1)
+    start = max(_int(query.get('start'), 0), 0)
+    length = _int(query.get('length'), 10)
+    if length <= 0 or length > MAX_LENGTH:
+        length = MAX_LENGTH
+
+    default_index, default_direction = spec.get('order', (0, 'desc'))
+    index = _int(query.get('order[0][column]'), default_index)
+    if not 0 <= index < len(columns) or columns[index].get('sortable') is False:
+        index = default_index
+    direction = query.get('order[0][dir]', default_direction)
+    if direction not in ('asc', 'desc'):
+        direction = default_direction
+    sort = columns[index]
+
+    where = spec['where']
+    params = list(params)
+    total = list_total(spec, params)
+    approximate = False
+
+    term = query.get('search[value]', '').strip()
+    index = None
+    if term and spec.get('search_index') and document_search.available():
+        index = document_search.index_condition(spec['search_index'], params[0], term)
+    condition, search_params = search_condition(columns, term, index)
+    if condition:
+        where = f'{where} AND {condition}'
+        params += search_params
+        filtered, approximate = row_counts.filtered(f"SELECT 1 FROM {spec['from']} WHERE {where}", params)
+    else:
+        filtered = total
+
+    # The sort column, then the tiebreaker, all in one direction
+    order_exprs = [sort['expr']] + [expr for expr in spec['key'] if expr != sort['expr']]
+    order_by = ', '.join(f'{expr} {direction}' for expr in order_exprs)
+    select = ', '.join([column['expr'] for column in columns] + order_exprs)
+
+    boundary_key = None
+    boundary = None
+    if sort.get('keyset'):
+        signature = _signature(spec['name'], where, params, order_by)
+        boundary_key = f"datatable_page:{signature}"
+        if start:
+            boundary = cache.get(f'{boundary_key}:{start}')
+
+    if boundary is not None and None not in boundary:
+        comparison = '<' if direction == 'desc' else '>'
+        placeholders = ', '.join(['%s'] * len(boundary))
+        sql = (
+            f"SELECT {select} FROM {spec['from']} WHERE {where} "
+            f"AND ({', '.join(order_exprs)}) {comparison} ({placeholders}) "
+            f"ORDER BY {order_by} LIMIT %s"
+        )
+        sql_params = params + list(boundary) + [length]
+    else:
+        sql = f"SELECT {select} FROM {spec['from']} WHERE {where} ORDER BY {order_by} LIMIT %s OFFSET %s"
+        sql_params = params + [length, start]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, sql_params)
+        rows = cursor.fetchall()
+
+    if boundary_key and len(rows) == length:
+        cache.set(
+            f'{boundary_key}:{start + length}',
+            tuple(rows[-1][len(columns):]),
+            getattr(settings, 'DATATABLE_KEYSET_TTL', DEFAULT_KEYSET_TTL),
+        )
+
+    return {
+        'draw': draw,
+        'recordsTotal': total,
+        'recordsFiltered': filtered,
+        'recordsApproximate': approximate,
+        'data': [row[:len(columns)] for row in rows],
+    }
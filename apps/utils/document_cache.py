@@ -0,0 +1,254 @@
+"""
+Render cache for printed documents
+
+Reprints are common at the counters, and each one used to re-run the
+document's joins and re-render its HTML/PDF. Rendered bytes are now kept per
+document under a content-addressed version key:
+
+    sha256(zid, kind, document number, stamp, template version)
+
+The stamp comes from one indexed lookup on the document's header row
+(STAMP_SQL: update time, status, totals), so a changed document misses
+even when nothing invalidated it. Not every edit path touches the header
+row, so edit_sales_api, po_grn_update and sales_return_update call
+invalidate(): it sets the header's zutime inside their transaction
+(TOUCH_SQL), which moves the stamp together with the edit, and drops the
+old render after commit. A render of the pre-edit document can still be
+stored after that, but only under the old version, which is never looked
+up again.
+
+A reprint is the stamp query plus a file read. The POS slip prints the
+current time and user, so for it the query results (pickled template
+context) are cached rather than the HTML, and only the template is rendered.
+
+Storage (DOCUMENT_CACHE_BACKEND):
+  'disk' (default): one file per document under DOCUMENT_CACHE_ROOT, shared by
+      every worker on the host. Reads refresh the file time; once the files
+      exceed DOCUMENT_CACHE_MAX_BYTES the least recently used are deleted.
+  'cache': the default Django cache (Redis in production). Eviction is
+      Redis' own maxmemory-policy; entries expire after DOCUMENT_CACHE_TIMEOUT.
+
+Example:
+    content, version = lookup(zid, 'invoice', xordernum)
+    if content is None:
+        content = render_invoice(...)
+        store(zid, 'invoice', xordernum, version, content)
+"""
+
+from pathlib import Path
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+import hashlib
+import logging
+import os
+import re
+import shutil
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TIMEOUT = 7 * 24 * 60 * 60
+
+# Eviction trims the disk cache to this share of DOCUMENT_CACHE_MAX_BYTES
+EVICT_TO = 0.9
+
+# Bump a document's template_version when its template (or the context it
+# gets) changes, so old renders are never served
+DOCUMENTS = {
+    'invoice': {'template_version': 1, 'extension': 'pdf'},
+    'pos_slip': {'template_version': 1, 'extension': 'pickle'},  # Template context, see above
+    'po_req': {'template_version': 1, 'extension': 'pdf'},
+    'po_grn': {'template_version': 1, 'extension': 'pdf'},
+    'sales_return': {'template_version': 1, 'extension': 'pdf'},
+}
+
+_ORDER_STAMP = """
+    SELECT zutime, xstatusord, xtotamt FROM opord
+    WHERE zid = %s AND xordernum = %s
+"""
+
+# kind -> query returning one row for the document, or none if it is missing
+STAMP_SQL = {
+    'invoice': _ORDER_STAMP,
+    'pos_slip': _ORDER_STAMP,
+    # The requisition prints current stock of its items, so their latest
+    # stock_balance change is part of the stamp
+    'po_req': """
+        SELECT po.xstatuspor, po.xtotamt, po.xdate,
+               (SELECT MAX(b.zutime) FROM poodt d
+                JOIN stock_balance b ON b.zid = d.zid AND b.xitem = d.xitem
+                WHERE d.zid = po.zid AND d.xpornum = po.xpornum)
+        FROM poord po
+        WHERE po.zid = %s AND po.xpornum = %s
+    """,
+    'po_grn': """
+        SELECT zutime, xstatusgrn, xtotamt FROM pogrn
+        WHERE zid = %s AND xgrnnum = %s
+    """,
+    'sales_return': """
+        SELECT zutime, xstatustrn FROM imtemptrn
+        WHERE zid = %s AND ximtmptrn = %s
+    """,
+}
+
+# kind -> update moving the header's zutime, and so the stamp (see invalidate)
+TOUCH_SQL = {
+    'invoice': "UPDATE opord SET zutime = %s WHERE zid = %s AND xordernum = %s",
+    'pos_slip': "UPDATE opord SET zutime = %s WHERE zid = %s AND xordernum = %s",
+    'po_grn': "UPDATE pogrn SET zutime = %s WHERE zid = %s AND xgrnnum = %s",
+    'sales_return': "UPDATE imtemptrn SET zutime = %s WHERE zid = %s AND ximtmptrn = %s",
+}
+
+_UNSAFE = re.compile(r'[^A-Za-z0-9._-]')
+_evict_lock = threading.Lock()
+
+
+def _backend():
+    return getattr(settings, 'DOCUMENT_CACHE_BACKEND', 'disk')
+
+
+def _root() -> Path:
+    return Path(getattr(settings, 'DOCUMENT_CACHE_ROOT', Path(settings.MEDIA_ROOT) / 'document_cache'))
+
+
+def _document_dir(zid, kind, number) -> Path:
+    return _root() / str(int(zid)) / kind / _UNSAFE.sub('_', str(number))
+
+
+def _cache_key(zid, kind, number) -> str:
+    return f'document_cache:{int(zid)}:{kind}:{hashlib.md5(str(number).encode()).hexdigest()}'
+
+
+def document_version(zid, kind, number):
+    """Version key for a document as it is now, or None if it does not exist"""
+    with connection.cursor() as cursor:
+        cursor.execute(STAMP_SQL[kind], [zid, number])
+        stamp = cursor.fetchone()
+    if stamp is None:
+        return None
+
+    parts = [int(zid), kind, str(number), [str(value) for value in stamp], DOCUMENTS[kind]['template_version']]
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def lookup(zid, kind, number):
+    """
+    Cached render of a document
+
+    Returns:
+        Tuple of (bytes or None, version). version is None when the document
+        does not exist; pass it to store() after rendering a miss.
+    """
+    version = document_version(zid, kind, number)
+    if version is None:
+        return None, None
+
+    if _backend() == 'cache':
+        entry = cache.get(_cache_key(zid, kind, number))
+        return (entry[1] if entry and entry[0] == version else None), version
+
+    path = _document_dir(zid, kind, number) / f"{version}.{DOCUMENTS[kind]['extension']}"
+    try:
+        content = path.read_bytes()
+    except FileNotFoundError:
+        return None, version
+    try:
+        os.utime(path)  # LRU: most recently used
+    except OSError:
+        pass
+    return content, version
+
+
+def store(zid, kind, number, version, content):
+    """Keep a render under its version, replacing older renders of the document; never raises"""
+    if version is None:
+        return
+    try:
+        if _backend() == 'cache':
+            cache.set(_cache_key(zid, kind, number), (version, content),
+                      getattr(settings, 'DOCUMENT_CACHE_TIMEOUT', DEFAULT_TIMEOUT))
+            return
+
+        directory = _document_dir(zid, kind, number)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{version}.{DOCUMENTS[kind]['extension']}"
+        # Write under a temporary name so a reader never sees a partial file
+        temporary = directory / f'.{version}.{os.getpid()}.{threading.get_ident()}.part'
+        temporary.write_bytes(content)
+        os.replace(temporary, path)
+        for stale in directory.iterdir():
+            if stale != path and not stale.name.startswith('.'):
+                stale.unlink(missing_ok=True)
+        evict()
+    except Exception as e:
+        logger.error(f"Could not cache {kind} {number} for zid {zid}: {str(e)}")
+
+
+def _delete(zid, kinds, numbers):
+    for kind in kinds:
+        for number in numbers:
+            if _backend() == 'cache':
+                cache.delete(_cache_key(zid, kind, number))
+            else:
+                shutil.rmtree(_document_dir(zid, kind, number), ignore_errors=True)
+
+
+def invalidate(zid, kinds, *numbers):
+    """
+    Retire the cached renders of edited documents
+
+    Call inside the edit's transaction: the headers' zutime is set now, so
+    the edit and the new version commit together, and the old renders are
+    deleted once the transaction commits.
+
+    Example:
+        invalidate(zid, ['invoice', 'pos_slip'], transaction_id)
+    """
+    if isinstance(kinds, str):
+        kinds = [kinds]
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        for sql in dict.fromkeys(TOUCH_SQL[kind] for kind in kinds if kind in TOUCH_SQL):
+            for number in numbers:
+                cursor.execute(sql, [now, zid, number])
+    transaction.on_commit(lambda: _delete(zid, kinds, numbers))
+
+
+def evict(max_bytes=None) -> int:
+    """Delete least recently used files until the disk cache fits; returns files removed"""
+    max_bytes = max_bytes or getattr(settings, 'DOCUMENT_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+    if not _evict_lock.acquire(blocking=False):
+        return 0  # Another thread is already trimming
+    try:
+        files = []
+        total = 0
+        for directory, _, names in os.walk(_root()):
+            for name in names:
+                if name.startswith('.'):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        if total <= max_bytes:
+            return 0
+
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= max_bytes * EVICT_TO:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+    finally:
+        _evict_lock.release()
@@ -0,0 +1,140 @@
+"""
+Search index for the document lists
+
+The list pages' search box used to match %term% against every header
+column, with dates and amounts cast to text. None of that can use an index,
+so every search scanned opord, imtemptrn, poord or pogrn.
+
+Every document header now has one row in document_search (model
+apps.crossapp.models.DocumentSearch): its searchable fields joined into
+search_text (upper case, trigram indexed for substring matches) and
+search_vector (tsvector, GIN indexed for word matches). Triggers on the
+header tables keep it current on insert, delete and updates of the indexed
+columns. Migration 0006 installs them from SEARCH_DOCUMENTS and indexes
+the existing rows; the rebuild_document_search command re-indexes them.
+
+apps.utils.datatables uses index_condition() for lists that declare a
+'search_index'. Every matching document is kept, as with the LIKE search it
+replaces; the page is ordered and limited by the list query, and a large
+match count is estimated by apps.utils.row_counts. PostgreSQL only; other
+databases keep the LIKE search.
+"""
+
+from django.db import connection
+
+# kind (source table) -> number column and the fields that are searchable.
+# Fields are SQL over the NEW row (trigger) or the table alias d (backfill);
+# {row} is replaced with either.
+SEARCH_DOCUMENTS = {
+    'opord': {
+        'number': 'xordernum',
+        'fields': ['xordernum', 'xstatusord', 'xwh', 'xsltype', 'xsalescat', 'xcus', 'xmobile'],
+    },
+    'imtemptrn': {
+        'number': 'ximtmptrn',
+        'fields': ['ximtmptrn', 'xstatustrn', 'xwh', 'xglref', 'xref', 'xsup', 'xcus'],
+    },
+    'poord': {
+        'number': 'xpornum',
+        'fields': [
+            'xpornum', 'xstatuspor', 'xsup', 'xwh',
+            '(SELECT s.xshort FROM casup s WHERE s.zid = {row}.zid AND s.xsup = {row}.xsup)',
+        ],
+    },
+    'pogrn': {
+        'number': 'xgrnnum',
+        'fields': [
+            'xgrnnum', 'xpornum', 'xstatusgrn', 'xsup', 'xwh', 'xref',
+            '(SELECT s.xshort FROM casup s WHERE s.zid = {row}.zid AND s.xsup = {row}.xsup)',
+        ],
+    },
+}
+
+
+def _document_text(kind, row):
+    fields = []
+    for field in SEARCH_DOCUMENTS[kind]['fields']:
+        fields.append(field.format(row=row) if '{row}' in field else f'{row}.{field}')
+    return f"upper(concat_ws(' ', {', '.join(fields)}))"
+
+
+def _columns(kind):
+    """Plain columns whose changes refresh the search row"""
+    return [field for field in SEARCH_DOCUMENTS[kind]['fields'] if not field.startswith('(')]
+
+
+def install_sql(kind) -> str:
+    """Trigger function and trigger keeping document_search current for one table"""
+    number = SEARCH_DOCUMENTS[kind]['number']
+    text = _document_text(kind, 'NEW')
+    return f"""
+        CREATE OR REPLACE FUNCTION {kind}_document_search() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                DELETE FROM document_search WHERE zid = OLD.zid AND kind = '{kind}' AND number = OLD.{number};
+            END IF;
+            IF TG_OP = 'DELETE' THEN
+                RETURN OLD;
+            END IF;
+            INSERT INTO document_search (zid, kind, number, search_text, search_vector)
+            VALUES (NEW.zid, '{kind}', NEW.{number}, {text}, to_tsvector('simple', {text}))
+            ON CONFLICT (zid, kind, number) DO UPDATE
+                SET search_text = EXCLUDED.search_text, search_vector = EXCLUDED.search_vector;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+
+        DROP TRIGGER IF EXISTS {kind}_document_search ON {kind};
+        CREATE TRIGGER {kind}_document_search
+            AFTER INSERT OR DELETE OR UPDATE OF {', '.join(_columns(kind))} ON {kind}
+            FOR EACH ROW EXECUTE FUNCTION {kind}_document_search();
+    """
+
+
+def uninstall_sql(kind) -> str:
+    return f"""
+        DROP TRIGGER IF EXISTS {kind}_document_search ON {kind};
+        DROP FUNCTION IF EXISTS {kind}_document_search();
+    """
+
+
+def backfill_sql(kind) -> str:
+    """Upsert the search rows of one business's documents of a kind (parameter: zid)"""
+    number = SEARCH_DOCUMENTS[kind]['number']
+    text = _document_text(kind, 'd')
+    return f"""
+        INSERT INTO document_search (zid, kind, number, search_text, search_vector)
+        SELECT DISTINCT ON (d.{number}) d.zid, '{kind}', d.{number}, {text}, to_tsvector('simple', {text})
+        FROM {kind} d
+        WHERE d.zid = %s AND d.{number} IS NOT NULL
+        ON CONFLICT (zid, kind, number) DO UPDATE
+            SET search_text = EXCLUDED.search_text, search_vector = EXCLUDED.search_vector
+    """
+
+
+def available() -> bool:
+    return connection.vendor == 'postgresql'
+
+
+def index_condition(indexes, zid, term):
+    """
+    SQL and parameters selecting documents whose search row matches term
+
+    Args:
+        indexes: List of (kind, number expression) pairs from a list declaration
+        zid: Business
+        term: Search box text
+
+    Example:
+        index_condition([('opord', 'xordernum')], 100001, 'card')
+    """
+    conditions = []
+    params = []
+    for kind, number in indexes:
+        conditions.append(
+            f"{number} IN (SELECT ds.number FROM document_search ds "
+            f"WHERE ds.zid = %s AND ds.kind = %s "
+            f"AND (ds.search_vector @@ plainto_tsquery('simple', %s) OR ds.search_text LIKE %s))"
+        )
+        params += [zid, kind, term, f'%{term.upper()}%']
+    return conditions, params
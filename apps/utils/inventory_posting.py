@@ -0,0 +1,376 @@
+"""
+Shared imtrn posting helpers that keep stock_balance and item_cost in step with imtrn
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from django.db import connection
+from apps.utils.bulk_insert import insert_rows
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _signed(amount, xsign) -> Decimal:
+    """Return amount * xsign as Decimal, treating NULLs as zero like SUM() does"""
+    if amount is None or xsign is None:
+        return Decimal('0')
+    return Decimal(str(amount)) * int(xsign)
+
+
+def _as_date(value):
+    """Normalise an xdate value (date, datetime or 'YYYY-MM-DD' string) to a date"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def apply_stock_deltas(cursor, movements) -> None:
+    """
+    Add quantity deltas to stock_balance in a single statement
+
+    Args:
+        cursor: Open database cursor (inside the caller's transaction)
+        movements: Iterable of (zid, xitem, xwh, delta) tuples
+
+    Deltas are summed per (zid, xitem, xwh) first and written in key order, so
+    concurrent postings touching the same items always lock rows in the same
+    order.
+    """
+    totals = {}
+    for zid, xitem, xwh, delta in movements:
+        if not xitem:
+            continue
+        key = (int(zid), str(xitem), str(xwh or ''))
+        totals[key] = totals.get(key, Decimal('0')) + delta
+
+    rows = [(key, delta) for key, delta in sorted(totals.items()) if delta != 0]
+    if not rows:
+        return
+
+    values_sql = ', '.join(['(%s, %s, %s, %s, NOW())'] * len(rows))
+    params = []
+    for (zid, xitem, xwh), delta in rows:
+        params.extend([zid, xitem, xwh, delta])
+
+    cursor.execute(
+        f"""
+        INSERT INTO stock_balance (zid, xitem, xwh, xqty, zutime)
+        VALUES {values_sql}
+        ON CONFLICT (zid, xitem, xwh)
+        DO UPDATE SET xqty = stock_balance.xqty + EXCLUDED.xqty, zutime = NOW()
+        """,
+        params
+    )
+
+
+def apply_cost_deltas(cursor, movements) -> None:
+    """
+    Add quantity/value deltas to item_cost in a single statement
+
+    Args:
+        cursor: Open database cursor (inside the caller's transaction)
+        movements: Iterable of (zid, xitem, qty_delta, value_delta, xdate) tuples;
+                   xdate may be None when the movement is a reversal
+
+    The average is recomputed from the new totals on every write. xdatelast
+    only ever moves forward, so a back-dated posting keeps the record exact and
+    date-bounded lookups before xdatelast fall back to imtrn.
+    """
+    totals = {}
+    for zid, xitem, qty_delta, value_delta, xdate in movements:
+        if not xitem:
+            continue
+        key = (int(zid), str(xitem))
+        qty, value, last = totals.get(key, (Decimal('0'), Decimal('0'), None))
+        xdate = _as_date(xdate)
+        if xdate is not None and (last is None or xdate > last):
+            last = xdate
+        totals[key] = (qty + qty_delta, value + value_delta, last)
+
+    rows = sorted(totals.items())
+    if not rows:
+        return
+
+    values_sql = ', '.join(['(%s, %s, %s, %s, %s, %s, NOW())'] * len(rows))
+    params = []
+    for (zid, xitem), (qty, value, last) in rows:
+        average = (value / qty) if qty > 0 else Decimal('0')
+        params.extend([zid, xitem, qty, value, average, last])
+
+    cursor.execute(
+        f"""
+        INSERT INTO item_cost (zid, xitem, xqty, xval, xavg, xdatelast, zutime)
+        VALUES {values_sql}
+        ON CONFLICT (zid, xitem)
+        DO UPDATE SET
+            xqty = item_cost.xqty + EXCLUDED.xqty,
+            xval = item_cost.xval + EXCLUDED.xval,
+            xavg = CASE
+                       WHEN item_cost.xqty + EXCLUDED.xqty > 0
+                       THEN (item_cost.xval + EXCLUDED.xval) / (item_cost.xqty + EXCLUDED.xqty)
+                       ELSE 0
+                   END,
+            xdatelast = GREATEST(item_cost.xdatelast, EXCLUDED.xdatelast),
+            zutime = NOW()
+        """,
+        params
+    )
+
+
+def post_imtrn(cursor, rows) -> int:
+    """
+    Insert inventory transactions and update stock_balance and item_cost
+
+    Args:
+        cursor: Open database cursor (inside the caller's transaction)
+        rows: List of dicts mapping imtrn column name to value, all with the
+              same columns; every row must include zid, xitem, xwh, xdate,
+              xqty, xval and xsign
+
+    Returns:
+        Number of imtrn rows inserted
+
+    Example:
+        post_imtrn(cursor, [{'zid': 100001, 'ximtrnnum': 'IS--000042', 'xitem': '02-007',
+                             'xwh': 'Fixit Gulshan', 'xqty': '2.000', 'xsign': -1, ...}])
+    """
+    if not rows:
+        return 0
+
+    insert_rows(cursor, 'imtrn', rows)
+
+    apply_stock_deltas(cursor, [
+        (row['zid'], row['xitem'], row.get('xwh'), _signed(row.get('xqty'), row.get('xsign')))
+        for row in rows
+    ])
+    apply_cost_deltas(cursor, [
+        (row['zid'], row['xitem'], _signed(row.get('xqty'), row.get('xsign')),
+         _signed(row.get('xval'), row.get('xsign')), row.get('xdate'))
+        for row in rows
+    ])
+    return len(rows)
+
+
+def delete_imtrn(cursor, where_sql: str, params) -> int:
+    """
+    Delete inventory transactions and reverse them out of stock_balance and item_cost
+
+    Args:
+        cursor: Open database cursor (inside the caller's transaction)
+        where_sql: WHERE clause body, e.g. "zid = %s AND xdocnum = %s"
+        params: Parameters for where_sql
+
+    Returns:
+        Number of imtrn rows deleted
+    """
+    cursor.execute(
+        f"DELETE FROM imtrn WHERE {where_sql} RETURNING zid, xitem, xwh, xqty, xval, xsign",
+        params
+    )
+    deleted = cursor.fetchall()
+
+    apply_stock_deltas(cursor, [
+        (zid, xitem, xwh, -_signed(xqty, xsign))
+        for zid, xitem, xwh, xqty, xval, xsign in deleted
+    ])
+    apply_cost_deltas(cursor, [
+        (zid, xitem, -_signed(xqty, xsign), -_signed(xval, xsign), None)
+        for zid, xitem, xwh, xqty, xval, xsign in deleted
+    ])
+    return len(deleted)
+
+
+def rebuild_stock_balance(cursor, zid: int = None) -> int:
+    """
+    Recompute stock_balance from imtrn (all businesses, or one zid)
+
+    The EXCLUSIVE lock waits for in-flight postings that already touched
+    stock_balance and holds back new ones until the rebuild commits, so a
+    posting is either in the recomputed snapshot or applied on top of it.
+
+    Returns:
+        Number of balance rows written
+    """
+    cursor.execute("LOCK TABLE stock_balance IN EXCLUSIVE MODE")
+
+    zid_filter = "WHERE zid = %s" if zid is not None else ""
+    params = [zid] if zid is not None else []
+    cursor.execute(f"DELETE FROM stock_balance {zid_filter}", params)
+
+    zid_filter = "AND zid = %s" if zid is not None else ""
+    cursor.execute(
+        f"""
+        INSERT INTO stock_balance (zid, xitem, xwh, xqty, zutime)
+        SELECT zid, xitem, COALESCE(xwh, ''), SUM(xqty * xsign), NOW()
+        FROM imtrn
+        WHERE xitem IS NOT NULL {zid_filter}
+        GROUP BY zid, xitem, COALESCE(xwh, '')
+        HAVING COALESCE(SUM(xqty * xsign), 0) <> 0
+        """,
+        params
+    )
+    logger.info(f"Rebuilt {cursor.rowcount} stock_balance rows for zid={zid or 'all'}")
+    return cursor.rowcount
+
+
+def rebuild_item_cost(cursor, zid: int = None) -> int:
+    """
+    Recompute item_cost from imtrn (all businesses, or one zid)
+
+    Locks item_cost the same way rebuild_stock_balance locks stock_balance.
+
+    Returns:
+        Number of item cost rows written
+    """
+    cursor.execute("LOCK TABLE item_cost IN EXCLUSIVE MODE")
+
+    zid_filter = "WHERE zid = %s" if zid is not None else ""
+    params = [zid] if zid is not None else []
+    cursor.execute(f"DELETE FROM item_cost {zid_filter}", params)
+
+    zid_filter = "AND zid = %s" if zid is not None else ""
+    cursor.execute(
+        f"""
+        INSERT INTO item_cost (zid, xitem, xqty, xval, xavg, xdatelast, zutime)
+        SELECT
+            zid,
+            xitem,
+            COALESCE(SUM(xqty * xsign), 0),
+            COALESCE(SUM(xval * xsign), 0),
+            CASE
+                WHEN SUM(xqty * xsign) > 0 THEN SUM(xval * xsign) / SUM(xqty * xsign)
+                ELSE 0
+            END,
+            MAX(xdate),
+            NOW()
+        FROM imtrn
+        WHERE xitem IS NOT NULL {zid_filter}
+        GROUP BY zid, xitem
+        """,
+        params
+    )
+    logger.info(f"Rebuilt {cursor.rowcount} item_cost rows for zid={zid or 'all'}")
+    return cursor.rowcount
+
+
+def find_stock_balance_mismatches(cursor, zid: int = None, limit: int = 100) -> list:
+    """
+    Compare stock_balance with a fresh aggregation of imtrn
+
+    Returns:
+        List of dicts with zid, xitem, xwh, balance_qty and imtrn_qty for
+        every key where the two disagree (at most limit rows)
+    """
+    zid_filter = "AND zid = %s" if zid is not None else ""
+    params = [zid, zid] if zid is not None else []
+    cursor.execute(
+        f"""
+        SELECT
+            COALESCE(b.zid, t.zid) AS zid,
+            COALESCE(b.xitem, t.xitem) AS xitem,
+            COALESCE(b.xwh, t.xwh) AS xwh,
+            COALESCE(b.xqty, 0) AS balance_qty,
+            COALESCE(t.xqty, 0) AS imtrn_qty
+        FROM (
+            SELECT zid, xitem, xwh, xqty FROM stock_balance WHERE 1 = 1 {zid_filter}
+        ) b
+        FULL OUTER JOIN (
+            SELECT zid, xitem, COALESCE(xwh, '') AS xwh, SUM(xqty * xsign) AS xqty
+            FROM imtrn
+            WHERE xitem IS NOT NULL {zid_filter}
+            GROUP BY zid, xitem, COALESCE(xwh, '')
+        ) t
+            ON b.zid = t.zid AND b.xitem = t.xitem AND b.xwh = t.xwh
+        WHERE COALESCE(b.xqty, 0) <> COALESCE(t.xqty, 0)
+        ORDER BY 1, 2, 3
+        LIMIT %s
+        """,
+        params + [limit]
+    )
+    columns = [col[0] for col in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def get_stock_on_hand(zid: int, items: list, xwh: str = None) -> dict:
+    """
+    Current stock for a list of items from stock_balance
+
+    Args:
+        zid: Zone/Company ID
+        items: List of item codes
+        xwh: Warehouse to read; all warehouses are summed when None
+
+    Returns:
+        Dictionary with item codes as keys and stock as float values (0.0 when
+        the item has no balance)
+    """
+    if not items:
+        return {}
+
+    placeholders = ','.join(['%s'] * len(items))
+    sql = f"""
+        SELECT xitem, SUM(xqty)
+        FROM stock_balance
+        WHERE zid = %s AND xitem IN ({placeholders})
+    """
+    params = [zid] + list(items)
+    if xwh is not None:
+        sql += " AND xwh = %s"
+        params.append(xwh)
+    sql += " GROUP BY xitem"
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        stock = {row[0]: float(row[1] or 0) for row in cursor.fetchall()}
+
+    return {item: stock.get(item, 0.0) for item in items}
+
+
+def lock_stock(cursor, zid: int, xwh: str, items: list) -> dict:
+    """
+    Lock the stock_balance rows of items in one warehouse and return their stock
+
+    Rows are locked with SELECT ... FOR UPDATE in xitem order, the same order
+    apply_stock_deltas writes them in. That is Python string order, so the
+    lock sorts with the "C" collation (byte order) rather than the database
+    default. Two sales sharing items therefore queue on the shared rows
+    instead of deadlocking, and sales with disjoint items never wait on each
+    other. The locks are held until the caller's transaction ends,
+    so stock read here cannot change before post_imtrn applies the sale.
+
+    Writers allocate their voucher numbers before taking any stock lock
+    (here, in post_imtrn or in delete_imtrn), so voucher_sequence rows and
+    stock rows are always locked in that order.
+
+    Args:
+        cursor: Open database cursor (inside the caller's transaction)
+        zid: Zone/Company ID
+        xwh: Warehouse to lock
+        items: List of item codes
+
+    Returns:
+        Dictionary with item codes as keys and locked stock as float values
+        (0.0 when the item has no balance row in the warehouse)
+    """
+    item_codes = sorted(set(items))
+    if not item_codes:
+        return {}
+
+    placeholders = ','.join(['%s'] * len(item_codes))
+    cursor.execute(
+        f"""
+        SELECT xitem, xqty
+        FROM stock_balance
+        WHERE zid = %s AND xwh = %s AND xitem IN ({placeholders})
+        ORDER BY xitem COLLATE "C"
+        FOR UPDATE
+        """,
+        [int(zid), xwh or ''] + item_codes
+    )
+    stock = {row[0]: float(row[1] or 0) for row in cursor.fetchall()}
+    return {item: stock.get(item, 0.0) for item in item_codes}
@@ -1,17 +1,22 @@
-from django.db import connection
+from apps.utils.inventory_posting import get_stock_on_hand, lock_stock
 import logging
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 
-def items_check_inventory(items, zid):
+def items_check_inventory(items, zid, xwh=None, cursor=None):
     """
     Validate item quantities against real-time inventory
 
     Args:
         items: List of items with xitem and quantity
         zid: Current business context ID
+        xwh: Warehouse to check; all warehouses are summed when None
+        cursor: Open cursor inside the caller's transaction. When given, the
+                warehouse balance rows are locked (see lock_stock) so the
+                checked stock stays valid until the transaction commits;
+                requires xwh
 
     Returns:
         dict: {'success': bool, 'message': str, 'errors': list}
@@ -27,40 +32,29 @@ def items_check_inventory(items, zid):
                 'errors': []
             }
 
-        # Build SQL query to get current inventory for all items
-        placeholders = ','.join(['%s'] * len(item_codes))
-        sql_query = f"""
-        SELECT
-            xitem,
-            SUM(xqty * xsign) as current_stock
-        FROM imtrn
-        WHERE zid = %s AND xitem IN ({placeholders})
-        GROUP BY xitem
-        """
+        # Current inventory from the maintained stock_balance table
+        if cursor is not None:
+            inventory_dict = lock_stock(cursor, zid, xwh, item_codes)
+        else:
+            inventory_dict = get_stock_on_hand(zid, item_codes, xwh)
 
-        # Prepare parameters: zid + item_codes
-        params = [zid] + item_codes
-
-        # Execute query
-        with connection.cursor() as cursor:
-            cursor.execute(sql_query, params)
-            inventory_results = cursor.fetchall()
-
-        # Convert results to dictionary for easy lookup
-        inventory_dict = {row[0]: float(row[1]) for row in inventory_results}
+        # Total requested per item, so repeated lines are checked together
+        requested = {}
+        descriptions = {}
+        for item in items:
+            requested[item['xitem']] = requested.get(item['xitem'], 0.0) + float(item['quantity'])
+            descriptions.setdefault(item['xitem'], item.get('xdesc', ''))
 
         # Validate each item
         validation_errors = []
 
-        for item in items:
-            xitem = item['xitem']
-            requested_qty = float(item['quantity'])
+        for xitem, requested_qty in requested.items():
             current_stock = inventory_dict.get(xitem, 0.0)
 
             if requested_qty > current_stock:
                 validation_errors.append({
                     'xitem': xitem,
-                    'xdesc': item.get('xdesc', ''),
+                    'xdesc': descriptions[xitem],
                     'requested_quantity': requested_qty,
                     'available_stock': current_stock,
                     'message': f'Insufficient stock for {xitem}. Requested: {requested_qty}, Available: {current_stock}'
@@ -81,6 +75,9 @@ def items_check_inventory(items, zid):
 
     except Exception as e:
         logger.error(f"Inventory validation error: {str(e)}")
+        if cursor is not None:
+            # The caller's transaction is unusable after a failed lock; let it roll back
+            raise
         return {
             'success': False,
             'message': f'Inventory validation error: {str(e)}',
@@ -0,0 +1,178 @@
+"""
+Master-data cache for the Select2 lookup APIs
+
+Warehouses, projects and the other xcodes types, suppliers and customers
+change rarely but were queried with LOWER(...) LIKE on every dropdown
+keystroke. Each (zid, list) is now loaded once and searched in memory:
+
+  L1: a process-local copy, trusted for MASTER_DATA_CHECK_SECONDS.
+  L2: the shared cache (Redis), keyed by the list's version and fingerprint,
+      so one process loads a list for all of them.
+
+A list is reloaded when:
+  * invalidate_master_data(zid, source) bumps its per-zid version (called by
+    the brand and item group create/update/delete APIs), or
+  * its fingerprint (row count and latest zutime) changes; it is probed when
+    the L1 copy is older than MASTER_DATA_CHECK_SECONDS, which picks up rows
+    written by the legacy system directly.
+
+Example:
+    rows, more = search_master_data(zid, 'casup', term='acme', offset=0, limit=20)
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'master_data_version:{source}:{zid}'
+LIST_KEY = 'master_data:{source}:{zid}:{xtype}:{version}:{fingerprint}'
+CHECK_SECONDS = getattr(settings, 'MASTER_DATA_CHECK_SECONDS', 30)
+LIST_TTL = getattr(settings, 'MASTER_DATA_TTL', 24 * 60 * 60)
+
+# source -> rows as (code, name) ordered by code, and their fingerprint.
+# xcodes lists take the xtype as a second parameter; their name is not searched.
+SOURCES = {
+    'xcodes': {
+        'rows': "SELECT xcode, NULL FROM xcodes WHERE zid = %s AND xtype = %s AND xcode IS NOT NULL ORDER BY xcode",
+        'fingerprint': "SELECT COUNT(*), MAX(zutime) FROM xcodes WHERE zid = %s AND xtype = %s",
+    },
+    'casup': {
+        'rows': "SELECT xsup, xshort FROM casup WHERE zid = %s AND xsup IS NOT NULL ORDER BY xsup",
+        'fingerprint': "SELECT COUNT(*), MAX(zutime) FROM casup WHERE zid = %s",
+    },
+    'cacus': {
+        'rows': "SELECT xcus, xshort FROM cacus WHERE zid = %s AND xcus IS NOT NULL ORDER BY xcus",
+        'fingerprint': "SELECT COUNT(*), MAX(zutime) FROM cacus WHERE zid = %s",
+    },
+}
+
+_lists = {}
+_lists_lock = threading.Lock()
+
+
+class MasterList:
+    """Rows of one (zid, source, xtype) list with lower-cased search texts"""
+
+    def __init__(self, rows, version, fingerprint):
+        self.rows = [tuple(row) for row in rows]
+        self.version = version
+        self.fingerprint = fingerprint
+        self.checked_at = time.monotonic()
+        self._texts = [
+            ((code or '').lower(), (name or '').lower()) for code, name in self.rows
+        ]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def search(self, term='', offset=0, limit=None):
+        """
+        Rows whose code or name contains term (case-insensitive), in code order
+
+        Returns:
+            Tuple of (list of (code, name), True when more matches follow)
+        """
+        term = (term or '').lower()
+        if not term:
+            matches = self.rows[offset:] if limit is None else self.rows[offset:offset + limit + 1]
+        else:
+            matches = []
+            wanted = None if limit is None else offset + limit + 1
+            for row, (code, name) in zip(self.rows, self._texts):
+                if term in code or term in name:
+                    matches.append(row)
+                    if wanted is not None and len(matches) == wanted:
+                        break
+            matches = matches[offset:]
+        if limit is None:
+            return matches, False
+        return matches[:limit], len(matches) > limit
+
+
+def _params(source, zid, xtype):
+    return [zid, xtype] if source == 'xcodes' else [zid]
+
+
+def _fingerprint(source, zid, xtype):
+    with connection.cursor() as cursor:
+        cursor.execute(SOURCES[source]['fingerprint'], _params(source, zid, xtype))
+        count, latest = cursor.fetchone()
+    return f"{count}-{latest}"
+
+
+def _load(source, zid, xtype, version, fingerprint):
+    key = LIST_KEY.format(source=source, zid=zid, xtype=xtype or '', version=version, fingerprint=fingerprint)
+    rows = cache.get(key)
+    if rows is None:
+        with connection.cursor() as cursor:
+            cursor.execute(SOURCES[source]['rows'], _params(source, zid, xtype))
+            rows = cursor.fetchall()
+        cache.set(key, rows, LIST_TTL)
+        logger.info(f"Loaded master data {source} {xtype or ''} for zid {zid}: {len(rows)} rows")
+    return MasterList(rows, version, fingerprint)
+
+
+def get_master_list(zid, source, xtype=None) -> MasterList:
+    """
+    The current list for a business, loading it if needed
+
+    Args:
+        zid: Business
+        source: Key of SOURCES
+        xtype: xcodes type (database value), for source 'xcodes'
+    """
+    zid = int(zid)
+    local_key = (source, zid, xtype)
+    version = cache.get(VERSION_KEY.format(source=source, zid=zid), 0)
+    current = _lists.get(local_key)
+
+    if current is not None and current.version == version:
+        if time.monotonic() - current.checked_at < CHECK_SECONDS:
+            return current
+        fingerprint = _fingerprint(source, zid, xtype)
+        if fingerprint == current.fingerprint:
+            current.checked_at = time.monotonic()
+            return current
+    else:
+        fingerprint = _fingerprint(source, zid, xtype)
+
+    master_list = _load(source, zid, xtype, version, fingerprint)
+    with _lists_lock:
+        _lists[local_key] = master_list
+    return master_list
+
+
+def search_master_data(zid, source, term='', xtype=None, offset=0, limit=None):
+    """
+    Search a cached master list
+
+    Example:
+        rows, more = search_master_data(100001, 'xcodes', 'main', xtype='Warehouse')
+    """
+    if not zid:
+        return [], False
+    return get_master_list(zid, source, xtype).search(term, offset, limit)
+
+
+def invalidate_master_data(zid, source) -> None:
+    """
+    Mark a business's lists of a source as stale in every process
+
+    Call after creating, editing or deleting xcodes, casup or cacus rows. Runs
+    on commit, so no process reloads the list before the write is visible.
+    """
+    key = VERSION_KEY.format(source=source, zid=int(zid))
+
+    def bump():
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+        logger.info(f"Invalidated master data {source} for zid {zid}")
+
+    transaction.on_commit(bump)
@@ -0,0 +1,410 @@
+"""
+Concurrent POS load harness
+
+Simulates checkout counters against a running server (runserver or gunicorn)
+over HTTP. Each counter is a thread with its own logged-in session that loops:
+  search: GET /api/pos/products/?search=<term> for every basket line
+  add:    GET /api/pos/scan/?code=<xitem> for the picked product
+  checkout: POST /sales/api/pos/complete-sale/ with the basket
+
+While the counters run, ContentionSampler polls pg_stat_activity and tallies
+what the server's backends are doing and waiting on, grouped by the part of
+the sale the statement belongs to (voucher numbering, stock check, imtrn
+insert, ...). Lock waits in that tally show where checkouts queue up.
+
+Failures are classified from the response: deadlocks and duplicate voucher
+numbers are counted separately from stock rejections and other errors. The
+load_test_pos management command drives this and prints the report.
+"""
+
+from collections import Counter as Tally
+from datetime import datetime
+from django.db import connection
+import logging
+import math
+import random
+import re
+import threading
+import time
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+REPORT_VERSION = 1
+
+LOGIN_URL = '/auth/login/'
+SEARCH_URL = '/api/pos/products/'
+SCAN_URL = '/api/pos/scan/'
+CHECKOUT_URL = '/sales/api/pos/complete-sale/'
+
+STEPS = ('search', 'add', 'checkout')
+
+# Lines per basket and units per line at a grocery-style counter: most
+# baskets are small, a few are large
+BASKET_SIZES = (1, 2, 3, 4, 5, 6, 8, 10, 15, 25)
+BASKET_WEIGHTS = (18, 17, 15, 12, 10, 8, 8, 6, 4, 2)
+LINE_QUANTITIES = (1, 2, 3)
+LINE_QUANTITY_WEIGHTS = (80, 15, 5)
+
+# Statement text -> the part of the sale it belongs to; first match wins
+STATEMENT_AREAS = (
+    ('voucher_numbering', re.compile(r'\bvoucher_sequence\b', re.IGNORECASE)),
+    ('stock_check', re.compile(r'\bstock_balance\b.*\bFOR\s+UPDATE\b', re.IGNORECASE | re.DOTALL)),
+    ('stock_update', re.compile(r'\bINSERT\s+INTO\s+stock_balance\b', re.IGNORECASE)),
+    ('item_cost', re.compile(r'\bINSERT\s+INTO\s+item_cost\b', re.IGNORECASE)),
+    ('imtrn_insert', re.compile(r'\bINSERT\s+INTO\s+imtrn\b', re.IGNORECASE)),
+    ('order_insert', re.compile(r'\bINSERT\s+INTO\s+(opord|opodt)\b', re.IGNORECASE)),
+    ('search', re.compile(r'\bcaitem\b', re.IGNORECASE)),
+    ('session', re.compile(r'\bdjango_session\b|\bauth_user\b', re.IGNORECASE)),
+)
+
+
+def percentile(values, pct) -> float:
+    """
+    Nearest-rank percentile of a list of numbers (0.0 when empty)
+
+    Example:
+        percentile([10, 20, 30, 40], 50) -> 20
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def basket_size(rng) -> int:
+    """Lines in the next basket, drawn from BASKET_SIZES"""
+    return rng.choices(BASKET_SIZES, BASKET_WEIGHTS)[0]
+
+
+def line_quantity(rng) -> int:
+    return rng.choices(LINE_QUANTITIES, LINE_QUANTITY_WEIGHTS)[0]
+
+
+def classify_failure(status, body) -> str:
+    """
+    Outcome of a checkout response
+
+    Returns:
+        'ok', 'deadlock', 'duplicate_voucher', 'stock_rejected', 'lock_timeout'
+        or 'error'
+    """
+    body = body if isinstance(body, dict) else {}
+    if status == 200 and body.get('success'):
+        return 'ok'
+    if body.get('validation_failed'):
+        return 'stock_rejected'
+
+    message = f"{body.get('error', '')} {body.get('message', '')}".lower()
+    if 'deadlock' in message:
+        return 'deadlock'
+    if 'duplicate key' in message or 'unique constraint' in message:
+        return 'duplicate_voucher'
+    if 'lock timeout' in message or 'could not obtain lock' in message or 'statement timeout' in message:
+        return 'lock_timeout'
+    return 'error'
+
+
+def classify_statement(sql) -> str:
+    """Part of the sale a statement belongs to, see STATEMENT_AREAS"""
+    for area, pattern in STATEMENT_AREAS:
+        if pattern.search(sql or ''):
+            return area
+    return 'other'
+
+
+def build_sale_payload(lines, warehouse) -> dict:
+    """
+    complete-sale request body for a basket
+
+    Args:
+        lines: List of (product dict from the search API, quantity)
+        warehouse: Selling warehouse
+    """
+    items = []
+    for product, quantity in lines:
+        price = float(product.get('xstdprice') or 0)
+        items.append({
+            'xitem': product['xitem'],
+            'xdesc': product.get('xdesc') or '',
+            'quantity': quantity,
+            'xstdprice': price,
+            'total': round(price * quantity, 2),
+            'item_vat': 0,
+            'item_cost': float(product.get('item_cost') or 0),
+            'xunitstk': product.get('xunitstk') or 'Pcs',
+        })
+    grand_total = round(sum(item['total'] for item in items), 2)
+    return {
+        'items': items,
+        'payment_method': 'cash',
+        'cash_amount': grand_total,
+        'totals': {'subtotal': grand_total, 'tax_amount': 0, 'grand_total': grand_total},
+        'discounts': {},
+        'header_info': {'warehouse': warehouse, 'customer_name': 'CUS-000001'},
+    }
+
+
+class RunStats:
+    """Latencies and outcomes shared by all counters of one run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {step: [] for step in STEPS}
+        self.outcomes = Tally()
+        self.errors = Tally()
+        self.lines = 0
+
+    def observe(self, step, ms):
+        with self._lock:
+            self.latencies[step].append(ms)
+
+    def checkout(self, outcome, lines, message=''):
+        with self._lock:
+            self.outcomes[outcome] += 1
+            if outcome == 'ok':
+                self.lines += lines
+            elif message:
+                self.errors[message[:200]] += 1
+
+    def summary(self, elapsed) -> dict:
+        with self._lock:
+            steps = {
+                step: {
+                    'count': len(values),
+                    'p50_ms': round(percentile(values, 50), 1),
+                    'p95_ms': round(percentile(values, 95), 1),
+                    'p99_ms': round(percentile(values, 99), 1),
+                    'max_ms': round(max(values), 1) if values else 0.0,
+                }
+                for step, values in self.latencies.items()
+            }
+            completed = self.outcomes['ok']
+            return {
+                'elapsed_s': round(elapsed, 2),
+                'sales': completed,
+                'sales_per_s': round(completed / elapsed, 2) if elapsed else 0.0,
+                'lines_per_s': round(self.lines / elapsed, 2) if elapsed else 0.0,
+                'steps': steps,
+                'outcomes': dict(self.outcomes),
+                'top_errors': self.errors.most_common(5),
+            }
+
+
+class CheckoutCounter(threading.Thread):
+    """
+    One simulated counter: logs in, then runs search -> add -> checkout
+    until the deadline
+
+    Example:
+        end = time.monotonic() + 60
+        counter = CheckoutCounter(1, 'http://127.0.0.1:8000', credentials, terms, 'Main', stats, lambda: end)
+        counter.start()
+        counter.join()
+    """
+
+    def __init__(self, number, base_url, credentials, terms, warehouse, stats, deadline,
+                 start_gate=None, seed=0, think_ms=0, timeout=30):
+        # deadline is a callable returning time.monotonic() at which to stop,
+        # so the clock can start after every counter has logged in. failure
+        # holds why the counter stopped early (login or an unexpected error)
+        super().__init__(name=f'counter-{number}', daemon=True)
+        self.base_url = base_url.rstrip('/')
+        self.credentials = credentials
+        self.terms = terms
+        self.warehouse = warehouse
+        self.stats = stats
+        self.deadline = deadline
+        self.start_gate = start_gate
+        self.rng = random.Random(f'{seed}:{number}')
+        self.think = think_ms / 1000
+        self.timeout = timeout
+        self.http = requests.Session()
+        self.failure = None
+
+    def login(self):
+        """Log in through the ZID login form; raises RuntimeError on failure"""
+        url = self.base_url + LOGIN_URL
+        self.http.get(url, timeout=self.timeout)
+        response = self.http.post(url, data={
+            'csrfmiddlewaretoken': self.http.cookies.get('csrftoken', ''),
+            'username': self.credentials['username'],
+            'password': self.credentials['password'],
+            'zid': self.credentials['zid'],
+        }, headers={'Referer': url}, allow_redirects=False, timeout=self.timeout)
+        if response.status_code != 302 or 'sessionid' not in self.http.cookies:
+            raise RuntimeError(f'{self.name}: login failed (HTTP {response.status_code})')
+
+    def _timed(self, step, method, path, **kwargs):
+        started = time.perf_counter()
+        response = self.http.request(method, self.base_url + path, timeout=self.timeout, **kwargs)
+        self.stats.observe(step, (time.perf_counter() - started) * 1000)
+        return response
+
+    def _pick_line(self):
+        """Search for a term and add one in-stock result; None when nothing matched"""
+        term = self.rng.choice(self.terms)
+        response = self._timed('search', 'GET', SEARCH_URL, params={'search': term})
+        if response.status_code != 200:
+            return None
+        in_stock = [product for product in response.json().get('results', []) if product.get('stock', 0) >= 1]
+        if not in_stock:
+            return None
+
+        product = self.rng.choice(in_stock)
+        response = self._timed('add', 'GET', SCAN_URL, params={'code': product['xitem']})
+        if response.status_code != 200:
+            return None
+        return response.json().get('result', product), line_quantity(self.rng)
+
+    def sell_once(self):
+        lines = {}
+        for _ in range(basket_size(self.rng)):
+            line = self._pick_line()
+            if line:
+                product, quantity = line
+                if product['xitem'] in lines:
+                    quantity += lines[product['xitem']][1]
+                lines[product['xitem']] = (product, quantity)
+        if not lines:
+            return
+
+        response = self._timed('checkout', 'POST', CHECKOUT_URL, json=build_sale_payload(list(lines.values()), self.warehouse))
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        outcome = classify_failure(response.status_code, body)
+        message = '' if outcome == 'ok' else str(body.get('error') or body.get('message') or f'HTTP {response.status_code}')
+        self.stats.checkout(outcome, len(lines), message)
+
+    def run(self):
+        try:
+            self.login()
+        except Exception as e:
+            self.failure = str(e)
+            return
+        finally:
+            if self.start_gate is not None:
+                self.start_gate.wait()
+
+        try:
+            while time.monotonic() < self.deadline():
+                try:
+                    self.sell_once()
+                except requests.RequestException as e:
+                    self.stats.checkout('error', 0, f'{type(e).__name__}: {e}')
+                if self.think:
+                    time.sleep(self.think)
+        except Exception as e:
+            # Any other error ends this counter; the command reports it
+            self.failure = f'{self.name}: {type(e).__name__}: {e}'
+
+
+class ContentionSampler(threading.Thread):
+    """
+    Polls pg_stat_activity for this database while the counters run
+
+    Every sample counts each busy backend once under (area, wait), where area
+    comes from classify_statement() and wait is the wait event ('Lock:tuple',
+    'Lock:transactionid', 'LWLock:WALWrite', ...) or 'CPU' when not waiting.
+    PostgreSQL only; other databases record nothing.
+    """
+
+    SQL = """
+        SELECT wait_event_type, wait_event, query
+        FROM pg_stat_activity
+        WHERE datname = current_database()
+          AND pid <> pg_backend_pid()
+          AND state IN ('active', 'idle in transaction')
+    """
+
+    def __init__(self, interval_ms=50):
+        super().__init__(name='contention-sampler', daemon=True)
+        self.interval = interval_ms / 1000
+        self.samples = 0
+        self.tally = Tally()
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def run(self):
+        if connection.vendor != 'postgresql':
+            return
+        try:
+            with connection.cursor() as cursor:
+                while not self._stop_event.is_set():
+                    cursor.execute(self.SQL)
+                    self.samples += 1
+                    for wait_type, wait_event, query in cursor.fetchall():
+                        wait = f'{wait_type}:{wait_event}' if wait_type else 'CPU'
+                        self.tally[(classify_statement(query), wait)] += 1
+                    self._stop_event.wait(self.interval)
+        except Exception as e:
+            logger.error(f"Contention sampling stopped: {str(e)}")
+        finally:
+            connection.close()
+
+    def summary(self, top=10) -> list:
+        """Busiest (area, wait) pairs with the share of samples they appeared in"""
+        return [
+            {'area': area, 'wait': wait, 'samples': count,
+             'avg_backends': round(count / self.samples, 2) if self.samples else 0.0}
+            for (area, wait), count in self.tally.most_common(top)
+        ]
+
+
+def database_deadlocks():
+    """pg_stat_database deadlock counter for this database (None off PostgreSQL)"""
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT deadlocks FROM pg_stat_database WHERE datname = current_database()")
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def duplicate_vouchers(zid, since) -> dict:
+    """
+    Voucher numbers issued more than once since a point in time
+
+    Catches duplicates even where the legacy tables have no unique constraint
+    that would have failed the sale.
+
+    Returns:
+        dict: {'opord': [(xordernum, count), ...], 'imtrn': [(ximtrn, count), ...]}
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT xordernum, COUNT(*) FROM opord
+            WHERE zid = %s AND ztime >= %s
+            GROUP BY xordernum
+            HAVING COUNT(*) > 1
+        """, [zid, since])
+        orders = cursor.fetchall()
+
+        # One imtrn row per sale line; the same line number twice is a duplicate
+        cursor.execute("""
+            SELECT ximtrnnum, COUNT(*) FROM imtrn
+            WHERE zid = %s AND ztime >= %s
+            GROUP BY ximtrnnum
+            HAVING COUNT(*) > 1
+        """, [zid, since])
+        transactions = cursor.fetchall()
+    return {'opord': orders, 'imtrn': transactions}
+
+
+def build_report(runs, zid, base_url, label='') -> dict:
+    """Machine-readable report for one load test (one entry per concurrency level)"""
+    return {
+        'version': REPORT_VERSION,
+        'label': label,
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'zid': zid,
+        'base_url': base_url,
+        'runs': runs,
+    }
@@ -0,0 +1,111 @@
+"""
+Query-count and wall-time budgets for the hot endpoints
+
+QUERY_BUDGETS holds the upper bounds; measure_endpoint() runs one request
+through the Django test client inside a rolled-back transaction and counts
+every SQL statement it sends (savepoints included, they are round trips too).
+The check_query_budgets management command drives this against a seeded
+database and writes a JSON report that can be diffed between releases.
+
+Budgets are for a warm process (catalog index and permission caches built);
+measure_endpoint() discards a warm-up run before the measured ones.
+"""
+
+from datetime import datetime
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+import statistics
+import time
+
+# name -> (max SQL statements, max milliseconds)
+QUERY_BUDGETS = {
+    'pos_products_api': (5, 200),
+    'avg_item_price': (4, 300),
+    'sales_item_list_ajax': (5, 500),
+    'po_open_list': (6, 500),
+    'get_item_ledger': (5, 1000),
+    'pos_complete_sale': (25, 1000),
+    'create_day_end_process': (20, 2000),
+    'po_confirm': (25, 1000),
+}
+
+REPORT_VERSION = 1
+
+
+def measure_endpoint(client, method, url, data=None, content_type=None, repeat=3):
+    """
+    Run one request repeat times (after a warm-up) and measure it
+
+    Every run is rolled back, so write endpoints see the same data each time.
+
+    Args:
+        client: Logged-in django.test.Client with current_zid in its session
+        method: 'get' or 'post'
+        url: Request path
+        data: Query parameters (GET) or body (POST)
+        content_type: POST content type, e.g. 'application/json'
+        repeat: Measured runs
+
+    Returns:
+        dict: {'status', 'queries' (max over runs), 'ms' (median), 'runs'}
+    """
+    kwargs = {'content_type': content_type} if content_type else {}
+    runs = []
+    for run in range(repeat + 1):
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = getattr(client, method)(url, data, **kwargs)
+                elapsed = (time.perf_counter() - started) * 1000
+            transaction.set_rollback(True)
+        if run:
+            runs.append({'status': response.status_code, 'queries': len(queries), 'ms': round(elapsed, 2)})
+
+    return {
+        'status': max(entry['status'] for entry in runs),
+        'queries': max(entry['queries'] for entry in runs),
+        'ms': round(statistics.median(entry['ms'] for entry in runs), 2),
+        'runs': runs,
+    }
+
+
+def check_budget(name, measurement, budgets=None) -> dict:
+    """
+    Compare a measurement with its budget
+
+    Returns:
+        dict: Report entry with the measurement, the limits and 'passed'
+    """
+    max_queries, max_ms = (budgets or QUERY_BUDGETS)[name]
+    failures = []
+    if measurement['status'] >= 400:
+        failures.append(f"HTTP {measurement['status']}")
+    if measurement['queries'] > max_queries:
+        failures.append(f"{measurement['queries']} queries > {max_queries}")
+    if measurement['ms'] > max_ms:
+        failures.append(f"{measurement['ms']} ms > {max_ms} ms")
+
+    return {
+        'name': name,
+        'status': measurement['status'],
+        'queries': measurement['queries'],
+        'max_queries': max_queries,
+        'ms': measurement['ms'],
+        'max_ms': max_ms,
+        'runs': measurement['runs'],
+        'passed': not failures,
+        'failures': failures,
+    }
+
+
+def build_report(entries, zid, label='', skipped=None) -> dict:
+    """Machine-readable report for one budget run"""
+    return {
+        'version': REPORT_VERSION,
+        'label': label,
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'zid': zid,
+        'passed': all(entry['passed'] for entry in entries),
+        'endpoints': entries,
+        'skipped': skipped or {},
+    }
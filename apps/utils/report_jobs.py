@@ -0,0 +1,274 @@
+"""
+Background PDF report jobs
+
+xhtml2pdf rendering is CPU-bound and can hold a gunicorn worker for seconds,
+so PDF reports are rendered by Celery instead:
+
+  1. The print view calls submit_and_wait(): a ReportJob is created (or an
+     identical one reused) and the browser is sent to the job page.
+  2. apps.crossapp.tasks.render_report_job builds the template context,
+     renders the PDF and writes it under REPORT_JOB_ROOT.
+  3. The job page polls the status API and opens the PDF when it is ready.
+
+Identical requests (same zid, report and parameters, and for single
+documents the same document_cache version) share one job while it is
+pending, running, or done and not yet expired, so a report that several
+people open at once is rendered once and an edited document is rendered
+again. Finished files are kept for
+REPORT_JOB_TTL_SECONDS; purge_report_jobs (scheduled through
+CELERY_BEAT_SCHEDULE) deletes them afterwards.
+
+Each entry in REPORTS names a context function taking (zid, **params) that
+returns the template context, or None when the document does not exist.
+Entries for single documents also name their apps.utils.document_cache kind
+and number parameter: a reprint of an unchanged document is served from the
+render cache without a job, and every render is stored there.
+
+Settings:
+  REPORT_JOB_ROOT: Directory for rendered files (default MEDIA_ROOT/report_jobs)
+  REPORT_JOB_TTL_SECONDS: Lifetime of a finished report (default 600)
+"""
+
+from datetime import timedelta
+from io import BytesIO
+from pathlib import Path
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
+from django.shortcuts import redirect
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from xhtml2pdf import pisa
+import hashlib
+import json
+import logging
+import os
+
+from apps.utils import document_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 600
+
+REPORTS = {
+    'daily_sales': {
+        'context': 'apps.sales.views.reports.daily_sales_report_export.daily_sales_pdf_context',
+        'template': 'reports/daily_sales_report_export.html',
+        'filename': 'daily_sales_report_{from_date}_to_{to_date}.pdf',
+        'params': ('from_date', 'to_date'),
+    },
+    'po_req': {
+        'document': ('po_req', 'transaction_id'),
+        'context': 'apps.purchase.reports.po_req_print.po_req_context',
+        'template': 'reports/po_req_print.html',
+        'filename': 'PO_{transaction_id}.pdf',
+        'params': ('transaction_id',),
+    },
+    'po_grn': {
+        'document': ('po_grn', 'transaction_id'),
+        'context': 'apps.purchase.reports.po_grn_print.po_grn_context',
+        'template': 'reports/po_grn_print.html',
+        'filename': 'GRN_{transaction_id}.pdf',
+        'params': ('transaction_id',),
+    },
+    'sales_return': {
+        'document': ('sales_return', 'transaction_id'),
+        'context': 'apps.sales.views.sales_return_print.sales_return_context',
+        'template': 'sales_return_print.html',
+        'filename': 'sales_return_{transaction_id}.pdf',
+        'params': ('transaction_id',),
+    },
+}
+
+
+def report_root() -> Path:
+    return Path(getattr(settings, 'REPORT_JOB_ROOT', Path(settings.MEDIA_ROOT) / 'report_jobs'))
+
+
+def report_ttl() -> timedelta:
+    return timedelta(seconds=getattr(settings, 'REPORT_JOB_TTL_SECONDS', DEFAULT_TTL_SECONDS))
+
+
+def fingerprint(zid, report, params, version=None) -> str:
+    """Identity of a report request; identical requests share a job"""
+    return hashlib.sha256(json.dumps([int(zid), report, params, version], sort_keys=True).encode()).hexdigest()
+
+
+def render_pdf(template, context) -> bytes:
+    """Render a template to PDF bytes with xhtml2pdf; raises RuntimeError on failure"""
+    html_string = render_to_string(template, context)
+    result = BytesIO()
+    pdf = pisa.pisaDocument(BytesIO(html_string.encode("UTF-8")), result)
+    if pdf.err:
+        raise RuntimeError(f'Error generating PDF ({pdf.err} errors)')
+    return result.getvalue()
+
+
+def submit_report(zid, report, params, requested_by='', version=None):
+    """
+    Queue a report, or join an identical one that is still current
+
+    Args:
+        zid: Business the report is for
+        report: Key of REPORTS
+        params: Dict with exactly the report's parameters
+        requested_by: Username, for the admin
+        version: The document's document_cache version, if the caller has
+            just read it; looked up otherwise
+
+    Returns:
+        Tuple of (ReportJob, created)
+
+    Example:
+        job, created = submit_report(100001, 'po_grn', {'transaction_id': 'GRN-000123'})
+    """
+    from apps.crossapp.models import ReportJob
+    from apps.crossapp.tasks import render_report_job
+
+    spec = REPORTS[report]
+    params = {name: str(params[name]) for name in spec['params']}
+    document = spec.get('document')
+    if document and version is None:
+        version = document_cache.document_version(zid, document[0], params[document[1]])
+    key = fingerprint(zid, report, params, version)
+
+    retire_jobs(ReportJob.objects.filter(fingerprint=key))
+
+    try:
+        with transaction.atomic():
+            job = ReportJob.objects.create(
+                zid=int(zid),
+                report=report,
+                params=params,
+                fingerprint=key,
+                filename=spec['filename'].format(**params),
+                requested_by=requested_by,
+            )
+    except IntegrityError:
+        # Another request for the same report is current; share it
+        existing = ReportJob.objects.filter(fingerprint=key, current=True).first()
+        if existing is not None:
+            return existing, False
+        # It finished failing or expired in between; try once more
+        return submit_report(zid, report, params, requested_by, version)
+
+    transaction.on_commit(lambda: _enqueue(render_report_job, job))
+    return job, True
+
+
+def retire_jobs(jobs):
+    """
+    Stop sharing jobs that can no longer serve identical requests
+
+    Finished jobs past expires_at lose current; jobs still pending or running
+    after a full TTL (lost message, killed worker) are failed as timed out.
+    """
+    from apps.crossapp.models import ReportJob
+
+    now = timezone.now()
+    jobs.filter(current=True, expires_at__lte=now).update(current=False)
+    jobs.filter(
+        current=True, status__in=[ReportJob.PENDING, ReportJob.RUNNING], created_at__lte=now - report_ttl()
+    ).update(current=False, status=ReportJob.FAILED, error='Timed out waiting for a worker', finished_at=now)
+
+
+def _enqueue(task, job):
+    try:
+        task.delay(str(job.id))
+    except Exception as e:
+        logger.error(f"Could not queue report job {job.id}: {str(e)}")
+        mark_failed(job, f'Could not queue the report: {str(e)}')
+
+
+def mark_failed(job, message):
+    job.status = job.FAILED
+    job.current = False
+    job.error = message
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'current', 'error', 'finished_at'])
+
+
+def run_report_job(job):
+    """Render a claimed (running) job's PDF to disk and mark it done or failed"""
+    spec = REPORTS[job.report]
+    document = spec.get('document')
+    try:
+        # Versioned before the context is read: an edit committed while
+        # rendering moves the stamp (document_cache.invalidate), so this
+        # render stays under the older version
+        version = document_cache.document_version(job.zid, document[0], job.params[document[1]]) if document else None
+        context = import_string(spec['context'])(job.zid, **job.params)
+        if context is None:
+            mark_failed(job, f"Document not found: {', '.join(job.params.values())}")
+            return job
+        content = render_pdf(spec['template'], context)
+        if document:
+            document_cache.store(job.zid, document[0], job.params[document[1]], version, content)
+
+        relative = Path(str(job.zid)) / f'{job.id}.pdf'
+        path = report_root() / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write under a temporary name so a download never sees a partial file
+        temporary = path.with_suffix('.part')
+        temporary.write_bytes(content)
+        os.replace(temporary, path)
+    except Exception as e:
+        logger.error(f"Report job {job.id} ({job.report} {job.params}) failed: {str(e)}")
+        mark_failed(job, str(e))
+        return job
+
+    job.status = job.DONE
+    job.file_path = str(relative)
+    job.size = len(content)
+    job.finished_at = timezone.now()
+    job.expires_at = job.finished_at + report_ttl()
+    job.save(update_fields=['status', 'file_path', 'size', 'finished_at', 'expires_at'])
+    logger.info(f"Report job {job.id} ({job.report}) rendered {job.size} bytes")
+    return job
+
+
+def purge_expired_jobs() -> int:
+    """Delete expired files and their jobs, and failed jobs older than the TTL"""
+    from apps.crossapp.models import ReportJob
+
+    retire_jobs(ReportJob.objects.all())
+    now = timezone.now()
+    expired = ReportJob.objects.filter(expires_at__lte=now) | ReportJob.objects.filter(
+        status=ReportJob.FAILED, created_at__lte=now - report_ttl()
+    )
+    removed = 0
+    for job in expired:
+        if job.file_path:
+            try:
+                (report_root() / job.file_path).unlink(missing_ok=True)
+            except OSError as e:
+                logger.error(f"Could not delete report file {job.file_path}: {str(e)}")
+                continue
+        job.delete()
+        removed += 1
+    return removed
+
+
+def submit_and_wait(request, report, params):
+    """
+    Submit a report for the session's business and send the browser to its job
+    page; an unchanged document already in the render cache is returned directly
+    """
+    zid = request.session.get('current_zid')
+    if not zid:
+        return HttpResponse("Session ZID not found", status=400)
+
+    spec = REPORTS[report]
+    document = spec.get('document')
+    version = None
+    if document:
+        content, version = document_cache.lookup(zid, document[0], params[document[1]])
+        if content is not None:
+            response = HttpResponse(content, content_type='application/pdf')
+            filename = spec['filename'].format(**{name: params[name] for name in spec['params']})
+            response['Content-Disposition'] = f'inline; filename="{filename}"'
+            return response
+
+    job, _ = submit_report(zid, report, params, requested_by=request.user.get_username(), version=version)
+    return redirect('report-job', job_id=job.id)
@@ -0,0 +1,121 @@
+"""
+Cached and estimated row counts for the list endpoints
+
+Every DataTables draw needs the list's total and its filtered size, and on
+the large document tables COUNT(*) costs more than the page itself.
+
+Totals (the list's unfiltered rows) are cached per (table, zid, tag) for
+ROW_COUNT_TTL seconds. The tag names the slice of the table a list shows:
+'' for every row of the business, or the voucher prefix ('REC-', 'SRE-')
+for the imtemptrn lists. Code that inserts or deletes document headers calls
+bump() so the cached total moves with them instead of being recounted; the
+TTL only bounds drift from writes that do not bump.
+
+Filtered counts (a search is active) start from the planner's row estimate
+(EXPLAIN, PostgreSQL only). At or above ROW_COUNT_ESTIMATE_OVER rows the
+estimate is returned and flagged approximate; below it the exact count is
+run and cached for ROW_COUNT_FILTERED_TTL seconds.
+
+Example:
+    total = row_counts.total('opord', zid, "SELECT COUNT(*) FROM opord WHERE zid = %s", [zid])
+    row_counts.bump('opord', zid, 1)   # After inserting a sale
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300
+DEFAULT_FILTERED_TTL = 30
+DEFAULT_ESTIMATE_OVER = 50000
+
+
+def _key(table, zid, tag) -> str:
+    return f'row_count:{table}:{zid}:{tag}'
+
+
+def _exact(sql, params) -> int:
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()[0]
+
+
+def total(table, zid, sql, params, tag='', ttl=None):
+    """
+    Unfiltered total of a list, cached and kept current by bump()
+
+    Args:
+        table: Table the rows live in (the bump() name)
+        zid: Business
+        sql: COUNT(*) query for the list's rows
+        params: Its parameters
+        tag: Slice of the table the list shows (see module docstring)
+        ttl: Seconds to cache, for totals nothing bumps (default ROW_COUNT_TTL)
+    """
+    key = _key(table, zid, tag)
+    count = cache.get(key)
+    if count is None:
+        count = _exact(sql, params)
+        cache.set(key, count, ttl or getattr(settings, 'ROW_COUNT_TTL', DEFAULT_TTL))
+    return count
+
+
+def bump(table, zid, delta, tag=''):
+    """
+    Move a cached total by delta once the current transaction commits
+
+    A total that is not cached is left alone; the next read counts it.
+    """
+    def apply():
+        try:
+            cache.incr(_key(table, zid, tag), delta)
+        except ValueError:
+            pass  # Not cached
+        except Exception as e:
+            logger.error(f"Could not bump row count {table} {zid} {tag}: {str(e)}")
+            cache.delete(_key(table, zid, tag))
+
+    transaction.on_commit(apply)
+
+
+def estimate(sql, params):
+    """Planner row estimate for a query, or None where EXPLAIN is not available"""
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def filtered(select_sql, params):
+    """
+    Size of a filtered set
+
+    Args:
+        select_sql: SELECT of the filtered rows (without ORDER BY/LIMIT)
+        params: Its parameters
+
+    Returns:
+        Tuple of (count, approximate)
+    """
+    key = 'row_count_filtered:' + hashlib.sha256(repr((select_sql, params)).encode()).hexdigest()[:32]
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    threshold = getattr(settings, 'ROW_COUNT_ESTIMATE_OVER', DEFAULT_ESTIMATE_OVER)
+    rows = estimate(select_sql, params)
+    if rows is not None and rows >= threshold:
+        result = (rows, True)
+    else:
+        result = (_exact(f'SELECT COUNT(*) FROM ({select_sql}) AS filtered', params), False)
+    cache.set(key, result, getattr(settings, 'ROW_COUNT_FILTERED_TTL', DEFAULT_FILTERED_TTL))
+    return result
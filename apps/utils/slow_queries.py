@@ -0,0 +1,213 @@
+"""
+Slow-query capture
+
+SlowQueryMiddleware times every statement a request executes. Statements over
+SLOW_QUERY_THRESHOLD_MS are recorded once the response is ready, outside the
+request's own query hook:
+  * the SQL as executed and its parameters, redacted (see redact_params)
+  * the call site: the innermost frame under apps/ that ran the query
+  * an EXPLAIN (ANALYZE off, FORMAT JSON) plan; the statement is planned,
+    never executed a second time
+
+Statements are grouped by fingerprint (the SQL with literals, placeholders and
+IN/VALUES lists collapsed), with running totals on SlowQuery and the newest
+SLOW_QUERY_SAMPLES executions kept as SlowQuerySample rows. Browse them in the
+Django admin under Crossapp > Slow Queries.
+
+Settings:
+  SLOW_QUERY_THRESHOLD_MS: Capture threshold; 0 (the default) disables the
+      middleware entirely.
+  SLOW_QUERY_SAMPLES: Samples kept per fingerprint (default 20).
+"""
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+import hashlib
+import json
+import logging
+import re
+import time
+import traceback
+
+from apps.utils import sql_metrics
+from apps.utils.sql_metrics import view_label
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLES = 20
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\([^)]+\)s")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_REPEATED_LIST = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH|INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+_APPS_DIR = str(settings.BASE_DIR / 'apps')
+# Query hooks that sit between the caller and the database
+_HOOK_FILES = {__file__, sql_metrics.__file__}
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    SQL with literals and parameters replaced by ?, for grouping
+
+    Example:
+        normalize_sql("SELECT * FROM caitem WHERE zid = %s AND xitem IN (%s, %s)")
+        -> "SELECT * FROM caitem WHERE zid = ? AND xitem IN (?)"
+    """
+    sql = _STRING.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _PARAM_LIST.sub('(?)', sql)
+    sql = _REPEATED_LIST.sub('(?)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def _redact(value):
+    # Integers are kept (zid, row numbers, limits); anything else may be
+    # customer data and only its type is recorded
+    if value is None or isinstance(value, (bool, int)):
+        return value
+    return f'<{type(value).__name__}>'
+
+
+def redact_params(params, many=False) -> str:
+    """Parameters as JSON with every non-integer value replaced by its type"""
+    if params is None:
+        return ''
+    if many:
+        return json.dumps(f'<{len(params)} parameter sets>')
+    if isinstance(params, dict):
+        return json.dumps({key: _redact(value) for key, value in params.items()})
+    return json.dumps([_redact(value) for value in params])
+
+
+def call_site() -> str:
+    """'path:line in function' of the innermost project frame on the stack"""
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename.startswith(_APPS_DIR) and frame.filename not in _HOOK_FILES:
+            path = frame.filename[len(str(settings.BASE_DIR)) + 1:]
+            return f"{path}:{frame.lineno} in {frame.name}"[:255]
+    return ''
+
+
+class SlowQueryCollector:
+    """
+    connection.execute_wrapper() hook that keeps statements over a threshold
+
+    Example:
+        collector = SlowQueryCollector(threshold_ms=200)
+        with connection.execute_wrapper(collector):
+            run_report()
+        record_slow_queries(collector.captured, view='day-end')
+    """
+
+    def __init__(self, threshold_ms):
+        self.threshold = threshold_ms / 1000
+        self.captured = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            if elapsed >= self.threshold:
+                self.captured.append({
+                    'sql': sql,
+                    'params': params,
+                    'many': many,
+                    'duration_ms': elapsed * 1000,
+                    'call_site': call_site(),
+                })
+
+
+def explain(sql, params, many=False):
+    """
+    EXPLAIN (ANALYZE off, FORMAT JSON) plan for a statement
+
+    Returns:
+        Tuple of (plan or None, error message or '')
+    """
+    if connection.vendor != 'postgresql':
+        return None, 'EXPLAIN plans need PostgreSQL'
+    if many or not _EXPLAINABLE.match(sql):
+        return None, 'Statement cannot be explained'
+
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (ANALYZE off, FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        return (json.loads(plan) if isinstance(plan, str) else plan), ''
+    except Exception as e:
+        return None, str(e)[:255]
+
+
+def record_slow_queries(captured, view=''):
+    """Store captured statements with their plans; never raises"""
+    from apps.crossapp.models import SlowQuery, SlowQuerySample
+
+    keep = getattr(settings, 'SLOW_QUERY_SAMPLES', DEFAULT_SAMPLES)
+    for entry in captured:
+        try:
+            plan, plan_error = explain(entry['sql'], entry['params'], entry['many'])
+            normalized = normalize_sql(entry['sql'])
+            with transaction.atomic():
+                query, _ = SlowQuery.objects.get_or_create(
+                    fingerprint=hashlib.md5(normalized.encode()).hexdigest(),
+                    defaults={'statement': normalized},
+                )
+                SlowQuery.objects.filter(pk=query.pk).update(
+                    calls=F('calls') + 1,
+                    total_ms=F('total_ms') + entry['duration_ms'],
+                    max_ms=Greatest(F('max_ms'), Value(entry['duration_ms'])),
+                    last_seen=timezone.now(),
+                )
+                SlowQuerySample.objects.create(
+                    query=query,
+                    sql=entry['sql'],
+                    params=redact_params(entry['params'], entry['many']),
+                    duration_ms=entry['duration_ms'],
+                    call_site=entry['call_site'],
+                    view=view[:255],
+                    plan=plan,
+                    plan_error=plan_error,
+                )
+                stale = list(
+                    SlowQuerySample.objects.filter(query=query)
+                    .order_by('-captured_at', '-id')
+                    .values_list('id', flat=True)[keep:]
+                )
+                if stale:
+                    SlowQuerySample.objects.filter(id__in=stale).delete()
+        except Exception as e:
+            logger.error(f"Could not record slow query from {entry['call_site']}: {str(e)}")
+
+
+class SlowQueryMiddleware:
+    """
+    Captures statements slower than SLOW_QUERY_THRESHOLD_MS with their plans
+
+    Disabled (removed from the chain at startup) when the threshold is 0.
+    """
+
+    def __init__(self, get_response):
+        self.threshold_ms = getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 0)
+        if not self.threshold_ms:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        collector = SlowQueryCollector(self.threshold_ms)
+        with connection.execute_wrapper(collector):
+            response = self.get_response(request)
+
+        if collector.captured:
+            record_slow_queries(collector.captured, view=view_label(request))
+        return response
@@ -0,0 +1,248 @@
+"""
+Per-view SQL instrumentation
+
+SqlMetricsMiddleware wraps the database execute hook for every request and
+records, per resolved view:
+  * response time
+  * number of SQL statements (raw connection.cursor() and ORM alike)
+  * total time spent in the database
+  * the slowest statement
+
+The numbers are folded into in-process histograms that sql_metrics_view
+serves in the Prometheus text format. Each gunicorn worker keeps its own
+histograms, so scrape every worker (or treat the numbers as a sample).
+
+Settings:
+  SQL_METRICS_ENABLED: Install the middleware (default False). When off the
+      middleware removes itself from the chain at startup, so it costs nothing.
+  SQL_METRICS_LOG_JSON: Also log one JSON line per request (default False).
+
+Queries run while a StreamingHttpResponse is being consumed happen after the
+view returns and are not counted.
+"""
+
+from bisect import bisect_left
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import HttpResponse
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# Longest statement kept for the slowest-query report
+MAX_SQL_LENGTH = 500
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts are per bucket, made cumulative on output"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """(upper bound label, cumulative count) pairs ending with +Inf"""
+        total = 0
+        bounds = [str(bound) for bound in self.buckets] + ['+Inf']
+        for bound, count in zip(bounds, self.counts):
+            total += count
+            yield bound, total
+
+
+class ViewStats:
+    """Everything recorded for one view"""
+
+    def __init__(self):
+        self.duration = Histogram(SECONDS_BUCKETS)
+        self.db_time = Histogram(SECONDS_BUCKETS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.slowest_seconds = 0.0
+        self.slowest_sql = ''
+
+
+class MetricsRegistry:
+    """Thread-safe map of view name -> ViewStats"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def observe(self, view, duration, recorder):
+        with self._lock:
+            stats = self._views.get(view)
+            if stats is None:
+                stats = self._views[view] = ViewStats()
+            stats.duration.observe(duration)
+            stats.db_time.observe(recorder.total_seconds)
+            stats.queries.observe(recorder.count)
+            if recorder.slowest_seconds > stats.slowest_seconds:
+                stats.slowest_seconds = recorder.slowest_seconds
+                stats.slowest_sql = recorder.slowest_sql
+
+    def reset(self):
+        with self._lock:
+            self._views = {}
+
+    def snapshot(self):
+        """Copy of the per-view stats, safe to read without the lock"""
+        with self._lock:
+            return {
+                view: {
+                    'duration': (list(stats.duration.cumulative()), stats.duration.sum, stats.duration.count),
+                    'db_time': (list(stats.db_time.cumulative()), stats.db_time.sum, stats.db_time.count),
+                    'queries': (list(stats.queries.cumulative()), stats.queries.sum, stats.queries.count),
+                    'slowest_seconds': stats.slowest_seconds,
+                    'slowest_sql': stats.slowest_sql,
+                }
+                for view, stats in self._views.items()
+            }
+
+
+registry = MetricsRegistry()
+
+
+class QueryRecorder:
+    """
+    connection.execute_wrapper() hook that times every statement
+
+    Example:
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            do_queries()
+        print(recorder.count, recorder.total_seconds, recorder.slowest_sql)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_sql = ''
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.total_seconds += elapsed
+            if elapsed > self.slowest_seconds:
+                self.slowest_seconds = elapsed
+                self.slowest_sql = sql
+
+
+def view_label(request) -> str:
+    """Metric label for the view that handled a request"""
+    resolver_match = getattr(request, 'resolver_match', None)
+    if resolver_match is None:
+        return 'unresolved'
+    return resolver_match.view_name
+
+
+class SqlMetricsMiddleware:
+    """
+    Records query count, DB time, slowest statement and response time per view
+
+    Add near the top of MIDDLEWARE (after static file handling) so session and
+    authentication queries are included. Disabled unless SQL_METRICS_ENABLED.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SQL_METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.log_json = getattr(settings, 'SQL_METRICS_LOG_JSON', False)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        view = view_label(request)
+        registry.observe(view, duration, recorder)
+
+        if self.log_json:
+            logger.info(json.dumps({
+                'view': view,
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'duration_ms': round(duration * 1000, 2),
+                'queries': recorder.count,
+                'db_ms': round(recorder.total_seconds * 1000, 2),
+                'slowest_ms': round(recorder.slowest_seconds * 1000, 2),
+                'slowest_sql': recorder.slowest_sql[:MAX_SQL_LENGTH],
+            }))
+
+        return response
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _histogram_lines(name, view, histogram):
+    buckets, total, count = histogram
+    for bound, cumulative in buckets:
+        yield f'{name}_bucket{{view="{view}",le="{bound}"}} {cumulative}'
+    yield f'{name}_sum{{view="{view}"}} {total}'
+    yield f'{name}_count{{view="{view}"}} {count}'
+
+
+def render_prometheus(snapshot) -> str:
+    """Render a MetricsRegistry snapshot in the Prometheus text exposition format"""
+    histograms = (
+        ('erp_request_duration_seconds', 'duration', 'Response time per view'),
+        ('erp_request_db_seconds', 'db_time', 'Total SQL time per request'),
+        ('erp_request_queries', 'queries', 'SQL statements per request'),
+    )
+    views = sorted(snapshot)
+    lines = []
+    for name, key, help_text in histograms:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for view in views:
+            lines.extend(_histogram_lines(name, _label(view), snapshot[view][key]))
+
+    lines.append('# HELP erp_slowest_query_seconds Slowest single SQL statement seen per view')
+    lines.append('# TYPE erp_slowest_query_seconds gauge')
+    for view in views:
+        lines.append(f'erp_slowest_query_seconds{{view="{_label(view)}"}} {snapshot[view]["slowest_seconds"]}')
+    return '\n'.join(lines) + '\n'
+
+
+@staff_member_required
+def sql_metrics_view(request):
+    """
+    Prometheus scrape endpoint for this worker's SQL metrics (staff only)
+
+    ?slowest=1 returns the slowest statement per view as JSON instead.
+    """
+    snapshot = registry.snapshot()
+    if request.GET.get('slowest'):
+        return HttpResponse(json.dumps({
+            view: {
+                'seconds': stats['slowest_seconds'],
+                'sql': stats['slowest_sql'][:MAX_SQL_LENGTH],
+            }
+            for view, stats in snapshot.items()
+        }, indent=2), content_type='application/json')
+    return HttpResponse(render_prometheus(snapshot), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,81 @@
+"""
+Streaming report exports
+
+Building helpers for exports whose size grows with the date range:
+  * iter_query(): rows from a server-side cursor, fetched in chunks
+  * iter_csv(): CSV lines for a StreamingHttpResponse, one row at a time
+  * write_only_workbook() / workbook_response(): openpyxl write-only
+    workbooks, which stream rows to a temporary file instead of keeping a
+    cell object per value, served back with FileResponse
+
+Memory stays flat whatever the row count: at most CHUNK_SIZE rows are held
+at once. Keep any totals in the generator that consumes the rows.
+
+Example:
+    rows = iter_query("SELECT xordernum, xtotamt FROM opord WHERE zid = %s", [zid])
+    response = StreamingHttpResponse(iter_csv(rows), content_type='text/csv')
+"""
+
+from django.db import connection, transaction
+from django.http import FileResponse
+import csv
+import tempfile
+
+import openpyxl
+
+# Rows fetched per round trip to the server-side cursor
+CHUNK_SIZE = 2000
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def iter_query(sql, params=None, chunk_size=CHUNK_SIZE):
+    """
+    Yield the rows of a query without loading the whole result
+
+    On PostgreSQL the query runs in a named (server-side) cursor inside a
+    transaction, so the server keeps the result and hands it over chunk_size
+    rows at a time. With DISABLE_SERVER_SIDE_CURSORS (transaction pooling)
+    or on other databases a plain cursor is used.
+
+    The transaction stays open until the generator is exhausted or closed;
+    StreamingHttpResponse closes it when the response is finished.
+    """
+    use_named = connection.vendor == 'postgresql' and not connection.settings_dict.get('DISABLE_SERVER_SIDE_CURSORS')
+    with transaction.atomic():
+        with (connection.chunked_cursor() if use_named else connection.cursor()) as cursor:
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+
+
+class _Echo:
+    """File-like object whose write() returns the line instead of storing it"""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    """CSV-formatted lines for an iterable of rows"""
+    writer = csv.writer(_Echo())
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def write_only_workbook(title):
+    """New write-only workbook and its single worksheet"""
+    workbook = openpyxl.Workbook(write_only=True)
+    return workbook, workbook.create_sheet(title)
+
+
+def workbook_response(workbook, filename):
+    """Save a workbook to a temporary file and stream it as an attachment"""
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    # FileResponse closes (and so deletes) the temporary file when done
+    return FileResponse(output, as_attachment=True, filename=filename, content_type=XLSX_CONTENT_TYPE)
@@ -0,0 +1,38 @@
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+
+from apps.inventory.models import ItemCost
+from apps.utils.average_price_calculation import get_average_prices_bulk, receipt_line_values
+
+
+class ReceiptValuationTests(TestCase):
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE imtrn (
+                    zid integer, xitem varchar(50), xdate date,
+                    xqty decimal(18, 3), xval decimal(20, 6), xsign integer
+                )
+            """)
+            # C was oversold: two issued with no receipt on record
+            cursor.execute("INSERT INTO imtrn VALUES (100001, 'C', '2026-10-01', 2, 20, -1)")
+        ItemCost.objects.create(zid=100001, xitem='A', xqty=4, xval=40, xavg=10, xdatelast=date(2026, 10, 1))
+
+    def test_repeated_items_see_the_lines_above_them(self):
+        values = receipt_line_values(100001, [
+            ('A', 2, 15), ('B', 2, 5), ('C', 5, 8),
+            ('A', 1, 20), ('B', 2, 7), ('C', 3, 9),
+        ], '2026-10-18')
+
+        self.assertEqual([value for _, value in values], [
+            Decimal('20'), Decimal('10'), Decimal('40'),
+            # A keeps its average; B and C are now stocked by the lines above
+            Decimal('10'), Decimal('10'), Decimal('20'),
+        ])
+        self.assertEqual(values[4][0], Decimal('5'))
+
+    def test_bulk_averages_read_item_cost_and_imtrn(self):
+        self.assertEqual(get_average_prices_bulk(100001, ['A', 'B', 'C'], '2026-10-18'), {'A': 10.0, 'B': 0.0, 'C': 0.0})
@@ -0,0 +1,89 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from apps.utils import document_cache
+
+
+class DocumentCacheTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        settings = override_settings(DOCUMENT_CACHE_ROOT=self.root.name, DOCUMENT_CACHE_BACKEND='disk')
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE TABLE pogrn (zid integer, xgrnnum varchar(20), xstatusgrn varchar(20), xtotamt numeric, zutime timestamp)")
+            cursor.execute("CREATE TABLE imtemptrn (zid integer, ximtmptrn varchar(20), xstatustrn varchar(20), zutime timestamp)")
+            cursor.execute("INSERT INTO pogrn VALUES (100001, 'GRN-1', 'Open', 100, NULL)")
+
+        self.version = 'v1'
+        patcher = patch.object(document_cache, 'document_version', side_effect=lambda *args: self.version)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reprint_is_served_until_the_document_changes(self):
+        self.assertEqual(document_cache.lookup(100001, 'invoice', 'SO-1'), (None, 'v1'))
+        document_cache.store(100001, 'invoice', 'SO-1', 'v1', b'%PDF first')
+        self.assertEqual(document_cache.lookup(100001, 'invoice', 'SO-1'), (b'%PDF first', 'v1'))
+        self.assertEqual(document_cache.lookup(100002, 'invoice', 'SO-1')[0], None)
+
+        self.version = 'v2'
+        self.assertEqual(document_cache.lookup(100001, 'invoice', 'SO-1'), (None, 'v2'))
+        document_cache.store(100001, 'invoice', 'SO-1', 'v2', b'%PDF second')
+        # The older render is replaced, not kept alongside
+        self.assertEqual(os.listdir(Path(self.root.name) / '100001' / 'invoice' / 'SO-1'), ['v2.pdf'])
+
+    def test_edits_invalidate_after_commit(self):
+        document_cache.store(100001, 'po_grn', 'GRN-1', 'v1', b'%PDF grn')
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            document_cache.invalidate(100001, 'po_grn', 'GRN-1')
+        self.assertEqual(document_cache.lookup(100001, 'po_grn', 'GRN-1')[0], b'%PDF grn')
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(document_cache.lookup(100001, 'po_grn', 'GRN-1')[0], None)
+
+    def test_a_render_stored_after_an_edit_is_never_served(self):
+        patch.stopall()
+        before = document_cache.document_version(100001, 'po_grn', 'GRN-1')
+
+        # The edit only changes lines; invalidate() still moves the stamp
+        with self.captureOnCommitCallbacks(execute=True):
+            document_cache.invalidate(100001, 'po_grn', 'GRN-1')
+        after = document_cache.document_version(100001, 'po_grn', 'GRN-1')
+        self.assertNotEqual(before, after)
+
+        # A print that started before the edit stores its render late
+        document_cache.store(100001, 'po_grn', 'GRN-1', before, b'%PDF pre-edit')
+        self.assertEqual(document_cache.lookup(100001, 'po_grn', 'GRN-1'), (None, after))
+
+    def test_least_recently_used_renders_are_evicted(self):
+        for number in ('SO-1', 'SO-2', 'SO-3'):
+            document_cache.store(100001, 'invoice', number, 'v1', b'x' * 100)
+        paths = {number: Path(self.root.name) / '100001' / 'invoice' / number / 'v1.pdf' for number in ('SO-1', 'SO-2', 'SO-3')}
+        os.utime(paths['SO-1'], (1000, 1000))
+        os.utime(paths['SO-2'], (3000, 3000))
+        os.utime(paths['SO-3'], (2000, 2000))
+
+        self.assertEqual(document_cache.evict(max_bytes=250), 1)
+        self.assertFalse(paths['SO-1'].exists())
+        self.assertTrue(paths['SO-2'].exists())
+
+    @override_settings(DOCUMENT_CACHE_BACKEND='cache')
+    def test_cache_backend(self):
+        self.addCleanup(cache.clear)
+        document_cache.store(100001, 'sales_return', 'SR-1', 'v1', b'%PDF return')
+        self.assertEqual(document_cache.lookup(100001, 'sales_return', 'SR-1')[0], b'%PDF return')
+
+        self.version = 'v2'
+        self.assertEqual(document_cache.lookup(100001, 'sales_return', 'SR-1')[0], None)
+        with self.captureOnCommitCallbacks(execute=True):
+            document_cache.invalidate(100001, 'sales_return', 'SR-1')
+        self.assertIsNone(cache.get(document_cache._cache_key(100001, 'sales_return', 'SR-1')))
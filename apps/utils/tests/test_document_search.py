@@ -0,0 +1,85 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+
+from apps.utils.datatables import DATE, fetch
+from apps.utils.document_search import backfill_sql, index_condition, install_sql
+
+TEST_LIST = {
+    'name': 'test_list',
+    'from': 'opord',
+    'where': 'zid = %s',
+    'key': ['xordernum'],
+    'search_index': [('opord', 'xordernum')],
+    'columns': [
+        {'expr': 'xdate', 'type': DATE, 'keyset': True},
+        {'expr': 'xordernum', 'keyset': True},
+        {'expr': 'xwh'},
+    ],
+}
+
+
+class RecordingCursor:
+    """Stands in for the PostgreSQL cursor: records statements, returns fixed rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+    def fetchall(self):
+        return self.rows
+
+
+class DocumentSearchTests(TestCase):
+    def search(self, term, matches, rows=()):
+        """One draw of TEST_LIST against the index, with matches documents found"""
+        cursor = RecordingCursor(list(rows))
+        connection = MagicMock()
+        connection.cursor.return_value = cursor
+        with patch('apps.utils.document_search.available', return_value=True), \
+                patch('apps.utils.datatables.connection', connection), \
+                patch('apps.utils.row_counts.filtered', return_value=(matches, False)) as filtered, \
+                patch('apps.utils.row_counts.total', return_value=5000):
+            result = fetch(TEST_LIST, {'search[value]': term, 'length': '10'}, [100001])
+        self.assertEqual(len(cursor.executed), 1)
+        return result, cursor.executed[0], filtered.call_args[0]
+
+    def test_triggers_refresh_only_on_indexed_columns(self):
+        sql = install_sql('poord')
+        self.assertIn('AFTER INSERT OR DELETE OR UPDATE OF xpornum, xstatuspor, xsup, xwh ON poord', sql)
+        self.assertIn('s.zid = NEW.zid AND s.xsup = NEW.xsup', sql)
+        self.assertIn('s.zid = d.zid AND s.xsup = d.xsup', backfill_sql('poord'))
+
+    def test_lists_search_through_the_index(self):
+        conditions, params = index_condition([('opord', 'xordernum')], 100001, 'card')
+        self.assertIn('ds.search_vector @@', conditions[0])
+        self.assertEqual(params, [100001, 'opord', 'card', '%CARD%'])
+
+        _, (sql, params), _ = self.search('2024-03', 0)
+        self.assertIn('document_search', sql)
+        self.assertIn('xdate >=', sql)
+        self.assertNotIn('xwh LIKE', sql)
+
+    def test_common_terms_keep_every_match(self):
+        rows = [('2024-03-01', f'SO-{i:04d}', 'Main', '2024-03-01', f'SO-{i:04d}') for i in range(10)]
+        result, (sql, params), (count_sql, count_params) = self.search('Confirmed', 1500, rows)
+
+        # Matches are neither ranked nor cut off: the list query pages them
+        self.assertIn('SELECT ds.number', count_sql)
+        self.assertNotIn('LIMIT', count_sql)
+        self.assertNotIn('ts_rank', sql)
+        self.assertEqual(sql.count('LIMIT'), 1)
+        self.assertTrue(sql.endswith('ORDER BY xdate desc, xordernum desc LIMIT %s OFFSET %s'))
+        self.assertEqual(params[-2:], [10, 0])
+
+        self.assertEqual(result['recordsFiltered'], 1500)
+        self.assertEqual(len(result['data']), 10)
@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.utils import master_data
+from apps.utils.master_data import invalidate_master_data, search_master_data
+
+
+class MasterDataTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        master_data._lists.clear()
+        self.addCleanup(cache.clear)
+        self.addCleanup(master_data._lists.clear)
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE TABLE xcodes (zid integer, xtype varchar(50), xcode varchar(50), zutime timestamp)")
+            cursor.execute("CREATE TABLE casup (zid integer, xsup varchar(50), xshort varchar(100), zutime timestamp)")
+            for code in ['Main Store', 'Back Store', 'Showroom']:
+                cursor.execute("INSERT INTO xcodes VALUES (100001, 'Warehouse', %s, NULL)", [code])
+            cursor.execute("INSERT INTO xcodes VALUES (100002, 'Warehouse', 'Other Business', NULL)")
+            for i in range(25):
+                cursor.execute("INSERT INTO casup VALUES (100001, %s, %s, NULL)", [f'SUP-{i:04d}', f'Supplier {i}'])
+
+    def test_lists_are_searched_in_memory(self):
+        rows, more = search_master_data(100001, 'xcodes', 'STORE', xtype='Warehouse')
+        self.assertEqual(rows, [('Back Store', None), ('Main Store', None)])
+        self.assertFalse(more)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(len(search_master_data(100001, 'xcodes', '', xtype='Warehouse')[0]), 3)
+            self.assertEqual(search_master_data(100001, 'xcodes', 'room', xtype='Warehouse')[0], [('Showroom', None)])
+        self.assertEqual(len(queries), 0)
+
+    def test_pages_match_on_code_or_name(self):
+        rows, more = search_master_data(100001, 'casup', 'supplier', offset=20, limit=20)
+        self.assertEqual([row[0] for row in rows], [f'SUP-{i:04d}' for i in range(20, 25)])
+        self.assertFalse(more)
+        rows, more = search_master_data(100001, 'casup', 'sup-001', limit=5)
+        self.assertEqual(len(rows), 5)
+        self.assertTrue(more)
+
+    def test_invalidation_reloads_after_commit(self):
+        search_master_data(100001, 'xcodes', xtype='Warehouse')
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE xcodes SET xcode = 'Main Depot' WHERE xcode = 'Main Store'")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_master_data(100001, 'xcodes')
+            self.assertEqual(len(search_master_data(100001, 'xcodes', 'depot', xtype='Warehouse')[0]), 0)
+        self.assertEqual(search_master_data(100001, 'xcodes', 'depot', xtype='Warehouse')[0], [('Main Depot', None)])
+
+    @patch.object(master_data, 'CHECK_SECONDS', 0)
+    def test_direct_writes_change_the_fingerprint(self):
+        search_master_data(100001, 'casup', limit=20)
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO casup VALUES (100001, 'SUP-9999', 'Legacy entry', NULL)")
+        self.assertEqual(search_master_data(100001, 'casup', 'legacy')[0], [('SUP-9999', 'Legacy entry')])
@@ -0,0 +1,76 @@
+import time
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from apps.sales.management.commands.load_test_pos import Command
+from apps.utils.pos_load import (
+    CheckoutCounter, RunStats, build_sale_payload, classify_failure, classify_statement, percentile,
+)
+
+
+class PosLoadTests(SimpleTestCase):
+    def test_percentiles_use_nearest_rank(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 95), 7)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_checkout_failures_are_classified(self):
+        self.assertEqual(classify_failure(200, {'success': True}), 'ok')
+        self.assertEqual(classify_failure(400, {'success': False, 'validation_failed': True}), 'stock_rejected')
+        self.assertEqual(
+            classify_failure(500, {'error': 'Failed to process sale: deadlock detected\nDETAIL: ...'}), 'deadlock'
+        )
+        self.assertEqual(
+            classify_failure(500, {'error': 'duplicate key value violates unique constraint "opord_pkey"'}),
+            'duplicate_voucher'
+        )
+        self.assertEqual(classify_failure(502, None), 'error')
+
+    def test_statements_are_grouped_by_sale_step(self):
+        self.assertEqual(classify_statement('UPDATE voucher_sequence SET xlast = xlast + 1'), 'voucher_numbering')
+        self.assertEqual(
+            classify_statement('SELECT xitem, xqty FROM stock_balance WHERE zid = $1\nORDER BY xitem FOR UPDATE'),
+            'stock_check'
+        )
+        self.assertEqual(classify_statement('INSERT INTO imtrn (ztime, zid) VALUES ($1, $2)'), 'imtrn_insert')
+        self.assertEqual(classify_statement('COMMIT'), 'other')
+
+    def test_payload_totals_and_summary(self):
+        product = {'xitem': 'IT-1', 'xdesc': 'Cable', 'xstdprice': 2.5, 'item_cost': 1.0, 'xunitstk': 'Pcs'}
+        payload = build_sale_payload([(product, 3)], 'Main')
+
+        self.assertEqual(payload['items'][0]['total'], 7.5)
+        self.assertEqual(payload['totals']['grand_total'], 7.5)
+        self.assertEqual(payload['header_info']['warehouse'], 'Main')
+
+        stats = RunStats()
+        for ms in (10, 20, 30, 40):
+            stats.observe('checkout', ms)
+        stats.checkout('ok', 3)
+        stats.checkout('ok', 1)
+        stats.checkout('deadlock', 2, 'deadlock detected')
+        summary = stats.summary(elapsed=2)
+
+        self.assertEqual(summary['sales'], 2)
+        self.assertEqual(summary['sales_per_s'], 1.0)
+        self.assertEqual(summary['lines_per_s'], 2.0)
+        self.assertEqual(summary['steps']['checkout']['p95_ms'], 40)
+        self.assertEqual(summary['outcomes']['deadlock'], 1)
+
+    def test_counters_start_on_the_clock_and_failures_are_reported(self):
+        command = 'apps.sales.management.commands.load_test_pos'
+        options = {'base_url': 'http://testserver', 'seed': 1, 'think_ms': 0, 'duration': 5}
+        with patch.object(CheckoutCounter, 'login'), \
+                patch.object(CheckoutCounter, 'sell_once', side_effect=ValueError('bad payload')), \
+                patch(f'{command}.database_deadlocks', side_effect=lambda: time.sleep(0.05)), \
+                patch(f'{command}.duplicate_vouchers', return_value={'opord': [], 'imtrn': []}), \
+                patch(f'{command}.ContentionSampler', return_value=MagicMock(**{'summary.return_value': []})):
+            run = Command()._run_step(3, {'zid': 100001}, ['cable'], 'Main', options)
+
+        # Every counter saw the deadline and then died in sell_once, not on a missing clock
+        self.assertEqual(run['dead_counters'], [f'counter-{n}: ValueError: bad payload' for n in (1, 2, 3)])
+        self.assertLess(run['elapsed_s'], 5)
@@ -0,0 +1,43 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from apps.crossapp.management.commands.check_query_budgets import Command
+from apps.utils.query_budgets import build_report, check_budget, measure_endpoint
+
+BUDGETS = {'metrics': (3, 1000)}
+
+
+class QueryBudgetTests(TestCase):
+    def test_measures_warm_runs(self):
+        user = User.objects.create_user('admin', password='x', is_staff=True)
+        self.client.force_login(user)
+
+        measurement = measure_endpoint(self.client, 'get', '/metrics/', repeat=2)
+
+        self.assertEqual(measurement['status'], 200)
+        self.assertEqual(len(measurement['runs']), 2)
+        # The auth user lookup; the session lives in the cache
+        self.assertEqual(measurement['queries'], 1)
+
+    def test_over_budget_entries_fail_the_report(self):
+        within = check_budget('metrics', {'status': 200, 'queries': 3, 'ms': 12.5, 'runs': []}, BUDGETS)
+        over = check_budget('metrics', {'status': 500, 'queries': 4, 'ms': 12.5, 'runs': []}, BUDGETS)
+
+        self.assertTrue(within['passed'])
+        self.assertEqual(over['failures'], ['HTTP 500', '4 queries > 3'])
+        self.assertFalse(build_report([within, over], 100001)['passed'])
+
+    @override_settings(ALLOWED_HOSTS=['erp.example.com'])
+    def test_command_requests_use_an_allowed_host(self):
+        User.objects.create_superuser('admin', password='x')
+        requests = {'pos_products_api': {'method': 'get', 'url': '/metrics/'}}
+        out = StringIO()
+        with patch.object(Command, '_fixtures', return_value={}), \
+                patch.object(Command, '_requests', return_value=requests):
+            call_command('check_query_budgets', '--zid', '100001', '--repeat', '1', stdout=out)
+
+        self.assertIn('HTTP 200', out.getvalue())
@@ -0,0 +1,48 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.utils import row_counts
+
+COUNT_SQL = "SELECT COUNT(*) FROM row_counts_test WHERE zid = %s"
+SELECT_SQL = "SELECT 1 FROM row_counts_test WHERE zid = %s AND xnum LIKE %s"
+
+
+class RowCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE TABLE row_counts_test (zid integer, xnum varchar(20))")
+            for i in range(12):
+                cursor.execute("INSERT INTO row_counts_test VALUES (%s, %s)", [100001, f'SO-{i:04d}'])
+
+    def test_totals_are_cached_and_bumped_after_commit(self):
+        self.assertEqual(row_counts.total('row_counts_test', 100001, COUNT_SQL, [100001]), 12)
+
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                row_counts.bump('row_counts_test', 100001, 1)
+                row_counts.bump('row_counts_test', 100002, 1)  # Not cached: ignored
+            self.assertEqual(row_counts.total('row_counts_test', 100001, COUNT_SQL, [100001]), 13)
+        self.assertEqual(len(queries), 0)
+
+        # A rolled-back write never reaches the cache
+        with self.captureOnCommitCallbacks(execute=False):
+            row_counts.bump('row_counts_test', 100001, -1)
+        self.assertEqual(row_counts.total('row_counts_test', 100001, COUNT_SQL, [100001]), 13)
+        self.assertEqual(row_counts.total('row_counts_test', 100002, COUNT_SQL, [100002]), 0)
+
+    def test_small_filtered_sets_are_counted_exactly(self):
+        self.assertEqual(row_counts.filtered(SELECT_SQL, [100001, 'SO-000%']), (10, False))
+
+    @patch.object(row_counts, 'estimate', return_value=2500000)
+    def test_large_filtered_sets_use_the_planner_estimate(self, estimate):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(row_counts.filtered(SELECT_SQL, [100001, 'SO-%']), (2500000, True))
+            self.assertEqual(row_counts.filtered(SELECT_SQL, [100001, 'SO-%']), (2500000, True))
+        self.assertEqual(len(queries), 0)
+        estimate.assert_called_once()
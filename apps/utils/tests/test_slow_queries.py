@@ -0,0 +1,54 @@
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from types import SimpleNamespace
+
+from apps.crossapp.models import SlowQuery, SlowQuerySample
+from apps.utils.slow_queries import SlowQueryMiddleware, normalize_sql, redact_params
+
+
+def ledger_view(request):
+    request.resolver_match = SimpleNamespace(view_name='item-ledger')
+    with connection.cursor() as cursor:
+        for xitem in ('A-1', 'B-2', 'C-3'):
+            cursor.execute("SELECT %s, 42 WHERE 'x' IN (%s, %s)", [xitem, 100001, 'secret'])
+    return HttpResponse('ok')
+
+
+class SlowQueryTests(TestCase):
+    def test_normalize_sql_groups_literals_and_lists(self):
+        self.assertEqual(
+            normalize_sql("SELECT *  FROM caitem\n WHERE zid = %s AND xitem IN (%s, %s) AND xdesc LIKE '%%bolt%%' LIMIT 20"),
+            "SELECT * FROM caitem WHERE zid = ? AND xitem IN (?) AND xdesc LIKE ? LIMIT ?",
+        )
+        self.assertEqual(
+            normalize_sql("INSERT INTO imtrn (zid, xitem) VALUES (%s, %s), (%s, %s)"),
+            "INSERT INTO imtrn (zid, xitem) VALUES (?)",
+        )
+
+    def test_redact_params_keeps_only_integers(self):
+        self.assertEqual(redact_params([100001, 'CO--000042', None]), '[100001, "<str>", null]')
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_zero_threshold_disables_capture(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            SlowQueryMiddleware(ledger_view)
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0.000001, SLOW_QUERY_SAMPLES=2)
+    def test_captures_grouped_samples(self):
+        SlowQueryMiddleware(ledger_view)(RequestFactory().get('/inventory/reports/item-ledger/'))
+
+        query = SlowQuery.objects.get()
+        self.assertEqual(query.calls, 3)
+        self.assertEqual(query.statement, "SELECT ?, ? WHERE ? IN (?)")
+
+        samples = SlowQuerySample.objects.filter(query=query)
+        self.assertEqual(samples.count(), 2)
+        sample = samples.first()
+        self.assertEqual(sample.view, 'item-ledger')
+        self.assertEqual(sample.params, '["<str>", 100001, "<str>"]')
+        self.assertIn('apps/utils/tests/test_slow_queries.py', sample.call_site)
+        self.assertIn('ledger_view', sample.call_site)
+        # Plans need PostgreSQL
+        self.assertIsNone(sample.plan)
@@ -0,0 +1,51 @@
+from django.contrib.auth.models import User
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from types import SimpleNamespace
+
+from apps.utils.sql_metrics import SqlMetricsMiddleware, registry, render_prometheus
+
+
+def two_query_view(request):
+    request.resolver_match = SimpleNamespace(view_name='pos-sales')
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.execute("SELECT 2")
+    return HttpResponse('ok')
+
+
+class SqlMetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        registry.reset()
+
+    @override_settings(SQL_METRICS_ENABLED=False)
+    def test_disabled_middleware_leaves_the_chain(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            SqlMetricsMiddleware(two_query_view)
+
+    @override_settings(SQL_METRICS_ENABLED=True)
+    def test_records_queries_per_view(self):
+        middleware = SqlMetricsMiddleware(two_query_view)
+        middleware(RequestFactory().get('/sales/pos-sales/'))
+        middleware(RequestFactory().get('/sales/pos-sales/'))
+
+        stats = registry.snapshot()['pos-sales']
+        self.assertEqual(stats['queries'][1:], (4, 2))
+        self.assertIn(stats['slowest_sql'], ('SELECT 1', 'SELECT 2'))
+
+        text = render_prometheus(registry.snapshot())
+        self.assertIn('erp_request_queries_bucket{view="pos-sales",le="2"} 2', text)
+        self.assertIn('erp_request_duration_seconds_count{view="pos-sales"} 2', text)
+
+    def test_endpoint_is_staff_only(self):
+        user = User.objects.create_user('clerk', password='x')
+        self.client.force_login(user)
+        self.assertEqual(self.client.get('/metrics/').status_code, 302)
+
+        user.is_staff = True
+        user.save()
+        response = self.client.get('/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('# TYPE erp_request_queries histogram', response.content.decode())
@@ -1,8 +1,16 @@
 """
 Simple and Flexible Voucher Number Generation System
+
+Numbers are allocated from the ``voucher_sequence`` counter table, one row per
+(zid, prefix), or per (zid, sequence key) where one prefix is numbered
+separately in two tables (see SEQUENCE_KEYS). The first allocation for a prefix seeds its counter from the
+highest number already stored in the owning table; after that every call is a
+single ``UPDATE ... RETURNING`` on one row, so it no longer scans the document
+tables and two sessions can never be handed the same number. The counter row
+stays locked until the caller's transaction commits, and a rolled back
+transaction gives its numbers back.
 """
 
-import re
 from django.db import transaction, connection
 from django.core.exceptions import ValidationError
 from django.utils import timezone
@@ -11,6 +19,115 @@
 logger = logging.getLogger(__name__)
 
 
+# Known (prefix, table, column) combinations, used by the seed_voucher_sequences
+# command to backfill counters. See transaction_prefix.md.
+VOUCHER_SOURCES = [
+    ('CO--', 'opord', 'xordernum'),
+    ('IS--', 'imtrn', 'ximtrnnum'),
+    ('RE--', 'imtrn', 'ximtrnnum'),
+    ('SRE', 'imtrn', 'ximtrnnum'),
+    ('PO--', 'poord', 'xpornum'),
+    ('GRN-', 'pogrn', 'xgrnnum'),
+    ('SALE', 'glheader', 'xvoucher'),
+    ('SRET', 'glheader', 'xvoucher'),
+    ('SRE-', 'imtemptrn', 'ximtmptrn'),
+    ('SRE-', 'imtemptdt', 'ximtrnnum'),
+    ('REC-', 'imtemptrn', 'ximtmptrn'),
+    ('ISS-', 'imtemptrn', 'ximtmptrn'),
+    ('PRE--', 'imtemptrn', 'ximtmptrn'),
+]
+
+# Counters are keyed by prefix. Sales return lines reuse their header's 'SRE-'
+# prefix but have always been numbered on their own, from imtemptdt, so they
+# keep a separate counter; stored in voucher_sequence.xprefix.
+SEQUENCE_KEYS = {
+    ('SRE-', 'imtemptdt'): 'SRE-@imtemptdt',
+}
+
+
+def sequence_key(prefix: str, table: str) -> str:
+    """voucher_sequence.xprefix of the counter numbering prefix in table"""
+    return SEQUENCE_KEYS.get((prefix, table), prefix)
+
+
+def like_prefix(prefix: str) -> str:
+    """Anchored LIKE pattern for a prefix, with wildcard characters escaped"""
+    escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"{escaped}%"
+
+
+def max_voucher_number_sql(table: str, column: str, xaction: str = None, group_by_zid: bool = False) -> str:
+    """
+    SQL returning the highest numeric part stored after a prefix in table.column.
+
+    Parameters, in order: prefix length + 1, LIKE pattern, then zid (unless
+    group_by_zid) and xaction (when given). The numeric part is the first run of
+    digits after the prefix, matching how numbers were parsed historically.
+    """
+    numeric_part = f"CAST(SUBSTRING(SUBSTRING({column} FROM %s) FROM '[0-9]+') AS BIGINT)"
+    filters = f"{column} LIKE %s"
+    if not group_by_zid:
+        filters += " AND zid = %s"
+    if xaction is not None:
+        filters += " AND xaction = %s"
+
+    if group_by_zid:
+        return f"SELECT zid, MAX({numeric_part}) FROM {table} WHERE {filters} GROUP BY zid"
+    return f"SELECT MAX({numeric_part}) FROM {table} WHERE {filters}"
+
+
+def _allocate_sequence(cursor, zid: int, prefix: str, count: int, table: str, column: str, xaction: str = None) -> int:
+    """
+    Advance the (zid, prefix) counter by count and return its new last value.
+
+    The issued numbers are (last - count + 1) .. last. When the counter does not
+    exist yet it is seeded from table.column before being advanced.
+    """
+    key = sequence_key(prefix, table)
+    cursor.execute(
+        """
+        UPDATE voucher_sequence
+        SET xlast = xlast + %s, zutime = NOW()
+        WHERE zid = %s AND xprefix = %s
+        RETURNING xlast
+        """,
+        [count, zid, key]
+    )
+    row = cursor.fetchone()
+    if row:
+        return int(row[0])
+
+    # First use of this prefix: seed from existing documents. Concurrent seeders
+    # insert the same value and the loser's insert is ignored; both then take
+    # their numbers through the row-locking UPDATE below.
+    params = [len(prefix) + 1, like_prefix(prefix), zid]
+    if xaction is not None:
+        params.append(xaction)
+    cursor.execute(max_voucher_number_sql(table, column, xaction), params)
+    seed_row = cursor.fetchone()
+    seed = int(seed_row[0]) if seed_row and seed_row[0] is not None else 0
+
+    cursor.execute(
+        """
+        INSERT INTO voucher_sequence (zid, xprefix, xlast, zutime)
+        VALUES (%s, %s, %s, NOW())
+        ON CONFLICT (zid, xprefix) DO NOTHING
+        """,
+        [zid, key, seed]
+    )
+    cursor.execute(
+        """
+        UPDATE voucher_sequence
+        SET xlast = xlast + %s, zutime = NOW()
+        WHERE zid = %s AND xprefix = %s
+        RETURNING xlast
+        """,
+        [count, zid, key]
+    )
+    logger.info(f"Seeded voucher sequence {key} for zid={zid} from {table}.{column} at {seed}")
+    return int(cursor.fetchone()[0])
+
+
 def generate_voucher_number(zid: int, prefix: str, table: str, column: str, length: int = 6, xaction: str = None) -> str:
     """
     Generate next voucher number for any table and column combination
@@ -21,80 +138,70 @@ def generate_voucher_number(zid: int, prefix: str, table: str, column: str, leng
         table: Database table name (e.g., 'imtrn', 'poord', 'pogrn')
         column: Column name containing voucher numbers (e.g., 'ximtmptrn', 'xpornum')
         length: Number padding length (default: 6)
-        xaction: Transaction type for additional filtering (default: None)
+        xaction: Transaction type filter applied when seeding a new counter (default: None)
 
     Returns:
         Next voucher number (e.g., 'RE--001035')
 
+    Note:
+        table, column and xaction are only read the first time a (zid, prefix)
+        counter is used; afterwards the number comes from voucher_sequence.
+        table also picks the counter when SEQUENCE_KEYS splits a prefix.
+
     Example:
         voucher = generate_voucher_number(100001, 'RE--', 'imtrn', 'ximtmptrn')
         # Returns: 'RE--001035'
-
-        voucher_with_action = generate_voucher_number(100001, 'RE--', 'imtrn', 'ximtmptrn', xaction='RETURN')
-        # Returns: 'RE--001036' (filtered by xaction)
     """
 
-    def extract_numeric_part(voucher_number: str, prefix: str) -> int:
-        """Extract numeric part from voucher number"""
-        if not voucher_number or not voucher_number.startswith(prefix):
-            return 0
-
-        # Remove prefix to get numeric part
-        numeric_part = voucher_number[len(prefix):]
-
-        # Extract only digits
-        digits = re.findall(r'\d+', numeric_part)
-        if digits:
-            return int(digits[0])
-
-        return 0
-
     def format_voucher_number(prefix: str, number: int, length: int) -> str:
         """Format voucher number with proper padding"""
         return f"{prefix}{number:0{length}d}"
 
     try:
         with transaction.atomic():
-            # Use raw SQL with SELECT FOR UPDATE to prevent race conditions
             with connection.cursor() as cursor:
-                # Build SQL query with optional xaction filtering
-                if xaction is not None:
-                    sql = f"""
-                        SELECT {column}
-                        FROM {table}
-                        WHERE zid = %s AND {column} LIKE %s AND xaction = %s
-                        ORDER BY {column} DESC
-                        LIMIT 1
-                        FOR UPDATE
-                    """
-                    params = [zid, f"%{prefix}%", xaction]
-                else:
-                    sql = f"""
-                        SELECT {column}
-                        FROM {table}
-                        WHERE zid = %s AND {column} LIKE %s
-                        ORDER BY {column} DESC
-                        LIMIT 1
-                        FOR UPDATE
-                    """
-                    params = [zid, f"%{prefix}%"]
-
-                cursor.execute(sql, params)
-                result = cursor.fetchone()
-
-                if result and result[0]:
-                    last_voucher = result[0]
-                    last_number = extract_numeric_part(last_voucher, prefix)
-                    next_number = last_number + 1
-                else:
-                    next_number = 1
-
+                next_number = _allocate_sequence(cursor, zid, prefix, 1, table, column, xaction)
                 return format_voucher_number(prefix, next_number, length)
 
     except Exception as e:
         logger.error(f"Error generating voucher number for table {table}, column {column}, prefix {prefix}: {str(e)}")
         raise ValidationError(f"Failed to generate voucher number: {str(e)}")
 
+def reserve_voucher_numbers(zid: int, prefix: str, table: str, column: str, count: int,
+                            length: int = 6, xaction: str = None) -> list:
+    """
+    Reserve a contiguous block of voucher numbers in one allocation
+
+    Args:
+        zid: Zone/Company ID for filtering
+        prefix: Transaction prefix (e.g., 'IS--', 'RE--')
+        table: Database table name, used to seed a new counter
+        column: Column name containing voucher numbers, used to seed a new counter
+        count: How many numbers to reserve
+        length: Number padding length (default: 6)
+        xaction: Transaction type filter applied when seeding a new counter (default: None)
+
+    Returns:
+        List of count consecutive voucher numbers in ascending order
+
+    Example:
+        numbers = reserve_voucher_numbers(100001, 'IS--', 'imtrn', 'ximtrnnum', 3)
+        # Returns: ['IS--000041', 'IS--000042', 'IS--000043']
+    """
+    if count <= 0:
+        return []
+
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                last_number = _allocate_sequence(cursor, zid, prefix, count, table, column, xaction)
+                first_number = last_number - count + 1
+                return [f"{prefix}{number:0{length}d}" for number in range(first_number, last_number + 1)]
+
+    except Exception as e:
+        logger.error(f"Error reserving {count} voucher numbers for table {table}, column {column}, prefix {prefix}: {str(e)}")
+        raise ValidationError(f"Failed to reserve voucher numbers: {str(e)}")
+
 def generate_sinv_voucher(zid: int, prefix: str) -> str:
     """
     Generate supplier invoice voucher in format "SINVMMYY-XXXXXX" with month-based serial reset.
@@ -110,8 +217,9 @@ def generate_sinv_voucher(zid: int, prefix: str) -> str:
         ValidationError: If database access fails or voucher generation encounters an error.
 
     Thread Safety:
-        Uses a transaction with SELECT FOR UPDATE to serialize concurrent generations
-        for an existing month scope.
+        Each month has its own voucher_sequence counter (prefix "SINVMMYY-"),
+        so the serial resets monthly and concurrent generations are serialized
+        on that counter row.
     """
     try:
         with transaction.atomic():
@@ -121,28 +229,7 @@ def generate_sinv_voucher(zid: int, prefix: str) -> str:
                 year_short = f"{now.year % 100:02d}"
                 base_prefix = f"{prefix}{month}{year_short}-"
 
-                cursor.execute(
-                    """
-                    SELECT xvoucher
-                    FROM glheader
-                    WHERE zid = %s AND xvoucher LIKE %s
-                    ORDER BY xvoucher DESC
-                    LIMIT 1
-                    FOR UPDATE
-                    """,
-                    [zid, f"{base_prefix}%"],
-                )
-                row = cursor.fetchone()
-
-                if row and row[0]:
-                    serial_str = row[0].split('-')[-1]
-                    try:
-                        last_serial = int(serial_str)
-                    except ValueError:
-                        last_serial = 0
-                    next_serial = last_serial + 1
-                else:
-                    next_serial = 1
+                next_serial = _allocate_sequence(cursor, zid, base_prefix, 1, 'glheader', 'xvoucher')
 
                 voucher = f"{base_prefix}{next_serial:06d}"
                 logger.info(f"Generated voucher {voucher} for zid={zid}")
@@ -165,6 +252,10 @@ def generate_sinv_voucher(zid: int, prefix: str) -> str:
 po_number = generate_voucher_number(100001, 'PO--', 'poord', 'xpornum')
 # Returns: 'PO--000123'
 
+# One allocation for every line of a multi-line document
+line_numbers = reserve_voucher_numbers(100001, 'IS--', 'imtrn', 'ximtrnnum', len(items))
+# Returns: ['IS--000041', 'IS--000042', ...]
+
 # Custom prefix for any table
 custom_voucher = generate_voucher_number(100001, 'CUSTOM-', 'mytable', 'mycolumn')
 # Returns: 'CUSTOM-000001'
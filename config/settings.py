@@ -101,6 +101,8 @@
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "apps.utils.sql_metrics.SqlMetricsMiddleware",  # No-op unless SQL_METRICS_ENABLED
+    "apps.utils.slow_queries.SlowQueryMiddleware",  # No-op unless SLOW_QUERY_THRESHOLD_MS
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -340,3 +342,37 @@
 
 # Your stuff...
 # ------------------------------------------------------------------------------
+
+# Seconds between caitem change checks for the in-memory POS catalog index
+POS_CATALOG_CHECK_SECONDS = 30
+
+# Per-view SQL metrics (served at /metrics/ for staff); JSON request log is optional
+SQL_METRICS_ENABLED = os.environ.get("SQL_METRICS_ENABLED", "False").lower() == "true"
+SQL_METRICS_LOG_JSON = os.environ.get("SQL_METRICS_LOG_JSON", "False").lower() == "true"
+
+# Statements slower than this (ms) are stored with an EXPLAIN plan; 0 disables capture
+SLOW_QUERY_THRESHOLD_MS = int(os.environ.get("SLOW_QUERY_THRESHOLD_MS", "0"))
+# Samples kept per normalized statement
+SLOW_QUERY_SAMPLES = 20
+
+# Background PDF reports: rendered files live here until they expire; identical
+# requests share a job until then
+REPORT_JOB_ROOT = BASE_DIR / 'media' / 'report_jobs'
+REPORT_JOB_TTL_SECONDS = int(os.environ.get("REPORT_JOB_TTL_SECONDS", "600"))
+
+# Rendered documents for reprints (apps.utils.document_cache): 'disk' or 'cache'
+DOCUMENT_CACHE_BACKEND = os.environ.get("DOCUMENT_CACHE_BACKEND", "disk")
+DOCUMENT_CACHE_ROOT = BASE_DIR / 'media' / 'document_cache'
+DOCUMENT_CACHE_MAX_BYTES = int(os.environ.get("DOCUMENT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Select2 lookup lists (apps.utils.master_data): seconds a process trusts its
+# copy before probing the table, and how long the shared copy is kept
+MASTER_DATA_CHECK_SECONDS = int(os.environ.get("MASTER_DATA_CHECK_SECONDS", "30"))
+MASTER_DATA_TTL = 24 * 60 * 60
+
+CELERY_BEAT_SCHEDULE = {
+    'purge-report-jobs': {
+        'task': 'apps.crossapp.tasks.purge_report_jobs',
+        'schedule': 15 * 60,
+    },
+}
@@ -19,10 +19,14 @@
 from django.urls import include, path
 from web_project.views import SystemView
 from apps.authentication.error_views import permission_denied_view
+from apps.utils.sql_metrics import sql_metrics_view
 
 urlpatterns = [
     path("admin/", admin.site.urls),
 
+    # SQL metrics (Prometheus, staff only)
+    path("metrics/", sql_metrics_view, name="sql-metrics"),
+
     # Home urls
     path("", include("apps.home.urls")),  # Add home URLs at root path
 
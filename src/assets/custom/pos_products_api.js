@@ -6,6 +6,7 @@
 // Product Search Configuration
 const PRODUCT_SEARCH_CONFIG = {
     API_URL: '/api/pos/products/',
+    SCAN_URL: '/api/pos/scan/',
     MIN_INPUT_LENGTH: 1,
     DELAY: 250,
     PLACEHOLDER: 'Search products by name, code, or barcode...'
@@ -94,11 +95,11 @@ function searchProductByBarcode(barcode, onSuccess = null, onError = null) {
     }
 
     $.ajax({
-        url: PRODUCT_SEARCH_CONFIG.API_URL,
-        data: { search: barcode.trim() },
+        url: PRODUCT_SEARCH_CONFIG.SCAN_URL,
+        data: { code: barcode.trim() },
         success: function(data) {
-            if (data.results && data.results.length > 0) {
-                const product = data.results[0];
+            if (data.result) {
+                const product = data.result;
 
                 // Call the provided success callback or default behavior
                 if (onSuccess && typeof onSuccess === 'function') {
@@ -121,7 +122,7 @@ function searchProductByBarcode(barcode, onSuccess = null, onError = null) {
             }
         },
         error: function(xhr, status, error) {
-            const errorMessage = 'Error searching product';
+            const errorMessage = xhr.status === 404 ? 'Product not found' : 'Error searching product';
 
             if (onError && typeof onError === 'function') {
                 onError(errorMessage);
@@ -1,11 +1,14 @@
 from django.conf import settings
-import json
 
 
+from web_project.template_helpers.menu import MenuRegistry
 from web_project.template_helpers.theme import TemplateHelper
 
 menu_file_path =  settings.BASE_DIR / "templates" / "layout" / "partials" / "menu" / "vertical" / "json" / "vertical_menu.json"
 
+# Parsed and indexed once per process (reloaded on change in DEBUG)
+menu_registry = MenuRegistry(menu_file_path)
+
 """
 This is an entry and Bootstrap class for the theme level.
 The init() function will be called in web_project/__init__.py
@@ -33,8 +36,8 @@ def init(context):
         return context
 
     def init_menu_data(context):
-        # Load the menu data from the JSON file
-        menu_data = json.load(menu_file_path.open()) if menu_file_path.exists() else []
+        # Menu data from the process-wide registry
+        registry = menu_registry.get()
 
         # Updated context with menu_data
-        context.update({"menu_data": menu_data})
+        context.update({"menu_data": registry.data, "menu_registry": registry})
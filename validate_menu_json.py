@@ -2,13 +2,14 @@
 import json
 import sys
 
+from web_project.template_helpers.menu import validate_menu
+
 def validate_json_file(file_path):
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
-            json.loads(content)
+            data = json.loads(content)
         print("✅ JSON is valid!")
-        return True
     except json.JSONDecodeError as e:
         print(f"❌ JSON Error: {e}")
         print(f"Line: {e.lineno}, Column: {e.colno}")
@@ -29,6 +30,15 @@ def validate_json_file(file_path):
         print(f"❌ Other error: {e}")
         return False
 
+    # Same structure checks the menu registry runs at startup
+    errors = validate_menu(data)
+    for error in errors:
+        print(f"❌ Menu error: {error}")
+    if errors:
+        return False
+    print("✅ Menu structure is valid!")
+    return True
+
 if __name__ == "__main__":
     file_path = "templates/layout/partials/menu/vertical/json/vertical_menu.json"
-    validate_json_file(file_path)
\ No newline at end of file
+    sys.exit(0 if validate_json_file(file_path) else 1)
\ No newline at end of file
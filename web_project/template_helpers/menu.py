@@ -0,0 +1,143 @@
+"""
+Menu registry: loads a menu JSON file once per process and pre-indexes it
+"""
+import hashlib
+import json
+import logging
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+PERMISSION_TYPES = ('view', 'create', 'edit', 'delete')
+
+
+def iter_menu(items, parents=()):
+    """Yield (item, parent slugs) for every item of a menu tree, depth first"""
+    for item in items:
+        yield item, parents
+        if item.get('submenu'):
+            yield from iter_menu(item['submenu'], parents + (item.get('slug'),))
+
+
+def validate_menu(data):
+    """
+    Check the structure of parsed menu JSON
+
+    Returns:
+        list: Error messages; empty when the menu is valid
+    """
+    if not isinstance(data, dict) or not isinstance(data.get('menu'), list):
+        return ['Top level must be an object with a "menu" list']
+
+    errors = []
+    seen_slugs = set()
+    for item, parents in iter_menu(data['menu']):
+        where = ' > '.join([slug for slug in parents if slug] + [str(item.get('slug') or item.get('name'))])
+        if not isinstance(item, dict):
+            errors.append(f'{where}: menu items must be objects')
+            continue
+        if 'menu_header' in item:
+            continue
+
+        if not item.get('name'):
+            errors.append(f'{where}: missing "name"')
+        if not item.get('url') and not item.get('submenu'):
+            errors.append(f'{where}: needs a "url" or a non-empty "submenu"')
+        if 'submenu' in item and not isinstance(item['submenu'], list):
+            errors.append(f'{where}: "submenu" must be a list')
+
+        slug = item.get('slug')
+        if not slug:
+            errors.append(f'{where}: missing "slug"')
+        elif slug in seen_slugs:
+            errors.append(f'{where}: duplicate slug "{slug}"')
+        seen_slugs.add(slug)
+
+        permission = item.get('permission')
+        if permission:
+            module_code, _, action = permission.partition('.')
+            if not module_code or action not in PERMISSION_TYPES:
+                errors.append(f'{where}: permission "{permission}" must look like "<module>.<{"|".join(PERMISSION_TYPES)}>"')
+
+    return errors
+
+
+class MenuRegistry:
+    """
+    One menu JSON file, parsed and validated once, with lookup tables
+
+    Attributes (after load):
+        data: Parsed JSON ({'menu': [...]})
+        digest: Content hash of the file, used in menu cache keys
+        by_slug: slug -> item
+        by_permission: permission code -> list of items
+        by_url: url name or path -> set of slugs of the groups containing it
+
+    In DEBUG the file's mtime is checked on every get() and the menu reloaded
+    when it changes; otherwise it is loaded once per process.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._loaded = False
+
+    def _read(self):
+        if not self.path.exists():
+            return {'menu': []}, None
+        mtime = self.path.stat().st_mtime
+        with self.path.open(encoding='utf-8') as menu_file:
+            raw = menu_file.read()
+        return json.loads(raw), (mtime, hashlib.md5(raw.encode()).hexdigest()[:12])
+
+    def load(self):
+        """(Re)load and index the menu file; raises ValueError when it is invalid"""
+        data, stamp = self._read()
+        errors = validate_menu(data)
+        if errors:
+            raise ValueError(f'Invalid menu {self.path}: ' + '; '.join(errors))
+
+        by_slug = {}
+        by_permission = {}
+        by_url = {}
+        for item, parents in iter_menu(data['menu']):
+            if 'menu_header' in item:
+                continue
+            by_slug[item['slug']] = item
+            if item.get('permission'):
+                by_permission.setdefault(item['permission'], []).append(item)
+            if item.get('url'):
+                by_url.setdefault(item['url'], set()).update(parents)
+
+        self.data = data
+        self.by_slug = by_slug
+        self.by_permission = by_permission
+        self.by_url = {url: frozenset(slugs) for url, slugs in by_url.items()}
+        self._mtime, self.digest = stamp if stamp else (None, 'empty')
+        self._loaded = True
+        logger.info(f"Loaded menu {self.path.name}: {len(by_slug)} items")
+        return self
+
+    def get(self):
+        """Return the loaded registry, reloading in DEBUG when the file changed"""
+        if self._loaded and not settings.DEBUG:
+            return self
+        with self._lock:
+            if not self._loaded:
+                return self.load()
+            mtime = self.path.stat().st_mtime if self.path.exists() else None
+            if mtime != self._mtime:
+                return self.load()
+        return self
+
+    def active_slugs(self, request):
+        """Slugs of the menu groups that contain the item for the current page"""
+        slugs = self.by_url.get(request.path, frozenset())
+        resolver_match = getattr(request, 'resolver_match', None)
+        if resolver_match is not None and resolver_match.url_name:
+            slugs = slugs | self.by_url.get(resolver_match.url_name, frozenset())
+        return slugs
+
@@ -18,6 +18,16 @@ def get_theme_config(scope):
     return mark_safe(TemplateHelper.get_theme_config(scope))
 
 
+@register.simple_tag(takes_context=True)
+def menu_active_slugs(context):
+    """Slugs of the menu groups containing the current page, from the menu registry"""
+    registry = context.get("menu_registry")
+    request = context.get("request")
+    if registry is None or request is None:
+        return frozenset()
+    return registry.active_slugs(request)
+
+
 @register.filter
 def filter_by_url(submenu, url):
     if submenu: